@@ -15,11 +15,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from .base_agent import BaseAgent
-from app.database import (
-    get_published_posts, get_analytics_summary,
-    record_analytics, log_agent_action, update_post_analytics,
-    get_connection, update_prompt_performance
-)
+from app.database import get_connection, async_crud
 from app.insights_helper import get_instagram_insights, get_instagram_media_insights
 from app.config import settings
 
@@ -184,7 +180,7 @@ class AnalyticsAgent(BaseAgent):
         days = input_data.get("days", 30)
         min_score = input_data.get("min_viral_score", 10.0)
 
-        analysis = get_viral_content_analysis(days=days, min_viral_score=min_score)
+        analysis = await async_crud.run_read(get_viral_content_analysis, days=days, min_viral_score=min_score)
 
         # AI ile pattern analizi
         if analysis['viral_posts']:
@@ -226,14 +222,14 @@ Bu verileri analiz et ve viral içerik patternleri çıkar.
 
 Sadece JSON döndür.
 """
-            response = await self.call_claude(prompt, timeout=60)
+            response = await self.call_claude(prompt, timeout=60, validate=self._is_json_response)
             try:
                 ai_analysis = json.loads(self._clean_json_response(response))
                 analysis['ai_insights'] = ai_analysis
             except json.JSONDecodeError:
                 analysis['ai_insights'] = {"error": "AI analizi başarısız"}
 
-        log_agent_action(
+        await async_crud.log_agent_action(
             agent_name=self.name,
             action="viral_analysis",
             input_data={"days": days, "min_score": min_score},
@@ -251,16 +247,20 @@ Sadece JSON döndür.
         if not post_id:
             return {"error": "post_id gerekli"}
 
-        conn = get_connection()
-        cursor = conn.cursor()
+        def _fetch_row():
+            conn = get_connection()
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT ig_reach, ig_saves, ig_shares, ig_engagement_rate, ig_reach_non_followers
-            FROM posts WHERE id = ?
-        ''', (post_id,))
+            cursor.execute('''
+                SELECT ig_reach, ig_saves, ig_shares, ig_engagement_rate, ig_reach_non_followers
+                FROM posts WHERE id = ?
+            ''', (post_id,))
 
-        row = cursor.fetchone()
-        conn.close()
+            row = cursor.fetchone()
+            conn.close()
+            return row
+
+        row = await async_crud.run_read(_fetch_row)
 
         if not row:
             return {"error": f"Post {post_id} bulunamadı"}
@@ -287,10 +287,10 @@ Sadece JSON döndür.
 
         # Bugünün postlarını al
         today = datetime.now().date()
-        posts = get_published_posts(days=1)
+        posts = await async_crud.get_published_posts(days=1)
 
         # Özet metrikleri al
-        summary = get_analytics_summary(days=1)
+        summary = await async_crud.get_analytics_summary(days=1)
 
         report = {
             "date": str(today),
@@ -310,7 +310,7 @@ Sadece JSON döndür.
             ]
         }
 
-        log_agent_action(
+        await async_crud.log_agent_action(
             agent_name=self.name,
             action="daily_report",
             output_data=report,
@@ -324,11 +324,11 @@ Sadece JSON döndür.
         """Haftalık performans raporu"""
         self.log("Haftalık rapor oluşturuluyor...")
 
-        posts = get_published_posts(days=7)
-        summary = get_analytics_summary(days=7)
+        posts = await async_crud.get_published_posts(days=7)
+        summary = await async_crud.get_analytics_summary(days=7)
 
         # Önceki hafta ile karşılaştır
-        prev_summary = get_analytics_summary(days=14)  # Son 14 gün
+        prev_summary = await async_crud.get_analytics_summary(days=14)  # Son 14 gün
 
         report = {
             "week_start": str((datetime.now() - timedelta(days=7)).date()),
@@ -354,7 +354,7 @@ Sadece JSON döndür.
             ]
         }
 
-        log_agent_action(
+        await async_crud.log_agent_action(
             agent_name=self.name,
             action="weekly_report",
             output_data=report,
@@ -368,8 +368,8 @@ Sadece JSON döndür.
         """Performans analizi - stratejiye feedback"""
         self.log("Performans analizi yapılıyor...")
 
-        posts = get_published_posts(days=30)
-        summary = get_analytics_summary(days=30)
+        posts = await async_crud.get_published_posts(days=30)
+        summary = await async_crud.get_analytics_summary(days=30)
 
         if not posts:
             return {"status": "no_data", "message": "Analiz için yeterli veri yok"}
@@ -436,12 +436,12 @@ Bu verileri analiz et ve strateji önerileri sun.
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=90)
+        response = await self.call_claude(prompt, timeout=90, validate=self._is_json_response)
 
         try:
             result = json.loads(self._clean_json_response(response))
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="analyze_performance",
                 input_data={"post_count": len(posts)},
@@ -499,7 +499,7 @@ Sadece JSON döndür.
 
             # DB'ye kaydet
             if post_id and analytics_data:
-                update_post_analytics(post_id, analytics_data)
+                await async_crud.update_post_analytics(post_id, analytics_data)
                 self.log(f"Post {post_id} metrikleri DB'ye kaydedildi")
 
                 # Prompt performansını güncelle
@@ -510,10 +510,10 @@ Sadece JSON döndür.
                     'saves': analytics_data.get('ig_saves', 0),
                     'shares': analytics_data.get('ig_shares', 0)
                 }
-                if update_prompt_performance(post_id, prompt_metrics):
+                if await async_crud.update_prompt_performance(post_id, prompt_metrics):
                     self.log(f"Post {post_id} prompt performansı güncellendi")
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="fetch_metrics",
                 input_data={"post_id": post_id, "ig_id": instagram_post_id},
@@ -525,7 +525,7 @@ Sadece JSON döndür.
 
         except Exception as e:
             self.log(f"Metrik çekme hatası: {e}")
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="fetch_metrics",
                 input_data=input_data,
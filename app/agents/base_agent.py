@@ -5,8 +5,10 @@ Retry logic ile exponential backoff destekli.
 """
 
 import asyncio
+import json
 import subprocess
 import re
+import sys
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Callable
 from pathlib import Path
@@ -15,6 +17,11 @@ from functools import wraps
 
 from app.config import settings
 from app.utils.logger import AgentLoggerAdapter, PerformanceTimer
+from app.llm.cache import cached_call
+from app.llm import runner
+
+# Cache key'e dahil edilen CLI seçenekleri (değişirse eski yanıtlar kullanılmaz)
+CLAUDE_CLI_OPTIONS = {"cli": "claude -p --print"}
 
 
 # ============ RETRY DECORATOR ============
@@ -201,31 +208,50 @@ class BaseAgent(ABC):
 
         return None
 
-    async def call_claude(self, prompt: str, timeout: int = 120) -> str:
-        """Claude Code CLI çağır (retry olmadan)"""
+    def _is_json_response(self, text: str) -> bool:
+        """Yanıt _clean_json_response sonrası JSON objesi olarak parse ediliyor mu (cache doğrulaması)"""
+        try:
+            return isinstance(json.loads(self._clean_json_response(text)), dict)
+        except (json.JSONDecodeError, TypeError):
+            return False
+
+    async def call_claude(
+        self,
+        prompt: str,
+        timeout: int = 120,
+        use_cache: bool = True,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Claude Code CLI çağır (retry olmadan).
+
+        Args:
+            prompt: Claude'a gönderilecek prompt
+            timeout: Timeout (saniye)
+            use_cache: False ise LLM cache atlanır (taze çıktı gereken yaratıcı çağrılar)
+            validate: Yanıt sadece bu kontrolden geçerse cache'lenir (örn. self._is_json_response)
+        """
+        persona = self.load_persona()
+        label = f"{self.name}.{sys._getframe(1).f_code.co_name}"
+        return await cached_call(
+            persona, prompt, CLAUDE_CLI_OPTIONS,
+            lambda: self._call_claude_uncached(persona, prompt, timeout, label),
+            use_cache=use_cache,
+            label=self.name,
+            validate=validate
+        )
+
+    async def _call_claude_uncached(self, persona: str, prompt: str, timeout: int, label: str) -> str:
         full_prompt = f"""
-{self.load_persona()}
+{persona}
 
 ---
 
 {prompt}
 """
 
-        cmd = ["claude", "-p", full_prompt, "--print"]
-
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout
-            )
-
-            output = stdout.decode('utf-8').strip()
+            output = await runner.complete(full_prompt, timeout=timeout, label=label)
 
             # Markdown code block'larını temizle
             output = self._clean_json_response(output)
@@ -241,7 +267,9 @@ class BaseAgent(ABC):
         self,
         prompt: str,
         timeout: int = 120,
-        max_retries: int = 3
+        max_retries: int = 3,
+        use_cache: bool = True,
+        validate: Optional[Callable[[str], bool]] = None
     ) -> str:
         """
         Claude Code CLI çağır - Retry logic ile.
@@ -251,35 +279,43 @@ class BaseAgent(ABC):
             prompt: Claude'a gönderilecek prompt
             timeout: Her deneme için timeout (saniye)
             max_retries: Maksimum deneme sayısı
+            use_cache: False ise LLM cache atlanır (taze çıktı gereken yaratıcı çağrılar)
+            validate: Yanıt sadece bu kontrolden geçerse cache'lenir
 
         Returns:
             Claude yanıtı veya hata JSON'ı
         """
+        persona = self.load_persona()
+        label = f"{self.name}.{sys._getframe(1).f_code.co_name}"
+        return await cached_call(
+            persona, prompt, CLAUDE_CLI_OPTIONS,
+            lambda: self._call_claude_with_retry_uncached(persona, prompt, timeout, max_retries, label),
+            use_cache=use_cache,
+            label=self.name,
+            validate=validate
+        )
+
+    async def _call_claude_with_retry_uncached(
+        self,
+        persona: str,
+        prompt: str,
+        timeout: int,
+        max_retries: int,
+        label: str
+    ) -> str:
         full_prompt = f"""
-{self.load_persona()}
+{persona}
 
 ---
 
 {prompt}
 """
 
-        cmd = ["claude", "-p", full_prompt, "--print"]
         last_error = None
 
         for attempt in range(max_retries):
             try:
-                process = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=timeout
-                )
-
-                output = stdout.decode('utf-8').strip()
+                output = await runner.complete(full_prompt, timeout=timeout, label=label)
 
                 # Markdown code block'larını temizle
                 output = self._clean_json_response(output)
@@ -8,11 +8,7 @@ import asyncio
 from datetime import datetime
 from typing import Dict, Any, Optional
 from .base_agent import BaseAgent
-from app.database import (
-    create_post, update_post, log_agent_action,
-    get_hook_weights_for_selection, get_underperforming_hooks,
-    check_duplicate_prompt
-)
+from app.database import async_crud
 from app.config import settings
 from app.video_styles import get_style_config, get_style_prefix, get_character_descriptions, get_voice_type
 import random
@@ -1112,8 +1108,8 @@ class CreatorAgent(BaseAgent):
 
         # Performance-based weighted selection
         import random
-        hook_weights = get_hook_weights_for_selection(platform=platform)
-        underperforming = set(get_underperforming_hooks(threshold_viral=settings.hook_underperformance_threshold))
+        hook_weights = await async_crud.get_hook_weights_for_selection(platform=platform)
+        underperforming = set(await async_crud.get_underperforming_hooks(threshold_viral=settings.hook_underperformance_threshold))
 
         # Düşük performanslı hook'ları filtrele (ama minimum 5 hook kalsın)
         available_hooks = [h for h in hook_types.keys() if h not in underperforming]
@@ -1217,7 +1213,7 @@ Her iki variant da:
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=120)
+        response = await self.call_claude(prompt, timeout=120, use_cache=False)
 
         try:
             result = json.loads(self._clean_json_response(response))
@@ -1230,7 +1226,7 @@ Sadece JSON döndür.
                 "selected_hook_types": [h[0] for h in selected_hooks]
             }
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_ab_variants",
                 input_data={"topic": topic, "platform": platform},
@@ -1242,7 +1238,7 @@ Sadece JSON döndür.
             return result
 
         except json.JSONDecodeError:
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_ab_variants",
                 success=False,
@@ -1329,13 +1325,13 @@ KURALLAR:
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=90)
+        response = await self.call_claude(prompt, timeout=90, use_cache=False)
 
         try:
             result = json.loads(self._clean_json_response(response))
 
             # Database'e kaydet
-            post_id = create_post(
+            post_id = await async_crud.create_post(
                 topic=topic,
                 post_text=result.get("post_text", ""),
                 visual_type=visual_type,
@@ -1344,7 +1340,7 @@ Sadece JSON döndür.
             )
             result["post_id"] = post_id
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_post",
                 input_data={"topic": topic, "category": category},
@@ -1356,7 +1352,7 @@ Sadece JSON döndür.
             return result
 
         except json.JSONDecodeError:
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_post",
                 success=False,
@@ -1394,9 +1390,9 @@ Sadece JSON döndür.
         content_strategy = self.load_context("content-strategy.md")
 
         # Hook performance verisini al
-        hook_weights = get_hook_weights_for_selection(platform="instagram")
+        hook_weights = await async_crud.get_hook_weights_for_selection(platform="instagram")
         top_hooks = sorted(hook_weights.items(), key=lambda x: x[1], reverse=True)[:3]
-        underperforming = get_underperforming_hooks(threshold_viral=settings.hook_underperformance_threshold)
+        underperforming = await async_crud.get_underperforming_hooks(threshold_viral=settings.hook_underperformance_threshold)
 
         # Hook önerisi oluştur
         hook_hint = f"ÖNCELİKLİ HOOK TİPLERİ (performansa göre): {', '.join([h[0] for h in top_hooks])}"
@@ -1491,7 +1487,7 @@ Sadece JSON döndür.
 Sadece post metnini yaz, başka açıklama ekleme.
 """
 
-        ig_response = await self.call_claude(ig_prompt, timeout=60)
+        ig_response = await self.call_claude(ig_prompt, timeout=60, use_cache=False)
         ig_text = ig_response.strip()
 
         # Instagram caption uzunluk kontrolü
@@ -1525,14 +1521,14 @@ Sadece post metnini yaz, başka açıklama ekleme.
 Sadece post metnini yaz, başka açıklama ekleme.
 """
 
-        fb_response = await self.call_claude(fb_prompt, timeout=60)
+        fb_response = await self.call_claude(fb_prompt, timeout=60, use_cache=False)
         fb_text = fb_response.strip()
 
         # Text-based prompt, hook_type çıkarılamıyor
         hook_type = None
 
         # Database'e kaydet
-        post_id = create_post(
+        post_id = await async_crud.create_post(
             topic=topic,
             post_text_ig=ig_text,
             post_text_fb=fb_text,
@@ -1547,7 +1543,7 @@ Sadece post metnini yaz, başka açıklama ekleme.
         self.log(f"Post oluşturuldu (ID: {post_id})")
         self.log(f"IG: {ig_words} kelime, FB: {fb_words} kelime")
 
-        log_agent_action(
+        await async_crud.log_agent_action(
             agent_name=self.name,
             action="create_post_multiplatform",
             input_data={"topic": topic, "category": category},
@@ -1655,16 +1651,16 @@ IoT/teknoloji temalı, temiz ve modern.
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=90)
+        response = await self.call_claude(prompt, timeout=90, use_cache=False)
 
         try:
             result = json.loads(self._clean_json_response(response))
 
             # Post'u güncelle
             if post_id:
-                update_post(post_id, visual_prompt=result.get("visual_prompt", ""))
+                await async_crud.update_post(post_id, visual_prompt=result.get("visual_prompt", ""))
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_visual_prompt",
                 input_data={"topic": topic, "visual_type": visual_type},
@@ -1712,23 +1708,22 @@ Orijinal mesajı ve tonu koru, sadece belirtilen sorunları düzelt.
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=60)
+        response = await self.call_claude(prompt, timeout=60, validate=self._is_json_response)
 
         try:
             result = json.loads(self._clean_json_response(response))
 
             # Post'u güncelle
             if post_id:
-                from app.database import get_post
-                current_post = get_post(post_id)
+                current_post = await async_crud.get_post(post_id)
                 revision_count = (current_post.get('revision_count', 0) or 0) + 1
-                update_post(
+                await async_crud.update_post(
                     post_id,
                     post_text=result.get("revised_post", ""),
                     revision_count=revision_count
                 )
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="revise_post",
                 input_data={"feedback": feedback},
@@ -2039,7 +2034,7 @@ Sadece JSON döndür, başka açıklama ekleme.
 
         for attempt in range(MAX_RETRIES):
             try:
-                response = await self.call_claude_with_retry(prompt, timeout=90, max_retries=2)
+                response = await self.call_claude_with_retry(prompt, timeout=90, max_retries=2, use_cache=False)
                 self.log(f"[REELS PROMPT] Attempt {attempt + 1}/{MAX_RETRIES} - Response: {len(response) if response else 0} chars")
 
                 if not response or not response.strip() or response.strip() == "{}":
@@ -2086,7 +2081,7 @@ Sadece JSON döndür, başka açıklama ekleme.
 
         # Başarılı - Post'u güncelle
         if post_id:
-            update_post(post_id, visual_prompt=video_prompt)
+            await async_crud.update_post(post_id, visual_prompt=video_prompt)
 
         complexity = result.get("complexity", "medium")
         model = result.get("recommended_model", "veo3")
@@ -2096,7 +2091,7 @@ Sadece JSON döndür, başka açıklama ekleme.
         self.log(f"   Model: {model}")
         self.log(f"   Duration: {result.get('recommended_duration', 5)}s")
 
-        log_agent_action(
+        await async_crud.log_agent_action(
             agent_name=self.name,
             action="create_reels_prompt",
             input_data={"topic": topic, "category": category},
@@ -2288,7 +2283,7 @@ Sadece JSON döndür.
 
         for attempt in range(MAX_RETRIES):
             try:
-                response = await self.call_claude(prompt, timeout=90)
+                response = await self.call_claude(prompt, timeout=90, use_cache=False)
                 result = json.loads(self._clean_json_response(response))
 
                 # Validasyon
@@ -2311,7 +2306,7 @@ Sadece JSON döndür.
                 self.log(f"   Segment sayısı: {len(result['scenes'])}")
                 self.log(f"   Narrative arc: {result.get('narrative_arc', 'N/A')}")
 
-                log_agent_action(
+                await async_crud.log_agent_action(
                     agent_name=self.name,
                     action="create_multi_scene_prompts",
                     input_data={"topic": topic, "segment_count": segment_count},
@@ -2337,7 +2332,7 @@ Sadece JSON döndür.
                     await asyncio.sleep(2)
 
         # Tüm denemeler başarısız
-        log_agent_action(
+        await async_crud.log_agent_action(
             agent_name=self.name,
             action="create_multi_scene_prompts",
             success=False,
@@ -2561,7 +2556,7 @@ Bölümler arasında doğal geçiş olmalı ama her bölüm video segmentiyle se
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=60)
+        response = await self.call_claude(prompt, timeout=60, use_cache=False)
 
         try:
             result = json.loads(self._clean_json_response(response))
@@ -2590,9 +2585,9 @@ Sadece JSON döndür.
 
             # Post'u güncelle
             if post_id:
-                update_post(post_id, speech_script=script)
+                await async_crud.update_post(post_id, speech_script=script)
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_speech_script",
                 input_data={"topic": topic, "target_duration": target_duration},
@@ -2614,7 +2609,7 @@ Sadece JSON döndür.
 
         except json.JSONDecodeError as e:
             self.log(f"JSON parse hatası: {e}")
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_speech_script",
                 success=False,
@@ -2826,7 +2821,7 @@ Eğitici ve görsel açıdan tutarlı bir carousel oluştur.
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=120)
+        response = await self.call_claude(prompt, timeout=120, use_cache=False)
 
         try:
             result = json.loads(self._clean_json_response(response))
@@ -2843,7 +2838,7 @@ Sadece JSON döndür.
                 caption = await self._shorten_caption(caption, max_words)
                 result["caption"] = caption
 
-            post_id = create_post(
+            post_id = await async_crud.create_post(
                 topic=topic,
                 post_text=caption,
                 post_text_ig=caption,
@@ -2855,7 +2850,7 @@ Sadece JSON döndür.
 
             slides = result.get("slides", [])
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_carousel_content",
                 input_data={"topic": topic, "slide_count": slide_count},
@@ -2877,7 +2872,7 @@ Sadece JSON döndür.
 
         except json.JSONDecodeError as e:
             self.log(f"JSON parse hatası: {e}")
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_carousel_content",
                 success=False,
@@ -3010,7 +3005,7 @@ Sadece prompt'u döndür, başka açıklama ekleme.
 """
 
         try:
-            response = await self.call_claude(alternative_prompt, timeout=60)
+            response = await self.call_claude(alternative_prompt, timeout=60, use_cache=False)
             return response.strip() if response else None
         except Exception as e:
             self.log(f"Yeniden oluşturma hatası: {e}")
@@ -3078,7 +3073,7 @@ Sadece JSON döndür.
 """
 
         try:
-            response = await self.call_claude(prompt, timeout=60)
+            response = await self.call_claude(prompt, timeout=60, use_cache=False)
             result = json.loads(self._clean_json_response(response))
 
             self.log(f"Manuel topic işlendi: {result.get('processed_topic', '')[:50]}...")
@@ -3339,7 +3334,7 @@ Sadece JSON döndür.
 """
 
         try:
-            response = await self.call_claude(prompt, timeout=120)
+            response = await self.call_claude(prompt, timeout=120, use_cache=False)
             result = json.loads(self._clean_json_response(response))
 
             # Validate dialog structure
@@ -3424,7 +3419,7 @@ CRITICAL INSTRUCTIONS:
                 self.log(f"[CONV] Dialog satırları video_prompt'a eklendi ({len(dialog_lines)} satır, {sum(len(l.get('text','').split()) for l in dialog_lines)} kelime)")
 
             # Log action
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_conversation_content",
                 input_data={"topic": topic, "target_duration": target_duration},
@@ -3447,7 +3442,7 @@ CRITICAL INSTRUCTIONS:
 
         except json.JSONDecodeError as e:
             self.log(f"JSON parse hatasi: {e}")
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_conversation_content",
                 input_data={"topic": topic},
@@ -3462,7 +3457,7 @@ CRITICAL INSTRUCTIONS:
 
         except Exception as e:
             self.log(f"Conversation content hatasi: {e}")
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="create_conversation_content",
                 input_data={"topic": topic},
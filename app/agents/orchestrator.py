@@ -6,14 +6,7 @@ import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 from .base_agent import BaseAgent
-from app.database import (
-    get_current_strategy, update_strategy,
-    get_published_posts, get_analytics_summary,
-    create_calendar_entry, get_week_calendar,
-    log_agent_action, get_best_performing_hooks,
-    get_ab_test_learnings, get_connection,
-    get_underperforming_hooks
-)
+from app.database import get_connection, async_crud
 from app.agents.creator import (
     VIRAL_CONTENT_FORMATS,
     COMMENT_CTA_TYPES,
@@ -73,15 +66,15 @@ class OrchestratorAgent(BaseAgent):
         self.log("Haftalık plan oluşturuluyor (engagement stratejileri dahil)...")
 
         # Mevcut stratejiyi al
-        strategy = get_current_strategy()
+        strategy = await async_crud.get_current_strategy()
 
         # Geçmiş performans verilerini al
-        analytics = get_analytics_summary(days=30) or {}
-        published_posts = get_published_posts(days=30) or []
+        analytics = await async_crud.get_analytics_summary(days=30) or {}
+        published_posts = await async_crud.get_published_posts(days=30) or []
 
         # Hook performance verilerini al
-        best_hooks = get_best_performing_hooks(limit=5)
-        underperforming_hooks = get_underperforming_hooks(threshold_viral=5.0)
+        best_hooks = await async_crud.get_best_performing_hooks(limit=5)
+        underperforming_hooks = await async_crud.get_underperforming_hooks(threshold_viral=5.0)
 
         # Context dosyalarını yükle
         company_profile = self.load_context("company-profile.md")
@@ -230,7 +223,7 @@ class OrchestratorAgent(BaseAgent):
 Tam 12 entry olmalı. Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=120)
+        response = await self.call_claude(prompt, timeout=120, validate=self._is_json_response)
 
         try:
             # JSON parse et
@@ -249,7 +242,7 @@ Tam 12 entry olmalı. Sadece JSON döndür.
                 else:
                     visual_type = entry.get("visual_type", "flux")
 
-                create_calendar_entry(
+                await async_crud.create_calendar_entry(
                     week_start=week_start.date(),
                     day_of_week=entry.get("day_of_week", 0),
                     scheduled_time=entry.get("time", "10:00"),
@@ -277,7 +270,7 @@ Tam 12 entry olmalı. Sadece JSON döndür.
             self.log(f"Viral format çeşitliliği: {len(formats_used)} tip - {formats_used}")
 
             # Log
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="plan_week",
                 input_data={"strategy": strategy, "best_hooks": [h.get('hook_type') for h in best_hooks]},
@@ -288,7 +281,7 @@ Tam 12 entry olmalı. Sadece JSON döndür.
             return result
 
         except json.JSONDecodeError:
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="plan_week",
                 success=False,
@@ -300,9 +293,8 @@ Tam 12 entry olmalı. Sadece JSON döndür.
         """Günlük kontrol - bugün ne yapılacak?"""
         self.log("Günlük kontrol yapılıyor...")
 
-        from app.database import get_todays_calendar
 
-        today_entries = get_todays_calendar()
+        today_entries = await async_crud.get_todays_calendar()
 
         if not today_entries:
             return {
@@ -321,9 +313,9 @@ Tam 12 entry olmalı. Sadece JSON döndür.
         self.log("Strateji analizi yapılıyor...")
 
         # Verileri topla
-        analytics = get_analytics_summary(days=30)
-        published_posts = get_published_posts(days=30)
-        current_strategy = get_current_strategy()
+        analytics = await async_crud.get_analytics_summary(days=30)
+        published_posts = await async_crud.get_published_posts(days=30)
+        current_strategy = await async_crud.get_current_strategy()
 
         prompt = f"""
 ## GÖREV: Performans Analizi ve Strateji Güncelleme
@@ -369,7 +361,7 @@ Yukarıdaki verileri analiz et ve stratejiyi güncelle.
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt)
+        response = await self.call_claude(prompt, validate=self._is_json_response)
 
         try:
             result = json.loads(self._clean_json_response(response))
@@ -377,14 +369,14 @@ Sadece JSON döndür.
             # Stratejiyi güncelle
             if "updated_strategy" in result:
                 # Best hooks'u da ekle (feedback loop için)
-                best_hooks_data = get_best_performing_hooks(limit=5)
+                best_hooks_data = await async_crud.get_best_performing_hooks(limit=5)
                 best_hooks = [h['hook_type'] for h in best_hooks_data] if best_hooks_data else []
                 result["updated_strategy"]["best_hooks"] = best_hooks
 
-                new_version = update_strategy(**result["updated_strategy"])
+                new_version = await async_crud.update_strategy(**result["updated_strategy"])
                 self.log(f"Strategy v{new_version} güncellendi, best_hooks: {best_hooks[:3]}")
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="update_strategy",
                 input_data={"analytics": analytics},
@@ -503,9 +495,9 @@ Sadece JSON döndür.
         self.log("Non-follower reach optimizasyonu analiz ediliyor...")
 
         # Veri topla
-        reach_data = self._get_non_follower_reach_data()
-        hook_performance = get_best_performing_hooks(limit=5)
-        ab_learnings = get_ab_test_learnings()
+        reach_data = await async_crud.run_read(self._get_non_follower_reach_data)
+        hook_performance = await async_crud.get_best_performing_hooks(limit=5)
+        ab_learnings = await async_crud.get_ab_test_learnings()
 
         prompt = f"""
 ## GÖREV: Non-Follower Reach Optimizasyonu
@@ -587,13 +579,13 @@ Bu verileri analiz et ve non-follower reach'i artırmak için öneriler sun.
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=120)
+        response = await self.call_claude(prompt, timeout=120, validate=self._is_json_response)
 
         try:
             result = json.loads(self._clean_json_response(response))
 
             # Sonuçları logla
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="optimize_non_follower_reach",
                 input_data={"reach_data_summary": {
@@ -608,7 +600,7 @@ Sadece JSON döndür.
             return result
 
         except json.JSONDecodeError:
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="optimize_non_follower_reach",
                 success=False,
@@ -620,9 +612,9 @@ Sadece JSON döndür.
         """Quick insights - AI çağrısı yapmadan mevcut datadan özetler"""
         self.log("Optimization insights toplanıyor...")
 
-        reach_data = self._get_non_follower_reach_data()
-        hook_performance = get_best_performing_hooks(limit=5)
-        ab_learnings = get_ab_test_learnings()
+        reach_data = await async_crud.run_read(self._get_non_follower_reach_data)
+        hook_performance = await async_crud.get_best_performing_hooks(limit=5)
+        ab_learnings = await async_crud.get_ab_test_learnings()
 
         # En iyi content type
         best_content = max(reach_data['content_types'],
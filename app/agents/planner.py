@@ -15,8 +15,9 @@ from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent
 from app.database import (
     get_current_strategy, get_published_posts,
-    log_agent_action, get_connection, get_strategy_version,
-    get_best_performing_hooks, get_hook_recommendations
+    get_connection, get_strategy_version,
+    get_best_performing_hooks, get_hook_recommendations,
+    async_crud
 )
 
 
@@ -382,15 +383,15 @@ Hedef dağılım: Tarım %25-30, Fabrika %25, Enerji %20, Genel %25-30
         company_profile = self.load_context("company-profile.md")
         content_strategy = self.load_context("content-strategy.md")
         topics_pool = self.load_context("topics.md")
-        strategy = self._get_strategy_with_cache()  # Feedback loop: cache'li version kullan
+        strategy = await async_crud.run_read(self._get_strategy_with_cache)  # Feedback loop: cache'li version kullan
 
         # Performance, trend ve sektör context
-        performance_context = self._get_performance_context()
+        performance_context = await async_crud.run_read(self._get_performance_context)
         trend_context = self._get_trend_context()
-        sector_context = self._get_sector_context()
+        sector_context = await async_crud.run_read(self._get_sector_context)
 
         # Son postları al (tekrar önleme)
-        recent_posts = get_published_posts(days=14)
+        recent_posts = await async_crud.get_published_posts(days=14)
         recent_topics = [p.get('topic', '') for p in recent_posts]
 
         # Bugünün bilgisi
@@ -486,13 +487,13 @@ Yukarıdaki bilgilere dayanarak bugün için EN UYGUN tek bir konu öner.
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=90)
+        response = await self.call_claude(prompt, timeout=90, use_cache=False)
 
         try:
             # call_claude zaten _clean_json_response çağırıyor, tekrar çağırmaya gerek yok
             result = json.loads(response)
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="suggest_topic",
                 input_data={"category": category, "exclude": exclude_topics},
@@ -517,7 +518,7 @@ Sadece JSON döndür.
             except json.JSONDecodeError:
                 pass
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="suggest_topic",
                 success=False,
@@ -533,14 +534,14 @@ Sadece JSON döndür.
         content_strategy = self.load_context("content-strategy.md")
         topics_pool = self.load_context("topics.md")
         schedule_strategy = self.load_context("schedule-strategy.md")
-        strategy = self._get_strategy_with_cache()  # Feedback loop: cache'li version kullan
+        strategy = await async_crud.run_read(self._get_strategy_with_cache)  # Feedback loop: cache'li version kullan
 
         posts_per_week = strategy.get('posts_per_week', 5)
         best_days = strategy.get('best_days', ['monday', 'tuesday', 'wednesday', 'thursday', 'friday'])
         best_hours = strategy.get('best_hours', ['10:00', '14:00', '18:00'])
         content_mix = strategy.get('content_mix', {})
 
-        recent_posts = get_published_posts(days=30)
+        recent_posts = await async_crud.get_published_posts(days=30)
         recent_topics = [p.get('topic', '') for p in recent_posts]
 
         prompt = f"""
@@ -610,12 +611,12 @@ Sadece JSON döndür.
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=120)
+        response = await self.call_claude(prompt, timeout=120, use_cache=False)
 
         try:
             result = json.loads(response)
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="suggest_week_topics",
                 output_data=result,
@@ -682,7 +683,7 @@ Sosyal medya içeriğine dönüştürülebilecek konuları belirle.
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=90)
+        response = await self.call_claude(prompt, timeout=90, validate=self._is_json_response)
 
         try:
             return json.loads(response)
@@ -10,7 +10,7 @@ import asyncio
 from datetime import datetime
 from typing import Dict, Any
 from .base_agent import BaseAgent
-from app.database import update_post, log_agent_action
+from app.database import async_crud
 from app.hashtag_helper import validate_and_complete_hashtags
 
 
@@ -87,7 +87,7 @@ class PublisherAgent(BaseAgent):
 
                 # Database güncelle
                 if post_id:
-                    update_post(
+                    await async_crud.update_post(
                         post_id,
                         status="published",
                         published_at=datetime.now(),
@@ -123,7 +123,7 @@ class PublisherAgent(BaseAgent):
                 result["error"] = ig_result.get("error", "Unknown error")
                 self.log(f"❌ Instagram hatası: {result['error']}")
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="publish",
                 input_data={"post_id": post_id, "platform": "instagram"},
@@ -136,7 +136,7 @@ class PublisherAgent(BaseAgent):
         except Exception as e:
             self.log(f"Yayınlama hatası: {str(e)}")
             result["error"] = str(e)
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="publish",
                 success=False,
@@ -194,13 +194,13 @@ class PublisherAgent(BaseAgent):
         scheduled_time = input_data.get("scheduled_time")
 
         if post_id and scheduled_time:
-            update_post(
+            await async_crud.update_post(
                 post_id,
                 status="scheduled",
                 scheduled_at=scheduled_time
             )
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="schedule",
                 input_data={"post_id": post_id, "scheduled_time": str(scheduled_time)},
@@ -263,7 +263,7 @@ class PublisherAgent(BaseAgent):
 
                 # Database güncelle
                 if post_id:
-                    update_post(
+                    await async_crud.update_post(
                         post_id,
                         status="published",
                         published_at=datetime.now(),
@@ -272,7 +272,7 @@ class PublisherAgent(BaseAgent):
 
                 self.log(f"✅ Carousel yayınlandı: {ig_result.get('id', 'N/A')}")
 
-                log_agent_action(
+                await async_crud.log_agent_action(
                     agent_name=self.name,
                     action="publish_carousel",
                     input_data={"post_id": post_id, "image_count": len(image_urls)},
@@ -286,7 +286,7 @@ class PublisherAgent(BaseAgent):
                 self.log(f"❌ Carousel hatası: {error}")
                 result["error"] = error
 
-                log_agent_action(
+                await async_crud.log_agent_action(
                     agent_name=self.name,
                     action="publish_carousel",
                     input_data={"post_id": post_id},
@@ -306,7 +306,7 @@ class PublisherAgent(BaseAgent):
             error = str(e)
             self.log(f"❌ Carousel hatası: {error}")
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="publish_carousel",
                 success=False,
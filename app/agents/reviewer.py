@@ -8,7 +8,7 @@ import re
 from datetime import datetime
 from typing import Dict, Any
 from .base_agent import BaseAgent
-from app.database import update_post, log_agent_action
+from app.database import async_crud
 
 class ReviewerAgent(BaseAgent):
     """Kalite kontrol - içeriği denetler ve onaylar"""
@@ -132,7 +132,7 @@ class ReviewerAgent(BaseAgent):
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=120)
+        response = await self.call_claude(prompt, timeout=120, validate=self._is_json_response)
 
         try:
             result = json.loads(self._clean_json_response(response))
@@ -156,7 +156,7 @@ Sadece JSON döndür.
                 "compared_at": datetime.now().isoformat()
             }
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="compare_ab_variants",
                 input_data={
@@ -176,7 +176,7 @@ Sadece JSON döndür.
             return result
 
         except json.JSONDecodeError:
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="compare_ab_variants",
                 success=False,
@@ -247,7 +247,7 @@ Toplam Puan Hesaplama:
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=90)
+        response = await self.call_claude(prompt, timeout=90, validate=self._is_json_response)
 
         try:
             result = json.loads(self._clean_json_response(response))
@@ -262,13 +262,13 @@ Sadece JSON döndür.
                 else:
                     status = "draft"  # Revizyon gerekli
 
-                update_post(
+                await async_crud.update_post(
                     post_id,
                     status=status,
                     reviewer_feedback=json.dumps(result, ensure_ascii=False)
                 )
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="review_post",
                 input_data={"topic": topic, "post_id": post_id},
@@ -280,7 +280,7 @@ Sadece JSON döndür.
             return result
 
         except json.JSONDecodeError:
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="review_post",
                 success=False,
@@ -334,12 +334,12 @@ Bu görsel prompt'unu değerlendir:
 Sadece JSON döndür.
 """
 
-        response = await self.call_claude(prompt, timeout=60)
+        response = await self.call_claude(prompt, timeout=60, validate=self._is_json_response)
 
         try:
             result = json.loads(self._clean_json_response(response))
 
-            log_agent_action(
+            await async_crud.log_agent_action(
                 agent_name=self.name,
                 action="review_visual",
                 input_data={"visual_type": visual_type, "topic": topic},
@@ -372,7 +372,7 @@ Sadece JSON döndür.
         all_passed = all(checklist.values())
 
         if post_id and all_passed:
-            update_post(post_id, status="approved")
+            await async_crud.update_post(post_id, status="approved")
 
         result = {
             "decision": "approved" if all_passed else "incomplete",
@@ -381,7 +381,7 @@ Sadece JSON döndür.
             "missing_items": [k for k, v in checklist.items() if not v]
         }
 
-        log_agent_action(
+        await async_crud.log_agent_action(
             agent_name=self.name,
             action="final_approval",
             input_data={"post_id": post_id},
@@ -10,12 +10,13 @@ CTA (son cümle) ve Hook (ilk cümle) korunmaya çalışılır.
 """
 
 import os
-import subprocess
 import logging
 from pathlib import Path
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 
+from app.media import probe_duration, run_media
+
 logger = logging.getLogger(__name__)
 
 # Output directory
@@ -24,22 +25,11 @@ AUDIO_OUTPUT_DIR = Path("/opt/olivenet-social-bot/outputs/audio")
 
 async def get_audio_duration(audio_path: str) -> float:
     """Audio süresini FFprobe ile al."""
-    try:
-        result = subprocess.run(
-            [
-                "ffprobe", "-v", "error",
-                "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1",
-                audio_path
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        return float(result.stdout.strip())
-    except Exception as e:
-        logger.error(f"Audio duration error: {e}")
+    duration = await probe_duration(audio_path)
+    if duration is None:
+        logger.error(f"Audio duration error: {audio_path}")
         return 0.0
+    return duration
 
 
 async def trim_audio_with_fadeout(
@@ -77,9 +67,9 @@ async def trim_audio_with_fadeout(
     ]
 
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-        if result.returncode != 0:
-            logger.error(f"FFmpeg trim error: {result.stderr[:200]}")
+        result = await run_media(cmd, timeout=60, duration=target_duration)
+        if not result.success:
+            logger.error(f"FFmpeg trim error: {result.error[:200]}")
             return audio_path  # Fallback: original
 
         logger.info(f"[AUDIO SYNC] Trimmed to {target_duration:.1f}s with {fade_duration}s fade")
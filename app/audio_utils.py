@@ -7,10 +7,11 @@ This module provides audio manipulation helpers including:
 """
 
 import os
-import subprocess
 from datetime import datetime
 from typing import Optional
 
+from app.media import probe_duration, run_media
+
 
 async def add_silence_prefix(
     audio_path: str,
@@ -29,7 +30,7 @@ async def add_silence_prefix(
         Path to the new audio file with silence prefix
 
     Raises:
-        Exception: If FFmpeg fails to process the audio
+        MediaProcessError: If FFmpeg fails to process the audio
     """
     if not os.path.exists(audio_path):
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
@@ -57,18 +58,15 @@ async def add_silence_prefix(
 
     print(f"[AUDIO] Adding {silence_duration}s silence prefix to audio...")
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        raise Exception(f"FFmpeg silence prefix failed: {result.stderr}")
+    await run_media(cmd, timeout=120).check()
 
     print(f"[AUDIO] Delay added: {output_path}")
     return output_path
 
 
-def get_audio_duration_sync(audio_path: str) -> float:
+async def get_audio_duration(audio_path: str) -> float:
     """
-    Get the duration of an audio file in seconds (synchronous).
+    Get the duration of an audio file in seconds.
 
     Args:
         audio_path: Path to the audio file
@@ -76,17 +74,9 @@ def get_audio_duration_sync(audio_path: str) -> float:
     Returns:
         Duration in seconds
     """
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=noprint_wrappers=1:nokey=1",
-        audio_path
-    ]
-
-    result = subprocess.run(cmd, capture_output=True, text=True)
+    duration = await probe_duration(audio_path)
 
-    if result.returncode != 0:
-        raise Exception(f"FFprobe failed: {result.stderr}")
+    if duration is None:
+        raise Exception(f"FFprobe failed: {audio_path}")
 
-    return float(result.stdout.strip())
+    return duration
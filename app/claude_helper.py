@@ -8,9 +8,11 @@ import json
 import logging
 import re
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict
 
 from .config import settings
+from .llm.cache import cached_call
+from .llm import runner
 
 logger = logging.getLogger(__name__)
 
@@ -75,13 +77,21 @@ OLIVENET_DESIGN = {
 }
 
 
-async def run_claude_code(prompt: str, timeout: int = 60) -> str:
+async def run_claude_code(
+    prompt: str,
+    timeout: int = 60,
+    use_cache: bool = True,
+    validate: Optional[Callable[[str], bool]] = None
+) -> str:
     """
     Run Claude Code CLI with the given prompt.
 
     Args:
         prompt: The prompt to send to Claude Code
         timeout: Maximum execution time in seconds
+        use_cache: Skip the LLM response cache when False (creative calls,
+            regenerate / retry paths that must not replay an earlier answer)
+        validate: Only cache the response when this returns True
 
     Returns:
         Claude's response as a string
@@ -89,31 +99,29 @@ async def run_claude_code(prompt: str, timeout: int = 60) -> str:
     Raises:
         Exception: If timeout occurs or Claude Code fails
     """
+    options = {"cli": "claude -p --print", "cwd": str(settings.base_dir)}
+    return await cached_call(
+        "", prompt, options,
+        lambda: _run_claude_code_uncached(prompt, timeout),
+        use_cache=use_cache,
+        label="claude_helper",
+        validate=validate
+    )
+
+
+async def _run_claude_code_uncached(prompt: str, timeout: int) -> str:
     try:
-        process = await asyncio.create_subprocess_exec(
-            'claude', '-p', prompt, '--print',
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-            cwd=str(settings.base_dir)
-        )
-
-        stdout, stderr = await asyncio.wait_for(
-            process.communicate(),
-            timeout=timeout
-        )
-
-        if process.returncode != 0:
-            error_msg = stderr.decode('utf-8').strip()
-            logger.error(f"Claude Code error: {error_msg}")
-            raise Exception(f"Claude Code failed: {error_msg}")
-
-        result = stdout.decode('utf-8').strip()
+        result = await runner.complete(prompt, timeout=timeout, label="claude_helper")
         logger.info(f"Claude Code response received ({len(result)} chars)")
         return result
 
+    except (runner.ClaudeCLIError, runner.WorkerError) as e:
+        logger.error(f"Claude Code error: {e}")
+        raise Exception(f"Claude Code failed: {e}")
+    except runner.PoolBusyError as e:
+        logger.error(f"Claude worker pool busy: {e}")
+        raise Exception(f"Claude Code busy: {e}")
     except asyncio.TimeoutError:
-        if process:
-            process.kill()
         logger.error(f"Claude Code timeout after {timeout}s")
         raise Exception(f"Claude Code timeout ({timeout}s)")
     except FileNotFoundError:
@@ -174,7 +182,7 @@ Analiz veya degerlendirme notlarini YAZMA.
 """
 
     logger.info(f"Generating post text for topic: {topic}")
-    result = await run_claude_code(prompt, timeout=settings.claude_timeout_post)
+    result = await run_claude_code(prompt, timeout=settings.claude_timeout_post, use_cache=False)
 
     # Clean up any potential markdown artifacts
     result = clean_response(result)
@@ -241,7 +249,7 @@ SADECE JSON yaz, markdown code block (```) KULLANMA!
 """
 
     logger.info("Generating topic suggestions")
-    result = await run_claude_code(prompt, timeout=60)
+    result = await run_claude_code(prompt, timeout=60, use_cache=False)
     result = clean_response(result)
 
     # Parse JSON response
@@ -354,7 +362,7 @@ SADECE geçerli JSON döndür, başka hiçbir şey yazma:
     logger.info(f"Generating infographic data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
 
         # JSON'u çıkar
         result = result.strip()
@@ -566,7 +574,7 @@ HTML icinde {{{{logo}}}} placeholder'i kullan, ben degistirecegim.
 """
 
     logger.info(f"Generating visual HTML for topic: {topic}")
-    result = await run_claude_code(prompt, timeout=settings.claude_timeout_visual)
+    result = await run_claude_code(prompt, timeout=settings.claude_timeout_visual, use_cache=False)
 
     # Clean up and extract HTML
     result = extract_html(result)
@@ -626,6 +634,10 @@ def extract_html(text: str) -> str:
 
     return text
 
+def is_complete_html(text: str) -> bool:
+    """Response contains a full HTML document (cache validation for slide HTML)."""
+    return bool(re.search(r'<html[\s>].*</html>', text or "", re.IGNORECASE | re.DOTALL))
+
 async def improve_post_text(original_post: str, feedback: str) -> str:
     """
     Improve an existing post based on feedback.
@@ -723,7 +735,7 @@ HTML icinde {{{{logo}}}} placeholder'i kullan.
 """
 
     logger.info(f"Generating visual HTML with feedback for topic: {topic}")
-    result = await run_claude_code(prompt, timeout=120)
+    result = await run_claude_code(prompt, timeout=120, use_cache=False)
 
     result = extract_html(result)
 
@@ -822,7 +834,7 @@ Sadece prompt'u yaz, başka açıklama yapma. Tırnak işareti kullanma.
 """
 
     logger.info(f"Generating video prompt for topic: {topic}")
-    result = await run_claude_code(prompt, timeout=90)
+    result = await run_claude_code(prompt, timeout=90, use_cache=False)
 
     # Temizle
     result = result.strip()
@@ -919,7 +931,7 @@ Sadece prompt'u yaz, başka açıklama yapma.
 """
 
     logger.info(f"Generating FLUX prompt for topic: {topic}")
-    result = await run_claude_code(prompt, timeout=90)
+    result = await run_claude_code(prompt, timeout=90, use_cache=False)
 
     # Temizle
     result = result.strip()
@@ -936,7 +948,8 @@ async def generate_carousel_slide_html(
     slide_data: Dict,
     slide_number: int,
     total_slides: int,
-    topic: str
+    topic: str,
+    use_cache: bool = False
 ) -> str:
     """
     Carousel slide için HTML oluştur.
@@ -946,6 +959,8 @@ async def generate_carousel_slide_html(
         slide_number: 1, 2, 3... (1-indexed)
         total_slides: Toplam slide sayısı
         topic: Ana konu
+        use_cache: True ise aynı slide için daha önce üretilmiş HTML tekrar kullanılabilir
+            (retry / yeniden üretimde False olmalı)
 
     Returns:
         Complete HTML code for the slide (1080x1080px)
@@ -1104,7 +1119,12 @@ Instagram carousel için profesyonel bir HTML slide tasarla.
 """
 
     logger.info(f"Generating carousel slide HTML: {slide_number}/{total_slides} ({slide_type})")
-    result = await run_claude_code(prompt, timeout=settings.claude_timeout_visual)
+    result = await run_claude_code(
+        prompt,
+        timeout=settings.claude_timeout_visual,
+        use_cache=use_cache,
+        validate=is_complete_html
+    )
 
     # Clean up and extract HTML
     result = extract_html(result)
@@ -1160,7 +1180,7 @@ SADECE geçerli JSON döndür:
     logger.info(f"Generating dashboard data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
 
         result = result.strip()
         if result.startswith("```"):
@@ -1268,7 +1288,7 @@ SADECE geçerli JSON döndür:
     logger.info(f"Generating comparison data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
 
         result = result.strip()
         if result.startswith("```"):
@@ -1369,7 +1389,7 @@ SADECE geçerli JSON döndür:
     logger.info(f"Generating process data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
 
         result = result.strip()
         if result.startswith("```"):
@@ -1453,7 +1473,7 @@ SADECE geçerli JSON döndür:
     logger.info(f"Generating quote data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
 
         result = result.strip()
         if result.startswith("```"):
@@ -1578,7 +1598,7 @@ SADECE geçerli JSON döndür:
     logger.info(f"Generating before/after data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
         result = result.strip()
         if result.startswith("```"):
             result = re.sub(r'^```json?\s*', '', result)
@@ -1671,7 +1691,7 @@ SADECE geçerli JSON döndür:
     logger.info(f"Generating checklist data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
         result = result.strip()
         if result.startswith("```"):
             result = re.sub(r'^```json?\s*', '', result)
@@ -1762,7 +1782,7 @@ SADECE geçerli JSON döndür:
     logger.info(f"Generating timeline data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
         result = result.strip()
         if result.startswith("```"):
             result = re.sub(r'^```json?\s*', '', result)
@@ -1851,7 +1871,7 @@ SADECE geçerli JSON döndür:
     logger.info(f"Generating feature grid data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
         result = result.strip()
         if result.startswith("```"):
             result = re.sub(r'^```json?\s*', '', result)
@@ -1937,7 +1957,7 @@ SADECE geçerli JSON döndür:
     logger.info(f"Generating big number data for topic: {topic}")
 
     try:
-        result = await run_claude_code(prompt, timeout=45)
+        result = await run_claude_code(prompt, timeout=45, use_cache=False)
         result = result.strip()
         if result.startswith("```"):
             result = re.sub(r'^```json?\s*', '', result)
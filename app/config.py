@@ -126,6 +126,11 @@ class Settings(BaseSettings):
     tts_stability: float = Field(default=0.5, description="Voice stability (0.0-1.0)")
     tts_similarity_boost: float = Field(default=0.75, description="Voice similarity boost (0.0-1.0)")
     tts_speed: float = Field(default=1.0, description="Speech speed (0.5-2.0)")
+    tts_cache_enabled: bool = Field(default=True, description="Reuse generated TTS audio for identical text + voice + settings")
+    tts_cache_max_mb: int = Field(default=500, description="Max TTS audio cache size (MB, LRU eviction)")
+    tts_cache_max_entries: int = Field(default=2000, description="Max cached TTS clips (LRU eviction)")
+    tts_dialog_concurrency: int = Field(default=3, description="Max concurrent ElevenLabs requests per dialog")
+    tts_stream_download: bool = Field(default=True, description="Stream TTS audio to disk and measure duration from MP3 frame headers")
 
     # ElevenLabs Conversational Reels Settings
     elevenlabs_voice_id_female: str = Field(default="EJGs6dWlD5VrB3llhBqB", description="Female Turkish voice ID for conversational reels")
@@ -140,15 +145,80 @@ class Settings(BaseSettings):
     claude_timeout_visual: int = Field(default=90, description="Timeout for visual generation (seconds)")
     claude_timeout_video: int = Field(default=120, description="Timeout for video prompt generation (seconds)")
 
+    # LLM Response Cache
+    llm_cache_enabled: bool = Field(default=True, description="Cache Claude responses for identical persona + prompt")
+    llm_cache_ttl_hours: int = Field(default=168, description="LLM cache entry lifetime (hours)")
+    llm_cache_max_entries: int = Field(default=5000, description="Max cached LLM responses (LRU eviction)")
+    llm_cache_max_mb: int = Field(default=100, description="Max LLM cache size (MB, LRU eviction)")
+
+    # Claude CLI Worker Pool
+    llm_cli_command: str = Field(default="claude", description="Claude CLI command (fake worker for offline load tests)")
+    llm_pool_enabled: bool = Field(default=False, description="Route Claude calls through pre-spawned single-use stream-json workers")
+    llm_pool_size: int = Field(default=2, description="Number of warm Claude CLI workers (each serves one request, then is replaced)")
+    llm_pool_max_waiters: int = Field(default=16, description="Max callers queued while all workers are busy")
+    llm_pool_acquire_timeout: float = Field(default=120.0, description="Max wait for a free worker (seconds)")
+
+    # LLM Dispatch (global priority queue + rate limit)
+    llm_max_concurrency: int = Field(default=3, description="Max concurrent Claude calls across all agents")
+    llm_rate_per_minute: float = Field(default=30, description="Max Claude calls started per minute (0 = unlimited)")
+    llm_rate_burst: int = Field(default=10, description="Token bucket burst size for Claude calls")
+
+    # Pipeline Runs
+    pipeline_max_concurrent_runs: int = Field(default=3, description="Max pipeline runs in progress at once (extra runs queue)")
+    pipeline_approval_timeout: int = Field(default=3600, description="Max wait for a Telegram approval per run (seconds)")
+
+    # Remote Generation Jobs (Sora, Kling/fal.ai, FLUX, Veo, lipsync)
+    job_poll_min_interval: float = Field(default=1.0, description="Shortest wait between polls of one remote job (seconds)")
+    job_poll_max_interval: float = Field(default=30.0, description="Longest wait between polls of one remote job (seconds)")
+    job_poll_concurrency: int = Field(default=8, description="Max status requests in flight across all remote jobs")
+
+    # Video Model Routing (latency-aware selection + hedging)
+    video_hedge_enabled: bool = Field(default=False, description="Start a second video provider when the first one passes its p90 latency")
+    video_hedge_delay: float = Field(default=300.0, description="Hedge deadline for models without latency history (seconds)")
+    video_max_cost_per_run: float = Field(default=3.0, description="Estimated USD ceiling per video across fallback/hedge attempts (0 = unlimited)")
+    video_router_window: int = Field(default=20, description="Recent attempts per model used for latency / failure stats")
+    video_router_max_failure_rate: float = Field(default=0.5, description="Models above this recent failure rate are tried last")
+
+    # Media Processing (ffmpeg/ffprobe)
+    media_max_concurrency: int = Field(default=0, description="Max concurrent ffmpeg processes (0 = CPU count / 2)")
+    media_probe_concurrency: int = Field(default=8, description="Max concurrent ffprobe processes")
+    media_probe_cache_entries: int = Field(default=2000, description="Max files kept in the in-memory ffprobe cache")
+    media_probe_index: bool = Field(default=True, description="Persist ffprobe results to data/media_probe.db")
+    render_single_pass: bool = Field(default=True, description="Finalize Reels with one ffmpeg encode (step-by-step fallback)")
+    media_concat_stream_copy: bool = Field(default=True, description="Stream-copy compatible segments on concat (crossfade re-encodes only the transitions)")
+
+    # HTML Rendering (Playwright page pool)
+    html_render_pool_size: int = Field(default=0, description="Pre-warmed Playwright pages rendering in parallel (0 = CPU count, max 8)")
+    html_render_recycle_after: int = Field(default=200, description="Relaunch the browser after this many renders (bounds Chromium memory)")
+    html_render_settle_ms: int = Field(default=1000, description="Wait after loading the HTML before the screenshot (ms)")
+
     # API Timeouts
     api_timeout_default: int = Field(default=30, description="Default API timeout (seconds)")
     api_timeout_video: int = Field(default=300, description="Video API timeout (seconds)")
     api_timeout_insights: int = Field(default=60, description="Insights API timeout (seconds)")
 
+    # Shared HTTP Clients (keep-alive pool per API service)
+    http_connect_timeout: float = Field(default=10.0, description="TCP/TLS connect timeout for shared API clients (seconds)")
+    http_max_connections: int = Field(default=20, description="Max open connections per API service client")
+    http_max_keepalive: int = Field(default=10, description="Max idle keep-alive connections per API service client")
+    http_keepalive_expiry: float = Field(default=30.0, description="Close idle keep-alive connections after (seconds)")
+    http2_enabled: bool = Field(default=True, description="Use HTTP/2 where the server supports it (needs the h2 package)")
+
     # Rate Limiting
     rate_limit_delay: float = Field(default=0.3, description="Delay between API calls (seconds)")
     rate_limit_carousel: float = Field(default=2.0, description="Delay between carousel items (seconds)")
 
+    # Carousel Slide Generation
+    carousel_slide_concurrency: int = Field(default=3, description="Max carousel slides generated / rendered concurrently")
+    carousel_slide_retries: int = Field(default=1, description="Extra attempts for failed slides only")
+    nano_banana_rate_per_minute: float = Field(default=10, description="Max Nano Banana image requests started per minute (0 = unlimited)")
+    nano_banana_rate_burst: int = Field(default=3, description="Nano Banana requests allowed at once before the per-minute rate applies")
+
+    # Database Settings
+    db_pool_size: int = Field(default=4, description="Max idle SQLite connections kept in the pool")
+    db_cache_size_kb: int = Field(default=16384, description="SQLite page cache per connection (KB)")
+    db_mmap_size_mb: int = Field(default=128, description="SQLite memory-mapped I/O size (MB)")
+
     # Content Settings
     max_instagram_words: int = Field(default=120, description="Max words for Instagram posts")
 
@@ -167,6 +237,15 @@ class Settings(BaseSettings):
     # Subtitle Settings (Automatic subtitles for voice reels/long videos)
     subtitle_enabled: bool = Field(default=False, description="Enable automatic subtitle generation")
     whisper_model_size: str = Field(default="small", description="Whisper model size: tiny, base, small, medium, large")
+    whisper_backend: str = Field(default="whisper", description="Transcription engine: whisper (PyTorch) or faster-whisper (CTranslate2)")
+    whisper_compute_type: str = Field(default="int8", description="faster-whisper quantization: int8, int8_float32, float32")
+    whisper_cpu_threads: int = Field(default=0, description="faster-whisper CPU threads (0 = library default)")
+    whisper_worker_enabled: bool = Field(default=True, description="Run Whisper in a resident worker process that keeps models loaded")
+    whisper_worker_preload: str = Field(default="", description="Comma-separated models loaded when the worker starts (e.g. small,medium)")
+    whisper_worker_concurrency: int = Field(default=1, description="Max concurrent Whisper inferences in the worker")
+    whisper_inprocess_fallback: bool = Field(default=False, description="Load Whisper in the bot process when the worker is unavailable (opt-in)")
+    whisper_model_idle_timeout: int = Field(default=600, description="Unload a Whisper model after this many idle seconds")
+    whisper_job_timeout: int = Field(default=900, description="Max seconds per transcription job (worker restarts on timeout)")
     subtitle_font: str = Field(default="DejaVu Sans", description="Subtitle font name")
     subtitle_font_size: int = Field(default=48, description="Subtitle font size in pixels")
     subtitle_max_chars: int = Field(default=35, description="Max characters per subtitle line")
@@ -31,6 +31,7 @@ from .crud import (
     get_recent_prompts, update_prompt_performance,
     get_top_performing_prompts, get_prompt_style_stats
 )
+from . import async_crud
 
 # Database'i initialize et
 init_database()
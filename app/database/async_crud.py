@@ -0,0 +1,321 @@
+"""
+Async CRUD - crud.py'nin event loop'u bloklamayan async aynası
+
+Coroutine'ler içinden senkron CRUD çağrıları (create_post, update_post,
+log_agent_action...) yavaş bir yazma veya lock beklemesinde tüm Telegram
+callback'lerini ve poller'ları dondurur. Bu modül aynı API'yi async olarak
+sunar:
+
+- Yazmalar tek bir dedicated writer thread'e kuyruklanır. Kuyrukta biriken
+  yazmalar (eşzamanlı coroutine'lerden gelenler) tek transaction'da commit
+  edilir; her yazma kendi SAVEPOINT'i içinde çalıştığı için birinin hatası
+  diğerlerini geri almaz.
+- Okumalar küçük bir read thread pool'unda çalışır (WAL sayesinde writer'ı
+  beklemez).
+- Future'lar ancak commit sonrası çözülür; `await update_post(...)` dönünce
+  sonraki okuma değişikliği görür.
+
+Kullanım:
+    from app.database import async_crud
+
+    post_id = await async_crud.create_post(topic="...", post_text="...")
+    await async_crud.log_agent_action("creator", "create_post", ...)
+"""
+
+import asyncio
+import atexit
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+from . import crud
+from .connection import bind_connection
+from .models import get_connection
+from app.utils.logger import get_logger
+
+logger = get_logger("database")
+
+MAX_WRITE_BATCH = 64    # Tek transaction'daki maksimum yazma sayısı
+READ_WORKERS = 2        # Okuma thread sayısı
+
+_STOP = object()
+
+
+class _Job:
+    __slots__ = ("fn", "args", "kwargs", "loop", "future", "result", "error")
+
+    def __init__(self, fn, args, kwargs, loop, future):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.loop = loop
+        self.future = future
+        self.result = None
+        self.error = None
+
+
+def _resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class DatabaseExecutor:
+    """
+    Dedicated DB writer thread + read pool.
+
+    Writer thread kuyruktan ilk işi bloklayarak alır, ardından kuyrukta
+    bekleyen diğer yazmaları (en fazla MAX_WRITE_BATCH) toplar ve hepsini
+    `BEGIN IMMEDIATE ... COMMIT` içinde çalıştırır.
+    """
+
+    def __init__(self, max_batch: int = MAX_WRITE_BATCH, read_workers: int = READ_WORKERS):
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue()
+        self._reader = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="db-read")
+        self._writer = threading.Thread(target=self._write_loop, name="db-writer", daemon=True)
+        self._started = False
+        self._start_lock = threading.Lock()
+        self.stats = {"writes": 0, "batches": 0, "reads": 0, "max_batch_seen": 0}
+
+    def _ensure_started(self):
+        if not self._started:
+            with self._start_lock:
+                if not self._started:
+                    self._writer.start()
+                    self._started = True
+
+    # ---------- Public ----------
+
+    async def write(self, fn: Callable, *args, **kwargs) -> Any:
+        """Yazma işini writer kuyruğuna ekle ve commit'i bekle"""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(_Job(fn, args, kwargs, loop, future))
+        return await future
+
+    async def read(self, fn: Callable, *args, **kwargs) -> Any:
+        """Okuma işini read pool'unda çalıştır"""
+        loop = asyncio.get_running_loop()
+        self.stats["reads"] += 1
+        return await loop.run_in_executor(self._reader, functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True):
+        """Kuyruktaki yazmaları flush edip thread'leri durdur"""
+        if self._started:
+            self._queue.put(_STOP)
+            if wait:
+                self._writer.join(timeout=10)
+        self._reader.shutdown(wait=wait)
+
+    # ---------- Writer thread ----------
+
+    def _collect_batch(self, first) -> Tuple[List[_Job], bool]:
+        batch = [first]
+        stop = False
+        while len(batch) < self.max_batch:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is _STOP:
+                stop = True
+                break
+            batch.append(job)
+        return batch, stop
+
+    def _write_loop(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, stop = self._collect_batch(first)
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: List[_Job]):
+        conn = get_connection()
+        commit_error = None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            with bind_connection(conn):
+                for job in batch:
+                    conn.execute("SAVEPOINT job")
+                    try:
+                        job.result = job.fn(*job.args, **job.kwargs)
+                    except Exception as e:
+                        job.error = e
+                        conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+            conn.execute("COMMIT")
+        except Exception as e:
+            commit_error = e
+            logger.error(f"DB write batch failed ({len(batch)} jobs): {e}")
+            try:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+            except Exception:
+                pass
+        finally:
+            conn.close()
+
+        self.stats["writes"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(batch))
+
+        for job in batch:
+            error = commit_error or job.error
+            try:
+                job.loop.call_soon_threadsafe(_resolve, job.future, job.result, error)
+            except RuntimeError:
+                pass  # Event loop kapanmış
+
+
+_executor: Optional[DatabaseExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> DatabaseExecutor:
+    """Global DatabaseExecutor (ilk çağrıda oluşturulur)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = DatabaseExecutor()
+    return _executor
+
+
+def shutdown():
+    """Bekleyen yazmaları flush et (uygulama kapanışında çağrılır)"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
+
+
+atexit.register(shutdown)
+
+
+async def run_read(fn: Callable, *args, **kwargs) -> Any:
+    """Herhangi bir senkron okuma fonksiyonunu read pool'unda çalıştır"""
+    return await get_executor().read(fn, *args, **kwargs)
+
+
+async def run_write(fn: Callable, *args, **kwargs) -> Any:
+    """Herhangi bir senkron yazma fonksiyonunu batch'lenen writer'da çalıştır"""
+    return await get_executor().write(fn, *args, **kwargs)
+
+
+def _reader(fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await get_executor().read(fn, *args, **kwargs)
+    return wrapper
+
+
+def _writer(fn: Callable) -> Callable:
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await get_executor().write(fn, *args, **kwargs)
+    return wrapper
+
+
+# ============ POSTS ============
+create_post = _writer(crud.create_post)
+update_post = _writer(crud.update_post)
+get_post = _reader(crud.get_post)
+get_posts_by_status = _reader(crud.get_posts_by_status)
+get_scheduled_posts = _reader(crud.get_scheduled_posts)
+get_published_posts = _reader(crud.get_published_posts)
+
+# ============ ANALYTICS ============
+record_analytics = _writer(crud.record_analytics)
+get_post_analytics = _reader(crud.get_post_analytics)
+get_analytics_summary = _reader(crud.get_analytics_summary)
+update_post_analytics = _writer(crud.update_post_analytics)
+get_posts_with_analytics = _reader(crud.get_posts_with_analytics)
+
+# ============ STRATEGY ============
+get_current_strategy = _reader(crud.get_current_strategy)
+get_strategy_version = _reader(crud.get_strategy_version)
+update_strategy = _writer(crud.update_strategy)
+
+# ============ CONTENT CALENDAR ============
+create_calendar_entry = _writer(crud.create_calendar_entry)
+get_week_calendar = _reader(crud.get_week_calendar)
+get_todays_calendar = _reader(crud.get_todays_calendar)
+update_calendar_status = _writer(crud.update_calendar_status)
+
+# ============ AGENT LOGS ============
+log_agent_action = _writer(crud.log_agent_action)
+get_agent_logs = _reader(crud.get_agent_logs)
+
+# ============ HOOK PERFORMANCE ============
+update_hook_performance = _writer(crud.update_hook_performance)
+get_best_performing_hooks = _reader(crud.get_best_performing_hooks)
+get_viral_score_leaderboard = _reader(crud.get_viral_score_leaderboard)
+update_post_viral_score = _writer(crud.update_post_viral_score)
+get_hook_performance_by_type = _reader(crud.get_hook_performance_by_type)
+get_hook_recommendations = _reader(crud.get_hook_recommendations)
+get_hook_weights_for_selection = _reader(crud.get_hook_weights_for_selection)
+get_underperforming_hooks = _reader(crud.get_underperforming_hooks)
+
+# ============ A/B TESTING ============
+log_ab_test_result = _writer(crud.log_ab_test_result)
+update_ab_test_actual_performance = _writer(crud.update_ab_test_actual_performance)
+get_ab_test_results = _reader(crud.get_ab_test_results)
+get_ab_test_learnings = _reader(crud.get_ab_test_learnings)
+
+# ============ APPROVAL AUDIT TRAIL ============
+log_approval_decision = _writer(crud.log_approval_decision)
+get_approval_history = _reader(crud.get_approval_history)
+get_approval_stats = _reader(crud.get_approval_stats)
+
+# ============ TELEGRAM BOT HELPERS ============
+get_todays_summary = _reader(crud.get_todays_summary)
+get_weekly_progress = _reader(crud.get_weekly_progress)
+get_next_scheduled = _reader(crud.get_next_scheduled)
+get_best_performing_content = _reader(crud.get_best_performing_content)
+get_next_schedule_slot = _reader(crud.get_next_schedule_slot)
+
+# ============ SCHEDULER HELPERS ============
+get_todays_content_by_type = _reader(crud.get_todays_content_by_type)
+should_run_scheduled_content = _reader(crud.should_run_scheduled_content)
+
+# ============ PROMPT TRACKING ============
+save_prompt = _writer(crud.save_prompt)
+check_duplicate_prompt = _reader(crud.check_duplicate_prompt)
+get_recent_prompts = _reader(crud.get_recent_prompts)
+update_prompt_performance = _writer(crud.update_prompt_performance)
+get_top_performing_prompts = _reader(crud.get_top_performing_prompts)
+get_prompt_style_stats = _reader(crud.get_prompt_style_stats)
+
+# ============ STORY BOOSTS ============
+log_story_boost = _writer(crud.log_story_boost)
+update_story_boost = _writer(crud.update_story_boost)
+get_story_boosts_for_post = _reader(crud.get_story_boosts_for_post)
+get_story_boost_stats = _reader(crud.get_story_boost_stats)
+
+# ============ PIPELINE CHECKPOINTS ============
+save_stage_checkpoint = _writer(crud.save_stage_checkpoint)
+finish_pipeline_run = _writer(crud.finish_pipeline_run)
+get_pipeline_run = _reader(crud.get_pipeline_run)
+get_interrupted_runs = _reader(crud.get_interrupted_runs)
+
+# ============ REMOTE JOBS ============
+save_remote_job = _writer(crud.save_remote_job)
+finish_remote_job = _writer(crud.finish_remote_job)
+get_pending_remote_job = _reader(crud.get_pending_remote_job)
+get_remote_job_durations = _reader(crud.get_remote_job_durations)
+
+# ============ VIDEO GENERATIONS ============
+log_video_generation = _writer(crud.log_video_generation)
+get_video_model_stats = _reader(crud.get_video_model_stats)
@@ -0,0 +1,237 @@
+"""
+Database Connection Pool - Yeniden kullanılan SQLite bağlantıları
+
+Her CRUD fonksiyonu `get_connection()` ile bağlantı alır ve `conn.close()`
+ile bırakır. Pool sayesinde `close()` fiziksel bağlantıyı kapatmaz, bağlantı
+havuza geri döner; böylece her çağrıda connect + PRAGMA maliyeti ödenmez ve
+sqlite3'ün prepared statement cache'i çağrılar arasında korunur.
+"""
+
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+# Bağlantı başına uygulanan PRAGMA'lar
+DEFAULT_CACHE_SIZE_KB = 16384      # 16 MB page cache (negatif değer = KB)
+DEFAULT_MMAP_SIZE = 128 * 1024 * 1024  # 128 MB memory-mapped I/O
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_STATEMENT_CACHE = 256      # sqlite3 prepared statement cache boyutu
+
+
+class PooledConnection:
+    """
+    sqlite3.Connection proxy'si.
+
+    Tüm çağrıları gerçek bağlantıya iletir; sadece `close()` bağlantıyı
+    havuza iade eder. Commit edilmemiş bir transaction varsa iade sırasında
+    rollback yapılır (eski open/close davranışıyla aynı).
+    """
+
+    __slots__ = ("_conn", "_pool")
+
+    def __init__(self, conn: sqlite3.Connection, pool: "ConnectionPool"):
+        self._conn = conn
+        self._pool = pool
+
+    def close(self):
+        """Bağlantıyı havuza iade et"""
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __getattr__(self, name):
+        conn = self._conn
+        if conn is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        return getattr(conn, name)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self._conn.__exit__(exc_type, exc_val, exc_tb)
+
+    def __del__(self):
+        # close() unutulursa bağlantı sızmasın
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class BoundConnection:
+    """
+    Dış transaction'a bağlı bağlantı proxy'si.
+
+    Batch içindeki CRUD fonksiyonları kendi `commit()` / `close()` çağrılarını
+    yapmaya devam eder; bunlar no-op olur ve transaction'ı batch sahibi
+    (async_crud writer thread'i) tek seferde commit eder.
+    """
+
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+_local = threading.local()
+
+
+@contextmanager
+def bind_connection(conn: sqlite3.Connection):
+    """
+    Bu thread'deki tüm get_connection() çağrılarını verilen bağlantıya yönlendir.
+
+    Kullanım:
+        with bind_connection(conn):
+            create_post(...)   # aynı transaction içinde çalışır
+    """
+    previous = getattr(_local, "conn", None)
+    _local.conn = conn
+    try:
+        yield conn
+    finally:
+        _local.conn = previous
+
+
+class ConnectionPool:
+    """
+    Thread-safe SQLite bağlantı havuzu.
+
+    - WAL journal mode + synchronous=NORMAL (yazarlar okuyucuları bloklamaz)
+    - Ayarlanmış page cache ve mmap
+    - Bağlantı başına prepared statement cache
+    - En fazla `size` boşta bağlantı tutulur; havuz boşsa yeni bağlantı açılır,
+      böylece eşzamanlı çağrılar asla beklemez
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        size: int = 4,
+        cache_size_kb: int = DEFAULT_CACHE_SIZE_KB,
+        mmap_size: int = DEFAULT_MMAP_SIZE,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cached_statements: int = DEFAULT_STATEMENT_CACHE
+    ):
+        self.db_path = Path(db_path)
+        self.size = max(1, size)
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {"created": 0, "reused": 0, "discarded": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Yeni fiziksel bağlantı aç ve PRAGMA'ları uygula"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        with self._lock:
+            self._stats["created"] += 1
+        return conn
+
+    def acquire(self):
+        """Havuzdan bağlantı al (boşsa yenisini aç)"""
+        bound = getattr(_local, "conn", None)
+        if bound is not None:
+            return BoundConnection(bound)
+
+        conn = None
+        with self._lock:
+            if self._idle:
+                conn = self._idle.pop()
+                self._stats["reused"] += 1
+        if conn is None:
+            conn = self._connect()
+        return PooledConnection(conn, self)
+
+    def release(self, conn: sqlite3.Connection):
+        """Bağlantıyı havuza iade et; havuz doluysa kapat"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = sqlite3.Row
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        self._discard(conn)
+
+    def _discard(self, conn: sqlite3.Connection):
+        with self._lock:
+            self._stats["discarded"] += 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close_all(self):
+        """Tüm boştaki bağlantıları kapat (shutdown / test için)"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def reopen(self):
+        """close_all() sonrası havuzu tekrar kullanılabilir yap"""
+        with self._lock:
+            self._closed = False
+
+    def get_stats(self) -> Dict[str, int]:
+        """Havuz istatistikleri"""
+        with self._lock:
+            return {**self._stats, "idle": len(self._idle), "size": self.size}
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(db_path: Path, **kwargs) -> ConnectionPool:
+    """Verilen DB için global havuzu döndür (ilk çağrıda oluşturulur)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.db_path != Path(db_path):
+            if _pool is not None:
+                _pool.close_all()
+            _pool = ConnectionPool(db_path, **kwargs)
+        return _pool
@@ -2074,3 +2074,264 @@ def get_story_boost_stats(days: int = 7) -> Dict[str, Any]:
             stats[row["status"]] = row["cnt"]
 
     return stats
+
+
+# ============ PIPELINE CHECKPOINTS ============
+
+def save_stage_checkpoint(
+    post_id: int,
+    pipeline: str,
+    stage: str,
+    outputs: Dict[str, Any],
+    file_hashes: Dict[str, str],
+    params: Dict[str, Any],
+    result: Dict[str, Any]
+):
+    """Tamamlanan aşamanın çıktısını kaydet, run kaydını güncelle (tek transaction)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+    now = datetime.now().isoformat()
+
+    cursor.execute('''
+        INSERT INTO pipeline_runs (post_id, pipeline, params, status, result, updated_at)
+        VALUES (?, ?, ?, 'running', ?, ?)
+        ON CONFLICT(post_id) DO UPDATE SET
+            status = 'running', result = excluded.result, error = NULL, updated_at = excluded.updated_at
+    ''', (post_id, pipeline, json.dumps(params, default=str), json.dumps(result, default=str), now))
+
+    cursor.execute('''
+        INSERT OR REPLACE INTO pipeline_checkpoints (post_id, stage, outputs, file_hashes, completed_at)
+        VALUES (?, ?, ?, ?, ?)
+    ''', (post_id, stage, json.dumps(outputs, default=str), json.dumps(file_hashes), now))
+
+    conn.commit()
+    conn.close()
+
+
+def finish_pipeline_run(post_id: int, status: str, result: Dict[str, Any] = None, error: str = None):
+    """Run durumunu güncelle (completed / failed)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    updates = ["status = ?", "error = ?", "updated_at = ?"]
+    values = [status, error[:500] if error else None, datetime.now().isoformat()]
+    if result is not None:
+        updates.append("result = ?")
+        values.append(json.dumps(result, default=str))
+
+    values.append(post_id)
+    cursor.execute(f"UPDATE pipeline_runs SET {', '.join(updates)} WHERE post_id = ?", values)
+
+    conn.commit()
+    conn.close()
+
+
+def get_pipeline_run(post_id: int) -> Optional[Dict]:
+    """Run kaydı + aşama checkpoint'leri ({stage: {outputs, file_hashes}})"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute("SELECT * FROM pipeline_runs WHERE post_id = ?", (post_id,))
+    row = cursor.fetchone()
+    if not row:
+        conn.close()
+        return None
+
+    cursor.execute('''
+        SELECT stage, outputs, file_hashes FROM pipeline_checkpoints
+        WHERE post_id = ?
+        ORDER BY completed_at
+    ''', (post_id,))
+    checkpoints = {
+        r["stage"]: {
+            "outputs": json.loads(r["outputs"]),
+            "file_hashes": json.loads(r["file_hashes"] or "{}")
+        }
+        for r in cursor.fetchall()
+    }
+    conn.close()
+
+    run = dict(row)
+    run["params"] = json.loads(run["params"] or "{}")
+    run["result"] = json.loads(run["result"] or "{}")
+    run["checkpoints"] = checkpoints
+    return run
+
+
+def get_interrupted_runs(days: int = 3, limit: int = 10) -> List[Dict]:
+    """Tamamlanmamış (running / failed) run'lar, en yeniden eskiye"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    since = (datetime.now() - timedelta(days=days)).isoformat()
+    cursor.execute('''
+        SELECT r.post_id, r.pipeline, r.status, r.error, r.updated_at,
+               (SELECT COUNT(*) FROM pipeline_checkpoints c WHERE c.post_id = r.post_id) as stage_count
+        FROM pipeline_runs r
+        WHERE r.status IN ('running', 'failed') AND r.updated_at > ?
+        ORDER BY r.updated_at DESC
+        LIMIT ?
+    ''', (since, limit))
+
+    rows = cursor.fetchall()
+    conn.close()
+
+    return [dict(row) for row in rows]
+
+
+# ============ REMOTE JOBS ============
+
+def save_remote_job(
+    job_key: str,
+    provider: str,
+    label: str,
+    remote_id: str,
+    poll_data: Dict[str, Any],
+    timeout_s: float
+):
+    """Gönderilen uzak işi bekleyen olarak kaydet (aynı key varsa üzerine yazar)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        INSERT OR REPLACE INTO remote_jobs
+        (job_key, provider, label, remote_id, poll_data, status, timeout_s, submitted_at)
+        VALUES (?, ?, ?, ?, ?, 'pending', ?, ?)
+    ''', (job_key, provider, label, remote_id, json.dumps(poll_data, default=str), timeout_s,
+          datetime.now().isoformat()))
+
+    conn.commit()
+    conn.close()
+
+
+def finish_remote_job(job_key: str, status: str, error: str = None, duration_s: float = None):
+    """İş sonucunu kaydet (completed / failed / timeout)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        UPDATE remote_jobs SET status = ?, error = ?, duration_s = ?, finished_at = ?
+        WHERE job_key = ?
+    ''', (status, error[:500] if error else None, duration_s, datetime.now().isoformat(), job_key))
+
+    conn.commit()
+    conn.close()
+
+
+def get_pending_remote_job(job_key: str) -> Optional[Dict]:
+    """Süresi dolmamış bekleyen iş (restart sonrası yeniden bağlanmak için)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        SELECT * FROM remote_jobs WHERE job_key = ? AND status = 'pending'
+    ''', (job_key,))
+    row = cursor.fetchone()
+    conn.close()
+
+    if not row:
+        return None
+
+    job = dict(row)
+    job["poll_data"] = json.loads(job["poll_data"] or "{}")
+    job["age_s"] = (datetime.now() - datetime.fromisoformat(job["submitted_at"])).total_seconds()
+    if job["timeout_s"] and job["age_s"] > job["timeout_s"]:
+        return None
+    return job
+
+
+def get_remote_job_durations(provider: str, label: str = None, limit: int = 50) -> List[float]:
+    """Son tamamlanan işlerin süreleri (saniye), en yeniden eskiye"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    if label is None:
+        cursor.execute('''
+            SELECT duration_s FROM remote_jobs
+            WHERE provider = ? AND status = 'completed' AND duration_s IS NOT NULL
+            ORDER BY finished_at DESC
+            LIMIT ?
+        ''', (provider, limit))
+    else:
+        cursor.execute('''
+            SELECT duration_s FROM remote_jobs
+            WHERE provider = ? AND label = ? AND status = 'completed' AND duration_s IS NOT NULL
+            ORDER BY finished_at DESC
+            LIMIT ?
+        ''', (provider, label, limit))
+
+    durations = [row[0] for row in cursor.fetchall()]
+    conn.close()
+    return durations
+
+
+# ============ VIDEO GENERATIONS ============
+
+def log_video_generation(
+    model_id: str,
+    status: str,
+    duration_s: float = None,
+    video_seconds: int = None,
+    cost_usd: float = None,
+    hedged: bool = False,
+    error: str = None
+) -> int:
+    """Tek model denemesini kaydet (success / failed / cancelled)"""
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        INSERT INTO video_generations
+        (model_id, status, duration_s, video_seconds, cost_usd, hedged, error, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (model_id, status, duration_s, video_seconds, cost_usd, hedged,
+          error[:500] if error else None, datetime.now().isoformat()))
+
+    generation_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+    return generation_id
+
+
+def get_video_model_stats(days: int = 14, window: int = 20) -> Dict[str, Dict[str, Any]]:
+    """
+    Model başına son `window` denemeden süre ve hata istatistikleri.
+
+    İptal edilen (hedge'i kaybeden) denemeler sayılmaz; süre yüzdelikleri
+    sadece başarılı denemelerden hesaplanır.
+
+    Returns:
+        {model_id: {"attempts", "failures", "failure_rate", "samples", "p50_s", "p90_s"}}
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    since = (datetime.now() - timedelta(days=days)).isoformat()
+    cursor.execute('''
+        SELECT model_id, status, duration_s FROM video_generations
+        WHERE created_at > ? AND status != 'cancelled'
+        ORDER BY created_at DESC
+        LIMIT 2000
+    ''', (since,))
+    rows = cursor.fetchall()
+    conn.close()
+
+    recent: Dict[str, List] = {}
+    for model_id, status, duration_s in rows:
+        attempts = recent.setdefault(model_id, [])
+        if len(attempts) < window:
+            attempts.append((status, duration_s))
+
+    stats = {}
+    for model_id, attempts in recent.items():
+        failures = sum(1 for status, _ in attempts if status != "success")
+        durations = sorted(d for status, d in attempts if status == "success" and d is not None)
+        stats[model_id] = {
+            "attempts": len(attempts),
+            "failures": failures,
+            "failure_rate": round(failures / len(attempts), 3),
+            "samples": len(durations),
+            "p50_s": durations[len(durations) // 2] if durations else None,
+            "p90_s": durations[min(len(durations) - 1, int(len(durations) * 0.9))] if durations else None,
+        }
+    return stats
@@ -0,0 +1,77 @@
+"""
+Database Migrations - PRAGMA user_version tabanlı şema versiyonlama
+
+Her migration (version, açıklama, fonksiyon) üçlüsüdür. `apply_migrations()`
+DB'nin mevcut `user_version` değerinden büyük adımları sırayla, her birini
+kendi transaction'ında çalıştırır ve başarılı adım sonrası `user_version`'ı
+günceller. Böylece her adım tam olarak bir kez uygulanır.
+
+Yeni migration eklemek için `models.py`'deki MIGRATIONS listesine bir sonraki
+version numarasıyla yeni bir adım ekleyin; mevcut adımları değiştirmeyin.
+"""
+
+import sqlite3
+from typing import Callable, List, Tuple
+
+from app.utils.logger import get_logger
+
+logger = get_logger("database")
+
+Migration = Tuple[int, str, Callable[[sqlite3.Cursor], None]]
+
+
+def get_schema_version(conn) -> int:
+    """DB'nin mevcut şema versiyonu (PRAGMA user_version)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def get_columns(cursor, table: str) -> List[str]:
+    """Tablonun kolon isimleri"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def add_column_if_missing(cursor, table: str, column: str, definition: str) -> bool:
+    """Kolon yoksa ekle (eski, user_version'sız DB'ler için idempotent)"""
+    if column in get_columns(cursor, table):
+        return False
+    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+def apply_migrations(conn, migrations: List[Migration]) -> int:
+    """
+    Bekleyen migration'ları uygula.
+
+    Args:
+        conn: Database bağlantısı
+        migrations: (version, açıklama, fonksiyon) listesi
+
+    Returns:
+        Son şema versiyonu
+    """
+    versions = [m[0] for m in migrations]
+    if versions != sorted(set(versions)):
+        raise ValueError(f"Migration versiyonları sıralı ve benzersiz olmalı: {versions}")
+
+    current = get_schema_version(conn)
+    for version, description, step in migrations:
+        if version <= current:
+            continue
+
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            step(cursor)
+            cursor.execute(f"PRAGMA user_version = {int(version)}")
+            cursor.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            logger.error(f"Migration v{version} başarısız ({description}): {e}")
+            raise
+
+        logger.info(f"Migration v{version} uygulandı: {description}")
+        current = version
+
+    return current
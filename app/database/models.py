@@ -2,7 +2,6 @@
 Database Models - SQLite ile içerik ve analitik takibi
 """
 
-import sqlite3
 import json
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
@@ -10,23 +9,34 @@ from pathlib import Path
 
 from app.config import settings
 from app.utils.logger import get_logger
+from .connection import get_pool
+from .migrations import apply_migrations, add_column_if_missing
 
 logger = get_logger("database")
 
 DB_PATH = settings.database_path
 
 def get_connection():
-    """Database bağlantısı al"""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def init_database():
-    """Database tablolarını oluştur"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
+    """
+    Database bağlantısı al (pool'dan).
+
+    `conn.close()` bağlantıyı kapatmaz, havuza iade eder.
+    """
+    pool = get_pool(
+        DB_PATH,
+        size=settings.db_pool_size,
+        cache_size_kb=settings.db_cache_size_kb,
+        mmap_size=settings.db_mmap_size_mb * 1024 * 1024
+    )
+    return pool.acquire()
+
+def _migrate_v1_base_schema(cursor):
+    """
+    v1 - Temel şema.
+
+    user_version öncesi oluşturulmuş DB'lerde de güvenle çalışır: tablolar
+    IF NOT EXISTS ile, sonradan eklenen kolonlar sadece eksikse eklenir.
+    """
     # Posts tablosu - Tüm postlar
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS posts (
@@ -365,80 +375,67 @@ def init_database():
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_story_boosts_post ON story_boosts(post_id)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_story_boosts_status ON story_boosts(status)')
 
-    conn.commit()
-
-    # Analytics kolonlarını posts tablosuna ekle (migration)
-    alter_statements = [
-        "ALTER TABLE posts ADD COLUMN fb_reach INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN fb_likes INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN fb_comments INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN fb_shares INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN fb_engagement_rate REAL DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_reach INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_likes INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_comments INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_engagement_rate REAL DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN insights_updated_at TIMESTAMP",
-        "ALTER TABLE posts ADD COLUMN post_text_ig TEXT",
-        "ALTER TABLE posts ADD COLUMN post_text_fb TEXT",
+    # Analytics kolonlarını posts tablosuna ekle
+    posts_columns = [
+        ("fb_reach", "INTEGER DEFAULT 0"),
+        ("fb_likes", "INTEGER DEFAULT 0"),
+        ("fb_comments", "INTEGER DEFAULT 0"),
+        ("fb_shares", "INTEGER DEFAULT 0"),
+        ("fb_engagement_rate", "REAL DEFAULT 0"),
+        ("ig_reach", "INTEGER DEFAULT 0"),
+        ("ig_likes", "INTEGER DEFAULT 0"),
+        ("ig_comments", "INTEGER DEFAULT 0"),
+        ("ig_engagement_rate", "REAL DEFAULT 0"),
+        ("insights_updated_at", "TIMESTAMP"),
+        ("post_text_ig", "TEXT"),
+        ("post_text_fb", "TEXT"),
         # Instagram Reels/Video metrikleri
-        "ALTER TABLE posts ADD COLUMN ig_saves INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_shares INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_plays INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_avg_watch_time REAL DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_total_watch_time INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_reach_followers INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_reach_non_followers INTEGER DEFAULT 0",
+        ("ig_saves", "INTEGER DEFAULT 0"),
+        ("ig_shares", "INTEGER DEFAULT 0"),
+        ("ig_plays", "INTEGER DEFAULT 0"),
+        ("ig_avg_watch_time", "REAL DEFAULT 0"),
+        ("ig_total_watch_time", "INTEGER DEFAULT 0"),
+        ("ig_reach_followers", "INTEGER DEFAULT 0"),
+        ("ig_reach_non_followers", "INTEGER DEFAULT 0"),
         # Hook tracking
-        "ALTER TABLE posts ADD COLUMN hook_type TEXT",
-        "ALTER TABLE posts ADD COLUMN hook_text TEXT",
-        "ALTER TABLE posts ADD COLUMN tone TEXT",
+        ("hook_type", "TEXT"),
+        ("hook_text", "TEXT"),
+        ("tone", "TEXT"),
         # A/B testing
-        "ALTER TABLE posts ADD COLUMN ab_test_id INTEGER",
-        "ALTER TABLE posts ADD COLUMN is_ab_winner BOOLEAN",
+        ("ab_test_id", "INTEGER"),
+        ("is_ab_winner", "BOOLEAN"),
         # Prompt tracking
-        "ALTER TABLE posts ADD COLUMN video_prompt TEXT",
-        "ALTER TABLE posts ADD COLUMN prompt_style TEXT",
+        ("video_prompt", "TEXT"),
+        ("prompt_style", "TEXT"),
         # Voice Reels (ElevenLabs TTS)
-        "ALTER TABLE posts ADD COLUMN speech_script TEXT",
-        "ALTER TABLE posts ADD COLUMN audio_path TEXT",
-        "ALTER TABLE posts ADD COLUMN voice_id TEXT",
-        "ALTER TABLE posts ADD COLUMN audio_duration REAL DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN voice_mode BOOLEAN DEFAULT 0",
+        ("speech_script", "TEXT"),
+        ("audio_path", "TEXT"),
+        ("voice_id", "TEXT"),
+        ("audio_duration", "REAL DEFAULT 0"),
+        ("voice_mode", "BOOLEAN DEFAULT 0"),
         # Topic category tracking
-        "ALTER TABLE posts ADD COLUMN topic_category TEXT",
+        ("topic_category", "TEXT"),
         # Multi-segment video support
-        "ALTER TABLE posts ADD COLUMN video_segment_count INTEGER DEFAULT 1",
-        "ALTER TABLE posts ADD COLUMN total_video_duration REAL DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN segment_prompts TEXT",
-        "ALTER TABLE posts ADD COLUMN video_model TEXT",
+        ("video_segment_count", "INTEGER DEFAULT 1"),
+        ("total_video_duration", "REAL DEFAULT 0"),
+        ("segment_prompts", "TEXT"),
+        ("video_model", "TEXT"),
         # Viral Score v2 Metrikleri
-        "ALTER TABLE posts ADD COLUMN ig_watch_time_pct REAL DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_replays INTEGER DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN ig_comment_rate REAL DEFAULT 0",
-        "ALTER TABLE posts ADD COLUMN viral_score_v2 REAL DEFAULT 0"
+        ("ig_watch_time_pct", "REAL DEFAULT 0"),
+        ("ig_replays", "INTEGER DEFAULT 0"),
+        ("ig_comment_rate", "REAL DEFAULT 0"),
+        ("viral_score_v2", "REAL DEFAULT 0")
     ]
 
-    for stmt in alter_statements:
-        try:
-            cursor.execute(stmt)
-        except sqlite3.OperationalError:
-            pass  # Kolon zaten var
-
-    # Strategy tablosu için migration
-    strategy_migrations = [
-        "ALTER TABLE strategy ADD COLUMN version INTEGER DEFAULT 1",
-        "ALTER TABLE strategy ADD COLUMN best_hooks TEXT"
-    ]
+    for col_name, col_def in posts_columns:
+        add_column_if_missing(cursor, "posts", col_name, col_def)
 
-    for stmt in strategy_migrations:
-        try:
-            cursor.execute(stmt)
-        except sqlite3.OperationalError:
-            pass  # Kolon zaten var
+    # Strategy tablosu kolonları
+    add_column_if_missing(cursor, "strategy", "version", "INTEGER DEFAULT 1")
+    add_column_if_missing(cursor, "strategy", "best_hooks", "TEXT")
 
     # Content Calendar v2 - Engagement strategy fields
-    calendar_migrations = [
+    calendar_columns = [
         ("content_type", "TEXT DEFAULT 'post'"),
         ("viral_format", "TEXT"),
         ("hook_type", "TEXT"),
@@ -448,15 +445,158 @@ def init_database():
         ("strategy_reasoning", "TEXT")
     ]
 
-    for col_name, col_def in calendar_migrations:
-        try:
-            cursor.execute(f"ALTER TABLE content_calendar ADD COLUMN {col_name} {col_def}")
-        except sqlite3.OperationalError:
-            pass  # Kolon zaten var
+    for col_name, col_def in calendar_columns:
+        add_column_if_missing(cursor, "content_calendar", col_name, col_def)
 
-    conn.commit()
-    conn.close()
-    print("✅ Database initialized")
+
+def _migrate_v2_hot_path_indexes(cursor):
+    """
+    v2 - Sık kullanılan sorgular için secondary index'ler.
+
+    tests/test_query_plans.py bu sorguların (crud.py'nin çalıştırdığı SQL)
+    full table scan yapmadığını EXPLAIN QUERY PLAN ile doğrular.
+    """
+    # posts: get_posts_by_status, get_published_posts, get_analytics_summary,
+    # get_scheduled_posts, get_next_scheduled
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_status_created ON posts(status, created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_status_published ON posts(status, published_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_status_scheduled ON posts(status, scheduled_at)')
+
+    # content_calendar: get_week_calendar, get_todays_calendar (sıralama dahil)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_calendar_week_day
+        ON content_calendar(week_start, day_of_week, scheduled_time)
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_calendar_status ON content_calendar(status)')
+
+    # analytics: get_post_analytics
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_analytics_post ON analytics(post_id, recorded_at)')
+
+    # agent_logs: get_agent_logs (agent filtreli ve filtresiz)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_agent_logs_agent_ts ON agent_logs(agent_name, timestamp)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_agent_logs_ts ON agent_logs(timestamp)')
+
+    # approval_logs: get_approval_history, get_approval_stats
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_approval_post ON approval_logs(post_id, created_at)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_approval_created ON approval_logs(created_at)')
+
+    # hook_performance: usage_count filtreli viral_score sıralamaları
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_hook_usage_score ON hook_performance(usage_count, viral_score)')
+
+    # ab_test_results: get_ab_test_results
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ab_created ON ab_test_results(created_at)')
+
+
+def _migrate_v3_pipeline_checkpoints(cursor):
+    """
+    v3 - Pipeline checkpoint'leri.
+
+    StageGraph pipeline'ları her aşamanın çıktısını post_id bazında saklar;
+    yarıda kalan (restart, publish hatası) run'lar son tamamlanan aşamadan
+    devam eder. Dosya çıktıları sha256 ile doğrulanır.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            post_id INTEGER PRIMARY KEY,
+            pipeline TEXT NOT NULL,  -- voice_reels, long_video, conversational_reels
+            params TEXT,  -- JSON: pipeline metodunun argümanları
+            status TEXT DEFAULT 'running',  -- running, completed, failed
+            result TEXT,  -- JSON: son result snapshot'ı
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (post_id) REFERENCES posts(id)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_checkpoints (
+            post_id INTEGER NOT NULL,
+            stage TEXT NOT NULL,
+            outputs TEXT NOT NULL,  -- JSON: aşamanın StageGraph output'ları
+            file_hashes TEXT,  -- JSON: {path: sha256}
+            completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (post_id, stage)
+        )
+    ''')
+
+    # get_interrupted_runs
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_pipeline_runs_status ON pipeline_runs(status, updated_at)')
+
+
+def _migrate_v4_remote_jobs(cursor):
+    """
+    v4 - Uzak üretim işleri (Sora, Kling/fal.ai, FLUX, Veo, lipsync).
+
+    JobTracker gönderilen her işi idempotency key'i ile saklar; restart sonrası
+    aynı istek yeniden geldiğinde bekleyen işe bağlanılır, tekrar ücret
+    ödenmez. Tamamlanan işlerin süreleri provider/label bazında polling
+    aralığını ayarlamak için kullanılır.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS remote_jobs (
+            job_key TEXT PRIMARY KEY,  -- sha256(provider + label + istek parametreleri)
+            provider TEXT NOT NULL,  -- sora, fal, flux, veo
+            label TEXT,  -- model / endpoint (örn. sora-2, kling_pro, sync-lipsync)
+            remote_id TEXT NOT NULL,
+            poll_data TEXT,  -- JSON: status/result URL'leri vb. (secret içermez)
+            status TEXT DEFAULT 'pending',  -- pending, completed, failed, timeout
+            error TEXT,
+            timeout_s REAL,
+            duration_s REAL,  -- gönderimden sonuca kadar geçen süre
+            submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    ''')
+
+    # get_remote_job_durations
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_remote_jobs_provider ON remote_jobs(provider, label, status, finished_at)')
+
+
+def _migrate_v5_video_generations(cursor):
+    """
+    v5 - Video model denemeleri (latency-aware routing).
+
+    generate_video_smart'ın her model denemesi uçtan uca süresi ve sonucuyla
+    kaydedilir; router son denemelerden model başına p50/p90 süre ve hata
+    oranı hesaplayıp en hızlı sağlıklı modeli seçer.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS video_generations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            model_id TEXT NOT NULL,  -- video_models.py ID'si (örn. kling-2.6-pro)
+            status TEXT NOT NULL,  -- success, failed, cancelled (hedge'i kaybeden)
+            duration_s REAL,  -- istekten sonuca kadar geçen süre
+            video_seconds INTEGER,  -- istenen video süresi
+            cost_usd REAL,  -- tahmini maliyet
+            hedged BOOLEAN DEFAULT 0,  -- hedge olarak başlatıldı mı
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # get_video_model_stats
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_generations_created ON video_generations(created_at)')
+
+
+# Şema migration'ları - sadece sona ekleyin, mevcut adımları değiştirmeyin
+MIGRATIONS = [
+    (1, "Temel şema", _migrate_v1_base_schema),
+    (2, "Hot path index'leri", _migrate_v2_hot_path_indexes),
+    (3, "Pipeline checkpoint'leri", _migrate_v3_pipeline_checkpoints),
+    (4, "Uzak üretim işleri", _migrate_v4_remote_jobs),
+    (5, "Video model denemeleri", _migrate_v5_video_generations),
+]
+
+
+def init_database():
+    """Database şemasını oluştur / bekleyen migration'ları uygula"""
+    conn = get_connection()
+    try:
+        version = apply_migrations(conn, MIGRATIONS)
+    finally:
+        conn.close()
+    print(f"✅ Database initialized (schema v{version})")
 
 # Varsayılan strateji oluştur
 def create_default_strategy():
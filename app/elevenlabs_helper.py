@@ -7,13 +7,18 @@ ElevenLabs Multilingual v2 modeli kullanarak Türkçe voiceover üretimi.
 import os
 import asyncio
 import hashlib
+import json
+import uuid
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime
 
 import httpx
 
 from app.config import settings
+from app.media import Mp3DurationCounter
+from app.net import get_http_client
+from app.tts import get_tts_cache
 from app.utils.logger import get_logger
 
 logger = get_logger("elevenlabs")
@@ -22,6 +27,7 @@ logger = get_logger("elevenlabs")
 ELEVENLABS_API_URL = "https://api.elevenlabs.io/v1"
 DEFAULT_MODEL = "eleven_multilingual_v2"  # Türkçe destekli
 DEFAULT_OUTPUT_FORMAT = "mp3_44100_128"
+TTS_REQUEST_TIMEOUT = 60.0  # Uzun metinlerde üretim 30s'yi aşabiliyor
 
 # Varsayılan ses ayarları (doğal Türkçe için optimize edildi)
 # stability: 0.5 = doğal varyasyon, similarity_boost: 0.75 = orijinal sese benzerlik
@@ -128,11 +134,94 @@ class ElevenLabsHelper:
         return base_duration / speed
 
     @staticmethod
-    def get_cache_key(text: str, voice_id: str) -> str:
-        """Text + voice ID'den unique hash oluştur"""
-        content = f"{text}:{voice_id}"
+    def get_cache_key(
+        text: str,
+        voice_id: str,
+        model_id: str = DEFAULT_MODEL,
+        voice_settings: Optional[Dict] = None,
+        speed: float = 1.0,
+        output_format: str = DEFAULT_OUTPUT_FORMAT
+    ) -> str:
+        """Text + voice + model + ses ayarları + hız + format'tan unique hash oluştur"""
+        content = json.dumps({
+            "text": text,
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "voice_settings": voice_settings or DEFAULT_VOICE_SETTINGS,
+            "speed": round(float(speed), 3),
+            "output_format": output_format
+        }, sort_keys=True, ensure_ascii=False)
         return hashlib.md5(content.encode()).hexdigest()
 
+    @staticmethod
+    def _raise_for_status(status_code: int, headers, text: str):
+        """HTTP durumunu ElevenLabs hatalarına çevir (200 ise bir şey yapmaz)"""
+        # Rate limit kontrolü
+        if status_code == 429:
+            retry_after = int(headers.get("Retry-After", 60))
+            logger.warning(f"[TTS] Rate limited, retry after {retry_after}s")
+            raise RateLimitError(f"Rate limited. Retry after {retry_after}s")
+
+        # Quota kontrolü
+        if status_code == 401:
+            raise ElevenLabsError("Invalid API key")
+
+        if status_code == 402:
+            raise ElevenLabsError(
+                "Payment required - voice may be a library voice not available on free tier. "
+                "Use a premade or cloned voice instead."
+            )
+
+        if status_code == 400:
+            if "quota" in text.lower() or "limit" in text.lower():
+                raise QuotaExceededError("Monthly character quota exceeded")
+            raise ElevenLabsError(f"Bad request: {text[:200]}")
+
+        if status_code != 200:
+            raise ElevenLabsError(f"API error {status_code}: {text[:200]}")
+
+    @staticmethod
+    async def _stream_to_file(
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Dict[str, str],
+        body: Dict[str, Any],
+        params: Dict[str, str],
+        output_path: Path
+    ) -> Tuple[int, Optional[float]]:
+        """
+        Streaming endpoint'inden gelen sesi chunk chunk diske yaz.
+
+        Yanıt bellekte birikmez; dosya önce .part olarak yazılır ve tamamlanınca
+        yerine taşınır (yarım dosya okunmaz).
+
+        Returns:
+            (dosya boyutu, frame header'larından ölçülen süre veya None)
+        """
+        partial_path = output_path.with_name(output_path.name + ".part")
+        counter = Mp3DurationCounter()
+        try:
+            async with client.stream(
+                "POST", url, headers=headers, json=body, params=params, timeout=TTS_REQUEST_TIMEOUT
+            ) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    ElevenLabsHelper._raise_for_status(response.status_code, response.headers, response.text)
+
+                with open(partial_path, "wb") as f:
+                    async for chunk in response.aiter_bytes():
+                        f.write(chunk)
+                        counter.feed(chunk)
+
+            if counter.bytes_seen < 1000:
+                raise ElevenLabsError("Audio data too small, generation may have failed")
+            os.replace(partial_path, output_path)
+        finally:
+            if partial_path.exists():
+                partial_path.unlink()
+
+        return counter.bytes_seen, (counter.duration if counter.frames else None)
+
     @staticmethod
     async def generate_speech(
         text: str,
@@ -140,7 +229,8 @@ class ElevenLabsHelper:
         model_id: str = DEFAULT_MODEL,
         voice_settings: Optional[Dict] = None,
         output_format: str = DEFAULT_OUTPUT_FORMAT,
-        speed: float = 1.0
+        speed: float = 1.0,
+        stream: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Text'i sese dönüştür.
@@ -152,12 +242,14 @@ class ElevenLabsHelper:
             voice_settings: Ses ayarları (stability, similarity_boost vb.)
             output_format: Çıktı formatı (mp3_44100_128)
             speed: Konuşma hızı (0.5-2.0)
+            stream: Streaming endpoint'inden diske akıt (None ise settings.tts_stream_download)
 
         Returns:
             {
                 "success": bool,
                 "audio_path": str,  # Lokal dosya yolu
-                "duration_seconds": float,
+                "duration_seconds": float,  # Metinden tahmin
+                "measured_duration": float | None,  # MP3 frame header'larından
                 "character_count": int,
                 "voice_id": str,
                 "error": str (hata durumunda)
@@ -212,39 +304,30 @@ class ElevenLabsHelper:
             "output_format": output_format
         }
 
+        # Eşzamanlı diyalog satırları aynı saniyede aynı sesle üretilebilir
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"tts_{timestamp}_{voice_id[:8]}_{uuid.uuid4().hex[:6]}.mp3"
+        output_path = AUDIO_OUTPUT_DIR / filename
+
+        if stream is None:
+            stream = settings.tts_stream_download
+
         try:
-            async with httpx.AsyncClient(timeout=60.0) as client:
+            client = get_http_client("elevenlabs")
+            if stream:
+                # Chunk'lar geldikçe diske yazılır, süre frame header'larından sayılır
+                file_size, measured_duration = await ElevenLabsHelper._stream_to_file(
+                    client, f"{url}/stream", headers, body, params, output_path
+                )
+            else:
                 response = await client.post(
                     url,
                     headers=headers,
                     json=body,
-                    params=params
+                    params=params,
+                    timeout=TTS_REQUEST_TIMEOUT
                 )
-
-                # Rate limit kontrolü
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", 60))
-                    logger.warning(f"[TTS] Rate limited, retry after {retry_after}s")
-                    raise RateLimitError(f"Rate limited. Retry after {retry_after}s")
-
-                # Quota kontrolü
-                if response.status_code == 401:
-                    raise ElevenLabsError("Invalid API key")
-
-                if response.status_code == 402:
-                    raise ElevenLabsError(
-                        "Payment required - voice may be a library voice not available on free tier. "
-                        "Use a premade or cloned voice instead."
-                    )
-
-                if response.status_code == 400:
-                    error_text = response.text
-                    if "quota" in error_text.lower() or "limit" in error_text.lower():
-                        raise QuotaExceededError("Monthly character quota exceeded")
-                    raise ElevenLabsError(f"Bad request: {error_text[:200]}")
-
-                if response.status_code != 200:
-                    raise ElevenLabsError(f"API error {response.status_code}: {response.text[:200]}")
+                ElevenLabsHelper._raise_for_status(response.status_code, response.headers, response.text)
 
                 # Audio verisini al
                 audio_data = response.content
@@ -252,27 +335,30 @@ class ElevenLabsHelper:
                 if len(audio_data) < 1000:
                     raise ElevenLabsError("Audio data too small, generation may have failed")
 
-                # Dosyayı kaydet
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"tts_{timestamp}_{voice_id[:8]}.mp3"
-                output_path = AUDIO_OUTPUT_DIR / filename
-
                 with open(output_path, "wb") as f:
                     f.write(audio_data)
 
-                # Süre tahmini
-                estimated_duration = ElevenLabsHelper.estimate_duration(text, speed)
-
-                logger.info(f"[TTS] Audio saved: {output_path} (~{estimated_duration:.1f}s)")
-
-                return {
-                    "success": True,
-                    "audio_path": str(output_path),
-                    "duration_seconds": estimated_duration,
-                    "character_count": char_count,
-                    "voice_id": voice_id,
-                    "file_size_bytes": len(audio_data)
-                }
+                counter = Mp3DurationCounter()
+                counter.feed(audio_data)
+                file_size = len(audio_data)
+                measured_duration = counter.duration if counter.frames else None
+
+            # Süre tahmini
+            estimated_duration = ElevenLabsHelper.estimate_duration(text, speed)
+
+            logger.info(f"[TTS] Audio saved: {output_path} (~{estimated_duration:.1f}s, "
+                        f"measured {measured_duration or 0:.1f}s)")
+
+            result = {
+                "success": True,
+                "audio_path": str(output_path),
+                "duration_seconds": estimated_duration,
+                "measured_duration": measured_duration,
+                "character_count": char_count,
+                "voice_id": voice_id,
+                "file_size_bytes": file_size
+            }
+            return result
 
         except (RateLimitError, QuotaExceededError):
             raise
@@ -313,37 +399,37 @@ class ElevenLabsHelper:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=headers)
-
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "error": f"API error: {response.status_code}"
-                    }
-
-                data = response.json()
-                voices = data.get("voices", [])
-
-                # Türkçe sesleri filtrele (varsa)
-                # ElevenLabs'da dil filtresi labels içinde olabilir
-                turkish_voices = []
-                for voice in voices:
-                    labels = voice.get("labels", {})
-                    # Multilingual modeller tüm dilleri destekler
-                    turkish_voices.append({
-                        "voice_id": voice.get("voice_id"),
-                        "name": voice.get("name"),
-                        "labels": labels,
-                        "preview_url": voice.get("preview_url")
-                    })
+            client = get_http_client("elevenlabs")
+            response = await client.get(url, headers=headers)
 
+            if response.status_code != 200:
                 return {
-                    "success": True,
-                    "voices": turkish_voices,
-                    "count": len(turkish_voices)
+                    "success": False,
+                    "error": f"API error: {response.status_code}"
                 }
 
+            data = response.json()
+            voices = data.get("voices", [])
+
+            # Türkçe sesleri filtrele (varsa)
+            # ElevenLabs'da dil filtresi labels içinde olabilir
+            turkish_voices = []
+            for voice in voices:
+                labels = voice.get("labels", {})
+                # Multilingual modeller tüm dilleri destekler
+                turkish_voices.append({
+                    "voice_id": voice.get("voice_id"),
+                    "name": voice.get("name"),
+                    "labels": labels,
+                    "preview_url": voice.get("preview_url")
+                })
+
+            return {
+                "success": True,
+                "voices": turkish_voices,
+                "count": len(turkish_voices)
+            }
+
         except Exception as e:
             logger.error(f"[TTS] Get voices error: {e}")
             return {
@@ -373,28 +459,28 @@ class ElevenLabsHelper:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=headers)
+            client = get_http_client("elevenlabs")
+            response = await client.get(url, headers=headers)
 
-                if response.status_code != 200:
-                    return {
-                        "success": False,
-                        "error": f"API error: {response.status_code}"
-                    }
+            if response.status_code != 200:
+                return {
+                    "success": False,
+                    "error": f"API error: {response.status_code}"
+                }
 
-                data = response.json()
+            data = response.json()
 
-                char_count = data.get("character_count", 0)
-                char_limit = data.get("character_limit", 10000)
+            char_count = data.get("character_count", 0)
+            char_limit = data.get("character_limit", 10000)
 
-                return {
-                    "success": True,
-                    "character_count": char_count,
-                    "character_limit": char_limit,
-                    "remaining": char_limit - char_count,
-                    "tier": data.get("tier", "unknown"),
-                    "next_reset": data.get("next_character_count_reset_unix")
-                }
+            return {
+                "success": True,
+                "character_count": char_count,
+                "character_limit": char_limit,
+                "remaining": char_limit - char_count,
+                "tier": data.get("tier", "unknown"),
+                "next_reset": data.get("next_character_count_reset_unix")
+            }
 
         except Exception as e:
             logger.error(f"[TTS] Get usage error: {e}")
@@ -404,24 +490,93 @@ class ElevenLabsHelper:
             }
 
 
+async def generate_speech_cached(
+    text: str,
+    voice_id: Optional[str] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """
+    Kalıcı TTS cache'i üzerinden ses üret (app/tts/cache.py).
+
+    Hit'te ElevenLabs'e istek atılmaz; cache'teki ses yeni bir
+    outputs/audio dosyasına kopyalanır. Miss'te üretilen sesin süresi
+    (frame header'larından, gerekirse ffprobe ile) cache'e yazılır. Her iki
+    durumda da sonuçta ölçülen süre "measured_duration" olarak döner.
+
+    Returns:
+        generate_speech sonucu + "cached": bool, "measured_duration": float | None
+    """
+    cache = get_tts_cache() if use_cache else None
+    if cache is None:
+        return await ElevenLabsHelper.generate_speech(text=text, voice_id=voice_id)
+
+    voice_id = voice_id or ElevenLabsHelper._get_voice_id()
+    # generate_speech'in API'ye gönderdiği metinle aynı (kırpma + telaffuz)
+    cache_key = ElevenLabsHelper.get_cache_key(fix_pronunciation(text[:5000]), voice_id)
+
+    ElevenLabsHelper._ensure_output_dir()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_path = AUDIO_OUTPUT_DIR / f"tts_{timestamp}_{voice_id[:8]}_{uuid.uuid4().hex[:6]}.mp3"
+    try:
+        entry = await cache.restore(cache_key, output_path)
+    except Exception as e:
+        logger.warning(f"[TTS] Cache read failed: {e}")
+        entry = None
+
+    if entry is not None:
+        logger.info(f"[TTS] Cache hit: {output_path} ({entry['duration'] or 0:.1f}s)")
+        result = {
+            "success": True,
+            "audio_path": entry["path"],
+            "duration_seconds": ElevenLabsHelper.estimate_duration(text),
+            "measured_duration": entry["duration"],
+            "character_count": min(len(text), 5000),
+            "voice_id": voice_id,
+            "file_size_bytes": entry["size_bytes"],
+            "cached": True
+        }
+        return result
+
+    result = await ElevenLabsHelper.generate_speech(text=text, voice_id=voice_id)
+    if not result.get("success"):
+        return result
+
+    measured_duration = result.get("measured_duration")
+    if not measured_duration:
+        from app.media import probe_duration
+        measured_duration = await probe_duration(result["audio_path"])
+    try:
+        await cache.aput(
+            cache_key, result["audio_path"], measured_duration,
+            voice_id=voice_id, character_count=result.get("character_count")
+        )
+    except Exception as e:
+        logger.warning(f"[TTS] Cache write failed: {e}")
+
+    return {**result, "measured_duration": measured_duration, "cached": False}
+
+
 async def generate_speech_with_retry(
     text: str,
     voice_id: Optional[str] = None,
     max_retries: int = 3,
-    retry_delay: float = 2.0
+    retry_delay: float = 2.0,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     Retry mekanizması ile TTS üret.
 
-    Rate limit durumunda exponential backoff uygular.
+    Rate limit durumunda exponential backoff uygular. use_cache=True ise
+    aynı metin + ses için kalıcı TTS cache'i kullanılır (generate_speech_cached).
     """
     last_error = None
 
     for attempt in range(max_retries):
         try:
-            result = await ElevenLabsHelper.generate_speech(
+            result = await generate_speech_cached(
                 text=text,
-                voice_id=voice_id
+                voice_id=voice_id,
+                use_cache=use_cache
             )
 
             if result.get("success"):
@@ -462,13 +617,18 @@ async def generate_dialog_audio(
     dialog_lines: list,
     male_voice_id: Optional[str] = None,
     female_voice_id: Optional[str] = None,
-    pause_between_ms: int = 300
+    pause_between_ms: int = 300,
+    use_cache: bool = True,
+    max_concurrency: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Generate multi-voice dialog audio for conversational reels.
 
-    Each line is generated with the appropriate voice and concatenated
-    with pauses between lines using pydub.
+    Lines are synthesised concurrently (up to max_concurrency requests in
+    flight, rate limits retried with backoff), then stitched in dialog order
+    with pauses between lines by a single streaming ffmpeg concat, so no
+    decoded segment is held in memory. Lines go through the persistent TTS
+    cache, so repeated lines and re-runs of the same dialog skip the API.
 
     Args:
         dialog_lines: List of dialog items, each containing:
@@ -477,6 +637,8 @@ async def generate_dialog_audio(
         male_voice_id: ElevenLabs voice ID for male (env default if None)
         female_voice_id: ElevenLabs voice ID for female (config default if None)
         pause_between_ms: Silence gap between lines (default 300ms)
+        use_cache: Use the persistent TTS cache for each line
+        max_concurrency: Max concurrent line requests (settings.tts_dialog_concurrency if None)
 
     Returns:
         {
@@ -496,14 +658,7 @@ async def generate_dialog_audio(
             {"speaker": "female", "text": "Yüzde kırk tasarruf sağlar."}
         ]
     """
-    try:
-        from pydub import AudioSegment
-    except ImportError:
-        logger.error("[TTS] pydub not installed. Run: pip install pydub")
-        return {
-            "success": False,
-            "error": "pydub not installed. Run: pip install pydub"
-        }
+    from app.media import concat_audio, probe_duration
 
     ElevenLabsHelper._ensure_output_dir()
 
@@ -518,34 +673,46 @@ async def generate_dialog_audio(
     if not female_voice_id:
         return {"success": False, "error": "Female voice ID not configured"}
 
-    logger.info(f"[TTS] Generating dialog audio: {len(dialog_lines)} lines")
+    concurrency = max(1, max_concurrency or settings.tts_dialog_concurrency)
+    logger.info(f"[TTS] Generating dialog audio: {len(dialog_lines)} lines (concurrency {concurrency})")
     logger.info(f"[TTS] Male voice: {male_voice_id[:8]}..., Female voice: {female_voice_id[:8]}...")
 
-    audio_segments = []
-    temp_audio_paths = []
-    combined_audio = AudioSegment.empty()
-    current_position_ms = 0
-
-    try:
-        for i, line in enumerate(dialog_lines):
-            speaker = line.get("speaker", "male")
-            text = line.get("text", "")
+    # (line index, speaker, text) - empty lines are skipped
+    jobs = []
+    for i, line in enumerate(dialog_lines):
+        text = line.get("text", "")
+        if not text.strip():
+            logger.warning(f"[TTS] Skipping empty line {i}")
+            continue
+        jobs.append((i, line.get("speaker", "male"), text))
 
-            if not text.strip():
-                logger.warning(f"[TTS] Skipping empty line {i}")
-                continue
+    if not jobs:
+        return {
+            "success": False,
+            "error": "No audio generated (all lines were empty)"
+        }
 
-            # Select voice ID based on speaker
-            voice_id = male_voice_id if speaker == "male" else female_voice_id
+    semaphore = asyncio.Semaphore(concurrency)
 
+    async def synthesize_line(i: int, speaker: str, text: str) -> Dict[str, Any]:
+        # Select voice ID based on speaker
+        voice_id = male_voice_id if speaker == "male" else female_voice_id
+        async with semaphore:
             logger.info(f"[TTS] Line {i+1}/{len(dialog_lines)}: {speaker} - '{text[:30]}...'")
-
-            # Generate TTS for this line
-            tts_result = await ElevenLabsHelper.generate_speech(
+            tts_result = await generate_speech_with_retry(
                 text=text,
-                voice_id=voice_id
+                voice_id=voice_id,
+                use_cache=use_cache
             )
+        if tts_result.get("success") and not tts_result.get("measured_duration"):
+            tts_result["measured_duration"] = await probe_duration(tts_result["audio_path"])
+        return tts_result
+
+    tasks = [asyncio.create_task(synthesize_line(*job)) for job in jobs]
+    try:
+        results = await asyncio.gather(*tasks)
 
+        for (i, _speaker, _text), tts_result in zip(jobs, results):
             if not tts_result.get("success"):
                 error_msg = tts_result.get("error", "Unknown TTS error")
                 logger.error(f"[TTS] Failed to generate line {i+1}: {error_msg}")
@@ -553,48 +720,45 @@ async def generate_dialog_audio(
                     "success": False,
                     "error": f"TTS failed for line {i+1}: {error_msg}"
                 }
+            if not tts_result.get("measured_duration"):
+                return {
+                    "success": False,
+                    "error": f"TTS failed for line {i+1}: audio duration could not be measured"
+                }
 
-            audio_path = tts_result.get("audio_path")
-            temp_audio_paths.append(audio_path)
-
-            # Load audio segment
-            segment = AudioSegment.from_mp3(audio_path)
-            duration_ms = len(segment)
-
-            # Record segment timing
+        # Record segment timing in dialog order
+        audio_segments = []
+        current_position_ms = 0
+        for n, ((_i, speaker, text), tts_result) in enumerate(zip(jobs, results)):
+            if n > 0:
+                current_position_ms += pause_between_ms
+            duration_ms = int(round(tts_result["measured_duration"] * 1000))
             audio_segments.append({
                 "speaker": speaker,
                 "start_ms": current_position_ms,
                 "end_ms": current_position_ms + duration_ms,
                 "duration_ms": duration_ms,
                 "text": text,
-                "temp_audio_path": audio_path
+                "temp_audio_path": tts_result["audio_path"]
             })
-
-            # Add to combined audio
-            combined_audio += segment
             current_position_ms += duration_ms
 
-            # Add pause between lines (except after last line)
-            if i < len(dialog_lines) - 1:
-                silence = AudioSegment.silent(duration=pause_between_ms)
-                combined_audio += silence
-                current_position_ms += pause_between_ms
-
-        if len(combined_audio) == 0:
-            return {
-                "success": False,
-                "error": "No audio generated (all lines were empty)"
-            }
-
         # Export combined audio
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_filename = f"dialog_{timestamp}.mp3"
         output_path = AUDIO_OUTPUT_DIR / output_filename
 
-        combined_audio.export(str(output_path), format="mp3")
+        if not await concat_audio(
+            [segment["temp_audio_path"] for segment in audio_segments],
+            str(output_path),
+            gap_ms=pause_between_ms
+        ):
+            return {
+                "success": False,
+                "error": "Dialog audio concat failed"
+            }
 
-        total_duration = len(combined_audio) / 1000.0  # Convert ms to seconds
+        total_duration = await probe_duration(str(output_path)) or current_position_ms / 1000.0
 
         logger.info(f"[TTS] Dialog audio generated: {output_path}")
         logger.info(f"[TTS] Total duration: {total_duration:.2f}s, Lines: {len(audio_segments)}")
@@ -613,3 +777,6 @@ async def generate_dialog_audio(
             "success": False,
             "error": str(e)
         }
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -6,12 +6,21 @@ Text-to-video veya image-to-video destekli.
 import os
 import logging
 import httpx
-import asyncio
 import uuid
 from typing import Dict, Any, Optional
 from datetime import datetime
 
 from app.config import settings
+from app.jobs import (
+    JobFailed,
+    JobTimeout,
+    PollResult,
+    Submission,
+    register_canceller,
+    register_poller,
+    run_remote_job,
+)
+from app.net import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +28,40 @@ logger = logging.getLogger(__name__)
 FAL_API_KEY = settings.fal_api_key or os.getenv("FAL_API_KEY", "")
 
 
+async def poll_fal_queue(client: httpx.AsyncClient, request_id: str, poll_data: Dict[str, Any]) -> PollResult:
+    """
+    fal.ai queue isteğinin durumu - job tracker poller'ı (Kling/Hailuo/Wan, lipsync).
+
+    poll_data: {"status_url": ..., "result_url": ...} (submit yanıtından)
+    """
+    headers = {"Authorization": f"Key {FAL_API_KEY}"}
+
+    status_response = await client.get(poll_data["status_url"], headers=headers)
+    status_response.raise_for_status()
+    status = status_response.json()
+    current_status = status.get("status", "unknown")
+
+    if current_status == "COMPLETED":
+        result_response = await client.get(poll_data["result_url"], headers=headers)
+        result_response.raise_for_status()
+        return PollResult.completed(result_response.json())
+    if current_status in ["FAILED", "CANCELLED"]:
+        return PollResult.failed(status.get("error", "Bilinmeyen hata"))
+    # IN_QUEUE veya IN_PROGRESS
+    return PollResult.pending()
+
+
+async def cancel_fal_queue(client: httpx.AsyncClient, request_id: str, poll_data: Dict[str, Any]):
+    """PUT .../requests/{request_id}/cancel - job tracker canceller'ı (kuyruktaki/çalışan iş)"""
+    cancel_url = poll_data["status_url"].rsplit("/status", 1)[0] + "/cancel"
+    response = await client.put(cancel_url, headers={"Authorization": f"Key {FAL_API_KEY}"})
+    response.raise_for_status()
+
+
+register_poller("fal", poll_fal_queue, default_interval=5.0)
+register_canceller("fal", cancel_fal_queue)
+
+
 class FalVideoGenerator:
     """fal.ai uzerinden Kling AI video uretimi."""
 
@@ -197,19 +240,20 @@ class FalVideoGenerator:
             "Content-Type": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=600.0) as client:
+        async def submit() -> Submission:
+            client = get_http_client("fal")
             # Submit request
             submit_url = f"{FalVideoGenerator.BASE_URL}/{endpoint}"
             logger.debug(f"Submitting to: {submit_url}")
 
-            response = await client.post(submit_url, json=request_body, headers=headers)
+            response = await client.post(submit_url, json=request_body, headers=headers, timeout=600.0)
             response.raise_for_status()
 
             result = response.json()
 
             # Eger sonuc hemen geldiyse (sync response)
             if "video" in result:
-                return result
+                return Submission(result=result)
 
             # Queue response - poll for result
             request_id = result.get("request_id")
@@ -230,32 +274,23 @@ class FalVideoGenerator:
 
             logger.debug(f"Status URL: {status_url}")
             logger.debug(f"Result URL: {result_url}")
+            return Submission(
+                remote_id=request_id,
+                poll_data={"status_url": status_url, "result_url": result_url}
+            )
 
-            max_attempts = 360  # 30 dakika (5 saniye aralikli)
-            for attempt in range(max_attempts):
-                await asyncio.sleep(5)
-
-                # Check status
-                status_response = await client.get(status_url, headers=headers)
-                status_response.raise_for_status()
-                status = status_response.json()
-
-                current_status = status.get("status", "unknown")
-                logger.debug(f"Video durumu [{attempt+1}/{max_attempts}]: {current_status}")
-
-                if current_status == "COMPLETED":
-                    # Get result
-                    result_response = await client.get(result_url, headers=headers)
-                    result_response.raise_for_status()
-                    return result_response.json()
-
-                elif current_status in ["FAILED", "CANCELLED"]:
-                    error_msg = status.get("error", "Bilinmeyen hata")
-                    raise Exception(f"Video uretimi basarisiz: {error_msg}")
-
-                # IN_QUEUE veya IN_PROGRESS - devam et
-
-            raise Exception("Video uretimi zaman asimina ugradi (15 dakika)")
+        try:
+            return await run_remote_job(
+                provider="fal",
+                label=endpoint,
+                submit=submit,
+                key_data=request_body,
+                timeout=1800  # 30 dakika
+            )
+        except JobTimeout:
+            raise Exception("Video uretimi zaman asimina ugradi (30 dakika)")
+        except JobFailed as e:
+            raise Exception(f"Video uretimi basarisiz: {e}")
 
     @staticmethod
     async def _download_video(video_url: str) -> str:
@@ -266,12 +301,12 @@ class FalVideoGenerator:
         unique_suffix = uuid.uuid4().hex[:6]
         output_path = settings.outputs_dir / f"kling_{timestamp}_{unique_suffix}.mp4"
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.get(video_url)
-            response.raise_for_status()
+        client = get_http_client("fal")
+        response = await client.get(video_url, timeout=120.0, follow_redirects=True)
+        response.raise_for_status()
 
-            with open(output_path, "wb") as f:
-                f.write(response.content)
+        with open(output_path, "wb") as f:
+            f.write(response.content)
 
         file_size_mb = output_path.stat().st_size / (1024 * 1024)
         logger.info(f"Video indirildi: {output_path} ({file_size_mb:.2f} MB)")
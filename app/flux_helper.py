@@ -3,13 +3,14 @@ FLUX.2 Pro Image Generation Helper
 Black Forest Labs API ile görsel üretimi
 """
 
-import asyncio
-import aiohttp
+import httpx
 import os
 from datetime import datetime
 from typing import Optional, Dict, Any
 
 from app.config import settings
+from app.jobs import JobFailed, JobTimeout, PollResult, Submission, register_poller, run_remote_job
+from app.net import get_http_client
 from app.utils.logger import get_logger
 
 logger = get_logger("flux")
@@ -19,6 +20,32 @@ BFL_API_BASE = "https://api.bfl.ai/v1"
 FLUX_API_KEY = settings.flux_api_key or os.getenv("FLUX_API_KEY")
 
 
+async def _poll_flux(client: httpx.AsyncClient, task_id: str, poll_data: Dict[str, Any]) -> PollResult:
+    """GET get_result?id= - job tracker poller'ı (tamamlanınca BFL yanıtının tamamı döner)"""
+    response = await client.get(
+        f"{BFL_API_BASE}/get_result",
+        params={"id": task_id},
+        headers={"x-key": os.getenv("BFL_API_KEY", "")}
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Status check failed: {response.status_code}")
+
+    data = response.json()
+    status = data.get("status")
+    if status == "Ready":
+        return PollResult.completed(data)
+    if status == "Error":
+        return PollResult.failed(data.get("details", "Unknown error"))
+    if status == "Content Moderated":
+        return PollResult.failed("İçerik moderasyon filtresi tarafından engellendi")
+    if status == "Request Moderated":
+        return PollResult.failed("İstek moderasyon filtresi tarafından engellendi")
+    return PollResult.pending(progress=data.get("progress"))
+
+
+register_poller("flux", _poll_flux, default_interval=2.0, http_service="bfl")
+
+
 async def generate_image_flux(
     prompt: str,
     output_path: Optional[str] = None,
@@ -73,91 +100,77 @@ async def generate_image_flux(
     print(f"   Prompt: {prompt[:100]}...")
 
     start_time = datetime.now()
+    cost = None
 
     try:
-        async with aiohttp.ClientSession() as session:
-            # 1. Görsel üretimini başlat
+        client = get_http_client("bfl")
+
+        # 1. Görsel üretimini başlat
+        async def submit() -> Submission:
+            nonlocal cost
             generate_url = f"{BFL_API_BASE}/flux-2-pro"
 
-            async with session.post(generate_url, headers=headers, json=payload, timeout=60) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    return {"success": False, "error": f"API Error {resp.status}: {error_text[:200]}"}
+            resp = await client.post(generate_url, headers=headers, json=payload, timeout=60)
+            if resp.status_code != 200:
+                raise JobFailed(f"API Error {resp.status_code}: {resp.text[:200]}")
 
-                result = await resp.json()
-                task_id = result.get("id")
-                polling_url = result.get("polling_url")
-                cost = result.get("cost")
+            result = resp.json()
+            task_id = result.get("id")
+            cost = result.get("cost")
 
-                if not task_id:
-                    return {"success": False, "error": "No task ID returned"}
+            if not task_id:
+                raise JobFailed("No task ID returned")
 
             print(f"   Task ID: {task_id}")
             if cost:
                 print(f"   Maliyet: {cost} credits (${cost * 0.01:.3f})")
+            return Submission(remote_id=task_id)
+
+        # 2. Polling - job tracker tamamlanana kadar bekler
+        try:
+            poll_data = await run_remote_job(
+                provider="flux",
+                label="flux-2-pro",
+                submit=submit,
+                key_data=payload,
+                timeout=max_wait_seconds
+            )
+        except JobTimeout:
+            return {"success": False, "error": f"Timeout after {max_wait_seconds}s"}
+        except JobFailed as e:
+            return {"success": False, "error": str(e)}
+
+        elapsed = (datetime.now() - start_time).total_seconds()
+        print(f"   ✅ Görsel hazır! ({elapsed:.1f}s)")
+
+        # 3. Görseli indir
+        image_url = poll_data.get("result", {}).get("sample")
+        if not image_url:
+            return {"success": False, "error": "No image URL in result"}
+
+        dl_resp = await client.get(image_url, timeout=60, follow_redirects=True)
+        if dl_resp.status_code != 200:
+            return {"success": False, "error": f"Download failed: {dl_resp.status_code}"}
+
+        with open(output_path, "wb") as f:
+            f.write(dl_resp.content)
+
+        total_time = (datetime.now() - start_time).total_seconds()
+        file_size = os.path.getsize(output_path)
+
+        print(f"   📁 Kaydedildi: {output_path}")
+        print(f"   📊 Boyut: {file_size/1024:.1f} KB")
+        print(f"   ⏱️ Toplam süre: {total_time:.1f}s")
+
+        return {
+            "success": True,
+            "image_path": output_path,
+            "duration": total_time,
+            "file_size": file_size,
+            "cost": cost
+        }
 
-            # 2. Polling - tamamlanana kadar bekle
-            result_url = f"{BFL_API_BASE}/get_result?id={task_id}"
-
-            while True:
-                elapsed = (datetime.now() - start_time).total_seconds()
-                if elapsed > max_wait_seconds:
-                    return {"success": False, "error": f"Timeout after {max_wait_seconds}s"}
-
-                await asyncio.sleep(2)  # 2 saniye bekle
-
-                async with session.get(result_url, headers=headers, timeout=30) as poll_resp:
-                    if poll_resp.status != 200:
-                        continue
-
-                    poll_data = await poll_resp.json()
-                    status = poll_data.get("status")
-
-                    if status == "Ready":
-                        print(f"   ✅ Görsel hazır! ({elapsed:.1f}s)")
-                        break
-                    elif status == "Error":
-                        return {"success": False, "error": poll_data.get("details", "Unknown error")}
-                    elif status == "Content Moderated":
-                        return {"success": False, "error": "İçerik moderasyon filtresi tarafından engellendi"}
-                    elif status == "Request Moderated":
-                        return {"success": False, "error": "İstek moderasyon filtresi tarafından engellendi"}
-
-                    # İlerleme göster
-                    progress = poll_data.get("progress")
-                    if progress:
-                        print(f"   ⏳ İşleniyor... {progress}% ({elapsed:.0f}s)")
-
-            # 3. Görseli indir
-            image_url = poll_data.get("result", {}).get("sample")
-            if not image_url:
-                return {"success": False, "error": "No image URL in result"}
-
-            async with session.get(image_url, timeout=60) as dl_resp:
-                if dl_resp.status != 200:
-                    return {"success": False, "error": f"Download failed: {dl_resp.status}"}
-
-                image_data = await dl_resp.read()
-
-                with open(output_path, "wb") as f:
-                    f.write(image_data)
-
-            total_time = (datetime.now() - start_time).total_seconds()
-            file_size = os.path.getsize(output_path)
-
-            print(f"   📁 Kaydedildi: {output_path}")
-            print(f"   📊 Boyut: {file_size/1024:.1f} KB")
-            print(f"   ⏱️ Toplam süre: {total_time:.1f}s")
-
-            return {
-                "success": True,
-                "image_path": output_path,
-                "duration": total_time,
-                "file_size": file_size,
-                "cost": cost
-            }
-
-    except asyncio.TimeoutError:
+    except httpx.TimeoutException:
         return {"success": False, "error": "Request timeout"}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -174,12 +187,13 @@ async def get_credits() -> Dict[str, Any]:
     headers = {"x-key": api_key}
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{BFL_API_BASE}/credits", headers=headers, timeout=10) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    return {"success": True, "credits": data.get("credits", 0)}
-                else:
-                    return {"success": False, "error": f"API Error {resp.status}"}
+        resp = await get_http_client("bfl").get(
+            f"{BFL_API_BASE}/credits", headers=headers, timeout=10, follow_redirects=True
+        )
+        if resp.status_code == 200:
+            data = resp.json()
+            return {"success": True, "credits": data.get("credits", 0)}
+        else:
+            return {"success": False, "error": f"API Error {resp.status_code}"}
     except Exception as e:
         return {"success": False, "error": str(e)}
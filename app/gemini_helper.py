@@ -2,13 +2,13 @@
 Olivenet Social Media Bot - Gemini 2.5 Flash Image Helper
 Generates realistic AI images using Gemini's image generation model.
 """
-import aiohttp
-import asyncio
+import httpx
 import base64
 import os
 from datetime import datetime
 
 from .config import settings
+from .net import get_http_client
 from .utils.logger import get_logger
 
 logger = get_logger("gemini")
@@ -46,13 +46,11 @@ async def generate_realistic_image(topic: str, post_text: str, output_dir: str =
             }
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=120)) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    raise Exception(f"Gemini API hatasi ({resp.status}): {error_text[:200]}")
+        resp = await get_http_client("gemini").post(url, json=payload, timeout=120)
+        if resp.status_code != 200:
+            raise Exception(f"Gemini API hatasi ({resp.status_code}): {resp.text[:200]}")
 
-                data = await resp.json()
+        data = resp.json()
 
         # Extract image from response
         candidates = data.get("candidates", [])
@@ -86,7 +84,7 @@ async def generate_realistic_image(topic: str, post_text: str, output_dir: str =
         print(f"Gorsel kaydedildi: {filepath}")
         return filepath
 
-    except asyncio.TimeoutError:
+    except httpx.TimeoutException:
         raise Exception("Gemini zaman asimi (120 saniye)")
     except Exception as e:
         logger.error(f"Gemini error: {e}")
@@ -155,19 +153,17 @@ async def test_gemini_connection() -> dict:
             }
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=60)) as resp:
-                if resp.status == 200:
-                    return {
-                        "success": True,
-                        "message": "Gemini API baglantisi basarili"
-                    }
-                else:
-                    error = await resp.text()
-                    return {
-                        "success": False,
-                        "message": f"Gemini API hatasi ({resp.status}): {error[:100]}"
-                    }
+        resp = await get_http_client("gemini").post(url, json=payload, timeout=60)
+        if resp.status_code == 200:
+            return {
+                "success": True,
+                "message": "Gemini API baglantisi basarili"
+            }
+        else:
+            return {
+                "success": False,
+                "message": f"Gemini API hatasi ({resp.status_code}): {resp.text[:100]}"
+            }
     except Exception as e:
         return {
             "success": False,
@@ -206,13 +202,11 @@ async def generate_realistic_image_with_feedback(topic: str, post_text: str, fee
             }
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=120)) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    raise Exception(f"Gemini API hatasi ({resp.status}): {error_text[:200]}")
+        resp = await get_http_client("gemini").post(url, json=payload, timeout=120)
+        if resp.status_code != 200:
+            raise Exception(f"Gemini API hatasi ({resp.status_code}): {resp.text[:200]}")
 
-                data = await resp.json()
+        data = resp.json()
 
         # Extract image from response
         candidates = data.get("candidates", [])
@@ -246,7 +240,7 @@ async def generate_realistic_image_with_feedback(topic: str, post_text: str, fee
         print(f"Gorsel kaydedildi: {filepath}")
         return filepath
 
-    except asyncio.TimeoutError:
+    except httpx.TimeoutException:
         raise Exception("Gemini zaman asimi (120 saniye)")
     except Exception as e:
         logger.error(f"Gemini error: {e}")
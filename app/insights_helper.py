@@ -4,11 +4,11 @@ Instagram Graph API ile çalışır (graph.instagram.com v21.0)
 """
 
 import os
-import httpx
 import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 
+from app.net import get_http_client
 from app.utils.logger import get_logger
 
 logger = get_logger("insights")
@@ -24,29 +24,29 @@ async def get_instagram_account_info() -> Dict[str, Any]:
     if not INSTAGRAM_ACCESS_TOKEN or not INSTAGRAM_USER_ID:
         return {"success": False, "error": "Instagram credentials not set"}
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        try:
-            response = await client.get(
-                f"{GRAPH_API_URL}/{INSTAGRAM_USER_ID}",
-                params={
-                    "fields": "id,username,media_count,followers_count",
-                    "access_token": INSTAGRAM_ACCESS_TOKEN
-                }
-            )
+    client = get_http_client("instagram")
+    try:
+        response = await client.get(
+            f"{GRAPH_API_URL}/{INSTAGRAM_USER_ID}",
+            params={
+                "fields": "id,username,media_count,followers_count",
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            }
+        )
 
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "success": True,
-                    "id": data.get("id"),
-                    "username": data.get("username"),
-                    "followers": data.get("followers_count", 0),
-                    "posts": data.get("media_count", 0)
-                }
-            else:
-                return {"success": False, "error": response.text[:200]}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                "success": True,
+                "id": data.get("id"),
+                "username": data.get("username"),
+                "followers": data.get("followers_count", 0),
+                "posts": data.get("media_count", 0)
+            }
+        else:
+            return {"success": False, "error": response.text[:200]}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
 
 async def get_instagram_media_type(media_id: str) -> Dict[str, Any]:
@@ -65,32 +65,32 @@ async def get_instagram_media_type(media_id: str) -> Dict[str, Any]:
     if not INSTAGRAM_ACCESS_TOKEN:
         return {"success": False, "error": "Instagram token not set"}
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        try:
-            response = await client.get(
-                f"{GRAPH_API_URL}/{media_id}",
-                params={
-                    "fields": "media_type,media_product_type",
-                    "access_token": INSTAGRAM_ACCESS_TOKEN
-                }
-            )
+    client = get_http_client("instagram")
+    try:
+        response = await client.get(
+            f"{GRAPH_API_URL}/{media_id}",
+            params={
+                "fields": "media_type,media_product_type",
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            }
+        )
 
-            if response.status_code == 200:
-                data = response.json()
-                media_type = data.get("media_type", "")
-                product_type = data.get("media_product_type", "")
-
-                return {
-                    "success": True,
-                    "media_id": media_id,
-                    "media_type": media_type,
-                    "media_product_type": product_type,
-                    "is_reels": product_type == "REELS" or (media_type == "VIDEO" and product_type != "STORY")
-                }
-            else:
-                return {"success": False, "error": response.text[:200]}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        if response.status_code == 200:
+            data = response.json()
+            media_type = data.get("media_type", "")
+            product_type = data.get("media_product_type", "")
+
+            return {
+                "success": True,
+                "media_id": media_id,
+                "media_type": media_type,
+                "media_product_type": product_type,
+                "is_reels": product_type == "REELS" or (media_type == "VIDEO" and product_type != "STORY")
+            }
+        else:
+            return {"success": False, "error": response.text[:200]}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
 
 async def get_instagram_reels_insights(media_id: str) -> Dict[str, Any]:
@@ -100,47 +100,78 @@ async def get_instagram_reels_insights(media_id: str) -> Dict[str, Any]:
     if not INSTAGRAM_ACCESS_TOKEN:
         return {"success": False, "error": "Instagram token not set"}
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        try:
-            result = {
-                "success": True,
-                "media_id": media_id,
-                "media_type": "REELS",
-                "plays": 0,
-                "reach": 0,
-                "saves": 0,
-                "shares": 0,
-                "comments": 0,
-                "likes": 0,
-                "total_interactions": 0,
-                "avg_watch_time": 0.0,  # Reels ortalama izleme süresi (ms)
-                "engagement_rate": 0.0
-            }
-
-            # Reels metrikleri (2025 güncel - impressions deprecated)
-            reels_metrics = [
-                "plays", "reach", "saved", "shares", "comments", "likes",
-                "total_interactions", "ig_reels_avg_watch_time"
-            ]
+    client = get_http_client("instagram")
+    try:
+        result = {
+            "success": True,
+            "media_id": media_id,
+            "media_type": "REELS",
+            "plays": 0,
+            "reach": 0,
+            "saves": 0,
+            "shares": 0,
+            "comments": 0,
+            "likes": 0,
+            "total_interactions": 0,
+            "avg_watch_time": 0.0,  # Reels ortalama izleme süresi (ms)
+            "engagement_rate": 0.0
+        }
 
-            insights_response = await client.get(
+        # Reels metrikleri (2025 güncel - impressions deprecated)
+        reels_metrics = [
+            "plays", "reach", "saved", "shares", "comments", "likes",
+            "total_interactions", "ig_reels_avg_watch_time"
+        ]
+
+        insights_response = await client.get(
+            f"{GRAPH_API_URL}/{media_id}/insights",
+            params={
+                "metric": ",".join(reels_metrics),
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            }
+        )
+
+        if insights_response.status_code == 200:
+            data = insights_response.json().get("data", [])
+            for metric in data:
+                name = metric.get("name")
+                values = metric.get("values", [])
+                value = values[0].get("value", 0) if values else 0
+
+                if name == "plays":
+                    result["plays"] = value
+                elif name == "reach":
+                    result["reach"] = value
+                elif name == "saved":
+                    result["saves"] = value
+                elif name == "shares":
+                    result["shares"] = value
+                elif name == "comments":
+                    result["comments"] = value
+                elif name == "likes":
+                    result["likes"] = value
+                elif name == "total_interactions":
+                    result["total_interactions"] = value
+                elif name == "ig_reels_avg_watch_time":
+                    result["avg_watch_time"] = value  # milliseconds
+        else:
+            # Fallback: temel metrikler
+            fallback_response = await client.get(
                 f"{GRAPH_API_URL}/{media_id}/insights",
                 params={
-                    "metric": ",".join(reels_metrics),
+                    "metric": "reach,saved,shares,comments,likes",
                     "access_token": INSTAGRAM_ACCESS_TOKEN
                 }
             )
 
-            if insights_response.status_code == 200:
-                data = insights_response.json().get("data", [])
+            if fallback_response.status_code == 200:
+                data = fallback_response.json().get("data", [])
                 for metric in data:
                     name = metric.get("name")
                     values = metric.get("values", [])
                     value = values[0].get("value", 0) if values else 0
 
-                    if name == "plays":
-                        result["plays"] = value
-                    elif name == "reach":
+                    if name == "reach":
                         result["reach"] = value
                     elif name == "saved":
                         result["saves"] = value
@@ -150,75 +181,44 @@ async def get_instagram_reels_insights(media_id: str) -> Dict[str, Any]:
                         result["comments"] = value
                     elif name == "likes":
                         result["likes"] = value
-                    elif name == "total_interactions":
-                        result["total_interactions"] = value
-                    elif name == "ig_reels_avg_watch_time":
-                        result["avg_watch_time"] = value  # milliseconds
-            else:
-                # Fallback: temel metrikler
-                fallback_response = await client.get(
-                    f"{GRAPH_API_URL}/{media_id}/insights",
-                    params={
-                        "metric": "reach,saved,shares,comments,likes",
-                        "access_token": INSTAGRAM_ACCESS_TOKEN
-                    }
-                )
-
-                if fallback_response.status_code == 200:
-                    data = fallback_response.json().get("data", [])
-                    for metric in data:
-                        name = metric.get("name")
-                        values = metric.get("values", [])
-                        value = values[0].get("value", 0) if values else 0
-
-                        if name == "reach":
-                            result["reach"] = value
-                        elif name == "saved":
-                            result["saves"] = value
-                        elif name == "shares":
-                            result["shares"] = value
-                        elif name == "comments":
-                            result["comments"] = value
-                        elif name == "likes":
-                            result["likes"] = value
-
-            # Temel bilgiler
-            try:
-                basic_response = await client.get(
-                    f"{GRAPH_API_URL}/{media_id}",
-                    params={
-                        "fields": "like_count,comments_count,media_type,media_product_type,caption,timestamp",
-                        "access_token": INSTAGRAM_ACCESS_TOKEN
-                    }
-                )
-
-                if basic_response.status_code == 200:
-                    basic_data = basic_response.json()
-                    if result["likes"] == 0:
-                        result["likes"] = basic_data.get("like_count", 0)
-                    if result["comments"] == 0:
-                        result["comments"] = basic_data.get("comments_count", 0)
-                    result["media_type"] = basic_data.get("media_product_type", "REELS")
-                    result["caption"] = (basic_data.get("caption") or "")[:100]
-                    result["timestamp"] = basic_data.get("timestamp")
-            except Exception as e:
-                print(f"[IG_REELS] Basic info warning for {media_id}: {e}")
 
-            # Engagement rate - reach yeterli değilse 0 döndür (anlamsız %700+ değerler önlenir)
-            reach = result["reach"]
-            total_engagement = result["likes"] + result["comments"] + result["saves"] + result["shares"]
-            if reach >= 10:  # Minimum 10 reach gerekli anlamlı engagement için
-                result["engagement_rate"] = round((total_engagement / reach) * 100, 2)
-            else:
-                result["engagement_rate"] = 0.0  # Yetersiz veri
+        # Temel bilgiler
+        try:
+            basic_response = await client.get(
+                f"{GRAPH_API_URL}/{media_id}",
+                params={
+                    "fields": "like_count,comments_count,media_type,media_product_type,caption,timestamp",
+                    "access_token": INSTAGRAM_ACCESS_TOKEN
+                }
+            )
+
+            if basic_response.status_code == 200:
+                basic_data = basic_response.json()
+                if result["likes"] == 0:
+                    result["likes"] = basic_data.get("like_count", 0)
+                if result["comments"] == 0:
+                    result["comments"] = basic_data.get("comments_count", 0)
+                result["media_type"] = basic_data.get("media_product_type", "REELS")
+                result["caption"] = (basic_data.get("caption") or "")[:100]
+                result["timestamp"] = basic_data.get("timestamp")
+        except Exception as e:
+            print(f"[IG_REELS] Basic info warning for {media_id}: {e}")
+
+        # Engagement rate - reach yeterli değilse 0 döndür (anlamsız %700+ değerler önlenir)
+        reach = result["reach"]
+        total_engagement = result["likes"] + result["comments"] + result["saves"] + result["shares"]
+        if reach >= 10:  # Minimum 10 reach gerekli anlamlı engagement için
+            result["engagement_rate"] = round((total_engagement / reach) * 100, 2)
+        else:
+            result["engagement_rate"] = 0.0  # Yetersiz veri
 
-            if result["total_interactions"] == 0:
-                result["total_interactions"] = total_engagement
+        if result["total_interactions"] == 0:
+            result["total_interactions"] = total_engagement
 
-            return result
+        return result
 
-        except Exception as e:
-            return {"success": False, "error": str(e), "media_id": media_id}
+    except Exception as e:
+        return {"success": False, "error": str(e), "media_id": media_id}
 
 
 async def get_instagram_image_insights(media_id: str) -> Dict[str, Any]:
@@ -228,72 +228,72 @@ async def get_instagram_image_insights(media_id: str) -> Dict[str, Any]:
     if not INSTAGRAM_ACCESS_TOKEN:
         return {"success": False, "error": "Instagram token not set"}
 
-    async with httpx.AsyncClient(timeout=30) as client:
-        try:
-            result = {
-                "success": True,
-                "media_id": media_id,
-                "media_type": "IMAGE",
-                "impressions": 0,
-                "reach": 0,
-                "saves": 0,
-                "likes": 0,
-                "comments": 0,
-                "engagement_rate": 0.0
-            }
-
-            # Insights çek
-            insights_response = await client.get(
-                f"{GRAPH_API_URL}/{media_id}/insights",
-                params={
-                    "metric": "impressions,reach,saved",
-                    "access_token": INSTAGRAM_ACCESS_TOKEN
-                }
-            )
-
-            if insights_response.status_code == 200:
-                data = insights_response.json().get("data", [])
-                for metric in data:
-                    name = metric.get("name")
-                    values = metric.get("values", [])
-                    value = values[0].get("value", 0) if values else 0
-
-                    if name == "impressions":
-                        result["impressions"] = value
-                    elif name == "reach":
-                        result["reach"] = value
-                    elif name == "saved":
-                        result["saves"] = value
+    client = get_http_client("instagram")
+    try:
+        result = {
+            "success": True,
+            "media_id": media_id,
+            "media_type": "IMAGE",
+            "impressions": 0,
+            "reach": 0,
+            "saves": 0,
+            "likes": 0,
+            "comments": 0,
+            "engagement_rate": 0.0
+        }
 
-            # Temel bilgiler
-            basic_response = await client.get(
-                f"{GRAPH_API_URL}/{media_id}",
-                params={
-                    "fields": "like_count,comments_count,media_type,caption,timestamp",
-                    "access_token": INSTAGRAM_ACCESS_TOKEN
-                }
-            )
+        # Insights çek
+        insights_response = await client.get(
+            f"{GRAPH_API_URL}/{media_id}/insights",
+            params={
+                "metric": "impressions,reach,saved",
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            }
+        )
+
+        if insights_response.status_code == 200:
+            data = insights_response.json().get("data", [])
+            for metric in data:
+                name = metric.get("name")
+                values = metric.get("values", [])
+                value = values[0].get("value", 0) if values else 0
+
+                if name == "impressions":
+                    result["impressions"] = value
+                elif name == "reach":
+                    result["reach"] = value
+                elif name == "saved":
+                    result["saves"] = value
+
+        # Temel bilgiler
+        basic_response = await client.get(
+            f"{GRAPH_API_URL}/{media_id}",
+            params={
+                "fields": "like_count,comments_count,media_type,caption,timestamp",
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            }
+        )
 
-            if basic_response.status_code == 200:
-                basic_data = basic_response.json()
-                result["likes"] = basic_data.get("like_count", 0)
-                result["comments"] = basic_data.get("comments_count", 0)
-                result["media_type"] = basic_data.get("media_type", "IMAGE")
-                result["caption"] = (basic_data.get("caption") or "")[:100]
-                result["timestamp"] = basic_data.get("timestamp")
+        if basic_response.status_code == 200:
+            basic_data = basic_response.json()
+            result["likes"] = basic_data.get("like_count", 0)
+            result["comments"] = basic_data.get("comments_count", 0)
+            result["media_type"] = basic_data.get("media_type", "IMAGE")
+            result["caption"] = (basic_data.get("caption") or "")[:100]
+            result["timestamp"] = basic_data.get("timestamp")
 
-            # Engagement rate - yetersiz reach/impressions varsa 0 döndür
-            denominator = result["reach"] if result["reach"] > 0 else result["impressions"]
-            total_engagement = result["likes"] + result["comments"] + result["saves"]
-            if denominator >= 10:  # Minimum 10 reach/impression gerekli
-                result["engagement_rate"] = round((total_engagement / denominator) * 100, 2)
-            else:
-                result["engagement_rate"] = 0.0  # Yetersiz veri
+        # Engagement rate - yetersiz reach/impressions varsa 0 döndür
+        denominator = result["reach"] if result["reach"] > 0 else result["impressions"]
+        total_engagement = result["likes"] + result["comments"] + result["saves"]
+        if denominator >= 10:  # Minimum 10 reach/impression gerekli
+            result["engagement_rate"] = round((total_engagement / denominator) * 100, 2)
+        else:
+            result["engagement_rate"] = 0.0  # Yetersiz veri
 
-            return result
+        return result
 
-        except Exception as e:
-            return {"success": False, "error": str(e), "media_id": media_id}
+    except Exception as e:
+        return {"success": False, "error": str(e), "media_id": media_id}
 
 
 async def get_instagram_media_insights(media_id: str) -> Dict[str, Any]:
@@ -321,46 +321,47 @@ async def get_instagram_insights(limit: int = 10) -> Dict[str, Any]:
     if not INSTAGRAM_ACCESS_TOKEN or not INSTAGRAM_USER_ID:
         return {"success": False, "error": "Instagram credentials not set"}
 
-    async with httpx.AsyncClient(timeout=60) as client:
-        try:
-            response = await client.get(
-                f"{GRAPH_API_URL}/{INSTAGRAM_USER_ID}/media",
-                params={
-                    "fields": "id,caption,timestamp,like_count,comments_count,media_type",
-                    "limit": limit,
-                    "access_token": INSTAGRAM_ACCESS_TOKEN
-                }
-            )
+    client = get_http_client("instagram")
+    try:
+        response = await client.get(
+            f"{GRAPH_API_URL}/{INSTAGRAM_USER_ID}/media",
+            params={
+                "fields": "id,caption,timestamp,like_count,comments_count,media_type",
+                "limit": limit,
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            },
+            timeout=60
+        )
 
-            if response.status_code != 200:
-                return {"success": False, "error": response.text[:200]}
+        if response.status_code != 200:
+            return {"success": False, "error": response.text[:200]}
 
-            media = response.json().get("data", [])
+        media = response.json().get("data", [])
 
-            results = []
-            for item in media:
-                media_id = item.get("id")
+        results = []
+        for item in media:
+            media_id = item.get("id")
 
-                # Insights çek
-                insights = await get_instagram_media_insights(media_id)
+            # Insights çek
+            insights = await get_instagram_media_insights(media_id)
 
-                results.append({
-                    "post_id": media_id,
-                    "caption": (item.get("caption") or "")[:50],
-                    "timestamp": item.get("timestamp"),
-                    "media_type": item.get("media_type"),
-                    "likes": insights.get("likes", item.get("like_count", 0)),
-                    "comments": insights.get("comments", item.get("comments_count", 0)),
-                    "reach": insights.get("reach", 0),
-                    "impressions": insights.get("impressions", 0),
-                    "engagement_rate": insights.get("engagement_rate", 0)
-                })
+            results.append({
+                "post_id": media_id,
+                "caption": (item.get("caption") or "")[:50],
+                "timestamp": item.get("timestamp"),
+                "media_type": item.get("media_type"),
+                "likes": insights.get("likes", item.get("like_count", 0)),
+                "comments": insights.get("comments", item.get("comments_count", 0)),
+                "reach": insights.get("reach", 0),
+                "impressions": insights.get("impressions", 0),
+                "engagement_rate": insights.get("engagement_rate", 0)
+            })
 
-                await asyncio.sleep(0.3)
+            await asyncio.sleep(0.3)
 
-            return {"success": True, "posts": results}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
+        return {"success": True, "posts": results}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
 
 
 async def get_best_performing_content() -> Dict[str, Any]:
@@ -397,9 +398,9 @@ async def sync_insights_to_database() -> Dict[str, Any]:
     Instagram insights'ları database'e kaydet.
     Sadece Instagram post'ları için çalışır.
     """
-    from app.database import update_post_analytics, get_published_posts
+    from app.database import async_crud
 
-    db_posts = get_published_posts(days=30)
+    db_posts = await async_crud.get_published_posts(days=30)
     synced = 0
     errors = 0
 
@@ -426,7 +427,7 @@ async def sync_insights_to_database() -> Dict[str, Any]:
                         analytics_data["ig_avg_watch_time"] = ig_insights.get("avg_watch_time", 0)
 
                     # Update database
-                    update_post_analytics(post.get("id"), analytics_data)
+                    await async_crud.update_post_analytics(post.get("id"), analytics_data)
                     synced += 1
             except Exception as e:
                 print(f"[INSIGHTS] Error syncing {ig_post_id}: {e}")
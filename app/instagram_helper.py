@@ -5,12 +5,13 @@ Yeni API: graph.instagram.com v21.0 (Instagram Login)
 
 import os
 import asyncio
-import aiohttp
-import subprocess
+import httpx
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 from app.config import settings
+from app.media import ProgressCallback, concat_stream_copy, ffmpeg_available, probe_duration, probe_media, run_media
+from app.net import get_http_client
 from app.utils.logger import get_logger
 
 logger = get_logger("instagram")
@@ -31,7 +32,10 @@ def get_instagram_credentials() -> Dict[str, str]:
     }
 
 
-async def convert_video_for_instagram(input_path: str) -> Dict[str, Any]:
+async def convert_video_for_instagram(
+    input_path: str,
+    progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
     """
     Video'yu Instagram Reels formatına dönüştür
 
@@ -41,6 +45,10 @@ async def convert_video_for_instagram(input_path: str) -> Dict[str, Any]:
     - FPS: 30
     - Max süre: 90 saniye
     - Format: MP4
+
+    Args:
+        input_path: Kaynak video
+        progress: ffmpeg ilerleme callback'i (MediaProgress)
     """
     if not os.path.exists(input_path):
         return {"success": False, "error": f"Video bulunamadı: {input_path}"}
@@ -48,39 +56,19 @@ async def convert_video_for_instagram(input_path: str) -> Dict[str, Any]:
     print(f"[VIDEO CONVERT] Kaynak: {input_path}")
 
     # ffmpeg kontrolü
-    try:
-        result = subprocess.run(["which", "ffmpeg"], capture_output=True)
-        if result.returncode != 0:
-            print("[VIDEO CONVERT] ffmpeg yüklü değil!")
-            return {"success": False, "error": "ffmpeg not installed"}
-    except Exception as e:
-        return {"success": False, "error": f"ffmpeg check failed: {e}"}
+    if not ffmpeg_available():
+        print("[VIDEO CONVERT] ffmpeg yüklü değil!")
+        return {"success": False, "error": "ffmpeg not installed"}
 
     # Video bilgilerini al
     try:
-        probe_cmd = [
-            "ffprobe", "-v", "error",
-            "-select_streams", "v:0",
-            "-show_entries", "stream=codec_name,width,height,r_frame_rate",
-            "-of", "csv=p=0",
-            input_path
-        ]
-        probe_result = subprocess.run(probe_cmd, capture_output=True, text=True)
-        probe_output = probe_result.stdout.strip()
-        print(f"[VIDEO CONVERT] Probe: {probe_output}")
-
-        parts = probe_output.split(",")
-        if len(parts) >= 4:
-            codec = parts[0]
-            width = int(parts[1])
-            height = int(parts[2])
-            fps_str = parts[3]
-
-            if "/" in fps_str:
-                num, den = fps_str.split("/")
-                fps = int(num) / int(den) if int(den) > 0 else 30
-            else:
-                fps = float(fps_str)
+        info = await probe_media(input_path)
+
+        if info and info.has_video:
+            codec = info.video_codec
+            width = info.width
+            height = info.height
+            fps = info.fps or 30
 
             print(f"[VIDEO CONVERT] Codec: {codec}, Size: {width}x{height}, FPS: {fps:.1f}")
 
@@ -127,16 +115,11 @@ async def convert_video_for_instagram(input_path: str) -> Dict[str, Any]:
     ]
 
     try:
-        process = subprocess.run(
-            ffmpeg_cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+        process = await run_media(ffmpeg_cmd, timeout=300, progress=progress, duration=90.0)
 
-        if process.returncode != 0:
-            print(f"[VIDEO CONVERT] ffmpeg hatası: {process.stderr[:500]}")
-            return {"success": False, "error": f"ffmpeg error: {process.stderr[:200]}"}
+        if not process.success:
+            print(f"[VIDEO CONVERT] ffmpeg hatası: {process.error}")
+            return {"success": False, "error": process.error[:200]}
 
         if not os.path.exists(output_path):
             return {"success": False, "error": "Output file not created"}
@@ -151,8 +134,6 @@ async def convert_video_for_instagram(input_path: str) -> Dict[str, Any]:
             "file_size_mb": round(file_size, 2)
         }
 
-    except subprocess.TimeoutExpired:
-        return {"success": False, "error": "ffmpeg timeout (5 min)"}
     except Exception as e:
         print(f"[VIDEO CONVERT] Exception: {e}")
         return {"success": False, "error": str(e)}
@@ -169,15 +150,7 @@ async def get_audio_duration(audio_path: str) -> float:
         Süre (saniye) veya 0.0 hata durumunda
     """
     try:
-        probe_cmd = [
-            "ffprobe", "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "csv=p=0",
-            audio_path
-        ]
-        result = subprocess.run(probe_cmd, capture_output=True, text=True)
-        duration_str = result.stdout.strip()
-        return float(duration_str) if duration_str else 0.0
+        return await probe_duration(audio_path) or 0.0
     except Exception as e:
         print(f"[AUDIO PROBE] Hata: {e}")
         return 0.0
@@ -194,15 +167,7 @@ async def get_video_duration(video_path: str) -> float:
         Süre (saniye) veya 0.0 hata durumunda
     """
     try:
-        probe_cmd = [
-            "ffprobe", "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "csv=p=0",
-            video_path
-        ]
-        result = subprocess.run(probe_cmd, capture_output=True, text=True)
-        duration_str = result.stdout.strip()
-        return float(duration_str) if duration_str else 0.0
+        return await probe_duration(video_path) or 0.0
     except Exception as e:
         print(f"[VIDEO PROBE] Hata: {e}")
         return 0.0
@@ -215,7 +180,8 @@ async def merge_audio_video(
     audio_volume: float = 1.0,
     fade_out: bool = True,
     fade_duration: float = 0.5,  # 0.5s fade-out - audio kesilse bile yumuşak biter
-    keep_video_duration: bool = False  # Video süresini koru, audio kısaysa sorun yok
+    keep_video_duration: bool = False,  # Video süresini koru, audio kısaysa sorun yok
+    progress: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Video ve audio dosyalarını birleştir.
@@ -239,6 +205,7 @@ async def merge_audio_video(
         fade_out: Video sonunda fade-out efekti
         fade_duration: Fade-out süresi (saniye)
         keep_video_duration: Video süresini koru (B-roll için)
+        progress: ffmpeg ilerleme callback'i (MediaProgress)
 
     Returns:
         {
@@ -385,16 +352,16 @@ async def merge_audio_video(
     print(f"[AUDIO-VIDEO MERGE] Strateji: {strategy}")
 
     try:
-        process = subprocess.run(
+        process = await run_media(
             ffmpeg_cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 dakika timeout
+            timeout=300,  # 5 dakika timeout
+            progress=progress,
+            duration=final_duration
         )
 
-        if process.returncode != 0:
-            print(f"[AUDIO-VIDEO MERGE] FFmpeg hatası: {process.stderr[:500]}")
-            return {"success": False, "error": f"FFmpeg error: {process.stderr[:200]}"}
+        if not process.success:
+            print(f"[AUDIO-VIDEO MERGE] FFmpeg hatası: {process.error}")
+            return {"success": False, "error": process.error[:200]}
 
         if not os.path.exists(output_path):
             return {"success": False, "error": "Output dosyası oluşturulamadı"}
@@ -415,8 +382,6 @@ async def merge_audio_video(
             "strategy": strategy
         }
 
-    except subprocess.TimeoutExpired:
-        return {"success": False, "error": "FFmpeg timeout (5 min)"}
     except Exception as e:
         print(f"[AUDIO-VIDEO MERGE] Exception: {e}")
         return {"success": False, "error": str(e)}
@@ -425,7 +390,8 @@ async def merge_audio_video(
 async def add_subtitles_to_video(
     video_path: str,
     ass_path: str,
-    output_path: Optional[str] = None
+    output_path: Optional[str] = None,
+    progress: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Burn ASS subtitles into video using FFmpeg.
@@ -437,6 +403,7 @@ async def add_subtitles_to_video(
         video_path: Input video file path
         ass_path: ASS subtitle file path
         output_path: Output file path (auto-generated if None)
+        progress: FFmpeg progress callback (MediaProgress)
 
     Returns:
         {
@@ -482,17 +449,11 @@ async def add_subtitles_to_video(
 
     try:
         print(f"[SUBTITLE BURN] Running FFmpeg...")
-        process = subprocess.run(
-            ffmpeg_cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        process = await run_media(ffmpeg_cmd, timeout=300, progress=progress)  # 5 minute timeout
 
-        if process.returncode != 0:
-            error_msg = process.stderr[-500:] if len(process.stderr) > 500 else process.stderr
-            print(f"[SUBTITLE BURN] FFmpeg error: {error_msg}")
-            return {"success": False, "error": f"FFmpeg error: {error_msg[:200]}"}
+        if not process.success:
+            print(f"[SUBTITLE BURN] FFmpeg error: {process.error}")
+            return {"success": False, "error": process.error[:200]}
 
         if not os.path.exists(output_path):
             return {"success": False, "error": "Output file not created"}
@@ -506,8 +467,6 @@ async def add_subtitles_to_video(
             "file_size_mb": round(file_size, 2)
         }
 
-    except subprocess.TimeoutExpired:
-        return {"success": False, "error": "FFmpeg timeout (5 min)"}
     except Exception as e:
         print(f"[SUBTITLE BURN] Exception: {e}")
         return {"success": False, "error": str(e)}
@@ -593,22 +552,18 @@ def build_crossfade_filter(
     return ";".join(filter_parts)
 
 
-def check_video_has_audio(video_path: str) -> bool:
+async def check_video_has_audio(video_path: str) -> bool:
     """Video'nun audio stream'i olup olmadığını kontrol et."""
-    try:
-        cmd = ["ffprobe", "-v", "error", "-select_streams", "a",
-               "-show_entries", "stream=codec_type", "-of", "csv=p=0", video_path]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-        return bool(result.stdout.strip())
-    except Exception:
-        return False
+    info = await probe_media(video_path)
+    return bool(info and info.has_audio)
 
 
 async def concatenate_videos_with_crossfade(
     video_paths: List[str],
     output_path: str = None,
     crossfade_duration: float = 0.5,
-    segment_duration: float = 10.0
+    segment_duration: float = 10.0,
+    progress: Optional[ProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Birden fazla videoyu crossfade geçişlerle birleştir.
@@ -618,6 +573,7 @@ async def concatenate_videos_with_crossfade(
         output_path: Çıktı dosya yolu (None ise otomatik oluşturulur)
         crossfade_duration: Crossfade süresi (saniye)
         segment_duration: Her segment'in yaklaşık süresi (saniye)
+        progress: ffmpeg ilerleme callback'i (MediaProgress)
 
     Returns:
         {
@@ -651,6 +607,14 @@ async def concatenate_videos_with_crossfade(
     print(f"[VIDEO CONCAT] Crossfade: {crossfade_duration}s")
 
     try:
+        # Uyumlu segmentler: stream copy (crossfade'de sadece geçişler encode edilir)
+        fast_result = await concat_stream_copy(
+            video_paths, output_path, crossfade=crossfade_duration, progress=progress
+        )
+        if fast_result:
+            print(f"[VIDEO CONCAT] Stream copy ile birleştirildi ({fast_result['encoded_seconds']}s encode)")
+            return fast_result
+
         # Her videonun gerçek süresini al
         video_durations = []
         for path in video_paths:
@@ -664,7 +628,7 @@ async def concatenate_videos_with_crossfade(
         print(f"[VIDEO CONCAT] Video süreleri: {video_durations}")
 
         # İlk videonun audio stream'i var mı kontrol et
-        has_audio = check_video_has_audio(video_paths[0])
+        has_audio = await check_video_has_audio(video_paths[0])
         print(f"[VIDEO CONCAT] Audio stream: {has_audio}")
 
         # Filter complex oluştur (gerçek sürelerle)
@@ -709,15 +673,14 @@ async def concatenate_videos_with_crossfade(
         print(f"[VIDEO CONCAT] FFmpeg çalıştırılıyor...")
 
         # FFmpeg çalıştır (5 dakika timeout)
-        process = subprocess.run(
-            ffmpeg_cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+        expected_duration = sum(video_durations) - (len(video_durations) - 1) * crossfade_duration
+        process = await run_media(ffmpeg_cmd, timeout=300, progress=progress, duration=expected_duration)
 
-        if process.returncode != 0:
-            print(f"[VIDEO CONCAT] FFmpeg hata: {process.stderr[:500]}")
+        if process.timed_out:
+            return {"success": False, "error": "FFmpeg concat timeout (5 min)"}
+
+        if not process.success:
+            print(f"[VIDEO CONCAT] FFmpeg hata: {process.error}")
 
             # Fallback: Simple concat (crossfade olmadan)
             print("[VIDEO CONCAT] Fallback: Simple concat deneniyor...")
@@ -749,8 +712,6 @@ async def concatenate_videos_with_crossfade(
             "file_size_mb": round(file_size, 2)
         }
 
-    except subprocess.TimeoutExpired:
-        return {"success": False, "error": "FFmpeg concat timeout (5 min)"}
     except Exception as e:
         print(f"[VIDEO CONCAT] Exception: {e}")
         return {"success": False, "error": str(e)}
@@ -764,6 +725,12 @@ async def simple_concat_fallback(
     Crossfade başarısız olursa basit concat ile birleştir.
     """
     try:
+        # Segmentler uyumluysa yeniden encode etmeden birleştir
+        fast_result = await concat_stream_copy(video_paths, output_path)
+        if fast_result:
+            fast_result["fallback"] = True
+            return fast_result
+
         # Concat demuxer için liste dosyası oluştur
         list_path = output_path.replace(".mp4", "_list.txt")
 
@@ -784,19 +751,14 @@ async def simple_concat_fallback(
             output_path
         ]
 
-        process = subprocess.run(
-            ffmpeg_cmd,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+        process = await run_media(ffmpeg_cmd, timeout=300)
 
         # Liste dosyasını temizle
         if os.path.exists(list_path):
             os.remove(list_path)
 
-        if process.returncode != 0:
-            return {"success": False, "error": f"Simple concat de başarısız: {process.stderr[:200]}"}
+        if not process.success:
+            return {"success": False, "error": f"Simple concat de başarısız: {process.error[:200]}"}
 
         file_size = os.path.getsize(output_path) / (1024 * 1024)
 
@@ -816,23 +778,6 @@ async def simple_concat_fallback(
         return {"success": False, "error": f"Fallback hata: {str(e)}"}
 
 
-async def get_video_duration(video_path: str) -> Optional[float]:
-    """FFprobe ile video süresini al"""
-    try:
-        cmd = [
-            "ffprobe", "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0 and result.stdout.strip():
-            return float(result.stdout.strip())
-    except Exception:
-        pass
-    return None
-
-
 async def get_account_info() -> Dict[str, Any]:
     """
     Instagram hesap bilgilerini al
@@ -852,16 +797,16 @@ async def get_account_info() -> Dict[str, Any]:
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        client = get_http_client("instagram")
+        response = await client.get(url, params=params, follow_redirects=True)
+        data = response.json()
 
-                if "error" in data:
-                    print(f"[INSTAGRAM] API Error: {data['error'].get('message', 'Unknown')}")
-                    return {"success": False, "error": data["error"].get("message")}
+        if "error" in data:
+            print(f"[INSTAGRAM] API Error: {data['error'].get('message', 'Unknown')}")
+            return {"success": False, "error": data["error"].get("message")}
 
-                print(f"[INSTAGRAM] Hesap: @{data.get('username')} | Takipçi: {data.get('followers_count', 0)}")
-                return {"success": True, **data}
+        print(f"[INSTAGRAM] Hesap: @{data.get('username')} | Takipçi: {data.get('followers_count', 0)}")
+        return {"success": True, **data}
 
     except Exception as e:
         print(f"[INSTAGRAM] Connection error: {e}")
@@ -920,29 +865,28 @@ async def create_media_container(
 
     for attempt in range(max_retries):
         try:
-            timeout = aiohttp.ClientTimeout(total=60)  # 30s → 60s
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, data=data) as response:
-                    result = await response.json()
-
-                    if "error" in result:
-                        error_msg = result["error"].get("message", "Unknown error")
-                        print(f"[INSTAGRAM] Container Error: {error_msg}")
-
-                        # Retry edilebilir hata mı?
-                        if "timeout" in error_msg.lower() or "rate" in error_msg.lower():
-                            if attempt < max_retries - 1:
-                                wait_time = 5 * (attempt + 1)
-                                print(f"[INSTAGRAM] Retry {attempt + 1}/{max_retries}, {wait_time}s bekleniyor...")
-                                await asyncio.sleep(wait_time)
-                                continue
-                        return None
-
-                    container_id = result.get("id")
-                    print(f"[INSTAGRAM] Media Container oluşturuldu: {container_id}")
-                    return container_id
-
-        except asyncio.TimeoutError:
+            client = get_http_client("instagram")
+            response = await client.post(url, data=data, timeout=60)
+            result = response.json()
+
+            if "error" in result:
+                error_msg = result["error"].get("message", "Unknown error")
+                print(f"[INSTAGRAM] Container Error: {error_msg}")
+
+                # Retry edilebilir hata mı?
+                if "timeout" in error_msg.lower() or "rate" in error_msg.lower():
+                    if attempt < max_retries - 1:
+                        wait_time = 5 * (attempt + 1)
+                        print(f"[INSTAGRAM] Retry {attempt + 1}/{max_retries}, {wait_time}s bekleniyor...")
+                        await asyncio.sleep(wait_time)
+                        continue
+                return None
+
+            container_id = result.get("id")
+            print(f"[INSTAGRAM] Media Container oluşturuldu: {container_id}")
+            return container_id
+
+        except httpx.TimeoutException:
             print(f"[INSTAGRAM] Container timeout (60s), retry {attempt + 1}/{max_retries}")
             if attempt < max_retries - 1:
                 wait_time = 5 * (attempt + 1)  # 5s, 10s, 15s
@@ -993,28 +937,27 @@ async def create_carousel_container(
 
     for attempt in range(max_retries):
         try:
-            timeout = aiohttp.ClientTimeout(total=60)  # 30s → 60s
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, data=data) as response:
-                    result = await response.json()
-
-                    if "error" in result:
-                        error_msg = result["error"].get("message", "Unknown")
-                        print(f"[INSTAGRAM] Carousel Container Error: {error_msg}")
-
-                        if "timeout" in error_msg.lower() or "rate" in error_msg.lower():
-                            if attempt < max_retries - 1:
-                                wait_time = 5 * (attempt + 1)
-                                print(f"[INSTAGRAM] Carousel retry {attempt + 1}/{max_retries}...")
-                                await asyncio.sleep(wait_time)
-                                continue
-                        return None
-
-                    container_id = result.get("id")
-                    print(f"[INSTAGRAM] Carousel Container: {container_id}")
-                    return container_id
-
-        except asyncio.TimeoutError:
+            client = get_http_client("instagram")
+            response = await client.post(url, data=data, timeout=60)
+            result = response.json()
+
+            if "error" in result:
+                error_msg = result["error"].get("message", "Unknown")
+                print(f"[INSTAGRAM] Carousel Container Error: {error_msg}")
+
+                if "timeout" in error_msg.lower() or "rate" in error_msg.lower():
+                    if attempt < max_retries - 1:
+                        wait_time = 5 * (attempt + 1)
+                        print(f"[INSTAGRAM] Carousel retry {attempt + 1}/{max_retries}...")
+                        await asyncio.sleep(wait_time)
+                        continue
+                return None
+
+            container_id = result.get("id")
+            print(f"[INSTAGRAM] Carousel Container: {container_id}")
+            return container_id
+
+        except httpx.TimeoutException:
             print(f"[INSTAGRAM] Carousel container timeout, retry {attempt + 1}/{max_retries}")
             if attempt < max_retries - 1:
                 await asyncio.sleep(5 * (attempt + 1))
@@ -1044,9 +987,9 @@ async def check_container_status(container_id: str) -> Dict[str, Any]:
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                return await response.json()
+        client = get_http_client("instagram")
+        response = await client.get(url, params=params, follow_redirects=True)
+        return response.json()
     except Exception as e:
         return {"error": str(e)}
 
@@ -1070,18 +1013,18 @@ async def publish_media(container_id: str) -> Dict[str, Any]:
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=data) as response:
-                result = await response.json()
+        client = get_http_client("instagram")
+        response = await client.post(url, data=data, timeout=120)
+        result = response.json()
 
-                if "error" in result:
-                    error_msg = result["error"].get("message", "Unknown error")
-                    print(f"[INSTAGRAM] Publish Error: {error_msg}")
-                    return {"success": False, "error": error_msg}
+        if "error" in result:
+            error_msg = result["error"].get("message", "Unknown error")
+            print(f"[INSTAGRAM] Publish Error: {error_msg}")
+            return {"success": False, "error": error_msg}
 
-                post_id = result.get("id")
-                print(f"[INSTAGRAM] Post yayınlandı! ID: {post_id}")
-                return {"success": True, "id": post_id}
+        post_id = result.get("id")
+        print(f"[INSTAGRAM] Post yayınlandı! ID: {post_id}")
+        return {"success": True, "id": post_id}
 
     except Exception as e:
         print(f"[INSTAGRAM] Publish error: {e}")
@@ -1293,22 +1236,23 @@ async def upload_image_to_cdn(local_path: str) -> Optional[str]:
             with open(local_path, "rb") as f:
                 image_data = base64.b64encode(f.read()).decode()
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.imgbb.com/1/upload",
-                    data={
-                        "key": imgbb_key,
-                        "image": image_data
-                    }
-                ) as response:
-                    result = await response.json()
-
-                    if result.get("success"):
-                        url = result["data"]["url"]
-                        print(f"[INSTAGRAM] Görsel yüklendi (imgBB): {url}")
-                        return url
-                    else:
-                        print(f"[INSTAGRAM] Imgbb error: {result}")
+            client = get_http_client("imgbb")
+            response = await client.post(
+                "https://api.imgbb.com/1/upload",
+                data={
+                    "key": imgbb_key,
+                    "image": image_data
+                },
+                timeout=60
+            )
+            result = response.json()
+
+            if result.get("success"):
+                url = result["data"]["url"]
+                print(f"[INSTAGRAM] Görsel yüklendi (imgBB): {url}")
+                return url
+            else:
+                print(f"[INSTAGRAM] Imgbb error: {result}")
 
         except Exception as e:
             print(f"[INSTAGRAM] CDN upload error: {e}")
@@ -1420,19 +1364,19 @@ async def get_media_insights(media_id: str) -> Dict[str, Any]:
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        client = get_http_client("instagram")
+        response = await client.get(url, params=params, follow_redirects=True)
+        data = response.json()
 
-                if "error" in data:
-                    return {"success": False, "error": data["error"].get("message")}
+        if "error" in data:
+            return {"success": False, "error": data["error"].get("message")}
 
-                # Parse insights
-                insights = {}
-                for item in data.get("data", []):
-                    insights[item["name"]] = item["values"][0]["value"]
+        # Parse insights
+        insights = {}
+        for item in data.get("data", []):
+            insights[item["name"]] = item["values"][0]["value"]
 
-                return {"success": True, "insights": insights}
+        return {"success": True, "insights": insights}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -1458,14 +1402,14 @@ async def get_recent_media(limit: int = 10) -> Dict[str, Any]:
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                data = await response.json()
+        client = get_http_client("instagram")
+        response = await client.get(url, params=params, follow_redirects=True)
+        data = response.json()
 
-                if "error" in data:
-                    return {"success": False, "error": data["error"].get("message")}
+        if "error" in data:
+            return {"success": False, "error": data["error"].get("message")}
 
-                return {"success": True, "media": data.get("data", [])}
+        return {"success": True, "media": data.get("data", [])}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -0,0 +1,33 @@
+"""
+Olivenet Social Bot - Uzak üretim işleri (tek polling döngüsü, kalıcı iş kaydı)
+"""
+
+from .tracker import (
+    JobCancelled,
+    JobFailed,
+    JobTimeout,
+    JobTracker,
+    PollResult,
+    Submission,
+    cancel_on_abandon,
+    get_job_tracker,
+    register_canceller,
+    register_poller,
+    run_remote_job,
+    shutdown_job_tracker,
+)
+
+__all__ = [
+    "JobCancelled",
+    "JobFailed",
+    "JobTimeout",
+    "JobTracker",
+    "PollResult",
+    "Submission",
+    "cancel_on_abandon",
+    "get_job_tracker",
+    "register_canceller",
+    "register_poller",
+    "run_remote_job",
+    "shutdown_job_tracker",
+]
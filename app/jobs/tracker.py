@@ -0,0 +1,577 @@
+"""
+Job Tracker - Uzak üretim işleri (video, görsel, lipsync) için tek polling döngüsü
+
+Sora, Kling/fal.ai, FLUX, Veo ve lipsync işleri gönderildikten sonra her
+helper'ın kendi sabit aralıklı poll döngüsünde dakikalarca bekliyordu. Bu
+modülde işler tracker'a kaydedilir; tek bir arka plan döngüsü tüm bekleyen
+işleri poll eder, tamamlanan işin awaitable'ını çözer:
+
+    result = await run_remote_job(
+        provider="fal", label="kling_pro",
+        submit=submit,                       # -> Submission(remote_id, poll_data)
+        key_data={"endpoint": ..., "body": ...},
+        timeout=1800,
+    )
+
+- Provider poller'ları helper modüllerinde register_poller() ile kaydedilir:
+  poller(client, remote_id, poll_data) -> PollResult
+- Adaptif aralık: provider/label başına gözlenen tamamlanma sürelerinin
+  dağılımına göre (p10 öncesi seyrek, p10-p90 arası sık, p90 sonrası geri
+  çekilen); yeterli geçmiş yoksa provider'ın varsayılan aralığı
+- Kalıcılık: gönderilen iş remote_jobs tablosuna idempotency key ile
+  yazılır; restart sonrası aynı istek geldiğinde yeniden gönderilmez,
+  bekleyen işe bağlanılır. Aynı süreçte aynı key'li iş zaten bekliyorsa
+  aynı sonuç paylaşılır.
+- Poll hataları geçici sayılır; üst üste MAX_POLL_ERRORS hatada iş başarısız olur
+- cancel_on_abandon() bloğunda başlatılan bir işin tek bekleyeni iptal
+  edilirse iş provider'da iptal edilir (register_canceller) ve takipten
+  çıkarılır; varsayılan olarak iptal edilen bekleyenin işi takip edilmeye
+  devam eder (aynı istek tekrar geldiğinde bağlanılır)
+"""
+
+import asyncio
+import hashlib
+import json
+import statistics
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from app.config import settings
+from app.database import async_crud
+from app.net import get_http_client
+from app.utils.logger import get_logger
+
+logger = get_logger("job_tracker")
+
+# Adaptif aralık için gereken minimum tamamlanmış iş sayısı
+MIN_HISTORY = 5
+HISTORY_SIZE = 50
+MAX_POLL_ERRORS = 5
+
+
+class JobFailed(Exception):
+    """Uzak iş başarısız oldu (provider hata döndü veya poll edilemedi)"""
+
+
+class JobTimeout(JobFailed):
+    """Uzak iş süre limitinde tamamlanmadı"""
+
+
+class JobCancelled(JobFailed):
+    """Uzak iş bekleyeni kalmadığı için iptal edildi (cancel_on_abandon)"""
+
+
+@dataclass
+class Submission:
+    """submit() sonucu: poll edilecek uzak iş veya anında gelen sonuç"""
+    remote_id: Optional[str] = None
+    poll_data: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class PollResult:
+    """Tek poll'un sonucu"""
+    status: str  # pending, completed, failed
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    progress: Optional[float] = None
+
+    @classmethod
+    def pending(cls, progress: Optional[float] = None) -> "PollResult":
+        return cls("pending", progress=progress)
+
+    @classmethod
+    def completed(cls, result: Dict[str, Any]) -> "PollResult":
+        return cls("completed", result=result)
+
+    @classmethod
+    def failed(cls, error: str) -> "PollResult":
+        return cls("failed", error=error)
+
+
+Poller = Callable[[httpx.AsyncClient, str, Dict[str, Any]], Awaitable[PollResult]]
+Canceller = Callable[[httpx.AsyncClient, str, Dict[str, Any]], Awaitable[None]]
+
+_pollers: Dict[str, Tuple[Poller, float, str]] = {}
+_cancellers: Dict[str, Canceller] = {}
+
+_cancel_on_abandon: ContextVar[bool] = ContextVar("job_cancel_on_abandon", default=False)
+
+
+def register_poller(provider: str, poller: Poller, default_interval: float, http_service: Optional[str] = None):
+    """
+    Provider'ın poll fonksiyonunu ve geçmiş yokken kullanılacak aralığı kaydet.
+
+    http_service: poller'a verilecek paylaşılan client (app.net, varsayılan provider adı)
+    """
+    _pollers[provider] = (poller, default_interval, http_service or provider)
+
+
+def register_canceller(provider: str, canceller: Canceller):
+    """
+    Provider'ın iptal fonksiyonunu kaydet: canceller(client, remote_id, poll_data).
+
+    Client, poller'ın http_service'inden alınır (register_poller önce çağrılmalı).
+    """
+    _cancellers[provider] = canceller
+
+
+@contextmanager
+def cancel_on_abandon():
+    """
+    Bu blokta run_remote_job ile başlatılan işler, bekleyen task iptal
+    edilince (işi paylaşan başka bekleyen yoksa) provider'da iptal edilir
+    ve takipten çıkarılır. Hedge'i kaybeden video denemeleri için.
+    """
+    token = _cancel_on_abandon.set(True)
+    try:
+        yield
+    finally:
+        _cancel_on_abandon.reset(token)
+
+
+def make_job_key(provider: str, label: str, key_data: Any) -> str:
+    """provider + label + istek parametrelerinden idempotency key"""
+    h = hashlib.sha256()
+    h.update(f"{provider}\x00{label}\x00".encode("utf-8"))
+    h.update(json.dumps(key_data, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def quantile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+@dataclass
+class TrackedJob:
+    key: str
+    provider: str
+    label: str
+    remote_id: str
+    poll_data: Dict[str, Any]
+    started: float  # monotonic; restart sonrası bağlanılan işte geriye kaydırılır
+    deadline: float
+    future: asyncio.Future
+    next_poll: float = 0.0
+    waiters: int = 0
+    polls: int = 0
+    errors: int = 0
+    progress: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+class JobTracker:
+    """Tüm bekleyen uzak işleri tek döngüden poll eden tracker"""
+
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        max_concurrent_polls: int = 8,
+        persist: bool = True
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.persist = persist
+
+        self._jobs: Dict[str, TrackedJob] = {}
+        self._starting: Dict[str, asyncio.Future] = {}
+        self._history: Dict[Tuple[str, str], Deque[float]] = {}
+        self._poll_slots = asyncio.Semaphore(max(1, max_concurrent_polls))
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        self._cancelling: Set[asyncio.Task] = set()
+        self.stats = {"submitted": 0, "reattached": 0, "shared": 0, "completed": 0,
+                      "failed": 0, "timeouts": 0, "cancelled": 0, "polls": 0, "poll_errors": 0}
+
+    # ---------- Geçmiş / adaptif aralık ----------
+
+    async def _get_history(self, provider: str, label: str) -> Deque[float]:
+        history = self._history.get((provider, label))
+        if history is None:
+            durations: List[float] = []
+            if self.persist:
+                try:
+                    durations = await async_crud.get_remote_job_durations(provider, label, HISTORY_SIZE)
+                except Exception as e:
+                    logger.warning(f"[JOBS] Süre geçmişi okunamadı ({provider}/{label}): {e}")
+            history = deque(reversed(durations), maxlen=HISTORY_SIZE)
+            self._history[(provider, label)] = history
+        return history
+
+    def next_interval(self, job: TrackedJob) -> float:
+        """
+        Gözlenen tamamlanma sürelerine göre sonraki poll'a kadar bekleme.
+
+        p10'dan önce (iş muhtemelen bitmedi) doğrudan p10'a atlanır, p10-p90
+        arasında dağılımın genişliğine göre sık poll edilir, p90'dan sonra
+        uzun kuyruk için aralık geçen süreyle büyür.
+        """
+        _, default_interval, _ = _pollers[job.provider]
+        history = self._history.get((job.provider, job.label)) or ()
+        elapsed = job.elapsed
+
+        if len(history) < MIN_HISTORY:
+            interval = default_interval
+        else:
+            p10, p90 = quantile(list(history), 0.1), quantile(list(history), 0.9)
+            if elapsed < p10:
+                interval = p10 - elapsed
+            elif elapsed <= p90:
+                interval = (p90 - p10) / 10
+            else:
+                interval = max(default_interval, (elapsed - p90) / 4)
+
+        interval = min(self.max_interval, max(self.min_interval, interval))
+        # Deadline'ı kaçırma
+        return max(self.min_interval, min(interval, job.deadline - time.monotonic()))
+
+    # ---------- Kayıt ----------
+
+    async def run(
+        self,
+        provider: str,
+        submit: Callable[[], Awaitable[Submission]],
+        label: str = "",
+        key_data: Any = None,
+        timeout: float = 600.0
+    ) -> Dict[str, Any]:
+        """
+        İşi gönder (veya bekleyen aynı işe bağlan) ve sonucu bekle.
+
+        Returns:
+            Provider poller'ının tamamlanma sonucu
+
+        Raises:
+            JobFailed: Provider hata döndü / poll edilemedi
+            JobTimeout: timeout içinde tamamlanmadı
+        """
+        if provider not in _pollers:
+            raise ValueError(f"No poller registered for provider: {provider}")
+
+        key = make_job_key(provider, label, key_data)
+        job = self._jobs.get(key)
+        if job is not None:
+            self.stats["shared"] += 1
+            logger.info(f"[JOBS] {provider}/{label} aynı iş zaten bekliyor, sonucu paylaşılacak ({job.remote_id})")
+        else:
+            # Aynı key için gönderim/bağlanma sürerken gelen istek de onu bekler
+            starting = self._starting.get(key)
+            if starting is None:
+                starting = asyncio.ensure_future(self._start(key, provider, label, submit, timeout))
+                self._starting[key] = starting
+                starting.add_done_callback(
+                    lambda task: self._starting.pop(key) if self._starting.get(key) is task else None
+                )
+            else:
+                self.stats["shared"] += 1
+            try:
+                started = await asyncio.shield(starting)
+            except asyncio.CancelledError:
+                if _cancel_on_abandon.get():
+                    # Gönderim sürerken bırakıldı: iş kaydedilince iptal et
+                    starting.add_done_callback(self._cancel_started)
+                raise
+            if not isinstance(started, TrackedJob):
+                return started  # Provider sonucu anında döndü
+            job = started
+
+        await self._get_history(provider, label)
+        if not job.next_poll:
+            job.next_poll = time.monotonic() + self.next_interval(job)
+        self._ensure_loop()
+        # shield: bir bekleyenin iptali, işi paylaşan diğerlerini etkilemez
+        job.waiters += 1
+        try:
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            if _cancel_on_abandon.get() and job.waiters == 1 and not job.future.done():
+                self._spawn_cancel(job)
+            raise
+        finally:
+            job.waiters -= 1
+
+    async def _start(
+        self,
+        key: str,
+        provider: str,
+        label: str,
+        submit: Callable[[], Awaitable[Submission]],
+        timeout: float
+    ) -> Any:
+        """Bekleyen işe bağlan veya yeni iş gönder. Returns: TrackedJob ya da anında gelen sonuç"""
+        job = await self._reattach(key, provider, label)
+        if job is not None:
+            return job
+
+        submission = await submit()
+        if submission.result is not None:
+            return submission.result
+        job = self._track(key, provider, label, submission.remote_id, submission.poll_data, timeout, 0.0)
+        self.stats["submitted"] += 1
+        if self.persist:
+            try:
+                await async_crud.save_remote_job(
+                    key, provider, label, submission.remote_id, submission.poll_data, timeout
+                )
+            except Exception as e:
+                logger.warning(f"[JOBS] İş kaydedilemedi ({provider}/{label}): {e}")
+        return job
+
+    async def _reattach(self, key: str, provider: str, label: str) -> Optional[TrackedJob]:
+        if not self.persist:
+            return None
+        try:
+            row = await async_crud.get_pending_remote_job(key)
+        except Exception as e:
+            logger.warning(f"[JOBS] Bekleyen iş okunamadı ({provider}/{label}): {e}")
+            return None
+        if row is None:
+            return None
+        self.stats["reattached"] += 1
+        logger.info(f"[JOBS] {provider}/{label} bekleyen işe yeniden bağlanıldı: {row['remote_id']} "
+                    f"({row['age_s']:.0f}s önce gönderilmiş)")
+        return self._track(key, provider, label, row["remote_id"], row["poll_data"],
+                           row["timeout_s"] or 600.0, row["age_s"])
+
+    def _track(
+        self,
+        key: str,
+        provider: str,
+        label: str,
+        remote_id: str,
+        poll_data: Dict[str, Any],
+        timeout: float,
+        age_s: float
+    ) -> TrackedJob:
+        now = time.monotonic()
+        started = now - age_s
+        job = TrackedJob(
+            key=key, provider=provider, label=label, remote_id=remote_id, poll_data=poll_data,
+            started=started, deadline=started + timeout, future=asyncio.get_running_loop().create_future()
+        )
+        # Sonucu kimse beklemiyorsa "exception never retrieved" uyarısı olmasın
+        job.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._jobs[key] = job
+        return job
+
+    # ---------- İptal ----------
+
+    def _cancel_started(self, starting: asyncio.Future):
+        if starting.cancelled() or starting.exception() is not None:
+            return
+        job = starting.result()
+        if isinstance(job, TrackedJob):
+            self._spawn_cancel(job)
+
+    def _spawn_cancel(self, job: TrackedJob):
+        task = asyncio.create_task(self._cancel(job))
+        self._cancelling.add(task)
+        task.add_done_callback(self._cancelling.discard)
+
+    async def _cancel(self, job: TrackedJob):
+        """İşi provider'da iptal et ve takipten çıkar (bu arada yeni bekleyen geldiyse dokunma)"""
+        if job.waiters or self._jobs.get(job.key) is not job:
+            return
+        canceller = _cancellers.get(job.provider)
+        if canceller is not None:
+            _, _, http_service = _pollers[job.provider]
+            try:
+                await canceller(get_http_client(http_service), job.remote_id, job.poll_data)
+                logger.info(f"[JOBS] {job.provider}/{job.label} provider'da iptal edildi ({job.remote_id})")
+            except Exception as e:
+                logger.warning(f"[JOBS] {job.provider}/{job.label} iptal isteği başarısız ({job.remote_id}): {e}")
+        await self._finish(job, error=JobCancelled(
+            f"{job.provider}/{job.label} job {job.remote_id} abandoned after {job.elapsed:.0f}s"
+        ))
+
+    # ---------- Polling döngüsü ----------
+
+    def _ensure_loop(self):
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._loop())
+
+    async def _loop(self):
+        in_flight: Dict[str, asyncio.Task] = {}
+
+        def poll_done(key: str):
+            in_flight.pop(key, None)
+            self._wakeup.set()
+
+        while self._jobs or in_flight:
+            now = time.monotonic()
+            for key, job in list(self._jobs.items()):
+                if key in in_flight:
+                    continue
+                if now >= job.deadline:
+                    await self._finish(job, error=JobTimeout(
+                        f"{job.provider}/{job.label} job {job.remote_id} did not finish in "
+                        f"{job.deadline - job.started:.0f}s"
+                    ))
+                elif now >= job.next_poll:
+                    task = asyncio.create_task(self._poll(job))
+                    task.add_done_callback(lambda _t, k=key: poll_done(k))
+                    in_flight[key] = task
+
+            waiting = [job.next_poll for key, job in self._jobs.items() if key not in in_flight]
+            waiting += [job.deadline for job in self._jobs.values()]
+            sleep_for = max(0.0, min(waiting) - time.monotonic()) if waiting else self.max_interval
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, job: TrackedJob):
+        poller, _, http_service = _pollers[job.provider]
+        async with self._poll_slots:
+            job.polls += 1
+            self.stats["polls"] += 1
+            try:
+                outcome = await poller(get_http_client(http_service), job.remote_id, job.poll_data)
+            except Exception as e:
+                job.errors += 1
+                self.stats["poll_errors"] += 1
+                logger.warning(f"[JOBS] {job.provider}/{job.label} poll hatası "
+                               f"({job.errors}/{MAX_POLL_ERRORS}): {e}")
+                if job.errors >= MAX_POLL_ERRORS:
+                    await self._finish(job, error=JobFailed(f"Polling failed: {e}"))
+                    return
+                job.next_poll = time.monotonic() + self.next_interval(job)
+                return
+
+        job.errors = 0
+        if outcome.status == "completed":
+            await self._finish(job, result=outcome.result or {})
+        elif outcome.status == "failed":
+            await self._finish(job, error=JobFailed(outcome.error or "unknown error"))
+        else:
+            if outcome.progress is not None and outcome.progress != job.progress:
+                logger.debug(f"[JOBS] {job.provider}/{job.label}: %{outcome.progress:.0f} ({job.elapsed:.0f}s)")
+            job.progress = outcome.progress
+            job.next_poll = time.monotonic() + self.next_interval(job)
+
+    async def _finish(
+        self,
+        job: TrackedJob,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[JobFailed] = None
+    ):
+        if self._jobs.get(job.key) is not job:
+            return
+        del self._jobs[job.key]
+        duration = job.elapsed
+
+        if error is None:
+            status = "completed"
+            self.stats["completed"] += 1
+            history = await self._get_history(job.provider, job.label)
+            history.append(duration)
+            logger.info(f"[JOBS] {job.provider}/{job.label} tamamlandı: {duration:.0f}s, {job.polls} poll")
+        else:
+            if isinstance(error, JobTimeout):
+                status = "timeout"
+            elif isinstance(error, JobCancelled):
+                status = "cancelled"
+            else:
+                status = "failed"
+            self.stats["timeouts" if status == "timeout" else status] += 1
+            logger.warning(f"[JOBS] {job.provider}/{job.label} {status}: {error}")
+
+        if self.persist:
+            try:
+                await async_crud.finish_remote_job(
+                    job.key, status, error=str(error) if error else None, duration_s=round(duration, 2)
+                )
+            except Exception as e:
+                logger.warning(f"[JOBS] İş sonucu kaydedilemedi: {e}")
+
+        if not job.future.done():
+            if error is None:
+                job.future.set_result(result)
+            else:
+                job.future.set_exception(error)
+
+    # ---------- Durum ----------
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["pending"] = [
+            {"provider": job.provider, "label": job.label, "remote_id": job.remote_id,
+             "elapsed_s": round(job.elapsed, 1), "polls": job.polls, "progress": job.progress}
+            for job in self._jobs.values()
+        ]
+        stats["latency"] = {
+            f"{provider}/{label}": {
+                "samples": len(history),
+                "p50_s": round(statistics.median(history), 1),
+                "p90_s": round(quantile(list(history), 0.9), 1),
+            }
+            for (provider, label), history in self._history.items() if history
+        }
+        return stats
+
+    async def close(self):
+        """Döngüyü durdur (bekleyen işler DB'de kalır)"""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+        for task in self._starting.values():
+            task.cancel()
+        self._starting.clear()
+        for task in list(self._cancelling):
+            task.cancel()
+        for job in self._jobs.values():
+            if not job.future.done():
+                job.future.cancel()
+        self._jobs.clear()
+
+
+_tracker: Optional[JobTracker] = None
+
+
+def get_job_tracker() -> JobTracker:
+    """Global job tracker"""
+    global _tracker
+    if _tracker is None:
+        _tracker = JobTracker(
+            min_interval=settings.job_poll_min_interval,
+            max_interval=settings.job_poll_max_interval,
+            max_concurrent_polls=settings.job_poll_concurrency
+        )
+    return _tracker
+
+
+async def run_remote_job(
+    provider: str,
+    submit: Callable[[], Awaitable[Submission]],
+    label: str = "",
+    key_data: Any = None,
+    timeout: float = 600.0
+) -> Dict[str, Any]:
+    """get_job_tracker().run() kısayolu"""
+    return await get_job_tracker().run(provider, submit, label=label, key_data=key_data, timeout=timeout)
+
+
+async def shutdown_job_tracker():
+    """Tracker'ı kapat"""
+    global _tracker
+    if _tracker is not None:
+        await _tracker.close()
+        _tracker = None
@@ -0,0 +1,26 @@
+"""
+Olivenet Social Bot - LLM altyapısı (cache, worker pool, dispatch)
+"""
+
+from .cache import LLMCache, get_llm_cache, cached_call, make_cache_key
+from .dispatcher import Priority, llm_priority, set_llm_priority, get_dispatcher
+from .pool import ClaudeWorkerPool, PoolBusyError, WorkerError
+from .runner import complete, get_worker_pool, get_latency_stats, ClaudeCLIError
+
+__all__ = [
+    "LLMCache",
+    "get_llm_cache",
+    "cached_call",
+    "make_cache_key",
+    "Priority",
+    "llm_priority",
+    "set_llm_priority",
+    "get_dispatcher",
+    "ClaudeWorkerPool",
+    "PoolBusyError",
+    "WorkerError",
+    "ClaudeCLIError",
+    "complete",
+    "get_worker_pool",
+    "get_latency_stats",
+]
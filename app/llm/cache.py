@@ -0,0 +1,288 @@
+"""
+LLM Response Cache - Content-addressed, kalıcı Claude yanıt cache'i
+
+Aynı persona + prompt + model seçenekleri için tekrar `claude -p` çağrısı
+yapmak yerine daha önce alınmış yanıtı döndürür (infographic data retry'ları,
+değişmemiş prompt'la review_visual, vb.).
+
+- Key: sha256(persona + prompt + model seçenekleri)
+- SQLite'ta saklanır (data/llm_cache.db), restart sonrası da geçerlidir
+- TTL: süresi dolan kayıtlar okunmaz ve temizlenir
+- LRU eviction: kayıt sayısı veya toplam boyut limiti aşılınca en uzun
+  süredir kullanılmayanlar silinir
+- Hit/miss metrikleri: get_stats()
+- Doğrulama: çağıran `validate` verirse yanıt sadece doğrulamadan geçince
+  saklanır; doğrulamadan geçmeyen eski kayıt okunurken silinir (tek bir
+  bozuk / parse edilemeyen yanıt her retry'da tekrar dönmez)
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("llm_cache")
+
+
+def make_cache_key(persona: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+    """persona + prompt + model seçeneklerinden content-addressed key üret"""
+    h = hashlib.sha256()
+    h.update((persona or "").encode("utf-8"))
+    h.update(b"\x00")
+    h.update((prompt or "").encode("utf-8"))
+    h.update(b"\x00")
+    h.update(json.dumps(options or {}, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def is_cacheable_response(response: str) -> bool:
+    """Hata / boş yanıtlar cache'lenmez"""
+    if not response or not response.strip() or response.strip() == "{}":
+        return False
+    head = response.lstrip()[:200]
+    if head.startswith('{"error"'):
+        return False
+    return True
+
+
+class LLMCache:
+    """SQLite tabanlı, TTL + LRU eviction'lı yanıt cache'i"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        max_bytes: int = 100 * 1024 * 1024
+    ):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0,
+                    label TEXT
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(last_accessed)')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # ---------- Sync API ----------
+
+    def get(self, key: str) -> Optional[str]:
+        """Cache'ten yanıt al (yoksa / süresi dolmuşsa None)"""
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            response, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                conn.commit()
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            conn.execute(
+                "UPDATE llm_cache SET last_accessed = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                (now, key)
+            )
+            conn.commit()
+            self._stats["hits"] += 1
+            return response
+
+    def set(self, key: str, response: str, label: Optional[str] = None):
+        """Yanıtı cache'e yaz ve gerekiyorsa evict et"""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute('''
+                INSERT OR REPLACE INTO llm_cache
+                (cache_key, response, size_bytes, created_at, last_accessed, hit_count, label)
+                VALUES (?, ?, ?, ?, ?, 0, ?)
+            ''', (key, response, size, now, now, label))
+            self._stats["stores"] += 1
+            self._evict(conn, now)
+            conn.commit()
+
+    def delete(self, key: str):
+        """Tek kaydı sil (doğrulamadan geçmeyen yanıt)"""
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Süresi dolanları ve LRU sırasına göre limit aşımını sil"""
+        if self.ttl_seconds:
+            cur = conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._stats["expired"] += cur.rowcount
+
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute(
+            "SELECT cache_key, size_bytes FROM llm_cache ORDER BY last_accessed ASC"
+        ).fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+            count -= 1
+            total -= size
+            evicted += 1
+
+        self._stats["evictions"] += evicted
+
+    def clear(self):
+        """Tüm cache'i temizle"""
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrikleri ve cache boyutu"""
+        with self._lock:
+            conn = self._get_conn()
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+            ).fetchone()
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["entries"] = count
+        stats["size_bytes"] = total
+        return stats
+
+    # ---------- Async API (event loop'u bloklamaz) ----------
+
+    async def aget(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, response: str, label: Optional[str] = None):
+        await asyncio.to_thread(self.set, key, response, label)
+
+    async def adelete(self, key: str):
+        await asyncio.to_thread(self.delete, key)
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Global LLM cache (devre dışıysa None)"""
+    global _cache
+    if not settings.llm_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache(
+                    settings.data_dir / "llm_cache.db",
+                    ttl_seconds=settings.llm_cache_ttl_hours * 3600,
+                    max_entries=settings.llm_cache_max_entries,
+                    max_bytes=settings.llm_cache_max_mb * 1024 * 1024
+                )
+    return _cache
+
+
+async def cached_call(
+    persona: str,
+    prompt: str,
+    options: Dict[str, Any],
+    call,
+    use_cache: bool = True,
+    label: Optional[str] = None,
+    validate: Optional[Callable[[str], bool]] = None
+) -> str:
+    """
+    Cache'li LLM çağrısı.
+
+    Args:
+        persona: Agent persona metni (key'e dahil)
+        prompt: Prompt
+        options: Model / CLI seçenekleri (key'e dahil)
+        call: Cache miss'te çağrılacak coroutine factory: `lambda: ...`
+        use_cache: False ise cache atlanır (taze çıktı gereken yaratıcı çağrılar)
+        label: Metriklerde görünecek etiket (örn. "reviewer")
+        validate: Yanıtı çağıranın beklediği formatta mı kontrol eder (örn. JSON
+            parse); False dönen yanıt saklanmaz, cache'teki kaydı silinir
+
+    Returns:
+        LLM yanıtı
+    """
+    cache = get_llm_cache() if use_cache else None
+    if cache is None:
+        return await call()
+
+    key = make_cache_key(persona, prompt, options)
+    try:
+        cached = await cache.aget(key)
+    except Exception as e:
+        logger.warning(f"LLM cache read failed: {e}")
+        cached = None
+
+    if cached is not None:
+        if validate is None or validate(cached):
+            logger.debug(f"LLM cache hit ({label or '-'}) {key[:12]}")
+            return cached
+        logger.info(f"LLM cache entry failed validation, evicting ({label or '-'}) {key[:12]}")
+        try:
+            await cache.adelete(key)
+        except Exception as e:
+            logger.warning(f"LLM cache delete failed: {e}")
+
+    response = await call()
+
+    if is_cacheable_response(response) and (validate is None or validate(response)):
+        try:
+            await cache.aset(key, response, label)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    return response
@@ -0,0 +1,244 @@
+"""
+LLM Dispatcher - Tüm Claude çağrıları için global öncelik kuyruğu
+
+Planner, Creator, Reviewer, Orchestrator ve claude_helper çağrıları
+runner.complete() üzerinden bu kuyruktan geçer:
+
+- Öncelik sınıfları: INTERACTIVE (Telegram) > SCHEDULED (planlı paylaşım)
+  > BACKGROUND (analytics, haftalık plan, strateji)
+- Global eşzamanlılık limiti (llm_max_concurrency)
+- Token bucket: dakikada en fazla llm_rate_per_minute çağrı başlatılır
+  (llm_rate_burst kadar ani artışa izin verilir)
+- Aynı öncelik sınıfında agent'lar arasında round-robin (bir agent'ın
+  uzun kuyruğu diğerlerini bekletmez)
+- Her çağrı PerformanceTimer ile kuyruk bekleme süresi ve derinliğiyle loglanır
+
+Öncelik contextvar ile taşınır; çağıran kod sadece bağlamı belirler:
+
+    with llm_priority(Priority.INTERACTIVE):
+        await creator.execute(...)
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from app.config import settings
+from app.utils.logger import AgentLoggerAdapter, PerformanceTimer
+
+
+class Priority(IntEnum):
+    """Küçük değer önce çalışır"""
+    INTERACTIVE = 0
+    SCHEDULED = 1
+    BACKGROUND = 2
+
+
+_current_priority: ContextVar[Priority] = ContextVar("llm_priority", default=Priority.SCHEDULED)
+
+
+def get_llm_priority() -> Priority:
+    return _current_priority.get()
+
+
+def set_llm_priority(priority: Priority):
+    """Geçerli task bağlamının önceliğini ayarla (Telegram update handler'ı gibi)"""
+    _current_priority.set(priority)
+
+
+@contextmanager
+def llm_priority(priority: Priority):
+    """Blok içindeki (ve buradan başlatılan task'lardaki) LLM çağrılarının önceliği"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class TokenBucket:
+    """Dakika bazlı token bucket (rate_per_minute <= 0 ise limitsiz)"""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class LLMDispatcher:
+    """Öncelikli, rate-limit'li, agent'lar arası adil LLM çağrı kuyruğu"""
+
+    def __init__(self, max_concurrency: int = 3, rate_per_minute: float = 30, burst: int = 10):
+        self.max_concurrency = max(1, max_concurrency)
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self.logger = AgentLoggerAdapter("llm_dispatcher")
+
+        # priority -> agent -> bekleyen future'lar (agent sırası round-robin için döner)
+        self._queues: Dict[Priority, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            p: OrderedDict() for p in Priority
+        }
+        self._active = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stats = {
+            p.name: {"dispatched": 0, "total_wait_ms": 0.0, "max_wait_ms": 0.0} for p in Priority
+        }
+
+    # ---------- Kuyruk ----------
+
+    def queue_depth(self, priority: Optional[Priority] = None) -> int:
+        priorities = [priority] if priority is not None else list(Priority)
+        return sum(
+            sum(1 for f in waiters if not f.done())
+            for p in priorities
+            for waiters in self._queues[p].values()
+        )
+
+    def _pop_next(self) -> Optional[asyncio.Future]:
+        """En yüksek öncelikli sınıftan, agent'lar arasında sırayla bir bekleyen al"""
+        for priority in Priority:
+            agents = self._queues[priority]
+            while agents:
+                agent, waiters = next(iter(agents.items()))
+                while waiters and waiters[0].done():
+                    waiters.popleft()  # İptal edilmiş bekleyen
+                if not waiters:
+                    del agents[agent]
+                    continue
+                fut = waiters.popleft()
+                if waiters:
+                    agents.move_to_end(agent)
+                else:
+                    del agents[agent]
+                return fut
+        return None
+
+    def _pump(self):
+        """Boş slot ve token varsa sıradaki bekleyenleri başlat"""
+        self._timer = None
+        while self._active < self.max_concurrency and self.queue_depth() > 0:
+            if not self.bucket.try_take():
+                loop = asyncio.get_running_loop()
+                self._timer = loop.call_later(self.bucket.time_until_token(), self._pump)
+                return
+            fut = self._pop_next()
+            if fut is None:
+                return
+            self._active += 1
+            fut.set_result(True)
+
+    def _schedule_pump(self):
+        if self._timer is None:
+            self._pump()
+
+    def _release(self):
+        self._active -= 1
+        self._schedule_pump()
+
+    # ---------- Public ----------
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        agent: str = "unknown",
+        label: Optional[str] = None,
+        priority: Optional[Priority] = None
+    ) -> Any:
+        """
+        Çağrıyı kuyruğa al, sırası gelince çalıştır.
+
+        Args:
+            call: Coroutine factory (örn. lambda: run_claude_cli(...))
+            agent: Adil paylaşım anahtarı (örn. "creator")
+            label: Metrik etiketi (örn. "creator._shorten_caption")
+            priority: Verilmezse geçerli bağlamın önceliği kullanılır
+        """
+        priority = get_llm_priority() if priority is None else priority
+        fut = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(agent, deque()).append(fut)
+        depth = self.queue_depth()
+        enqueued = time.perf_counter()
+        self._schedule_pump()
+
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Slot verildi ama çağıran iptal edildi
+                self._release()
+            raise
+
+        wait_ms = (time.perf_counter() - enqueued) * 1000
+        stats = self._stats[priority.name]
+        stats["dispatched"] += 1
+        stats["total_wait_ms"] += wait_ms
+        stats["max_wait_ms"] = max(stats["max_wait_ms"], wait_ms)
+
+        try:
+            with PerformanceTimer(
+                self.logger, "llm_call",
+                llm_label=label or agent,
+                priority=priority.name,
+                queue_wait_ms=round(wait_ms, 1),
+                queue_depth=depth
+            ):
+                return await call()
+        finally:
+            self._release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Kuyruk derinliği, aktif çağrı ve öncelik bazında bekleme süreleri"""
+        per_priority = {}
+        for p in Priority:
+            s = self._stats[p.name]
+            per_priority[p.name] = {
+                "queued": self.queue_depth(p),
+                "dispatched": s["dispatched"],
+                "avg_wait_ms": round(s["total_wait_ms"] / s["dispatched"], 1) if s["dispatched"] else 0.0,
+                "max_wait_ms": round(s["max_wait_ms"], 1),
+            }
+        return {
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "queued": self.queue_depth(),
+            "priorities": per_priority,
+        }
+
+
+_dispatcher: Optional[LLMDispatcher] = None
+
+
+def get_dispatcher() -> LLMDispatcher:
+    """Global LLM dispatcher"""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = LLMDispatcher(
+            max_concurrency=settings.llm_max_concurrency,
+            rate_per_minute=settings.llm_rate_per_minute,
+            burst=settings.llm_rate_burst
+        )
+    return _dispatcher
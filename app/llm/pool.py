@@ -0,0 +1,279 @@
+"""
+Claude Worker Pool - Önceden başlatılmış Claude CLI süreçleri
+
+Her agent çağrısında yeni bir `claude` süreci başlatmak kısa çağrılarda
+(_shorten_caption, generate_comment_cta, review_visual) süreyi process
+startup'ına harcatır. Bu pool, stream-json modunda önceden başlatılmış
+(sıcak) worker'ları tutar ve prompt'ları onlara dağıtır.
+
+Her worker tek bir istek için kullanılır: stream-json süreci tek bir CLI
+oturumudur ve önceki prompt'lar sonraki yanıtları etkiler (farklı agent /
+persona'ların bağlamı birbirine karışır). Kullanılan worker kapatılır ve
+yerine yenisi arka planda başlatılır; böylece her istek temiz bir oturumla
+çalışır, süreç başlangıcı yine isteğin dışında kalır.
+
+Worker protokolü (Claude CLI stream-json):
+    stdin  -> {"type": "user", "message": {"role": "user", "content": "<prompt>"}}
+    stdout <- ... {"type": "result", "result": "<yanıt>", "is_error": false}
+
+- size: eşzamanlı (hazır bekleyen) worker sayısı
+- Health check: ölü / takılmış worker'lar arka planda yenilenir
+- Back-pressure: tüm worker'lar meşgulken en fazla `max_waiters` çağrı
+  bekler, `acquire_timeout` aşılırsa PoolBusyError fırlatılır
+
+Offline yük testi için scripts/fake_claude_worker.py aynı protokolü konuşur.
+"""
+
+import asyncio
+import json
+import time
+from typing import List, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger("llm_pool")
+
+STREAM_JSON_ARGS = ["-p", "--input-format", "stream-json", "--output-format", "stream-json", "--verbose"]
+
+
+class PoolBusyError(Exception):
+    """Tüm worker'lar meşgul ve bekleme kuyruğu dolu / bekleme süresi aşıldı"""
+
+
+class WorkerError(Exception):
+    """Worker hatalı yanıt döndü veya beklenmedik şekilde kapandı"""
+
+
+class ClaudeWorker:
+    """Tek bir uzun ömürlü Claude CLI süreci"""
+
+    def __init__(self, command: List[str], cwd: Optional[str] = None, worker_id: int = 0):
+        self.command = command
+        self.cwd = cwd
+        self.worker_id = worker_id
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.request_count = 0
+        self.started_at = 0.0
+        self.broken = False
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=self.cwd,
+            limit=16 * 1024 * 1024  # Uzun JSON satırları için
+        )
+        self.started_at = time.monotonic()
+        self.request_count = 0
+        self.broken = False
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None and not self.broken
+
+    def is_fresh(self) -> bool:
+        """Çalışıyor ve henüz hiç istek almamış (oturumu boş)"""
+        return self.is_alive() and self.request_count == 0
+
+    async def request(self, prompt: str, timeout: float) -> str:
+        """Prompt gönder, result mesajını bekle"""
+        if not self.is_alive():
+            raise WorkerError(f"worker {self.worker_id} not running")
+        if self.request_count:
+            # Aynı oturuma ikinci prompt önceki bağlamı görür
+            raise WorkerError(f"worker {self.worker_id} already served a request")
+
+        self.request_count += 1
+        message = {"type": "user", "message": {"role": "user", "content": prompt}}
+        try:
+            self.process.stdin.write((json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8"))
+            await self.process.stdin.drain()
+            return await asyncio.wait_for(self._read_result(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Yanıt ortasında kalan worker'ın durumu belirsiz, yenilenmeli
+            self.broken = True
+            raise
+        except (BrokenPipeError, ConnectionResetError) as e:
+            self.broken = True
+            raise WorkerError(f"worker {self.worker_id} pipe closed: {e}")
+
+    async def _read_result(self) -> str:
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                self.broken = True
+                raise WorkerError(f"worker {self.worker_id} exited (code {self.process.returncode})")
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if event.get("type") != "result":
+                continue
+            if event.get("is_error"):
+                raise WorkerError(str(event.get("result") or event.get("error") or "unknown error"))
+            return event.get("result") or ""
+
+    async def stop(self):
+        if self.process and self.process.returncode is None:
+            try:
+                self.process.stdin.close()
+            except Exception:
+                pass
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=2)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+
+
+class ClaudeWorkerPool:
+    """Sıcak, tek kullanımlık Claude worker havuzu"""
+
+    def __init__(
+        self,
+        command: List[str],
+        size: int = 2,
+        max_waiters: int = 16,
+        acquire_timeout: float = 120.0,
+        health_interval: float = 30.0,
+        cwd: Optional[str] = None
+    ):
+        self.command = command
+        self.size = max(1, size)
+        self.max_waiters = max_waiters
+        self.acquire_timeout = acquire_timeout
+        self.health_interval = health_interval
+        self.cwd = cwd
+
+        self._idle: Optional[asyncio.Queue] = None
+        self._workers: List[ClaudeWorker] = []
+        self._waiters = 0
+        self._next_id = 0
+        self._health_task: Optional[asyncio.Task] = None
+        self._started = False
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._pending = set()
+        self.stats = {"requests": 0, "recycled": 0, "replaced": 0, "rejected": 0, "errors": 0}
+
+    async def start(self):
+        """Worker'ları başlat (ilk request'te otomatik çağrılır)"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._started:
+                return
+            self._idle = asyncio.Queue()
+            for _ in range(self.size):
+                worker = await self._spawn()
+                self._idle.put_nowait(worker)
+            self._health_task = asyncio.create_task(self._health_loop())
+            self._started = True
+            logger.info(f"Claude worker pool started ({self.size} workers)")
+
+    async def _spawn(self) -> ClaudeWorker:
+        self._next_id += 1
+        worker = ClaudeWorker(self.command, cwd=self.cwd, worker_id=self._next_id)
+        await worker.start()
+        self._workers.append(worker)
+        return worker
+
+    async def _replace(self, worker: ClaudeWorker) -> ClaudeWorker:
+        await worker.stop()
+        if worker in self._workers:
+            self._workers.remove(worker)
+        return await self._spawn()
+
+    async def _release(self, worker: ClaudeWorker):
+        """Kullanılan worker'ı kapat, yerine temiz oturumlu yenisini kuyruğa koy"""
+        try:
+            if worker.request_count:
+                self.stats["recycled"] += 1
+            else:
+                self.stats["replaced"] += 1
+            worker = await self._replace(worker)
+        except Exception as e:
+            logger.error(f"Worker restart failed: {e}")
+            # Havuz boyutunu korumak için health loop tekrar deneyecek
+            self._workers = [w for w in self._workers if w is not worker]
+            return
+        self._idle.put_nowait(worker)
+
+    async def request(self, prompt: str, timeout: float = 120) -> str:
+        """
+        Boş bir worker'a prompt gönder.
+
+        Raises:
+            PoolBusyError: Back-pressure (bekleme kuyruğu dolu veya süre aşıldı)
+            asyncio.TimeoutError: Worker yanıt vermedi
+            WorkerError: Worker hata döndü
+        """
+        if not self._started:
+            await self.start()
+
+        # Henüz worker almamış bekleyenler de boştaki worker'ları tüketecek
+        if self._waiters - self._idle.qsize() >= self.max_waiters:
+            self.stats["rejected"] += 1
+            raise PoolBusyError(f"All {self.size} workers busy, {self._waiters} waiting")
+
+        self._waiters += 1
+        try:
+            worker = await asyncio.wait_for(self._idle.get(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            raise PoolBusyError(f"No worker available within {self.acquire_timeout}s")
+        finally:
+            self._waiters -= 1
+
+        self.stats["requests"] += 1
+        try:
+            return await worker.request(prompt, timeout)
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            # Worker bir daha kullanılmaz; yenisi çağıranı bekletmeden arka planda başlatılır
+            task = asyncio.create_task(self._release(worker))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _health_loop(self):
+        """Ölü boştaki worker'ları yenile, eksik worker'ları tamamla"""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            try:
+                idle = []
+                while not self._idle.empty():
+                    idle.append(self._idle.get_nowait())
+                for worker in idle:
+                    if not worker.is_fresh():
+                        self.stats["replaced"] += 1
+                        worker = await self._replace(worker)
+                    self._idle.put_nowait(worker)
+
+                missing = self.size - len(self._workers)
+                for _ in range(missing):
+                    self._idle.put_nowait(await self._spawn())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker pool health check failed: {e}")
+
+    def get_status(self) -> dict:
+        return {
+            **self.stats,
+            "size": self.size,
+            "alive": sum(1 for w in self._workers if w.is_alive()),
+            "idle": self._idle.qsize() if self._idle else 0,
+            "waiting": self._waiters,
+        }
+
+    async def close(self):
+        if self._health_task:
+            self._health_task.cancel()
+        for task in list(self._pending):
+            task.cancel()
+        for worker in list(self._workers):
+            await worker.stop()
+        self._workers = []
+        self._started = False
@@ -0,0 +1,152 @@
+"""
+Claude CLI Runner - Tüm Claude CLI çağrılarının tek giriş noktası
+
+- llm_pool_enabled=True: istek sıcak worker pool'una gider (app/llm/pool.py)
+- llm_pool_enabled=False: her çağrı için tek seferlik `claude -p ... --print`
+
+Tüm çağrılar önce global dispatcher kuyruğundan geçer (öncelik, rate limit,
+agent'lar arası adil paylaşım - app/llm/dispatcher.py).
+
+Her çağrı etiket bazında (örn. "creator._shorten_caption") süre olarak
+kaydedilir; get_latency_stats() p50/p95 değerlerini verir.
+"""
+
+import asyncio
+import shlex
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.config import settings
+from app.utils.logger import get_logger
+from .dispatcher import get_dispatcher
+from .pool import ClaudeWorkerPool, STREAM_JSON_ARGS
+
+logger = get_logger("llm_runner")
+
+# Etiket başına saklanan son ölçüm sayısı
+LATENCY_WINDOW = 500
+
+
+class ClaudeCLIError(Exception):
+    """Claude CLI sıfır olmayan exit code ile döndü"""
+
+
+def get_cli_command() -> List[str]:
+    """Ayarlardan CLI komutunu çöz (örn. "claude" veya "python scripts/fake_claude_worker.py")"""
+    return shlex.split(settings.llm_cli_command)
+
+
+async def run_claude_cli(prompt: str, timeout: float, cwd: Optional[str] = None) -> str:
+    """
+    Tek seferlik Claude CLI çağrısı.
+
+    Raises:
+        asyncio.TimeoutError: Süre aşıldı (süreç öldürülür)
+        ClaudeCLIError: CLI hata döndü
+        FileNotFoundError: CLI kurulu değil
+    """
+    process = await asyncio.create_subprocess_exec(
+        *get_cli_command(), "-p", prompt, "--print",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+
+    if process.returncode != 0:
+        raise ClaudeCLIError(stderr.decode("utf-8", errors="replace").strip() or f"exit code {process.returncode}")
+
+    return stdout.decode("utf-8").strip()
+
+
+# ============ WORKER POOL ============
+
+_pool: Optional[ClaudeWorkerPool] = None
+
+
+def get_worker_pool() -> Optional[ClaudeWorkerPool]:
+    """Global worker pool (devre dışıysa None)"""
+    global _pool
+    if not settings.llm_pool_enabled:
+        return None
+    if _pool is None:
+        _pool = ClaudeWorkerPool(
+            [*get_cli_command(), *STREAM_JSON_ARGS],
+            size=settings.llm_pool_size,
+            max_waiters=settings.llm_pool_max_waiters,
+            acquire_timeout=settings.llm_pool_acquire_timeout,
+            cwd=str(settings.base_dir)
+        )
+    return _pool
+
+
+async def shutdown_worker_pool():
+    """Worker süreçlerini kapat"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+# ============ LATENCY METRICS ============
+
+_latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+
+
+def record_latency(label: str, duration_ms: float):
+    _latencies[label].append(duration_ms)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def get_latency_stats() -> Dict[str, Dict[str, Any]]:
+    """Etiket bazında çağrı sayısı ve p50/p95 gecikme (ms)"""
+    stats = {}
+    for label, values in _latencies.items():
+        ordered = sorted(values)
+        stats[label] = {
+            "count": len(ordered),
+            "p50_ms": round(_percentile(ordered, 50), 1),
+            "p95_ms": round(_percentile(ordered, 95), 1),
+        }
+    return stats
+
+
+# ============ PUBLIC API ============
+
+async def complete(prompt: str, timeout: float = 120, label: Optional[str] = None) -> str:
+    """
+    Prompt'u Claude'a gönder ve yanıt metnini döndür.
+
+    Raises:
+        asyncio.TimeoutError, ClaudeCLIError, WorkerError, PoolBusyError
+
+    Label "agent.aksiyon" formatındaysa agent kısmı dispatcher'da adil
+    paylaşım anahtarı olarak kullanılır. Timeout sadece CLI çağrısını kapsar,
+    kuyrukta bekleme süresi dahil değildir.
+    """
+    label = label or "unlabeled"
+    pool = get_worker_pool()
+
+    async def call() -> str:
+        if pool is not None:
+            return await pool.request(prompt, timeout=timeout)
+        return await run_claude_cli(prompt, timeout, cwd=str(settings.base_dir))
+
+    start = time.perf_counter()
+    try:
+        return await get_dispatcher().run(call, agent=label.split(".", 1)[0], label=label)
+    finally:
+        record_latency(label, (time.perf_counter() - start) * 1000)
+
@@ -0,0 +1,42 @@
+"""
+Olivenet Social Bot - Medya işleme altyapısı (ffmpeg/ffprobe)
+"""
+
+from .runner import (
+    MediaProgress,
+    ProgressCallback,
+    MediaProcessError,
+    MediaResult,
+    run_media,
+    run_ffprobe,
+)
+from .probe import MediaInfo, MediaProbeCache, ffmpeg_available, get_probe_cache, probe_duration, probe_media
+from .mp3 import Mp3DurationCounter, mp3_duration
+from .concat import concat_audio, concat_stream_copy, keyframe_times, probe_compatible
+from .render import RenderPlan, RenderSegment, finalize_video, render_single_pass, render_stepwise
+
+__all__ = [
+    "MediaProgress",
+    "ProgressCallback",
+    "MediaProcessError",
+    "MediaResult",
+    "run_media",
+    "run_ffprobe",
+    "MediaInfo",
+    "MediaProbeCache",
+    "ffmpeg_available",
+    "get_probe_cache",
+    "probe_duration",
+    "probe_media",
+    "Mp3DurationCounter",
+    "mp3_duration",
+    "concat_audio",
+    "concat_stream_copy",
+    "keyframe_times",
+    "probe_compatible",
+    "RenderPlan",
+    "RenderSegment",
+    "finalize_video",
+    "render_single_pass",
+    "render_stepwise",
+]
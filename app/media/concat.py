@@ -0,0 +1,307 @@
+"""
+Concat Fast Path - Uyumlu segmentleri yeniden encode etmeden birleştir
+
+Segmentler aynı codec, çözünürlük, pixel format, frame rate ve timebase'e
+(ve aynı audio parametrelerine) sahipse:
+
+- Düz kesme (crossfade=0): concat demuxer ile tamamen stream copy
+- Crossfade: sadece her geçişteki kısa pencere yeniden encode edilir
+  (önceki segmentin son keyframe'inden sonrası + sonraki segmentin ilk
+  keyframe'ine kadarki kısım, xfade/acrossfade ile). Segmentlerin
+  ortası stream copy edilir.
+
+Encode maliyeti O(toplam süre) yerine O(geçiş sayısı x geçiş uzunluğu)
+olur. Parçalar MPEG-TS olarak yazılır (SPS/PPS her parçada in-band), son
+adımda concat demuxer ile MP4'e kopyalanır.
+
+Uyumsuz segmentlerde veya herhangi bir adım başarısız olursa None döner;
+çağıran tam encode yoluna devam eder.
+
+concat_audio: ses klipleri (örn. diyalog satırları) arasına sessizlik
+koyarak tek geçişte, akış halinde birleştirir.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger import get_logger
+from .probe import MediaInfo, probe_duration, probe_media
+from .runner import ProgressCallback, run_ffprobe, run_media
+
+logger = get_logger("media_concat")
+
+# Stream copy yalnızca Annex B'ye çevrilebilen codec'lerde
+COPY_VIDEO_CODECS = {"h264": "h264_mp4toannexb", "hevc": "hevc_mp4toannexb"}
+
+
+def stream_signature(info: MediaInfo) -> Optional[Tuple]:
+    """Concat uyumluluğunu belirleyen stream parametreleri (video yoksa None)"""
+    video = info.video_stream
+    if not video:
+        return None
+    audio = info.audio_stream
+    audio_sig = (
+        audio.get("codec_name"), audio.get("sample_rate"), audio.get("channels")
+    ) if audio else None
+    return (
+        video.get("codec_name"), video.get("width"), video.get("height"),
+        video.get("pix_fmt"), video.get("r_frame_rate"), video.get("time_base"),
+        audio_sig,
+    )
+
+
+async def probe_compatible(paths: List[str]) -> Optional[List[MediaInfo]]:
+    """Tüm segmentler stream copy ile birleştirilebiliyorsa MediaInfo listesi"""
+    infos = []
+    for path in paths:
+        info = await probe_media(path)
+        if info is None or not info.duration:
+            return None
+        infos.append(info)
+
+    signatures = {stream_signature(info) for info in infos}
+    if len(signatures) != 1 or None in signatures:
+        return None
+
+    video = infos[0].video_stream
+    if video.get("codec_name") not in COPY_VIDEO_CODECS:
+        return None
+    # Tam encode yolu her zaman 9:16 çıktı üretir; farklı oranlı kaynaklar o yoldan gider
+    if video.get("width", 0) * 16 != video.get("height", 0) * 9:
+        return None
+    return infos
+
+
+async def keyframe_times(path: str) -> List[float]:
+    """Video stream'indeki keyframe zamanları (paket bayraklarından, decode etmeden)"""
+    result = await run_ffprobe([
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags",
+        "-of", "csv=p=0",
+        path
+    ], timeout=60)
+    times = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags:
+            try:
+                times.append(float(pts))
+            except ValueError:
+                continue
+    return sorted(times)
+
+
+def _copy_cmd(info: MediaInfo, start: float, end: float, output: str) -> List[str]:
+    """[start, end) aralığını MPEG-TS'e stream copy et (start bir keyframe olmalı)"""
+    bsf = COPY_VIDEO_CODECS[info.video_codec]
+    cmd = ["ffmpeg", "-y"]
+    if start > 0:
+        cmd.extend(["-ss", f"{start:.6f}"])
+    cmd.extend([
+        "-i", info.path,
+        "-t", f"{end - start:.6f}",
+        "-map", "0:v:0",
+    ])
+    if info.has_audio:
+        cmd.extend(["-map", "0:a:0"])
+    cmd.extend(["-c", "copy", "-bsf:v", bsf, "-f", "mpegts", output])
+    return cmd
+
+
+def _transition_cmd(
+    prev: MediaInfo,
+    nxt: MediaInfo,
+    tail_start: float,
+    head_end: float,
+    crossfade: float,
+    output: str
+) -> List[str]:
+    """Önceki segmentin kuyruğu + sonraki segmentin başı -> xfade ile encode edilmiş geçiş parçası"""
+    video = prev.video_stream
+    fps = video.get("r_frame_rate", "30/1")
+    pix_fmt = video.get("pix_fmt", "yuv420p")
+    tail_len = prev.duration - tail_start
+
+    norm = f"setpts=PTS-STARTPTS,fps={fps},format={pix_fmt},settb=AVTB"
+    parts = [
+        f"[0:v]{norm}[t]",
+        f"[1:v]{norm}[h]",
+        f"[t][h]xfade=transition=fade:duration={crossfade}:offset={tail_len - crossfade:.6f}[v]",
+    ]
+    if prev.has_audio:
+        parts.extend([
+            "[0:a]asetpts=PTS-STARTPTS[ta]",
+            "[1:a]asetpts=PTS-STARTPTS[ha]",
+            f"[ta][ha]acrossfade=d={crossfade}:c1=tri:c2=tri[a]",
+        ])
+
+    cmd = [
+        "ffmpeg", "-y",
+        "-ss", f"{tail_start:.6f}", "-i", prev.path,
+        "-t", f"{head_end:.6f}", "-i", nxt.path,
+        "-filter_complex", ";".join(parts),
+        "-map", "[v]",
+    ]
+    if prev.has_audio:
+        audio = prev.audio_stream
+        cmd.extend(["-map", "[a]", "-c:a", audio.get("codec_name", "aac"), "-b:a", "128k",
+                    "-ar", str(audio.get("sample_rate", 44100)), "-ac", str(audio.get("channels", 2))])
+    cmd.extend([
+        "-c:v", "libx264" if prev.video_codec == "h264" else "libx265",
+        "-preset", "medium", "-crf", "23", "-pix_fmt", pix_fmt,
+        "-f", "mpegts", output
+    ])
+    return cmd
+
+
+async def _join_parts(parts: List[str], output_path: str, has_audio: bool, workdir: str) -> bool:
+    list_path = os.path.join(workdir, "parts.txt")
+    with open(list_path, "w") as f:
+        for part in parts:
+            f.write(f"file '{part}'\n")
+
+    cmd = ["ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy"]
+    if has_audio:
+        cmd.extend(["-bsf:a", "aac_adtstoasc"])
+    cmd.extend(["-movflags", "+faststart", output_path])
+    result = await run_media(cmd, timeout=300)
+    if not result.success:
+        logger.warning(f"[CONCAT] Parça birleştirme başarısız: {result.error[:200]}")
+    return result.success
+
+
+async def concat_stream_copy(
+    video_paths: List[str],
+    output_path: str,
+    crossfade: float = 0.0,
+    progress: Optional[ProgressCallback] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Uyumlu segmentleri stream copy ile birleştir (crossfade varsa sadece geçişler encode edilir).
+
+    Returns:
+        concatenate_videos_with_crossfade formatında sonuç veya uygun değilse / başarısızsa None
+    """
+    if not settings.media_concat_stream_copy:
+        return None
+
+    infos = await probe_compatible(video_paths)
+    if infos is None:
+        return None
+
+    started = time.monotonic()
+    n = len(infos)
+    has_audio = infos[0].has_audio
+    if has_audio and infos[0].audio_stream.get("codec_name") != "aac":
+        return None
+
+    # Her segmentin stream copy edilecek [start, end) aralığı (keyframe sınırlarında)
+    bounds = [(0.0, info.duration) for info in infos]
+    if crossfade > 0:
+        for i, info in enumerate(infos):
+            keyframes = await keyframe_times(info.path)
+            start, end = 0.0, info.duration
+            if i > 0:
+                start = next((k for k in keyframes if k >= crossfade), None)
+            if i < n - 1:
+                end = max((k for k in keyframes if k <= info.duration - crossfade), default=None)
+            if start is None or end is None or end <= start:
+                logger.info(f"[CONCAT] {os.path.basename(info.path)}: uygun keyframe yok, tam encode")
+                return None
+            bounds[i] = (start, end)
+
+    workdir = tempfile.mkdtemp(prefix="concat_", dir=os.path.dirname(output_path) or None)
+    try:
+        parts = []
+        encoded_s = 0.0
+        for i, info in enumerate(infos):
+            start, end = bounds[i]
+            middle = os.path.join(workdir, f"part_{i:02d}_copy.ts")
+            result = await run_media(_copy_cmd(info, start, end, middle), timeout=120)
+            if not result.success:
+                logger.warning(f"[CONCAT] Stream copy başarısız: {result.error[:200]}")
+                return None
+            parts.append(middle)
+
+            if crossfade > 0 and i < n - 1:
+                nxt_start = bounds[i + 1][0]
+                window = (info.duration - end) + nxt_start - crossfade
+                transition = os.path.join(workdir, f"part_{i:02d}_xfade.ts")
+                result = await run_media(
+                    _transition_cmd(info, infos[i + 1], end, nxt_start, crossfade, transition),
+                    timeout=120, progress=progress, duration=window
+                )
+                if not result.success:
+                    logger.warning(f"[CONCAT] Geçiş encode başarısız: {result.error[:200]}")
+                    return None
+                encoded_s += window
+                parts.append(transition)
+
+        if not await _join_parts(parts, output_path, has_audio, workdir):
+            return None
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    total_duration = sum(info.duration for info in infos) - (n - 1) * crossfade
+    elapsed = time.monotonic() - started
+    logger.info(f"[CONCAT] Stream copy: {n} segment, {total_duration:.1f}s çıktı, "
+                f"{encoded_s:.1f}s encode edildi ({elapsed:.1f}s)")
+
+    return {
+        "success": True,
+        "output_path": output_path,
+        "total_duration": await probe_duration(output_path) or total_duration,
+        "segment_count": n,
+        "file_size_mb": round(os.path.getsize(output_path) / (1024 * 1024), 2),
+        "stream_copy": True,
+        "encoded_seconds": round(encoded_s, 2),
+    }
+
+
+async def concat_audio(
+    audio_paths: List[str],
+    output_path: str,
+    gap_ms: int = 0,
+    bitrate: str = "128k",
+    timeout: float = 300
+) -> bool:
+    """
+    Ses dosyalarını sırayla, aralarına gap_ms sessizlik koyarak MP3'e birleştir.
+
+    ffmpeg concat filtresi girdileri akış halinde decode eder; segmentlerin
+    tamamı belleğe alınmaz. Sample rate / kanal düzeni ilk dosyadan alınır,
+    diğer girdiler ona resample edilir.
+    """
+    if not audio_paths:
+        return False
+
+    info = await probe_media(audio_paths[0])
+    stream = (info.audio_stream if info else None) or {}
+    sample_rate = int(stream.get("sample_rate") or 44100)
+    layout = stream.get("channel_layout") or ("stereo" if stream.get("channels") == 2 else "mono")
+
+    cmd = ["ffmpeg", "-y"]
+    for path in audio_paths:
+        cmd.extend(["-i", path])
+
+    filters, labels = [], []
+    for i in range(len(audio_paths)):
+        filters.append(f"[{i}:a]aresample={sample_rate},aformat=sample_fmts=fltp:channel_layouts={layout}[a{i}]")
+        labels.append(f"[a{i}]")
+        if gap_ms > 0 and i < len(audio_paths) - 1:
+            filters.append(f"anullsrc=r={sample_rate}:cl={layout},atrim=duration={gap_ms / 1000:.3f}[g{i}]")
+            labels.append(f"[g{i}]")
+    filters.append(f"{''.join(labels)}concat=n={len(labels)}:v=0:a=1[out]")
+
+    cmd.extend([
+        "-filter_complex", ";".join(filters), "-map", "[out]",
+        "-c:a", "libmp3lame", "-b:a", bitrate, output_path
+    ])
+    result = await run_media(cmd, timeout=timeout)
+    if not result.success:
+        logger.warning(f"[CONCAT] Ses birleştirme başarısız: {result.error[:200]}")
+    return result.success
@@ -0,0 +1,159 @@
+"""
+MP3 Frame Sayacı - ffprobe olmadan, akış halinde MP3 süresi
+
+Dosya indirilirken gelen chunk'lar feed() ile verilir; frame header'ları
+okunup frame'in geri kalanı atlanır, yani bellekte en fazla bir header
+kadar veri tutulur. Süre = toplam sample / sample rate.
+
+    counter = Mp3DurationCounter()
+    async for chunk in response.aiter_bytes():
+        f.write(chunk)
+        counter.feed(chunk)
+    counter.duration  # saniye
+
+- Baştaki ID3v2 tag'i atlanır
+- İlk frame Xing/Info (VBR/LAME) header'ı ise ses frame'i sayılmaz
+- Geçersiz byte'larda bir sonraki frame sync'ine kadar ilerlenir (ID3v1 vb.)
+"""
+
+from typing import Optional, Tuple
+
+# Bitrate tabloları (kbps), index 0 = free format (desteklenmez)
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# version bitleri -> (tablo versiyonu, sample rate'ler)
+_VERSIONS = {
+    3: (1, (44100, 48000, 32000)),  # MPEG-1
+    2: (2, (22050, 24000, 16000)),  # MPEG-2
+    0: (2, (11025, 12000, 8000)),   # MPEG-2.5
+}
+
+# layer bitleri -> layer numarası
+_LAYERS = {3: 1, 2: 2, 1: 3}
+
+
+def parse_frame_header(header: bytes) -> Optional[Tuple[int, int, int, int]]:
+    """
+    4 byte MPEG audio frame header'ı.
+
+    Returns:
+        (frame_length, samples, sample_rate, xing_offset) veya geçersizse None
+    """
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (header[1] >> 3) & 0x03
+    layer = _LAYERS.get((header[1] >> 1) & 0x03)
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version_bits not in _VERSIONS or layer is None or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    version, sample_rates = _VERSIONS[version_bits]
+    bitrate = _BITRATES[(version, layer)][bitrate_index] * 1000
+    sample_rate = sample_rates[rate_index]
+    padding = (header[2] >> 1) & 0x01
+    mono = (header[3] >> 6) == 3
+
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or version == 1) else 576
+        frame_length = samples // 8 * bitrate // sample_rate + padding
+
+    # Xing/Info tag'i side info'dan hemen sonra gelir
+    if version == 1:
+        xing_offset = 4 + (17 if mono else 32)
+    else:
+        xing_offset = 4 + (9 if mono else 17)
+    return frame_length, samples, sample_rate, xing_offset
+
+
+class Mp3DurationCounter:
+    """Chunk chunk beslenen MP3 akışının frame / sample sayacı"""
+
+    def __init__(self):
+        self.frames = 0
+        self.samples = 0
+        self.sample_rate: Optional[int] = None
+        self.bytes_seen = 0
+        self._buffer = bytearray()
+        self._skip = 0
+        self._id3_checked = False
+        self._first_frame = True
+
+    @property
+    def duration(self) -> float:
+        return self.samples / self.sample_rate if self.sample_rate else 0.0
+
+    def feed(self, chunk: bytes):
+        self.bytes_seen += len(chunk)
+        if self._skip:
+            skipped = min(self._skip, len(chunk))
+            chunk = chunk[skipped:]
+            self._skip -= skipped
+        if chunk:
+            self._buffer += chunk
+            self._parse()
+
+    def _parse(self):
+        buf = self._buffer
+        pos = 0
+        while True:
+            if not self._id3_checked:
+                if len(buf) - pos < 10:
+                    break
+                if buf[pos:pos + 3] == b"ID3":
+                    size = (buf[pos + 6] << 21) | (buf[pos + 7] << 14) | (buf[pos + 8] << 7) | buf[pos + 9]
+                    footer = 10 if buf[pos + 5] & 0x10 else 0
+                    pos += 10 + size + footer
+                self._id3_checked = True
+                continue
+
+            if len(buf) - pos < 4:
+                break
+            header = parse_frame_header(bytes(buf[pos:pos + 4]))
+            if header is None:
+                pos += 1
+                continue
+
+            frame_length, samples, sample_rate, xing_offset = header
+            if self._first_frame:
+                if len(buf) - pos < xing_offset + 4:
+                    break
+                self._first_frame = False
+                if bytes(buf[pos + xing_offset:pos + xing_offset + 4]) in (b"Xing", b"Info"):
+                    pos += frame_length
+                    continue
+
+            self.frames += 1
+            self.samples += samples
+            self.sample_rate = self.sample_rate or sample_rate
+            pos += frame_length
+
+        if pos >= len(buf):
+            # Frame'in kalanı henüz gelmedi - sonraki chunk'lardan atlanacak
+            self._skip += pos - len(buf)
+            buf.clear()
+        else:
+            del buf[:pos]
+
+
+def mp3_duration(path: str, chunk_size: int = 64 * 1024) -> Optional[float]:
+    """MP3 dosyasının frame header'larından süresi (frame bulunamazsa None)"""
+    counter = Mp3DurationCounter()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            counter.feed(chunk)
+    return counter.duration if counter.frames else None
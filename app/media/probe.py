@@ -0,0 +1,292 @@
+"""
+Media Probe Cache - Dosya başına tek JSON ffprobe
+
+Süre, codec, çözünürlük, fps ve audio stream bilgisi aynı dosya için
+pipeline boyunca defalarca soruluyordu. Her (path, size, mtime) için bir kez
+`ffprobe -show_format -show_streams -of json` çalıştırılır, tüm format ve
+stream alanları MediaInfo olarak bellekte (LRU) tutulur:
+
+    info = await probe_media(video_path)
+    if info and info.has_audio:
+        ...
+    duration = await probe_duration(audio_path)
+
+- Dosya değişirse (boyut veya mtime) kayıt geçersiz sayılır, yeniden probe edilir
+- Aynı dosya için eşzamanlı istekler tek ffprobe'u paylaşır
+- Opsiyonel disk index'i (data/media_probe.db): restart sonrası da geçerli
+- Başarısız probe'lar cache'lenmez (dosya henüz yazılıyor olabilir)
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger import get_logger
+from .runner import run_ffprobe
+
+logger = get_logger("media_probe")
+
+
+@lru_cache(maxsize=None)
+def ffmpeg_available() -> bool:
+    """ffmpeg PATH'te var mı (süreç başına bir kez bakılır)"""
+    return shutil.which("ffmpeg") is not None
+
+
+def _parse_rate(value: Optional[str]) -> Optional[float]:
+    """"30000/1001" veya "30" -> float"""
+    if not value:
+        return None
+    try:
+        if "/" in value:
+            num, den = value.split("/", 1)
+            return float(num) / float(den) if float(den) else None
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class MediaInfo:
+    """ffprobe JSON çıktısı (format + streams) ve sık kullanılan alanlar"""
+    path: str
+    size: int
+    mtime_ns: int
+    format: Dict[str, Any] = field(default_factory=dict)
+    streams: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def signature(self) -> Tuple[int, int]:
+        return self.size, self.mtime_ns
+
+    def stream(self, codec_type: str) -> Optional[Dict[str, Any]]:
+        """İlk video / audio stream'i"""
+        return next((s for s in self.streams if s.get("codec_type") == codec_type), None)
+
+    @property
+    def video_stream(self) -> Optional[Dict[str, Any]]:
+        return self.stream("video")
+
+    @property
+    def audio_stream(self) -> Optional[Dict[str, Any]]:
+        return self.stream("audio")
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_stream is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_stream is not None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Format süresi; yoksa en uzun stream süresi"""
+        duration = _to_float(self.format.get("duration"))
+        if duration is not None:
+            return duration
+        stream_durations = [d for d in (_to_float(s.get("duration")) for s in self.streams) if d is not None]
+        return max(stream_durations) if stream_durations else None
+
+    @property
+    def video_codec(self) -> Optional[str]:
+        return (self.video_stream or {}).get("codec_name")
+
+    @property
+    def width(self) -> Optional[int]:
+        return (self.video_stream or {}).get("width")
+
+    @property
+    def height(self) -> Optional[int]:
+        return (self.video_stream or {}).get("height")
+
+    @property
+    def fps(self) -> Optional[float]:
+        stream = self.video_stream or {}
+        return _parse_rate(stream.get("r_frame_rate")) or _parse_rate(stream.get("avg_frame_rate"))
+
+    @property
+    def bit_rate(self) -> Optional[int]:
+        value = _to_float(self.format.get("bit_rate"))
+        return int(value) if value is not None else None
+
+    def to_json(self) -> str:
+        return json.dumps({"format": self.format, "streams": self.streams})
+
+
+class MediaProbeCache:
+    """(path, size, mtime) anahtarlı ffprobe cache'i - bellek LRU + opsiyonel SQLite index"""
+
+    def __init__(self, max_entries: int = 2000, index_path: Optional[Path] = None):
+        self.max_entries = max(1, max_entries)
+        self.index_path = Path(index_path) if index_path else None
+
+        self._memory: "OrderedDict[str, MediaInfo]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int, int], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "index_hits": 0, "misses": 0, "failures": 0}
+
+    # ---------- Disk index ----------
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS media_probe (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    info TEXT NOT NULL,
+                    probed_at REAL NOT NULL
+                )
+            ''')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _index_get(self, path: str, size: int, mtime_ns: int) -> Optional[MediaInfo]:
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT info FROM media_probe WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, size, mtime_ns)
+            ).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row[0])
+        return MediaInfo(path, size, mtime_ns, data.get("format", {}), data.get("streams", []))
+
+    def _index_set(self, info: MediaInfo):
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO media_probe (path, size, mtime_ns, info, probed_at) VALUES (?, ?, ?, ?, ?)",
+                (info.path, info.size, info.mtime_ns, info.to_json(), time.time())
+            )
+            conn.commit()
+
+    # ---------- Lookup ----------
+
+    def _remember(self, info: MediaInfo):
+        self._memory[info.path] = info
+        self._memory.move_to_end(info.path)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def _probe(self, path: str, size: int, mtime_ns: int) -> Optional[MediaInfo]:
+        result = await run_ffprobe(["-show_format", "-show_streams", "-of", "json", path])
+        if not result.success:
+            return None
+        try:
+            data = json.loads(result.stdout or "{}")
+        except json.JSONDecodeError:
+            return None
+        return MediaInfo(path, size, mtime_ns, data.get("format", {}), data.get("streams", []))
+
+    async def get(self, path: str) -> Optional[MediaInfo]:
+        """Dosyanın MediaInfo'su (dosya yoksa veya probe başarısızsa None)"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        key = os.path.realpath(path)
+        signature = (st.st_size, st.st_mtime_ns)
+
+        cached = self._memory.get(key)
+        if cached is not None and cached.signature == signature:
+            self._memory.move_to_end(key)
+            self._stats["hits"] += 1
+            return cached
+
+        inflight_key = (key, *signature)
+        pending = self._inflight.get(inflight_key)
+        if pending is not None:
+            self._stats["hits"] += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = future
+        info = None
+        try:
+            if self.index_path:
+                try:
+                    info = await asyncio.to_thread(self._index_get, key, *signature)
+                except Exception as e:
+                    logger.warning(f"[PROBE] Index okunamadı: {e}")
+                if info is not None:
+                    self._stats["index_hits"] += 1
+
+            if info is None:
+                self._stats["misses"] += 1
+                info = await self._probe(key, *signature)
+                if info is None:
+                    self._stats["failures"] += 1
+                elif self.index_path:
+                    try:
+                        await asyncio.to_thread(self._index_set, info)
+                    except Exception as e:
+                        logger.warning(f"[PROBE] Index yazılamadı: {e}")
+
+            if info is not None:
+                self._remember(info)
+            return info
+        finally:
+            self._inflight.pop(inflight_key, None)
+            future.set_result(info)
+
+    def invalidate(self, path: str):
+        """Dosyanın bellek kaydını sil (index kaydı imza uyuşmazlığıyla zaten geçersizleşir)"""
+        self._memory.pop(os.path.realpath(path), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        lookups = stats["hits"] + stats["index_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["index_hits"]) / lookups, 3) if lookups else 0.0
+        stats["entries"] = len(self._memory)
+        return stats
+
+
+_cache: Optional[MediaProbeCache] = None
+
+
+def get_probe_cache() -> MediaProbeCache:
+    """Global probe cache"""
+    global _cache
+    if _cache is None:
+        _cache = MediaProbeCache(
+            max_entries=settings.media_probe_cache_entries,
+            index_path=settings.data_dir / "media_probe.db" if settings.media_probe_index else None
+        )
+    return _cache
+
+
+async def probe_media(path: str) -> Optional[MediaInfo]:
+    """Dosyanın cache'li MediaInfo'su"""
+    return await get_probe_cache().get(path)
+
+
+async def probe_duration(path: str) -> Optional[float]:
+    """Medya dosyasının süresi (saniye); okunamazsa None"""
+    info = await probe_media(path)
+    return info.duration if info else None
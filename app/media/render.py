@@ -0,0 +1,366 @@
+"""
+Render Plan - Reels finalizasyonu için tek geçişli ffmpeg filter graph
+
+Sesli Reels eskiden her adımda ayrı decode + H.264 encode yapıyordu
+(concat -> freeze frame -> audio merge -> altyazı burn). RenderPlan bu
+adımları tek bir filter_complex'te birleştirir ve bir kez encode eder:
+
+- Segmentler: 720x1280@30 scale/pad, opsiyonel freeze-frame kuyruğu (tpad)
+- Segmentler arası xfade/acrossfade veya düz concat
+- Harici ses (TTS) mux: volume + fade-out, video fade-out
+- ASS altyazı burn-in
+
+    plan = RenderPlan(
+        segments=[RenderSegment(video_path)],
+        output_path=output_path,
+        audio_path=audio_path,
+        duration=audio_duration,
+        fade_out=0.5,
+        ass_path=ass_path,
+    )
+    result = await finalize_video(plan)
+
+Tek geçiş başarısız olursa (veya render_single_pass=False ise) eski adım
+adım yol (instagram_helper fonksiyonları) fallback olarak çalışır.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger import get_logger
+from .probe import probe_duration, probe_media
+from .runner import ProgressCallback, run_media
+
+logger = get_logger("render")
+
+# Instagram Reels limitleri
+REEL_WIDTH = 720
+REEL_HEIGHT = 1280
+REEL_FPS = 30
+MAX_REEL_DURATION = 90.0
+
+# Hedef süre video süresini bu kadar aşmıyorsa loop yapılmaz (merge_audio_video ile aynı)
+LOOP_TOLERANCE = 1.0
+
+AUDIO_FORMAT = "aformat=sample_fmts=fltp:sample_rates=44100:channel_layouts=stereo"
+
+
+def escape_filter_path(path: str) -> str:
+    """Dosya yolunu ffmpeg filter argümanı için escape et (ass='...')"""
+    return path.replace("\\", "/").replace(":", "\\:").replace("'", "'\\''")
+
+
+async def add_freeze_frame(video_path: str, duration: float) -> str:
+    """
+    Add freeze frame to end of video using FFmpeg tpad filter.
+
+    Args:
+        video_path: Path to input video
+        duration: Duration of freeze in seconds
+
+    Returns:
+        Path to output video with freeze frame
+    """
+    output_path = video_path.replace(".mp4", "_freeze.mp4")
+
+    cmd = [
+        "ffmpeg", "-y",
+        "-i", video_path,
+        "-vf", f"tpad=stop_mode=clone:stop_duration={duration}",
+        "-c:a", "copy",
+        output_path
+    ]
+
+    print(f"[FREEZE FRAME] Adding {duration:.1f}s freeze to video...")
+    result = await run_media(cmd, timeout=300)
+
+    if not result.success:
+        raise Exception(f"Freeze frame failed: {result.error}")
+
+    print(f"[FREEZE FRAME] Output: {output_path}")
+    return output_path
+
+
+@dataclass
+class RenderSegment:
+    """Render edilecek video segmenti"""
+    path: str
+    duration: Optional[float] = None  # None ise ffprobe ile okunur
+    freeze_tail: float = 0.0          # Son kareyi bu kadar saniye dondur
+    has_audio: Optional[bool] = None  # None ise ffprobe ile okunur (harici ses yoksa)
+
+    @property
+    def total_duration(self) -> float:
+        return (self.duration or 0.0) + self.freeze_tail
+
+
+@dataclass
+class RenderPlan:
+    """Tek encode ile üretilecek final Reels videosu"""
+    segments: List[RenderSegment]
+    output_path: str
+    crossfade: float = 0.0                # Segmentler arası geçiş (0 = düz kesme)
+    audio_path: Optional[str] = None      # Harici ses; verilirse segment sesleri kullanılmaz
+    audio_volume: float = 1.0
+    duration: Optional[float] = None      # Hedef süre (None = video süresi)
+    keep_video_duration: bool = False     # Hedef süre yerine video süresini koru
+    fade_out: float = 0.0                 # Video + ses fade-out süresi
+    ass_path: Optional[str] = None        # Burn edilecek ASS altyazı
+    crf: int = 23
+    preset: str = "medium"
+
+    @property
+    def video_duration(self) -> float:
+        """Geçişler düşüldükten sonra birleşik video süresi"""
+        total = sum(s.total_duration for s in self.segments)
+        return max(0.0, total - max(0, len(self.segments) - 1) * self.crossfade)
+
+    def strategy(self) -> Tuple[float, bool]:
+        """(çıktı süresi, video loop gerekli mi) - merge_audio_video stratejisiyle aynı"""
+        video_total = self.video_duration
+        loop = False
+        if self.duration is None or self.keep_video_duration or self.duration <= video_total:
+            out = video_total if self.duration is None or self.keep_video_duration else self.duration
+        elif self.duration - video_total <= LOOP_TOLERANCE or len(self.segments) > 1:
+            out = video_total
+        else:
+            out = self.duration
+            loop = True
+        return min(out, MAX_REEL_DURATION), loop
+
+    async def resolve(self):
+        """Eksik segment sürelerini ve audio stream bilgisini ffprobe ile doldur"""
+        for seg in self.segments:
+            if seg.duration is not None and (seg.has_audio is not None or self.audio_path):
+                continue
+            info = await probe_media(seg.path)
+            if info is None or not info.duration:
+                raise ValueError(f"Segment süresi okunamadı: {seg.path}")
+            if seg.duration is None:
+                seg.duration = info.duration
+            if seg.has_audio is None:
+                seg.has_audio = info.has_audio
+
+    def build_filter(self, out_duration: float) -> Tuple[str, bool]:
+        """filter_complex string'i ve [aout] üretilip üretilmediği"""
+        n = len(self.segments)
+        parts = []
+
+        for i, seg in enumerate(self.segments):
+            chain = (
+                f"[{i}:v]setpts=PTS-STARTPTS,"
+                f"scale={REEL_WIDTH}:{REEL_HEIGHT}:force_original_aspect_ratio=decrease,"
+                f"pad={REEL_WIDTH}:{REEL_HEIGHT}:(ow-iw)/2:(oh-ih)/2,setsar=1,"
+                f"fps={REEL_FPS},format=yuv420p"
+            )
+            if seg.freeze_tail > 0:
+                chain += f",tpad=stop_mode=clone:stop_duration={seg.freeze_tail:.3f}"
+            parts.append(f"{chain}[v{i}]")
+
+        # Harici ses yoksa segment sesleri video ile hizalı taşınır (freeze kuyruğu sessiz)
+        segment_audio = not self.audio_path and all(s.has_audio for s in self.segments)
+        if segment_audio:
+            for i, seg in enumerate(self.segments):
+                d = seg.total_duration
+                parts.append(f"[{i}:a]asetpts=PTS-STARTPTS,{AUDIO_FORMAT},apad=whole_dur={d:.3f},atrim=end={d:.3f}[a{i}]")
+
+        # Segmentleri birleştir
+        if n == 1:
+            v_label, a_label = "v0", "a0"
+        elif self.crossfade > 0:
+            v_label, a_label = "v0", "a0"
+            offset = 0.0
+            for i in range(1, n):
+                offset += self.segments[i - 1].total_duration - self.crossfade
+                parts.append(
+                    f"[{v_label}][v{i}]xfade=transition=fade:duration={self.crossfade}:offset={offset:.3f}[vx{i}]"
+                )
+                v_label = f"vx{i}"
+                if segment_audio:
+                    parts.append(f"[{a_label}][a{i}]acrossfade=d={self.crossfade}:c1=tri:c2=tri[ax{i}]")
+                    a_label = f"ax{i}"
+        else:
+            pads = "".join(f"[v{i}][a{i}]" if segment_audio else f"[v{i}]" for i in range(n))
+            outs = "[vcat][acat]" if segment_audio else "[vcat]"
+            parts.append(f"{pads}concat=n={n}:v=1:a={1 if segment_audio else 0}{outs}")
+            v_label, a_label = "vcat", "acat"
+
+        # Video son işlem: fade-out, altyazı
+        post = []
+        if self.fade_out and out_duration > self.fade_out:
+            post.append(f"fade=t=out:st={out_duration - self.fade_out:.2f}:d={self.fade_out:.2f}")
+        if self.ass_path:
+            post.append(f"ass='{escape_filter_path(self.ass_path)}'")
+        parts.append(f"[{v_label}]{','.join(post) if post else 'null'}[vout]")
+
+        # Ses
+        if self.audio_path:
+            a_chain = [AUDIO_FORMAT]
+            if self.audio_volume != 1.0:
+                a_chain.append(f"volume={self.audio_volume}")
+            if self.fade_out and out_duration > self.fade_out:
+                a_chain.append(f"afade=t=out:st={out_duration - self.fade_out:.2f}:d={self.fade_out:.2f}")
+            parts.append(f"[{n}:a]{','.join(a_chain)}[aout]")
+            return ";".join(parts), True
+
+        if segment_audio:
+            if self.fade_out and out_duration > self.fade_out:
+                parts.append(f"[{a_label}]afade=t=out:st={out_duration - self.fade_out:.2f}:d={self.fade_out:.2f}[aout]")
+            else:
+                parts.append(f"[{a_label}]anull[aout]")
+            return ";".join(parts), True
+
+        return ";".join(parts), False
+
+    def build_command(self) -> List[str]:
+        """Tek encode için ffmpeg komutu (resolve() sonrası çağrılmalı)"""
+        out_duration, loop = self.strategy()
+        filter_complex, has_audio = self.build_filter(out_duration)
+
+        cmd = ["ffmpeg", "-y"]
+        for i, seg in enumerate(self.segments):
+            if loop and i == 0:
+                cmd.extend(["-stream_loop", "-1"])
+            cmd.extend(["-i", seg.path])
+        if self.audio_path:
+            cmd.extend(["-i", self.audio_path])
+
+        cmd.extend(["-filter_complex", filter_complex, "-map", "[vout]"])
+        if has_audio:
+            cmd.extend(["-map", "[aout]"])
+        cmd.extend(["-c:v", "libx264", "-preset", self.preset, "-crf", str(self.crf), "-pix_fmt", "yuv420p"])
+        if has_audio:
+            cmd.extend(["-c:a", "aac", "-b:a", "128k", "-ar", "44100"])
+        cmd.extend(["-r", str(REEL_FPS), "-t", f"{out_duration:.3f}", "-movflags", "+faststart", self.output_path])
+        return cmd
+
+
+async def render_single_pass(plan: RenderPlan, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """RenderPlan'ı tek ffmpeg çağrısıyla encode et"""
+    started = time.monotonic()
+    try:
+        await plan.resolve()
+        out_duration, loop = plan.strategy()
+        cmd = plan.build_command()
+    except Exception as e:
+        return {"success": False, "error": f"Render plan hatası: {e}"}
+
+    os.makedirs(os.path.dirname(plan.output_path) or ".", exist_ok=True)
+    logger.info(f"[RENDER] Tek geçiş: {len(plan.segments)} segment, {out_duration:.1f}s"
+                f"{', loop' if loop else ''}{', altyazı' if plan.ass_path else ''}")
+
+    result = await run_media(cmd, timeout=600, progress=progress, duration=out_duration)
+    if not result.success:
+        return {"success": False, "error": result.error[:300]}
+    if not os.path.exists(plan.output_path):
+        return {"success": False, "error": "Output file not created"}
+
+    return {
+        "success": True,
+        "output_path": plan.output_path,
+        "duration": await probe_duration(plan.output_path) or out_duration,
+        "file_size_mb": round(os.path.getsize(plan.output_path) / 1024 / 1024, 2),
+        "single_pass": True,
+        "subtitles": bool(plan.ass_path),
+        "encode_s": round(time.monotonic() - started, 2),
+    }
+
+
+async def render_stepwise(plan: RenderPlan, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """
+    Eski adım adım yol: freeze -> concat -> audio merge -> altyazı burn.
+
+    Her adım ayrı dosyaya yazar (plan.output_path kullanılmaz). Altyazı burn
+    hatası render'ı düşürmez, sonuçta subtitles=False döner.
+    """
+    from app.instagram_helper import (
+        add_subtitles_to_video,
+        concatenate_videos_with_crossfade,
+        convert_video_for_instagram,
+        merge_audio_video,
+    )
+
+    started = time.monotonic()
+    paths = []
+    for seg in plan.segments:
+        path = seg.path
+        if seg.freeze_tail > 0:
+            path = await add_freeze_frame(path, seg.freeze_tail)
+        paths.append(path)
+
+    duration = None
+    if len(paths) > 1:
+        concat = await concatenate_videos_with_crossfade(
+            video_paths=paths,
+            crossfade_duration=plan.crossfade,
+            progress=progress
+        )
+        if not concat.get("success"):
+            return {"success": False, "error": f"Video concat hatası: {concat.get('error')}"}
+        video_path = concat["output_path"]
+        duration = concat.get("total_duration")
+    else:
+        video_path = paths[0]
+
+    if plan.audio_path:
+        merge = await merge_audio_video(
+            video_path=video_path,
+            audio_path=plan.audio_path,
+            target_duration=plan.duration,
+            audio_volume=plan.audio_volume,
+            fade_out=plan.fade_out > 0,
+            fade_duration=plan.fade_out or 0.5,
+            keep_video_duration=plan.keep_video_duration,
+            progress=progress
+        )
+        if not merge.get("success"):
+            return {"success": False, "error": f"Merge hatası: {merge.get('error')}"}
+        video_path = merge["output_path"]
+        duration = merge.get("duration")
+    elif len(paths) == 1:
+        converted = await convert_video_for_instagram(video_path, progress=progress)
+        if not converted.get("success"):
+            return {"success": False, "error": converted.get("error")}
+        video_path = converted["output_path"]
+
+    subtitles = False
+    subtitle_error = None
+    if plan.ass_path:
+        burn = await add_subtitles_to_video(video_path=video_path, ass_path=plan.ass_path, progress=progress)
+        if burn.get("success"):
+            video_path = burn["output_path"]
+            subtitles = True
+        else:
+            subtitle_error = burn.get("error")
+
+    return {
+        "success": True,
+        "output_path": video_path,
+        "duration": duration or await probe_duration(video_path) or 0.0,
+        "file_size_mb": round(os.path.getsize(video_path) / 1024 / 1024, 2),
+        "single_pass": False,
+        "subtitles": subtitles,
+        "subtitle_error": subtitle_error,
+        "encode_s": round(time.monotonic() - started, 2),
+    }
+
+
+async def finalize_video(plan: RenderPlan, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+    """
+    Final Reels videosunu üret: önce tek geçiş, başarısızsa adım adım.
+
+    Returns:
+        {"success", "output_path", "duration", "file_size_mb",
+         "single_pass", "subtitles", "encode_s", "error" (başarısızsa)}
+    """
+    if settings.render_single_pass:
+        result = await render_single_pass(plan, progress)
+        if result["success"]:
+            logger.info(f"[RENDER] Tamamlandı: {result['duration']:.1f}s, {result['encode_s']:.1f}s encode")
+            return result
+        logger.warning(f"[RENDER] Tek geçiş başarısız, adım adım render'a dönülüyor: {result['error']}")
+
+    return await render_stepwise(plan, progress)
@@ -0,0 +1,335 @@
+"""
+Media Process Runner - Tüm ffmpeg/ffprobe çağrılarının tek giriş noktası
+
+Blocking subprocess.run yerine asyncio subprocess kullanılır; encode
+sürerken event loop (Telegram polling dahil) çalışmaya devam eder.
+
+- Eşzamanlılık limiti: ffmpeg encode'ları için CPU sayısına göre
+  (media_max_concurrency, 0 = CPU / 2), ffprobe için ayrı ve daha geniş
+  bir limit (kısa probe'lar uzun encode'ların arkasında beklemez)
+- Timeout ve iptal: süre aşılırsa, cancel_event set edilirse veya çağıran
+  task iptal edilirse süreç öldürülür
+- stderr'deki `frame= fps= time= speed=` satırları MediaProgress olarak
+  progress callback'ine iletilir
+- Sonuç her zaman MediaResult (returncode, stdout, stderr, süre, hata özeti);
+  exception isteyen çağıranlar result.check() kullanır
+
+    result = await run_media(["ffmpeg", "-y", "-i", src, dst], timeout=300, progress=on_progress)
+    if not result.success:
+        return {"success": False, "error": result.error}
+"""
+
+import asyncio
+import inspect
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("media")
+
+# ffprobe çağrıları için varsayılan timeout (saniye)
+DEFAULT_PROBE_TIMEOUT = 30
+
+# Progress callback'leri arası minimum süre (saniye)
+PROGRESS_INTERVAL = 1.0
+
+# Hata özeti için saklanan son stderr satırı sayısı
+STDERR_TAIL_LINES = 200
+
+PROGRESS_FIELD_RE = re.compile(r"\b(frame|fps|time|speed)=\s*(\S+)")
+DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+LINE_SPLIT_RE = re.compile(r"[\r\n]")
+
+
+@dataclass
+class MediaProgress:
+    """ffmpeg stderr'inden okunan ilerleme durumu"""
+    frame: Optional[int] = None
+    fps: Optional[float] = None
+    time_s: Optional[float] = None
+    speed: Optional[float] = None
+    percent: Optional[float] = None
+    elapsed_s: float = 0.0
+
+
+ProgressCallback = Callable[[MediaProgress], Any]
+
+
+class MediaProcessError(Exception):
+    """ffmpeg/ffprobe başarısız oldu; detaylar self.result içinde"""
+
+    def __init__(self, result: "MediaResult"):
+        super().__init__(result.error)
+        self.result = result
+
+
+@dataclass
+class MediaResult:
+    """Tek bir ffmpeg/ffprobe çalıştırmasının sonucu"""
+    cmd: List[str]
+    returncode: Optional[int] = None
+    stdout: str = ""
+    stderr: str = ""
+    elapsed_s: float = 0.0
+    queued_s: float = 0.0
+    timeout: Optional[float] = None
+    timed_out: bool = False
+    cancelled: bool = False
+    spawn_error: Optional[str] = None
+    last_progress: Optional[MediaProgress] = field(default=None, repr=False)
+
+    @property
+    def tool(self) -> str:
+        return os.path.basename(self.cmd[0]) if self.cmd else "media"
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not (self.timed_out or self.cancelled or self.spawn_error)
+
+    @property
+    def error(self) -> Optional[str]:
+        """Hata özeti (başarılıysa None): timeout, iptal, başlatılamama veya stderr'in sonu"""
+        if self.success:
+            return None
+        if self.spawn_error:
+            return self.spawn_error
+        if self.timed_out:
+            return f"{self.tool} timeout ({self.timeout:.0f}s)"
+        if self.cancelled:
+            return f"{self.tool} cancelled"
+        tail = self.stderr.strip()[-500:]
+        return f"{self.tool} exit {self.returncode}: {tail}" if tail else f"{self.tool} exit {self.returncode}"
+
+    def check(self) -> "MediaResult":
+        """Başarısızsa MediaProcessError fırlat"""
+        if not self.success:
+            raise MediaProcessError(self)
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tool": self.tool,
+            "success": self.success,
+            "returncode": self.returncode,
+            "elapsed_s": round(self.elapsed_s, 2),
+            "queued_s": round(self.queued_s, 2),
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "error": self.error,
+        }
+
+
+def parse_timestamp(value: str) -> Optional[float]:
+    """ffmpeg süre formatı (HH:MM:SS.ms veya saniye) -> saniye"""
+    try:
+        sign = -1.0 if value.startswith("-") else 1.0
+        parts = value.lstrip("-").split(":")
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + float(part)
+        return sign * seconds
+    except ValueError:
+        return None
+
+
+def parse_progress_line(line: str) -> Optional[MediaProgress]:
+    """`frame=  120 fps= 30 ... time=00:00:04.00 ... speed=1.2x` satırını ayrıştır"""
+    fields = dict(PROGRESS_FIELD_RE.findall(line))
+    if "time" not in fields:
+        return None
+
+    progress = MediaProgress(time_s=parse_timestamp(fields["time"]))
+    try:
+        if "frame" in fields:
+            progress.frame = int(fields["frame"])
+        if "fps" in fields:
+            progress.fps = float(fields["fps"])
+        if fields.get("speed", "N/A").endswith("x"):
+            progress.speed = float(fields["speed"][:-1])
+    except ValueError:
+        pass
+    return progress
+
+
+class _StderrReader:
+    """stderr'i okur: progress satırlarını callback'e, diğerlerini tail'e"""
+
+    def __init__(self, progress: Optional[ProgressCallback], duration: Optional[float], started: float):
+        self.callback = progress
+        self.duration = duration
+        self.started = started
+        self.lines: Deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        self.last: Optional[MediaProgress] = None
+        self._last_emit = 0.0
+
+    async def consume(self, stream: asyncio.StreamReader):
+        # ffmpeg progress satırlarını \r ile yazar, readline() kullanılamaz
+        pending = ""
+        while True:
+            chunk = await stream.read(4096)
+            if not chunk:
+                break
+            pending += chunk.decode(errors="replace")
+            *lines, pending = LINE_SPLIT_RE.split(pending)
+            for line in lines:
+                await self._handle(line)
+        if pending:
+            await self._handle(pending)
+
+    async def _handle(self, line: str):
+        line = line.strip()
+        if not line:
+            return
+
+        progress = parse_progress_line(line) if "time=" in line else None
+        if progress is None:
+            self.lines.append(line)
+            if self.duration is None:
+                match = DURATION_RE.search(line)
+                if match:
+                    h, m, s = match.groups()
+                    self.duration = int(h) * 3600 + int(m) * 60 + float(s)
+            return
+
+        now = time.monotonic()
+        progress.elapsed_s = now - self.started
+        if self.duration and progress.time_s is not None:
+            progress.percent = max(0.0, min(100.0, progress.time_s / self.duration * 100))
+        self.last = progress
+
+        if self.callback is None or now - self._last_emit < PROGRESS_INTERVAL:
+            return
+        self._last_emit = now
+        try:
+            ret = self.callback(progress)
+            if inspect.isawaitable(ret):
+                await ret
+        except Exception as e:
+            logger.warning(f"[MEDIA] Progress callback hatası: {e}")
+
+
+_encode_slots: Optional[asyncio.Semaphore] = None
+_probe_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_encode_concurrency() -> int:
+    """Eşzamanlı ffmpeg limiti (ayar 0 ise CPU sayısının yarısı)"""
+    if settings.media_max_concurrency > 0:
+        return settings.media_max_concurrency
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def _slots_for(cmd: List[str]) -> asyncio.Semaphore:
+    global _encode_slots, _probe_slots
+    if os.path.basename(cmd[0]) == "ffprobe":
+        if _probe_slots is None:
+            _probe_slots = asyncio.Semaphore(max(1, settings.media_probe_concurrency))
+        return _probe_slots
+    if _encode_slots is None:
+        _encode_slots = asyncio.Semaphore(get_encode_concurrency())
+    return _encode_slots
+
+
+async def _kill(process: asyncio.subprocess.Process):
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+
+async def run_media(
+    cmd: List[str],
+    timeout: Optional[float] = None,
+    progress: Optional[ProgressCallback] = None,
+    duration: Optional[float] = None,
+    cancel_event: Optional[asyncio.Event] = None,
+) -> MediaResult:
+    """
+    ffmpeg/ffprobe komutunu eşzamanlılık limiti altında çalıştır.
+
+    Args:
+        cmd: Komut ve argümanları (cmd[0] "ffmpeg" veya "ffprobe")
+        timeout: Çalışma süresi limiti (saniye, slot beklemesi hariç)
+        progress: MediaProgress ile çağrılır (sync veya async, en fazla saniyede bir)
+        duration: Çıktının beklenen süresi; verilmezse stderr'deki ilk
+            "Duration:" kullanılır (percent hesabı için)
+        cancel_event: Set edildiğinde süreç öldürülür
+
+    Returns:
+        MediaResult - hata durumunda da exception fırlatmaz (task iptali hariç)
+    """
+    result = MediaResult(cmd=list(cmd), timeout=timeout)
+    queued_at = time.monotonic()
+
+    async with _slots_for(cmd):
+        started = time.monotonic()
+        result.queued_s = started - queued_at
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            result.spawn_error = f"{result.tool} çalıştırılamadı: {e}"
+            logger.error(f"[MEDIA] {result.spawn_error}")
+            return result
+
+        reader = _StderrReader(progress, duration, started)
+
+        async def collect():
+            stdout, _ = await asyncio.gather(process.stdout.read(), reader.consume(process.stderr))
+            await process.wait()
+            return stdout
+
+        collect_task = asyncio.ensure_future(collect())
+        watchers = {collect_task}
+        cancel_task = asyncio.ensure_future(cancel_event.wait()) if cancel_event else None
+        if cancel_task:
+            watchers.add(cancel_task)
+
+        try:
+            done, _ = await asyncio.wait(watchers, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            await _kill(process)
+            try:
+                await asyncio.wait_for(collect_task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            raise
+        finally:
+            if cancel_task:
+                cancel_task.cancel()
+
+        if collect_task not in done:
+            result.cancelled = cancel_task is not None and cancel_task in done
+            result.timed_out = not result.cancelled
+            await _kill(process)
+
+        stdout = await collect_task
+        result.returncode = process.returncode
+        result.stdout = stdout.decode(errors="replace")
+        result.stderr = "\n".join(reader.lines)
+        result.last_progress = reader.last
+        result.elapsed_s = time.monotonic() - started
+
+    if not result.success:
+        logger.warning(f"[MEDIA] {result.tool} başarısız ({result.elapsed_s:.1f}s): {(result.error or '')[:200]}")
+    elif result.tool != "ffprobe":
+        logger.debug(f"[MEDIA] {result.tool} tamamlandı: {result.elapsed_s:.1f}s (kuyruk {result.queued_s:.1f}s)")
+    return result
+
+
+async def run_ffprobe(args: List[str], timeout: float = DEFAULT_PROBE_TIMEOUT) -> MediaResult:
+    """`ffprobe -v error <args>` çalıştır"""
+    return await run_media(["ffprobe", "-v", "error", *args], timeout=timeout)
+
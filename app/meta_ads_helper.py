@@ -12,12 +12,13 @@ Kullanım:
 """
 
 import os
-import httpx
 import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
 from dotenv import load_dotenv
 
+from app.net import get_http_client
+
 load_dotenv()
 
 # API Configuration
@@ -74,31 +75,31 @@ async def get_ad_account_info() -> Dict[str, Any]:
         return {"success": False, "error": "INSTAGRAM_ACCESS_TOKEN not set"}
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{GRAPH_API_BASE}/{META_AD_ACCOUNT_ID}",
-                params={
-                    "fields": "name,account_status,currency,business,amount_spent",
-                    "access_token": INSTAGRAM_ACCESS_TOKEN
-                }
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "success": True,
-                    "account_id": META_AD_ACCOUNT_ID,
-                    "name": data.get("name", "Unknown"),
-                    "status": data.get("account_status"),
-                    "currency": data.get("currency", "USD"),
-                    "amount_spent": float(data.get("amount_spent", 0)) / 100,  # cents to dollars
-                    "business": data.get("business", {}).get("name", "N/A")
-                }
-            else:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", response.text)
-                _log(f"Ad account error: {error_msg}")
-                return {"success": False, "error": error_msg}
+        client = get_http_client("meta")
+        response = await client.get(
+            f"{GRAPH_API_BASE}/{META_AD_ACCOUNT_ID}",
+            params={
+                "fields": "name,account_status,currency,business,amount_spent",
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            }
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                "success": True,
+                "account_id": META_AD_ACCOUNT_ID,
+                "name": data.get("name", "Unknown"),
+                "status": data.get("account_status"),
+                "currency": data.get("currency", "USD"),
+                "amount_spent": float(data.get("amount_spent", 0)) / 100,  # cents to dollars
+                "business": data.get("business", {}).get("name", "N/A")
+            }
+        else:
+            error_data = response.json()
+            error_msg = error_data.get("error", {}).get("message", response.text)
+            _log(f"Ad account error: {error_msg}")
+            return {"success": False, "error": error_msg}
 
     except Exception as e:
         _log(f"Ad account fetch error: {e}")
@@ -130,27 +131,28 @@ async def get_campaign_insights(
         date_stop = datetime.now().strftime("%Y-%m-%d")
 
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(
-                f"{GRAPH_API_BASE}/{META_AD_ACCOUNT_ID}/insights",
-                params={
-                    "fields": ",".join(AD_INSIGHTS_FIELDS),
-                    "level": level,
-                    "time_range": f'{{"since":"{date_start}","until":"{date_stop}"}}',
-                    "access_token": INSTAGRAM_ACCESS_TOKEN
-                }
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                campaigns = data.get("data", [])
-                _log(f"Fetched {len(campaigns)} {level}(s) from {date_start} to {date_stop}")
-                return {"success": True, "data": campaigns, "count": len(campaigns)}
-            else:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", response.text)
-                _log(f"Campaign insights error: {error_msg}")
-                return {"success": False, "error": error_msg, "data": []}
+        client = get_http_client("meta")
+        response = await client.get(
+            f"{GRAPH_API_BASE}/{META_AD_ACCOUNT_ID}/insights",
+            params={
+                "fields": ",".join(AD_INSIGHTS_FIELDS),
+                "level": level,
+                "time_range": f'{{"since":"{date_start}","until":"{date_stop}"}}',
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            },
+            timeout=60.0
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            campaigns = data.get("data", [])
+            _log(f"Fetched {len(campaigns)} {level}(s) from {date_start} to {date_stop}")
+            return {"success": True, "data": campaigns, "count": len(campaigns)}
+        else:
+            error_data = response.json()
+            error_msg = error_data.get("error", {}).get("message", response.text)
+            _log(f"Campaign insights error: {error_msg}")
+            return {"success": False, "error": error_msg, "data": []}
 
     except Exception as e:
         _log(f"Campaign insights fetch error: {e}")
@@ -370,24 +372,24 @@ async def get_active_campaigns() -> Dict[str, Any]:
         return {"success": False, "error": "META_AD_ACCOUNT_ID not set", "data": []}
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{GRAPH_API_BASE}/{META_AD_ACCOUNT_ID}/campaigns",
-                params={
-                    "fields": "id,name,status,objective,daily_budget,lifetime_budget,start_time,stop_time",
-                    "filtering": '[{"field":"effective_status","operator":"IN","value":["ACTIVE","PAUSED"]}]',
-                    "access_token": INSTAGRAM_ACCESS_TOKEN
-                }
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                campaigns = data.get("data", [])
-                return {"success": True, "data": campaigns, "count": len(campaigns)}
-            else:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", response.text)
-                return {"success": False, "error": error_msg, "data": []}
+        client = get_http_client("meta")
+        response = await client.get(
+            f"{GRAPH_API_BASE}/{META_AD_ACCOUNT_ID}/campaigns",
+            params={
+                "fields": "id,name,status,objective,daily_budget,lifetime_budget,start_time,stop_time",
+                "filtering": '[{"field":"effective_status","operator":"IN","value":["ACTIVE","PAUSED"]}]',
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            }
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            campaigns = data.get("data", [])
+            return {"success": True, "data": campaigns, "count": len(campaigns)}
+        else:
+            error_data = response.json()
+            error_msg = error_data.get("error", {}).get("message", response.text)
+            return {"success": False, "error": error_msg, "data": []}
 
     except Exception as e:
         return {"success": False, "error": str(e), "data": []}
@@ -410,44 +412,44 @@ async def get_promoted_post_insights(ig_media_id: str) -> Dict[str, Any]:
         return {"success": False, "error": "META_AD_ACCOUNT_ID not set"}
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Search for ads linked to this media
-            response = await client.get(
-                f"{GRAPH_API_BASE}/{META_AD_ACCOUNT_ID}/ads",
-                params={
-                    "fields": "id,name,effective_object_story_id,insights{impressions,reach,spend,clicks,actions,cost_per_action_type}",
-                    "filtering": f'[{{"field":"effective_object_story_id","operator":"CONTAIN","value":"{ig_media_id}"}}]',
-                    "access_token": INSTAGRAM_ACCESS_TOKEN
-                }
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                ads = data.get("data", [])
-
-                if not ads:
-                    return {"success": True, "is_promoted": False, "message": "Post is not promoted"}
-
-                # Get first matching ad
-                ad = ads[0]
-                insights = ad.get("insights", {}).get("data", [{}])[0]
-
-                return {
-                    "success": True,
-                    "is_promoted": True,
-                    "ad_id": ad.get("id"),
-                    "ad_name": ad.get("name"),
-                    "impressions": int(insights.get("impressions", 0)),
-                    "reach": int(insights.get("reach", 0)),
-                    "spend": float(insights.get("spend", 0)),
-                    "clicks": int(insights.get("clicks", 0)),
-                    "actions": parse_actions(insights.get("actions", [])),
-                    "cost_per_action": parse_cost_per_action(insights.get("cost_per_action_type", []))
-                }
-            else:
-                error_data = response.json()
-                error_msg = error_data.get("error", {}).get("message", response.text)
-                return {"success": False, "error": error_msg}
+        client = get_http_client("meta")
+        # Search for ads linked to this media
+        response = await client.get(
+            f"{GRAPH_API_BASE}/{META_AD_ACCOUNT_ID}/ads",
+            params={
+                "fields": "id,name,effective_object_story_id,insights{impressions,reach,spend,clicks,actions,cost_per_action_type}",
+                "filtering": f'[{{"field":"effective_object_story_id","operator":"CONTAIN","value":"{ig_media_id}"}}]',
+                "access_token": INSTAGRAM_ACCESS_TOKEN
+            }
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            ads = data.get("data", [])
+
+            if not ads:
+                return {"success": True, "is_promoted": False, "message": "Post is not promoted"}
+
+            # Get first matching ad
+            ad = ads[0]
+            insights = ad.get("insights", {}).get("data", [{}])[0]
+
+            return {
+                "success": True,
+                "is_promoted": True,
+                "ad_id": ad.get("id"),
+                "ad_name": ad.get("name"),
+                "impressions": int(insights.get("impressions", 0)),
+                "reach": int(insights.get("reach", 0)),
+                "spend": float(insights.get("spend", 0)),
+                "clicks": int(insights.get("clicks", 0)),
+                "actions": parse_actions(insights.get("actions", [])),
+                "cost_per_action": parse_cost_per_action(insights.get("cost_per_action_type", []))
+            }
+        else:
+            error_data = response.json()
+            error_msg = error_data.get("error", {}).get("message", response.text)
+            return {"success": False, "error": error_msg}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -7,12 +7,14 @@ Model: gemini-3-pro-image-preview
 """
 
 import os
+import time
 import asyncio
 import base64
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
 from app.config import settings
+from app.llm.dispatcher import TokenBucket
 from app.utils.logger import get_logger
 
 logger = get_logger("nano_banana")
@@ -136,6 +138,34 @@ def get_client():
     return _client
 
 
+class ImageRateLimiter:
+    """Provider-level token bucket shared by every Nano Banana request"""
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.bucket = TokenBucket(rate_per_minute, burst)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a request may be started"""
+        async with self._lock:
+            while not self.bucket.try_take():
+                await asyncio.sleep(self.bucket.time_until_token())
+
+
+_rate_limiter: Optional[ImageRateLimiter] = None
+
+
+def get_rate_limiter() -> ImageRateLimiter:
+    """Get Nano Banana rate limiter (singleton)"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = ImageRateLimiter(
+            rate_per_minute=settings.nano_banana_rate_per_minute,
+            burst=settings.nano_banana_rate_burst
+        )
+    return _rate_limiter
+
+
 async def generate_infographic(
     topic: str,
     content_text: str = "",
@@ -195,7 +225,8 @@ async def generate_infographic(
         # Generate content
         logger.info("  Sending request to Nano Banana Pro API...")
 
-        response = client.models.generate_content(
+        await get_rate_limiter().acquire()
+        response = await client.aio.models.generate_content(
             model="gemini-3-pro-image-preview",
             contents=prompt,
             config=config
@@ -258,6 +289,10 @@ async def generate_carousel_infographics(
     """
     Generate multiple infographic images for carousel
 
+    Slides are generated concurrently (carousel_slide_concurrency) through the
+    shared rate limiter; failed slides are retried on their own
+    (carousel_slide_retries). image_paths keeps slide order.
+
     Args:
         topic: Main carousel topic
         slides: List of slide data [{"title": "...", "content": "..."}]
@@ -265,7 +300,7 @@ async def generate_carousel_infographics(
         language: Language for text
 
     Returns:
-        Dict with success, image_paths list, errors, etc.
+        Dict with success, image_paths list, errors, slide_timings, etc.
     """
 
     if not GEMINI_API_KEY:
@@ -275,47 +310,66 @@ async def generate_carousel_infographics(
         return {"success": False, "error": "No slides provided"}
 
     start_time = datetime.now()
-    image_paths = []
-    errors = []
-    total_cost = 0
-
     slide_count = len(slides)
+    concurrency = max(1, settings.carousel_slide_concurrency)
     logger.info(f"Nano Banana carousel generation starting...")
     logger.info(f"  Topic: {topic[:50]}...")
-    logger.info(f"  Slides: {slide_count}")
+    logger.info(f"  Slides: {slide_count} (concurrency {concurrency})")
 
+    # Build slide-specific prompts
+    prompts = []
     for i, slide in enumerate(slides, 1):
-        slide_title = slide.get("title", "")
-        slide_content = slide.get("content", "") or slide.get("text", "")
-        slide_type = slide.get("slide_type", "content")
-
-        logger.info(f"  Generating slide {i}/{slide_count}: {slide_title[:30]}...")
-
-        # Build slide-specific prompt
-        slide_prompt = _build_carousel_slide_prompt(
+        prompts.append(_build_carousel_slide_prompt(
             topic=topic,
             slide_number=i,
             total_slides=slide_count,
-            title=slide_title,
-            content=slide_content,
-            slide_type=slide_type,
+            title=slide.get("title", ""),
+            content=slide.get("content", "") or slide.get("text", ""),
+            slide_type=slide.get("slide_type", "content"),
             style=style,
             language=language
-        )
-
-        # Generate this slide
-        result = await _generate_single_slide(slide_prompt, i)
-
+        ))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results: List[Dict[str, Any]] = [{} for _ in slides]
+    slide_timings = [{"slide": i, "attempts": 0, "duration": 0.0, "success": False} for i in range(1, slide_count + 1)]
+
+    async def run_slide(index: int):
+        async with semaphore:
+            slide_start = time.monotonic()
+            result = await _generate_single_slide(prompts[index], index + 1)
+            elapsed = time.monotonic() - slide_start
+
+        timing = slide_timings[index]
+        timing["attempts"] += 1
+        timing["duration"] = round(timing["duration"] + elapsed, 2)
+        timing["success"] = bool(result.get("success"))
+        if result.get("success"):
+            logger.info(f"  Slide {index + 1}/{slide_count} done ({elapsed:.1f}s)")
+        else:
+            logger.warning(f"  Slide {index + 1} failed ({elapsed:.1f}s): {result.get('error')}")
+        results[index] = result
+
+    # Generate all slides, then retry only the failed ones
+    pending = list(range(slide_count))
+    for attempt in range(1 + max(0, settings.carousel_slide_retries)):
+        if attempt:
+            logger.info(f"  Retrying {len(pending)} failed slide(s): {[i + 1 for i in pending]}")
+        await asyncio.gather(*(run_slide(i) for i in pending))
+        pending = [i for i in pending if not results[i].get("success")]
+        if not pending:
+            break
+
+    # Keep slide order
+    image_paths = []
+    errors = []
+    total_cost = 0
+    for i, result in enumerate(results, 1):
         if result.get("success"):
             image_paths.append(result["image_path"])
             total_cost += result.get("cost_estimate", 0.15)
         else:
             errors.append(f"Slide {i}: {result.get('error', 'Unknown error')}")
-            logger.warning(f"  Slide {i} failed: {result.get('error')}")
-
-        # Small delay between requests to avoid rate limiting
-        if i < slide_count:
-            await asyncio.sleep(1)
 
     elapsed = (datetime.now() - start_time).total_seconds()
 
@@ -329,6 +383,7 @@ async def generate_carousel_infographics(
         "requested_count": slide_count,
         "errors": errors,
         "duration": elapsed,
+        "slide_timings": slide_timings,
         "cost_estimate": total_cost,
         "model": "gemini-3-pro-image-preview"
     }
@@ -351,7 +406,8 @@ async def _generate_single_slide(prompt: str, slide_number: int) -> Dict[str, An
             )
         )
 
-        response = client.models.generate_content(
+        await get_rate_limiter().acquire()
+        response = await client.aio.models.generate_content(
             model="gemini-3-pro-image-preview",
             contents=prompt,
             config=config
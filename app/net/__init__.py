@@ -0,0 +1,21 @@
+"""
+Olivenet Social Bot - Paylaşılan HTTP client'ları
+"""
+
+from .clients import (
+    HttpClientRegistry,
+    close_http_clients,
+    get_http_client,
+    get_http_registry,
+    get_http_stats,
+    http2_available,
+)
+
+__all__ = [
+    "HttpClientRegistry",
+    "close_http_clients",
+    "get_http_client",
+    "get_http_registry",
+    "get_http_stats",
+    "http2_available",
+]
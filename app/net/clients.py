@@ -0,0 +1,167 @@
+"""
+HTTP Client Registry - Tüm API helper'larının paylaştığı httpx client'ları
+
+Helper'lar her çağrıda yeni bir client/session açıp kapatıyordu; her
+istekte DNS çözümü, TCP bağlantısı ve TLS handshake tekrarlanıyordu.
+Burada servis başına (Graph API, ElevenLabs, OpenAI, fal.ai, ...) tek bir
+uzun ömürlü client tutulur:
+
+    client = get_http_client("meta")
+    response = await client.get(url, params=params)            # varsayılan timeout
+    response = await client.post(url, json=body, timeout=120)  # istek bazında
+
+- Keep-alive: boştaki bağlantılar http_keepalive_expiry saniye açık kalır
+- HTTP/2: http2_enabled ve `h2` paketi kuruluysa (yoksa HTTP/1.1)
+- Timeout: varsayılan api_timeout_default (connect: http_connect_timeout);
+  uzun sürebilen çağrılar timeout'u istek bazında verir
+- Redirect'ler takip edilmez (httpx varsayılanı, aiohttp'nin aksine);
+  harici / sonuç URL'lerinden indirmede istek bazında follow_redirects=True
+- Client'lar event loop'a bağlıdır; farklı bir loop'tan (ayrı asyncio.run)
+  istenirse o loop için yeni client açılır
+- Bağlantı metrikleri: istek, yeni TCP bağlantısı, TLS handshake ve
+  yeniden kullanım oranı (get_http_stats)
+- Kapatma: close_http_clients() (bot shutdown'ında çağrılır)
+
+Client'lar kapatılmamalı (`async with` ile kullanılmamalı).
+"""
+
+import asyncio
+import importlib.util
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("http_clients")
+
+
+def http2_available() -> bool:
+    """httpx HTTP/2 desteği için `h2` paketi kurulu mu"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class _ConnectionStats:
+    """Tek client'ın istek / bağlantı sayaçları (httpcore trace event'lerinden)"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    async def on_request(self, request: httpx.Request):
+        self.counts["requests"] += 1
+        request.extensions["trace"] = self.trace
+
+    async def on_response(self, response: httpx.Response):
+        self.counts[response.http_version] += 1
+
+    async def trace(self, event: str, info: Dict[str, Any]):
+        # Sadece yeni bağlantı kurulurken gelir; havuzdan alınan bağlantıda gelmez
+        if event == "connection.connect_tcp.complete":
+            self.counts["new_connections"] += 1
+        elif event == "connection.start_tls.complete":
+            self.counts["tls_handshakes"] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        stats = dict(self.counts)
+        requests = stats.get("requests", 0)
+        new_connections = stats.get("new_connections", 0)
+        stats["reused"] = max(0, requests - new_connections)
+        stats["reuse_rate"] = round(stats["reused"] / requests, 3) if requests else 0.0
+        return stats
+
+
+class HttpClientRegistry:
+    """Servis adı -> paylaşılan httpx.AsyncClient"""
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True
+    ):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and http2_available()
+        if http2 and not self.http2:
+            logger.info("HTTP/2 devre dışı: `h2` paketi kurulu değil (pip install 'httpx[http2]')")
+
+        self._clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._stats: Dict[str, _ConnectionStats] = {}
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        """Servisin paylaşılan client'ı (çalışan event loop içinden çağrılmalı)"""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(name)
+        if entry is not None:
+            client_loop, client = entry
+            if client_loop is loop and not client.is_closed:
+                return client
+
+        stats = self._stats.setdefault(name, _ConnectionStats())
+        client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+            event_hooks={"request": [stats.on_request], "response": [stats.on_response]}
+        )
+        self._clients[name] = (loop, client)
+        logger.debug(f"HTTP client oluşturuldu: {name} (http2={self.http2})")
+        return client
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Servis başına istek, yeni bağlantı, TLS handshake ve reuse oranı"""
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    async def close(self):
+        """Bu loop'a ait client'ları kapat (diğer loop'larınkiler bırakılır)"""
+        loop = asyncio.get_running_loop()
+        for name, (client_loop, client) in list(self._clients.items()):
+            del self._clients[name]
+            if client_loop is loop and not client.is_closed:
+                try:
+                    await client.aclose()
+                except Exception as e:
+                    logger.warning(f"HTTP client kapatılamadı ({name}): {e}")
+
+
+_registry: Optional[HttpClientRegistry] = None
+
+
+def get_http_registry() -> HttpClientRegistry:
+    """Global client registry"""
+    global _registry
+    if _registry is None:
+        _registry = HttpClientRegistry(
+            timeout=settings.api_timeout_default,
+            connect_timeout=settings.http_connect_timeout,
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive,
+            keepalive_expiry=settings.http_keepalive_expiry,
+            http2=settings.http2_enabled
+        )
+    return _registry
+
+
+def get_http_client(name: str = "default") -> httpx.AsyncClient:
+    """get_http_registry().get() kısayolu"""
+    return get_http_registry().get(name)
+
+
+def get_http_stats() -> Dict[str, Dict[str, Any]]:
+    """Servis başına bağlantı metrikleri"""
+    return get_http_registry().get_stats() if _registry is not None else {}
+
+
+async def close_http_clients():
+    """Paylaşılan client'ları kapat (shutdown)"""
+    if _registry is not None:
+        await _registry.close()
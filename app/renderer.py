@@ -1,45 +1,234 @@
 """
 Olivenet Social Media Bot - HTML to PNG Renderer
 Uses Playwright for high-quality rendering.
+
+Renders go through a RenderPool: one shared Chromium with a fixed number of
+pre-warmed pages (each in its own context), so a render only pays for
+set_content + screenshot. Concurrent callers (carousel slides, each in its
+own generate -> render -> upload task) render in parallel up to the pool size.
+The browser is relaunched after html_render_recycle_after renders to bound memory.
 """
 import asyncio
 import logging
+import os
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import async_playwright, Browser, Page, Playwright
 
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
-# Global browser instance for reuse
-_browser: Optional[Browser] = None
-
-
-async def get_browser() -> Browser:
-    """Get or create a browser instance."""
-    global _browser
-    if _browser is None or not _browser.is_connected():
-        playwright = await async_playwright().start()
-        _browser = await playwright.chromium.launch(
+DEVICE_SCALE_FACTOR = 2  # For retina quality
+MAX_AUTO_POOL_SIZE = 8
+
+
+def get_render_pool_size() -> int:
+    """Configured pool size (0 = CPU count, capped at MAX_AUTO_POOL_SIZE)."""
+    if settings.html_render_pool_size > 0:
+        return settings.html_render_pool_size
+    return max(1, min(os.cpu_count() or 1, MAX_AUTO_POOL_SIZE))
+
+
+class RenderPool:
+    """Pool of pre-warmed Playwright pages on one shared browser."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        recycle_after: int = 200,
+        settle_ms: int = 1000,
+        width: int = 1080,
+        height: int = 1080
+    ):
+        self.size = max(1, size)
+        self.recycle_after = recycle_after
+        self.settle_ms = settle_ms
+        self.width = width
+        self.height = height
+
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._generation = 0
+        self._idle: List[Page] = []
+        self._page_generation: Dict[Page, int] = {}
+        self._in_use = 0
+        self._renders_since_launch = 0
+        self._cond = asyncio.Condition()
+        self._stats = {"renders": 0, "failures": 0, "recycles": 0, "render_s": 0.0}
+
+    async def _launch(self):
+        """(Re)launch the browser and pre-warm `size` pages."""
+        if self._browser is not None:
+            await self._close_browser()
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+
+        self._browser = await self._playwright.chromium.launch(
             headless=True,
             args=['--no-sandbox', '--disable-setuid-sandbox']
         )
-        logger.info("Browser instance created")
-    return _browser
+        self._generation += 1
+        self._renders_since_launch = 0
+        self._idle = [await self._new_page() for _ in range(self.size)]
+        logger.info(f"Browser instance created (pool size {self.size})")
+
+    async def _new_page(self) -> Page:
+        context = await self._browser.new_context(
+            viewport={'width': self.width, 'height': self.height},
+            device_scale_factor=DEVICE_SCALE_FACTOR
+        )
+        page = await context.new_page()
+        self._page_generation[page] = self._generation
+        return page
+
+    async def _close_page(self, page: Page):
+        self._page_generation.pop(page, None)
+        try:
+            await page.context.close()
+        except Exception:
+            pass
+
+    async def _close_browser(self):
+        for page in self._idle:
+            self._page_generation.pop(page, None)
+        self._idle = []
+        try:
+            await self._browser.close()
+        except Exception as e:
+            logger.warning(f"Browser close failed: {e}")
+        self._browser = None
+
+    async def _acquire(self) -> Page:
+        async with self._cond:
+            while True:
+                if self._browser is None or not self._browser.is_connected():
+                    await self._launch()
+                elif self.recycle_after and self._renders_since_launch >= self.recycle_after:
+                    # Drain in-flight renders, then relaunch
+                    if self._in_use == 0:
+                        logger.info(f"Recycling browser after {self._renders_since_launch} renders")
+                        self._stats["recycles"] += 1
+                        await self._launch()
+                        continue
+                    await self._cond.wait()
+                    continue
+
+                if self._idle:
+                    self._in_use += 1
+                    self._renders_since_launch += 1
+                    return self._idle.pop()
+                await self._cond.wait()
+
+    async def _release(self, page: Page, broken: bool = False):
+        async with self._cond:
+            self._in_use -= 1
+            current = self._page_generation.get(page) == self._generation
+            if current and not broken and not page.is_closed():
+                self._idle.append(page)
+            else:
+                # Broken page or page of a replaced browser
+                await self._close_page(page)
+                if current and self._browser is not None and self._browser.is_connected():
+                    self._idle.append(await self._new_page())
+            self._cond.notify_all()
+
+    async def render(
+        self,
+        html_content: str,
+        output_path: str,
+        width: int = 1080,
+        height: int = 1080
+    ) -> str:
+        """Render HTML content to a PNG on a pooled page."""
+        page = await self._acquire()
+        broken = False
+        start = time.monotonic()
+        try:
+            if page.viewport_size != {'width': width, 'height': height}:
+                await page.set_viewport_size({'width': width, 'height': height})
+
+            # Set the HTML content
+            await page.set_content(html_content, wait_until='domcontentloaded')
+
+            # Kısa bir bekleme (render için)
+            await page.wait_for_timeout(self.settle_ms)
+
+            # Take screenshot - font bekleme olmadan
+            await page.screenshot(
+                path=output_path,
+                type='png',
+                clip={'x': 0, 'y': 0, 'width': width, 'height': height},
+                timeout=60000  # 60 saniye
+            )
+            self._stats["renders"] += 1
+            self._stats["render_s"] += time.monotonic() - start
+            return output_path
+        except BaseException:
+            broken = True
+            self._stats["failures"] += 1
+            raise
+        finally:
+            await self._release(page, broken=broken)
+
+    def get_status(self) -> dict:
+        renders = self._stats["renders"]
+        return {
+            "size": self.size,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "renders_since_launch": self._renders_since_launch,
+            "renders": renders,
+            "failures": self._stats["failures"],
+            "recycles": self._stats["recycles"],
+            "avg_render_ms": round(self._stats["render_s"] / renders * 1000, 1) if renders else 0.0,
+        }
+
+    async def close(self):
+        async with self._cond:
+            if self._browser is not None:
+                await self._close_browser()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            self._page_generation.clear()
+            self._in_use = 0
+
+
+_pool: Optional[RenderPool] = None
+
+
+def get_render_pool() -> RenderPool:
+    """Get the shared render pool (singleton)."""
+    global _pool
+    if _pool is None:
+        _pool = RenderPool(
+            size=get_render_pool_size(),
+            recycle_after=settings.html_render_recycle_after,
+            settle_ms=settings.html_render_settle_ms
+        )
+    return _pool
 
 
 async def close_browser():
-    """Close the browser instance."""
-    global _browser
-    if _browser is not None:
-        await _browser.close()
-        _browser = None
+    """Close the render pool and its browser instance."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
         logger.info("Browser instance closed")
 
 
+def _default_output_path(index: Optional[int] = None) -> str:
+    settings.ensure_directories()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    suffix = f"_{index}" if index is not None else ""
+    return str(settings.outputs_dir / f"visual_{timestamp}{suffix}.png")
+
+
 async def render_html_to_png(
     html_content: str,
     output_path: Optional[str] = None,
@@ -60,36 +249,12 @@ async def render_html_to_png(
     """
     # Generate output path if not provided
     if output_path is None:
-        settings.ensure_directories()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = str(settings.outputs_dir / f"visual_{timestamp}.png")
+        output_path = _default_output_path()
 
     logger.info(f"Rendering HTML to PNG: {output_path}")
 
     try:
-        browser = await get_browser()
-        context = await browser.new_context(
-            viewport={'width': width, 'height': height},
-            device_scale_factor=2  # For retina quality
-        )
-        page = await context.new_page()
-
-        # Set the HTML content
-        await page.set_content(html_content, wait_until='domcontentloaded')
-
-        # Kısa bir bekleme (render için)
-        await page.wait_for_timeout(1000)
-
-        # Take screenshot - font bekleme olmadan
-        await page.screenshot(
-            path=output_path,
-            type='png',
-            clip={'x': 0, 'y': 0, 'width': width, 'height': height},
-            timeout=60000  # 60 saniye
-        )
-
-        await context.close()
-
+        await get_render_pool().render(html_content, output_path, width, height)
         logger.info(f"PNG rendered successfully: {output_path}")
         return output_path
 
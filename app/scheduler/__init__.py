@@ -1,10 +1,17 @@
 from .pipeline import ContentPipeline, PipelineState
 from .scheduler import ContentScheduler, ScheduledTask, create_default_scheduler
+from .stage_graph import Stage, StageGraph, StageFailed
+from .run_registry import PipelineRun, RunRegistry
 
 __all__ = [
     'ContentPipeline',
     'PipelineState',
     'ContentScheduler',
     'ScheduledTask',
-    'create_default_scheduler'
+    'create_default_scheduler',
+    'Stage',
+    'StageGraph',
+    'StageFailed',
+    'PipelineRun',
+    'RunRegistry'
 ]
@@ -0,0 +1,163 @@
+"""
+Pipeline Checkpoint - StageGraph run'ları için kalıcı aşama kaydı ve devam
+
+Her tamamlanan aşamanın output'ları (path, ID, süre, prompt) post_id bazında
+DB'ye yazılır (pipeline_runs / pipeline_checkpoints). Restart veya son
+aşamada (örn. Instagram publish) hata sonrası run, son tamamlanan aşamadan
+devam eder; pahalı video segmentleri yeniden üretilmez.
+
+    checkpoint = PipelineCheckpoint("long_video", params, result, resume_post_id)
+    skip = await checkpoint.load(graph)
+    await graph.run(initial, on_stage_complete=checkpoint.on_stage_complete, skip=skip)
+    await checkpoint.finish("completed")
+
+Dosya output'ları sha256 ile kaydedilir; devam ederken dosyası silinmiş
+veya değişmiş aşama (ve ona bağlı tüm aşamalar) yeniden çalıştırılır.
+post_id üretilmeden önce biten aşamalar (örn. konu seçimi) bellekte tutulur
+ve post_id belli olunca yazılır.
+"""
+
+import asyncio
+import hashlib
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.database import async_crud
+from app.utils.logger import get_logger
+from .stage_graph import StageGraph
+
+logger = get_logger("checkpoint")
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(path: str) -> str:
+    """Dosyanın sha256 özeti (1MB'lık parçalarla)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_file_paths(value: Any) -> List[str]:
+    """Output değeri içindeki mevcut dosya path'leri (dict/list içinde de arar)"""
+    if isinstance(value, str):
+        return [value] if len(value) < 1024 and "\n" not in value and os.path.isfile(value) else []
+    if isinstance(value, dict):
+        return [p for v in value.values() for p in find_file_paths(v)]
+    if isinstance(value, (list, tuple)):
+        return [p for v in value for p in find_file_paths(v)]
+    return []
+
+
+def hash_outputs(outputs: Dict[str, Any]) -> Dict[str, str]:
+    """Output'lardaki tüm dosyaların {path: sha256} haritası"""
+    return {path: hash_file(path) for path in dict.fromkeys(find_file_paths(outputs))}
+
+
+def verify_file_hashes(file_hashes: Dict[str, str]) -> Optional[str]:
+    """İlk geçersiz dosyayı döndür (yoksa None)"""
+    for path, digest in file_hashes.items():
+        if not os.path.isfile(path) or hash_file(path) != digest:
+            return path
+    return None
+
+
+class PipelineCheckpoint:
+    """Bir pipeline run'ının aşama checkpoint'leri"""
+
+    def __init__(
+        self,
+        pipeline: str,
+        params: Dict[str, Any],
+        result: Dict[str, Any],
+        post_id: Optional[int] = None
+    ):
+        """
+        Args:
+            pipeline: Pipeline adı (ContentPipeline.resume_pipeline bununla yönlendirir)
+            params: Pipeline metodunun argümanları (devam ederken aynen verilir)
+            result: Pipeline'ın result dict'i (her aşamada snapshot'ı saklanır)
+            post_id: Devam edilen run'ın post_id'si (yeni run için None)
+        """
+        self.pipeline = pipeline
+        self.params = params
+        self.result = result
+        self.post_id = post_id
+        self._buffer: List[Tuple[str, Dict[str, Any], Dict[str, str]]] = []
+
+    async def load(self, graph: StageGraph) -> Dict[str, Dict[str, Any]]:
+        """
+        Doğrulanmış checkpoint'leri StageGraph.run(skip=...) formatında döndür.
+
+        result dict'i son snapshot ile güncellenir. Dosyası doğrulanamayan
+        aşamalar ve girdilerini bu aşamalardan alanlar yeniden çalışır.
+        """
+        if self.post_id is None:
+            return {}
+
+        run = await async_crud.get_pipeline_run(self.post_id)
+        if not run:
+            return {}
+
+        valid = {}
+        for stage, checkpoint in run["checkpoints"].items():
+            if stage not in graph.stages:
+                continue
+            # Aşamanın output seti değişmişse (eski sürümün checkpoint'i) yeniden çalışır
+            if any(key not in checkpoint["outputs"] for key in graph.stages[stage].outputs):
+                continue
+            bad_path = await asyncio.to_thread(verify_file_hashes, checkpoint["file_hashes"])
+            if bad_path:
+                logger.warning(f"[CHECKPOINT] #{self.post_id} {stage}: dosya doğrulanamadı ({bad_path}), yeniden çalışacak")
+                continue
+            valid[stage] = checkpoint["outputs"]
+
+        # Yeniden çalışacak bir aşamanın çıktısını kullanan aşamalar da yeniden çalışır
+        changed = True
+        while changed:
+            changed = False
+            for stage in list(valid):
+                for key in graph.stages[stage].inputs:
+                    producer = graph.producers.get(key)
+                    if producer and producer not in valid:
+                        del valid[stage]
+                        changed = True
+                        break
+
+        self.result.update(run["result"])
+        self.result["resumed_from"] = list(valid)
+        logger.info(f"[CHECKPOINT] #{self.post_id} {self.pipeline}: {len(valid)} aşama atlanıyor ({', '.join(valid)})")
+        return valid
+
+    async def on_stage_complete(self, stage: str, outputs: Dict[str, Any]):
+        """StageGraph hook'u - aşama çıktısını hash'leyip kaydet"""
+        file_hashes = await asyncio.to_thread(hash_outputs, outputs)
+
+        if self.post_id is None and outputs.get("post_id"):
+            self.post_id = outputs["post_id"]
+
+        self._buffer.append((stage, outputs, file_hashes))
+        if self.post_id is None:
+            return
+
+        # Checkpoint yazılamaması pipeline'ı durdurmaz, sadece devam imkanı kaybolur
+        try:
+            while self._buffer:
+                name, stage_outputs, hashes = self._buffer[0]
+                await async_crud.save_stage_checkpoint(
+                    self.post_id, self.pipeline, name, stage_outputs, hashes, self.params, self.result
+                )
+                self._buffer.pop(0)
+        except Exception as e:
+            logger.error(f"[CHECKPOINT] #{self.post_id} {stage} kaydedilemedi: {e}")
+
+    async def finish(self, status: str, error: Optional[str] = None):
+        """Run'ı completed / failed olarak işaretle (post_id yoksa kayıt yok)"""
+        if self.post_id is None:
+            return
+        try:
+            await async_crud.finish_pipeline_run(self.post_id, status, result=self.result, error=error)
+        except Exception as e:
+            logger.error(f"[CHECKPOINT] #{self.post_id} durum kaydedilemedi: {e}")
@@ -4,15 +4,22 @@ Semi-autonomous mod: Her aşamada Telegram onayı bekler
 """
 
 import asyncio
+import functools
 import json
 import os
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional, Callable
 from enum import Enum
 
-from app.database import save_prompt
+from app.config import settings
+from app.database import async_crud
+from app.media.render import RenderPlan, RenderSegment, add_freeze_frame, finalize_video
 from app.validators.text_validator import validate_html_content, fix_common_issues
 from app.video_models import get_model_config, get_prompt_key, validate_duration, should_disable_audio, get_max_duration
+from .stage_graph import Stage, StageGraph
+from .checkpoint import PipelineCheckpoint
+from .run_registry import PipelineRun, RunRegistry, current_run, tag_callback
 from telegram.helpers import escape_markdown
 
 # Conversational Reels Constants
@@ -38,39 +45,6 @@ def calculate_freeze_duration(video_duration: float, last_word_end: float) -> fl
     return 0
 
 
-async def add_freeze_frame(video_path: str, duration: float) -> str:
-    """
-    Add freeze frame to end of video using FFmpeg tpad filter.
-
-    Args:
-        video_path: Path to input video
-        duration: Duration of freeze in seconds
-
-    Returns:
-        Path to output video with freeze frame
-    """
-    import subprocess
-
-    output_path = video_path.replace(".mp4", "_freeze.mp4")
-
-    cmd = [
-        "ffmpeg", "-y",
-        "-i", video_path,
-        "-vf", f"tpad=stop_mode=clone:stop_duration={duration}",
-        "-c:a", "copy",
-        output_path
-    ]
-
-    print(f"[FREEZE FRAME] Adding {duration:.1f}s freeze to video...")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-
-    if result.returncode != 0:
-        raise Exception(f"Freeze frame failed: {result.stderr}")
-
-    print(f"[FREEZE FRAME] Output: {output_path}")
-    return output_path
-
-
 def _escape_md(value) -> str:
     """Telegram Markdown için güvenli escape - None ve boş değerleri de handle eder"""
     if value is None:
@@ -121,6 +95,7 @@ def extract_shot_structure(speech_script: str, target_duration: int) -> list:
 class PipelineState(Enum):
     """Pipeline durumları"""
     IDLE = "idle"
+    QUEUED = "queued"
     PLANNING = "planning"
     AWAITING_TOPIC_APPROVAL = "awaiting_topic_approval"
     CREATING_CONTENT = "creating_content"
@@ -133,15 +108,32 @@ class PipelineState(Enum):
     COMPLETED = "completed"
     ERROR = "error"
 
+
+def pipeline_run(kind: str):
+    """
+    Pipeline metodunu kendi PipelineRun'ı içinde çalıştır.
+
+    Başka bir run içinden çağrılırsa (örn. otonom içerik -> reels, resume)
+    mevcut run kullanılır.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            if current_run() is not None:
+                return await method(self, *args, **kwargs)
+            async with self.runs.start(kind, PipelineState.QUEUED, on_queued=self._notify_queued):
+                self.state = PipelineState.IDLE
+                return await method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class ContentPipeline:
     """İçerik üretim pipeline'ı"""
 
     def __init__(self, telegram_callback: Optional[Callable] = None):
-        self.state = PipelineState.IDLE
-        self.current_data = {}
         self.telegram_callback = telegram_callback
-        self.approval_event = asyncio.Event()
-        self.approval_response = None
+        self.runs = RunRegistry(max_concurrent=settings.pipeline_max_concurrent_runs)
 
         # Agent'ları import et
         from app.agents import (
@@ -163,26 +155,100 @@ class ContentPipeline:
         timestamp = datetime.now().strftime("%H:%M:%S")
         print(f"[PIPELINE {timestamp}] {message}")
 
+    # ---------- Run bağlamı ----------
+    # state / current_data geçerli task'ın PipelineRun'ına aittir; böylece
+    # eşzamanlı run'lar birbirinin durumunu ezmez.
+
+    @property
+    def run(self) -> Optional[PipelineRun]:
+        return current_run()
+
+    @property
+    def state(self) -> PipelineState:
+        run = current_run()
+        return run.state if run else PipelineState.IDLE
+
+    @state.setter
+    def state(self, value: PipelineState):
+        run = current_run()
+        if run:
+            run.state = value
+
+    @property
+    def current_data(self) -> Dict[str, Any]:
+        run = current_run()
+        return run.current_data if run else {}
+
+    async def _notify_queued(self, run: PipelineRun):
+        status = self.runs.get_status()
+        await self.notify_telegram(
+            message=f"⏳ *{_escape_md(run.kind)}* sırada - "
+            f"{status['running']}/{status['max_concurrent']} run çalışıyor",
+            data={},
+            buttons=[]
+        )
+
     async def notify_telegram(self, message: str, data: Dict = None, buttons: list = None):
-        """Telegram'a bildirim gönder"""
-        if self.telegram_callback:
-            await self.telegram_callback(message, data, buttons)
+        """Telegram'a bildirim gönder (run içindeyse butonlar run ID'sini taşır)"""
+        if not self.telegram_callback:
+            return
+        run = current_run()
+        if run and buttons:
+            message = f"🔖 `{run.kind}#{run.run_id}`\n{message}"
+            buttons = [{**btn, "callback": tag_callback(btn["callback"], run.run_id)} for btn in buttons]
+        await self.telegram_callback(message, data, buttons)
+
+    async def wait_for_approval(self, timeout: int = None) -> Dict[str, Any]:
+        """Geçerli run için kullanıcı onayı bekle (default pipeline_approval_timeout)"""
+        run = current_run()
+        if run is None:
+            raise RuntimeError("wait_for_approval bir pipeline run'ı dışında çağrıldı")
+        return await run.wait_for_approval(timeout or settings.pipeline_approval_timeout)
+
+    def set_approval(self, response: Dict[str, Any], run_id: str = None) -> bool:
+        """
+        Onay yanıtını run'a ilet (Telegram'dan çağrılır).
+
+        run_id verilmezse onay bekleyen en eski run'a gider. Hedef run yoksa
+        veya onay beklemiyorsa False.
+        """
+        return self.runs.set_approval(response, run_id)
 
-    async def wait_for_approval(self, timeout: int = 3600) -> Dict[str, Any]:
-        """Kullanıcı onayı bekle (default 1 saat)"""
-        self.approval_event.clear()
-        self.approval_response = None
+    def get_current_state(self, run_id: str = None) -> Dict[str, Any]:
+        """Telegram audit log'u için run'ın post/konu bilgisi"""
+        run = self.runs.resolve(run_id)
+        return run.current_state if run else {}
 
-        try:
-            await asyncio.wait_for(self.approval_event.wait(), timeout=timeout)
-            return self.approval_response or {"action": "timeout"}
-        except asyncio.TimeoutError:
-            return {"action": "timeout"}
+    async def resume_pipeline(self, post_id: int) -> Dict[str, Any]:
+        """
+        Yarıda kalan bir StageGraph run'ını son tamamlanan aşamadan devam ettir.
+
+        Checkpoint'i doğrulanan aşamalar atlanır; run'ın orijinal parametreleri
+        pipeline_runs tablosundan okunur.
+        """
+        run = await async_crud.get_pipeline_run(post_id)
+        if not run:
+            return {"success": False, "error": f"Post #{post_id} için checkpoint yok"}
+        if run["status"] == "completed":
+            return {"success": False, "error": f"Post #{post_id} zaten tamamlandı"}
+
+        runners = {
+            "voice_reels": self.run_reels_voice_content,
+            "long_video": self.run_long_video_pipeline,
+            "conversational_reels": self.run_conversational_reels,
+        }
+        runner = runners.get(run["pipeline"])
+        if not runner:
+            return {"success": False, "error": f"Bilinmeyen pipeline: {run['pipeline']}"}
+
+        self.log(f"[RESUME] #{post_id} {run['pipeline']} devam ediyor ({len(run['checkpoints'])} checkpoint)")
+        return await runner(**run["params"], resume_post_id=post_id)
 
-    def set_approval(self, response: Dict[str, Any]):
-        """Onay yanıtını ayarla (Telegram'dan çağrılır)"""
-        self.approval_response = response
-        self.approval_event.set()
+    def _resume_buttons(self, checkpoint: PipelineCheckpoint) -> list:
+        """Hata bildirimine 'devam et' butonu (checkpoint kaydı varsa)"""
+        if checkpoint.post_id is None:
+            return []
+        return [{"text": "▶️ Kaldığı Yerden Devam Et", "callback": f"resume_run:{checkpoint.post_id}"}]
 
     def _create_avatar_prompt(self, original_prompt: str) -> str:
         """Video prompt'u lipsync için sessiz avatar prompt'una çevir."""
@@ -207,17 +273,11 @@ Show natural gestures and expressions, NO actual speech.
 
     @property
     def current_state(self) -> Dict[str, Any]:
-        """Audit logging için current_data'dan state çıkar"""
-        content = self.current_data.get("content", {})
-        topic = self.current_data.get("topic_suggestion", {})
-        visual = self.current_data.get("visual_result", {})
-
-        return {
-            "post_id": content.get("post_id"),
-            "topic": topic.get("topic"),
-            "visual_type": visual.get("visual_type", "post")
-        }
+        """Audit logging için geçerli run'ın current_data'sından state çıkar"""
+        run = current_run()
+        return run.current_state if run else {}
 
+    @pipeline_run("daily")
     async def run_daily_content(self, topic: str = None, manual_topic_mode: bool = False, visual_type: str = None) -> Dict[str, Any]:
         """Günlük içerik pipeline'ı çalıştır"""
         self.log("Günlük içerik pipeline'ı başlatılıyor...")
@@ -388,7 +448,7 @@ Show natural gestures and expressions, NO actual speech.
             visual_prompt = visual_prompt_result.get("visual_prompt", "")
             if visual_prompt and content_result.get("post_id"):
                 prompt_style = visual_prompt_result.get("style") or visual_type
-                save_prompt(
+                await async_crud.save_prompt(
                     post_id=content_result.get("post_id"),
                     prompt_text=visual_prompt,
                     prompt_type='image',
@@ -701,6 +761,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
             return result
 
+    @pipeline_run("autonomous")
     async def run_autonomous_content(self, min_score: int = 7) -> Dict[str, Any]:
         """
         Tam otonom içerik pipeline'ı - Telegram onayı beklemez
@@ -788,7 +849,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             visual_prompt = visual_prompt_result.get("visual_prompt", "")
             if visual_prompt and content_result.get("post_id"):
                 prompt_style = visual_prompt_result.get("style") or visual_type
-                save_prompt(
+                await async_crud.save_prompt(
                     post_id=content_result.get("post_id"),
                     prompt_text=visual_prompt,
                     prompt_type='image',
@@ -963,6 +1024,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
             return result
 
+    @pipeline_run("scheduled")
     async def run_autonomous_content_with_plan(self, plan: dict) -> Dict[str, Any]:
         """Plana göre otonom içerik üret ve paylaş - Engagement stratejileriyle"""
         topic = plan.get('topic_suggestion') or 'Genel IoT konusu'
@@ -1130,6 +1192,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             result["error"] = str(e)
             return result
 
+    @pipeline_run("reels")
     async def run_reels_content(self, topic: str = None, force_model: str = None, manual_topic_mode: bool = False, visual_style: str = "cinematic_4k", viral_format: str = None, hook_type: str = None) -> Dict[str, Any]:
         """
         Instagram Reels içeriği üret ve yayınla
@@ -1254,7 +1317,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             # Video prompt'u kaydet
             if video_prompt and content_result.get("post_id"):
                 prompt_style = reels_prompt_result.get("camera_movement") or complexity
-                save_prompt(
+                await async_crud.save_prompt(
                     post_id=content_result.get("post_id"),
                     prompt_text=video_prompt,
                     prompt_type='video',
@@ -1383,6 +1446,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
             return result
 
+    @pipeline_run("voice_reels")
     async def run_reels_voice_content(
         self,
         topic: str = None,
@@ -1390,7 +1454,8 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
         target_duration: int = 15,
         manual_topic_mode: bool = False,
         model_id: str = "sora-2",
-        visual_style: str = "cinematic_4k"
+        visual_style: str = "cinematic_4k",
+        resume_post_id: int = None
     ) -> Dict[str, Any]:
         """
         Sesli Instagram Reels içeriği üret ve yayınla.
@@ -1398,15 +1463,15 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
         ElevenLabs TTS + Video + FFmpeg merge pipeline.
         Multi-model desteği: Sora 2, Veo 2, Kling 2.1, Wan 2.1, Minimax
 
-        Pipeline Akışı:
+        Pipeline Akışı (StageGraph - bağımsız aşamalar eşzamanlı):
         1. Konu seçimi (Planner) veya manuel konu işleme (Creator)
-        2. Caption üretimi (Creator)
-        3. Speech script üretimi (Creator)
-        4. TTS ses üretimi (ElevenLabs)
-        5. Video prompt üretimi (Creator)
-        6. Video üretimi (model_id'ye göre)
+        2. Caption üretimi (Creator)           ┐ konuya bağlı, paralel
+        3. Speech script üretimi (Creator)     ┘
+        4. TTS ses üretimi (ElevenLabs)        ┐ script'e bağlı, paralel
+        5. Video prompt üretimi (Creator)      ┘ (+ caption)
+        6. Video üretimi (prompt + gerçek ses süresi)
         7. Audio-video birleştirme (FFmpeg)
-        8. Kalite kontrol (Reviewer)
+        8. Kalite kontrol (Reviewer) - caption hazır olunca, video ile paralel
         9. Instagram Reels yayını (Publisher)
 
         Args:
@@ -1416,6 +1481,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             manual_topic_mode: True ise topic Creator ile profesyonelleştirilir
             model_id: Video model ID (sora-2, veo-2, kling-2.1, wan-2.1, minimax)
             visual_style: Görsel stil (cinematic_4k, anime, vb.)
+            resume_post_id: Yarıda kalan run'ın post_id'si (son tamamlanan aşamadan devam)
 
         Returns:
             Pipeline sonucu
@@ -1443,8 +1509,9 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             "model_name": model_name
         }
 
-        try:
-            # ========== AŞAMA 1: Konu Seçimi ==========
+        # ========== AŞAMA 1: Konu Seçimi ==========
+        async def stage_topic(ctx):
+            topic = ctx["topic_input"]
             if topic and manual_topic_mode:
                 # Manuel topic: Creator ile profesyonelleştir
                 self.log(f"[VOICE REELS] Manuel konu işleniyor: {topic[:50]}...")
@@ -1495,15 +1562,17 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 data=topic_data,
                 buttons=[]
             )
+            return {"topic": topic, "topic_data": topic_data}
 
-            # ========== AŞAMA 2: Caption Üretimi ==========
+        # ========== AŞAMA 2: Caption Üretimi ==========
+        async def stage_caption(ctx):
             self.log("[VOICE REELS] Aşama 2: Caption üretiliyor...")
             self.state = PipelineState.CREATING_CONTENT
 
             content_result = await self.creator.execute({
                 "action": "create_post_multiplatform",
-                "topic": topic,
-                "category": topic_data.get("category", "tanitim"),
+                "topic": ctx["topic"],
+                "category": ctx["topic_data"].get("category", "tanitim"),
                 "visual_type": "video"
             })
 
@@ -1515,39 +1584,41 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             result["post_id"] = content_result.get("post_id")
 
             self.log(f"[VOICE REELS] Caption: IG {content_result.get('ig_word_count', 0)} kelime")
+            return {"content": content_result, "post_id": content_result.get("post_id")}
 
-            # ========== AŞAMA 3: Speech Script Üretimi ========== [YENİ]
+        # ========== AŞAMA 3: Speech Script Üretimi ==========
+        async def stage_speech(ctx):
             self.log("[VOICE REELS] Aşama 3: Voiceover scripti oluşturuluyor...")
 
+            # post_id caption ile paralel üretildiği için henüz yok,
+            # script video prompt aşamasında post'a yazılır
             speech_result = await self.creator.execute({
                 "action": "create_speech_script",
-                "topic": topic,
+                "topic": ctx["topic"],
                 "target_duration": target_duration,
-                "tone": "friendly",  # Samimi ton
-                "post_id": content_result.get("post_id")
+                "tone": "friendly"  # Samimi ton
             })
 
             if not speech_result.get("success"):
                 raise Exception(f"Speech script error: {speech_result.get('error', 'Unknown')}")
 
-            speech_script = speech_result.get("speech_script", "")
             self.current_data["speech"] = speech_result
             result["stages_completed"].append("speech_script")
 
             self.log(f"[VOICE REELS] Script hazır: {speech_result.get('word_count')} kelime, ~{speech_result.get('estimated_duration'):.1f}s")
+            return {"speech_script": speech_result.get("speech_script", "")}
 
-            # ========== AŞAMA 4: TTS ile Ses Üretimi ========== [YENİ]
+        # ========== AŞAMA 4: TTS ile Ses Üretimi ==========
+        async def stage_tts(ctx):
             self.log("[VOICE REELS] Aşama 4: TTS ile ses üretiliyor...")
 
-            audio_path = None
-            audio_duration = 0
-            voice_fallback = False
+            audio = {"audio_path": None, "audio_duration": 0, "actual_audio_duration": None, "voice_fallback": False}
 
             try:
                 from app.elevenlabs_helper import generate_speech_with_retry, ElevenLabsError, QuotaExceededError
 
                 tts_result = await generate_speech_with_retry(
-                    text=speech_script,
+                    text=ctx["speech_script"],
                     max_retries=3
                 )
 
@@ -1555,9 +1626,9 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                     audio_path = tts_result.get("audio_path")
                     estimated_duration = tts_result.get("duration_seconds", 0)
 
-                    # GERÇEK audio süresini ffprobe ile ölç (tahmini değil!)
+                    # GERÇEK audio süresi (TTS cache ölçümü, yoksa ffprobe - tahmini değil!)
                     from app.instagram_helper import get_audio_duration
-                    actual_audio_duration = await get_audio_duration(audio_path)
+                    actual_audio_duration = tts_result.get("measured_duration") or await get_audio_duration(audio_path)
                     self.log(f"[VOICE REELS] TTS süre karşılaştırma - Tahmini: {estimated_duration:.1f}s, Gerçek: {actual_audio_duration:.1f}s")
 
                     # Gerçek süreyi kullan (tahmini değil)
@@ -1568,6 +1639,11 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                         self.log(f"[VOICE REELS] Ses çok uzun ({audio_duration:.1f}s), {target_duration}s'ye kırpılacak")
                         audio_duration = target_duration  # merge_audio_video -t ile kırpacak
 
+                    audio.update(
+                        audio_path=audio_path,
+                        audio_duration=audio_duration,
+                        actual_audio_duration=actual_audio_duration
+                    )
                     result["stages_completed"].append("tts_generation")
                     result["actual_audio_duration"] = actual_audio_duration  # Gerçek süreyi kaydet
                     self.log(f"[VOICE REELS] Ses hazır: {audio_duration:.1f}s (gerçek: {actual_audio_duration:.1f}s)")
@@ -1582,20 +1658,31 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                             buttons=[]
                         )
 
-                    voice_fallback = True
+                    audio["voice_fallback"] = True
 
             except Exception as e:
                 self.log(f"[VOICE REELS] TTS exception: {e}")
-                voice_fallback = True
+                audio["voice_fallback"] = True
 
-            if voice_fallback:
+            if audio["voice_fallback"]:
                 self.log("[VOICE REELS] Sessiz video moduna geçiliyor...")
                 result["voice_fallback"] = True
 
-            # ========== AŞAMA 5: Video Prompt Üretimi ==========
+            return {"audio": audio}
+
+        # ========== AŞAMA 5: Video Prompt Üretimi ==========
+        async def stage_video_prompt(ctx):
             self.log("[VOICE REELS] Aşama 5: Video prompt oluşturuluyor...")
             self.state = PipelineState.CREATING_VISUAL
 
+            topic = ctx["topic"]
+            content_result = ctx["content"]
+            speech_script = ctx["speech_script"]
+            post_id = content_result.get("post_id")
+
+            if post_id and speech_script:
+                await async_crud.update_post(post_id, speech_script=speech_script)
+
             # Speech-Video senkronizasyonu için shot yapısı çıkar
             speech_structure = extract_shot_structure(speech_script, target_duration)
             self.log(f"[VOICE REELS] Shot yapısı: {len(speech_structure)} shot")
@@ -1605,9 +1692,9 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             reels_prompt_result = await self.creator.execute({
                 "action": "create_reels_prompt",
                 "topic": topic,
-                "category": topic_data.get("category", "tanitim"),
+                "category": ctx["topic_data"].get("category", "tanitim"),
                 "post_text": content_result.get("post_text_ig", ""),
-                "post_id": content_result.get("post_id"),
+                "post_id": post_id,
                 "speech_structure": speech_structure,  # Senkronizasyon için
                 "voice_mode": True,  # Sesli reels modu
                 "visual_style": visual_style
@@ -1645,24 +1732,27 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 raise Exception("Video prompt boş! LLM geçerli bir prompt üretemedi.")
 
             # Video prompt'u kaydet
-            if video_prompt and content_result.get("post_id"):
+            if video_prompt and post_id:
                 prompt_style = reels_prompt_result.get("camera_movement") or complexity
-                save_prompt(
-                    post_id=content_result.get("post_id"),
+                await async_crud.save_prompt(
+                    post_id=post_id,
                     prompt_text=video_prompt,
                     prompt_type='video',
                     style=prompt_style
                 )
 
             self.log(f"[VOICE REELS] Prompt hazır (model: {model_to_use}, prompt_key: {prompt_key})")
+            return {"video_prompt": video_prompt, "complexity": complexity}
 
-            # ========== AŞAMA 6: Video Üretimi ==========
+        # ========== AŞAMA 6: Video Üretimi ==========
+        async def stage_video(ctx):
+            model_to_use = force_model or model_id
             self.log(f"[VOICE REELS] Aşama 6: Video üretiliyor ({model_name})...")
 
             from app.sora_helper import generate_video_smart
 
             # Video süresini GERÇEK audio süresine göre belirle
-            actual_dur = result.get("actual_audio_duration", target_duration)
+            actual_dur = ctx["audio"]["actual_audio_duration"] or target_duration
 
             # Model'in desteklediği sürelere göre video_gen_duration belirle
             model_durations = model_config.get("durations", [8, 12])
@@ -1679,8 +1769,8 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             self.log(f"[VOICE REELS] Video süresi: {video_gen_duration}s (audio: {actual_dur:.1f}s, model: {model_name})")
 
             video_result = await generate_video_smart(
-                prompt=video_prompt,
-                topic=topic,
+                prompt=ctx["video_prompt"],
+                topic=ctx["topic"],
                 force_model=model_to_use,
                 duration=video_gen_duration,  # Gerçek audio süresine göre
                 voice_mode=True  # TTS voiceover için NO dialogue suffix
@@ -1689,7 +1779,6 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             if not video_result.get("success"):
                 raise Exception(f"Video generation failed: {video_result.get('error', 'Unknown')}")
 
-            video_path = video_result.get("video_path")
             model_used = video_result.get("model_used", "unknown")
 
             self.current_data["video_result"] = video_result
@@ -1697,106 +1786,130 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             result["model_used"] = model_used
 
             self.log(f"[VOICE REELS] Video üretildi ({model_used})")
+            return {"video_path": video_result.get("video_path"), "model_used": model_used}
 
-            # ========== AŞAMA 7: Audio-Video Birleştirme ========== [YENİ]
-            final_video_path = video_path
+        # ========== AŞAMA 7: Audio/Video Sync ==========
+        async def stage_audio_sync(ctx):
+            video_path = ctx["video_path"]
+            audio_path = ctx["audio"]["audio_path"]
+            audio_duration = ctx["audio"]["audio_duration"]
 
-            if audio_path and not voice_fallback:
-                self.log("[VOICE REELS] Aşama 7: Video ve ses birleştiriliyor...")
+            if not audio_path or ctx["audio"]["voice_fallback"]:
+                self.log("[VOICE REELS] Audio yok, sessiz video kullanılacak")
+                return {"final_audio_path": None, "final_audio_duration": 0.0, "source_video_duration": None}
 
-                from app.instagram_helper import merge_audio_video, get_video_duration
-                from app.audio_sync_helper import sync_audio_to_video
+            self.log("[VOICE REELS] Aşama 7: Ses video süresine uyarlanıyor...")
 
-                # Video süresini kontrol et
-                video_duration = await get_video_duration(video_path)
+            from app.instagram_helper import get_video_duration
+            from app.audio_sync_helper import sync_audio_to_video
 
-                # Audio/Video sync - video loop yapmadan audio'yu adapte et
-                if audio_duration > video_duration:
-                    self.log(f"[VOICE REELS] Audio ({audio_duration:.1f}s) > Video ({video_duration:.1f}s) - sync yapılıyor...")
+            # Video süresini kontrol et
+            video_duration = await get_video_duration(video_path)
 
-                    sync_result = await sync_audio_to_video(
-                        audio_path=audio_path,
-                        video_duration=video_duration,
-                        original_script=speech_script
-                    )
-
-                    if sync_result.get("success"):
-                        audio_path = sync_result["audio_path"]
-                        audio_duration = sync_result["final_duration"]
-                        self.log(f"[VOICE REELS] Sync: {sync_result['action']} ({sync_result.get('trimmed_seconds', 0):.1f}s kırpıldı)")
+            # Audio/Video sync - video loop yapmadan audio'yu adapte et
+            if video_duration and audio_duration > video_duration:
+                self.log(f"[VOICE REELS] Audio ({audio_duration:.1f}s) > Video ({video_duration:.1f}s) - sync yapılıyor...")
 
-                merge_result = await merge_audio_video(
-                    video_path=video_path,
+                sync_result = await sync_audio_to_video(
                     audio_path=audio_path,
-                    target_duration=audio_duration,
-                    fade_out=True,
-                    fade_duration=0.5
+                    video_duration=video_duration,
+                    original_script=ctx["speech_script"]
                 )
 
-                if merge_result.get("success"):
-                    final_video_path = merge_result.get("output_path")
-                    result["stages_completed"].append("audio_merge")
-                    result["final_duration"] = merge_result.get("duration")
-                    self.log(f"[VOICE REELS] Merge tamamlandı: {merge_result.get('duration'):.1f}s")
+                if sync_result.get("success"):
+                    audio_path = sync_result["audio_path"]
+                    audio_duration = sync_result["final_duration"]
+                    self.log(f"[VOICE REELS] Sync: {sync_result['action']} ({sync_result.get('trimmed_seconds', 0):.1f}s kırpıldı)")
 
-                    # ========== SUBTITLE GENERATION (Optional) ==========
-                    if os.getenv("SUBTITLE_ENABLED", "false").lower() == "true":
-                        self.log("[VOICE REELS] Altyazı ekleniyor...")
-                        try:
-                            from app.subtitle_helper import create_subtitle_file
-                            from app.instagram_helper import add_subtitles_to_video
-
-                            # Generate ASS subtitle from audio (hybrid: original script + Whisper timing)
-                            sub_result = await create_subtitle_file(
-                                audio_path=audio_path,
-                                original_script=speech_script,
-                                model_size=os.getenv("WHISPER_MODEL_SIZE", "base"),
-                                language="tr"
-                            )
+            return {
+                "final_audio_path": audio_path,
+                "final_audio_duration": audio_duration,
+                "source_video_duration": video_duration
+            }
 
-                            if sub_result.get("success"):
-                                # Burn subtitles into video
-                                burn_result = await add_subtitles_to_video(
-                                    video_path=final_video_path,
-                                    ass_path=sub_result["ass_path"]
-                                )
+        # ========== SUBTITLE GENERATION (Optional) ==========
+        async def stage_subtitle_file(ctx):
+            audio_path = ctx["final_audio_path"]
+            if not audio_path or os.getenv("SUBTITLE_ENABLED", "false").lower() != "true":
+                return {"ass_path": None, "subtitle_count": 0}
 
-                                if burn_result.get("success"):
-                                    final_video_path = burn_result["output_path"]
-                                    result["stages_completed"].append("subtitles")
-                                    result["subtitle_count"] = sub_result["subtitle_count"]
-                                    self.log(f"[VOICE REELS] Altyazı eklendi: {sub_result['subtitle_count']} satır")
-                                else:
-                                    self.log(f"[VOICE REELS] Altyazı burn hatası: {burn_result.get('error')}")
-                            else:
-                                self.log(f"[VOICE REELS] Altyazı üretim hatası: {sub_result.get('error')}")
-                        except Exception as e:
-                            self.log(f"[VOICE REELS] Altyazı exception: {e}")
-                            # Continue without subtitles - graceful degradation
+            self.log("[VOICE REELS] Altyazı dosyası oluşturuluyor...")
+            try:
+                from app.subtitle_helper import create_subtitle_file
+
+                # Generate ASS subtitle from audio (hybrid: original script + Whisper timing)
+                sub_result = await create_subtitle_file(
+                    audio_path=audio_path,
+                    original_script=ctx["speech_script"],
+                    model_size=os.getenv("WHISPER_MODEL_SIZE", "base"),
+                    language="tr"
+                )
+
+                if sub_result.get("success"):
+                    return {"ass_path": sub_result["ass_path"], "subtitle_count": sub_result["subtitle_count"]}
+                self.log(f"[VOICE REELS] Altyazı üretim hatası: {sub_result.get('error')}")
+            except Exception as e:
+                self.log(f"[VOICE REELS] Altyazı exception: {e}")
+                # Continue without subtitles - graceful degradation
+
+            return {"ass_path": None, "subtitle_count": 0}
+
+        # ========== AŞAMA 7b: Final Render (ses + fade + altyazı tek encode) ==========
+        async def stage_render(ctx):
+            final_video_path = ctx["video_path"]
+            audio_path = ctx["final_audio_path"]
+
+            if audio_path:
+                self.log("[VOICE REELS] Video, ses ve altyazı tek geçişte render ediliyor...")
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                render_result = await finalize_video(RenderPlan(
+                    segments=[RenderSegment(ctx["video_path"], duration=ctx["source_video_duration"] or None)],
+                    output_path=os.path.join(str(settings.outputs_dir), f"voice_reel_{timestamp}.mp4"),
+                    audio_path=audio_path,
+                    duration=ctx["final_audio_duration"],
+                    fade_out=0.5,
+                    ass_path=ctx["ass_path"]
+                ))
+
+                if render_result.get("success"):
+                    final_video_path = render_result["output_path"]
+                    result["stages_completed"].append("audio_merge")
+                    result["final_duration"] = render_result.get("duration")
+                    result["single_pass_render"] = render_result["single_pass"]
+                    self.log(f"[VOICE REELS] Render tamamlandı: {render_result.get('duration'):.1f}s "
+                             f"({'tek geçiş' if render_result['single_pass'] else 'adım adım'}, {render_result['encode_s']:.1f}s)")
+
+                    if render_result["subtitles"]:
+                        result["stages_completed"].append("subtitles")
+                        result["subtitle_count"] = ctx["subtitle_count"]
+                        self.log(f"[VOICE REELS] Altyazı eklendi: {ctx['subtitle_count']} satır")
+                    elif ctx["ass_path"]:
+                        self.log(f"[VOICE REELS] Altyazı burn hatası: {render_result.get('subtitle_error')}")
                 else:
-                    self.log(f"[VOICE REELS] Merge hatası: {merge_result.get('error')}")
+                    self.log(f"[VOICE REELS] Merge hatası: {render_result.get('error')}")
                     self.log("[VOICE REELS] Sessiz video ile devam ediliyor...")
                     result["merge_fallback"] = True
-            else:
-                self.log("[VOICE REELS] Audio yok, sessiz video kullanılacak")
 
+            audio_ok = bool(ctx["audio"]["audio_path"]) and not ctx["audio"]["voice_fallback"]
             await self.notify_telegram(
                 message=f"🎥 *SESLİ REELS* - Video Hazır\n\n"
-                f"Model: {model_used}\n"
-                f"Ses: {'✅ Eklendi' if audio_path and not voice_fallback else '❌ Yok (fallback)'}\n"
-                f"Complexity: {complexity}",
+                f"Model: {ctx['model_used']}\n"
+                f"Ses: {'✅ Eklendi' if audio_ok else '❌ Yok (fallback)'}\n"
+                f"Complexity: {ctx['complexity']}",
                 data={"video_path": final_video_path},
                 buttons=[]
             )
+            return {"final_video_path": final_video_path}
 
-            # ========== AŞAMA 8: Kalite Kontrol ==========
+        # ========== AŞAMA 8: Kalite Kontrol ==========
+        async def stage_review(ctx):
             self.log("[VOICE REELS] Aşama 8: Kalite kontrol...")
-            self.state = PipelineState.REVIEWING
+            content_result = ctx["content"]
 
             review_result = await self.reviewer.execute({
                 "action": "review_post",
                 "post_text": content_result.get("post_text_ig", ""),
-                "topic": topic,
+                "topic": ctx["topic"],
                 "post_id": content_result.get("post_id")
             })
 
@@ -1806,55 +1919,105 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
             self.log(f"[VOICE REELS] Review: {score}/10")
 
+            caption = content_result.get("post_text_ig", "")
+
             # Düşük puan ise revizyon
             if score < 7:
                 self.log("[VOICE REELS] Puan düşük, caption revize ediliyor...")
                 revision_result = await self.creator.execute({
                     "action": "revise_post",
-                    "post_text": content_result.get("post_text_ig", ""),
+                    "post_text": caption,
                     "feedback": review_result.get("feedback", "Daha kısa ve etkili yaz"),
                     "post_id": content_result.get("post_id")
                 })
-                content_result["post_text_ig"] = revision_result.get("revised_post", content_result.get("post_text_ig"))
+                caption = revision_result.get("revised_post", caption)
+                content_result["post_text_ig"] = caption
 
-            # ========== AŞAMA 9: Yayınla ==========
+            return {"final_caption": caption, "review_score": score}
+
+        # ========== AŞAMA 9: Yayınla ==========
+        async def stage_publish(ctx):
             self.log("[VOICE REELS] Aşama 9: Yayınlanıyor...")
             self.state = PipelineState.PUBLISHING
 
             publish_result = await self.publisher.execute({
                 "action": "publish",
-                "post_id": content_result.get("post_id"),
-                "post_text": content_result.get("post_text_ig", ""),
-                "post_text_ig": content_result.get("post_text_ig", ""),
-                "video_path": final_video_path,
+                "post_id": ctx["content"].get("post_id"),
+                "post_text": ctx["final_caption"],
+                "post_text_ig": ctx["final_caption"],
+                "video_path": ctx["final_video_path"],
                 "platform": "instagram"
             })
 
-            if publish_result.get("success"):
-                result["stages_completed"].append("published")
-                result["success"] = True
-                result["instagram_post_id"] = publish_result.get("instagram_post_id")
+            if not publish_result.get("success"):
+                raise Exception(f"Publish error: {publish_result.get('error')}")
 
-                self.log(f"[VOICE REELS] Başarıyla yayınlandı! Instagram Reels")
+            result["stages_completed"].append("published")
+            result["success"] = True
+            result["instagram_post_id"] = publish_result.get("instagram_post_id")
 
-                voice_status = "🔊 Sesli" if (audio_path and not voice_fallback) else "🔇 Sessiz"
+            self.log(f"[VOICE REELS] Başarıyla yayınlandı! Instagram Reels")
 
-                await self.notify_telegram(
-                    message=f"🎉 *SESLİ REELS* - Yayınlandı!\n\n"
-                    f"📝 Konu: {_escape_md(topic[:50])}...\n"
-                    f"🎥 Model: {_escape_md(model_used)}\n"
-                    f"🎙️ Ses: {voice_status}\n"
-                    f"⏱️ Süre: ~{target_duration}s\n"
-                    f"📱 Platform: Instagram Reels\n"
-                    f"⭐ Puan: {score}/10",
-                    data=publish_result,
-                    buttons=[]
-                )
-            else:
-                raise Exception(f"Publish error: {publish_result.get('error')}")
+            audio_ok = bool(ctx["audio"]["audio_path"]) and not ctx["audio"]["voice_fallback"]
+            voice_status = "🔊 Sesli" if audio_ok else "🔇 Sessiz"
+
+            await self.notify_telegram(
+                message=f"🎉 *SESLİ REELS* - Yayınlandı!\n\n"
+                f"📝 Konu: {_escape_md(ctx['topic'][:50])}...\n"
+                f"🎥 Model: {_escape_md(ctx['model_used'])}\n"
+                f"🎙️ Ses: {voice_status}\n"
+                f"⏱️ Süre: ~{target_duration}s\n"
+                f"📱 Platform: Instagram Reels\n"
+                f"⭐ Puan: {ctx['review_score']}/10",
+                data=publish_result,
+                buttons=[]
+            )
+            return {"publish_result": publish_result}
+
+        graph = StageGraph("voice_reels", [
+            Stage("topic", stage_topic, ("topic_input",), ("topic", "topic_data")),
+            Stage("caption", stage_caption, ("topic", "topic_data"), ("content", "post_id")),
+            Stage("speech_script", stage_speech, ("topic",), ("speech_script",)),
+            Stage("tts", stage_tts, ("speech_script",), ("audio",), resource="tts"),
+            Stage("video_prompt", stage_video_prompt,
+                  ("topic", "topic_data", "content", "speech_script"), ("video_prompt", "complexity")),
+            Stage("video", stage_video, ("topic", "video_prompt", "audio"), ("video_path", "model_used"), resource="video"),
+            Stage("audio_sync", stage_audio_sync, ("video_path", "audio", "speech_script"),
+                  ("final_audio_path", "final_audio_duration", "source_video_duration"), resource="ffmpeg"),
+            Stage("subtitle_file", stage_subtitle_file, ("final_audio_path", "speech_script"),
+                  ("ass_path", "subtitle_count"), resource="whisper"),
+            Stage("render", stage_render,
+                  ("video_path", "final_audio_path", "final_audio_duration", "source_video_duration",
+                   "ass_path", "subtitle_count", "audio", "model_used", "complexity"),
+                  ("final_video_path",), resource="ffmpeg"),
+            Stage("review", stage_review, ("topic", "content"), ("final_caption", "review_score")),
+            Stage("publish", stage_publish,
+                  ("content", "final_caption", "final_video_path", "review_score", "topic", "audio", "model_used"),
+                  ("publish_result",)),
+        ])
+
+        checkpoint = PipelineCheckpoint(
+            "voice_reels",
+            params={
+                "topic": topic,
+                "force_model": force_model,
+                "target_duration": target_duration,
+                "manual_topic_mode": manual_topic_mode,
+                "model_id": model_id,
+                "visual_style": visual_style
+            },
+            result=result,
+            post_id=resume_post_id
+        )
+
+        try:
+            skip = await checkpoint.load(graph)
+            await graph.run({"topic_input": topic}, on_stage_complete=checkpoint.on_stage_complete, skip=skip)
+            self.log(f"[VOICE REELS] {graph.summary()}")
 
             self.state = PipelineState.COMPLETED
             result["final_state"] = self.state.value
+            await checkpoint.finish("completed")
 
             self.log("[VOICE REELS] Pipeline tamamlandı!")
             return result
@@ -1864,15 +2027,17 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             self.state = PipelineState.ERROR
             result["error"] = str(e)
             result["final_state"] = self.state.value
+            await checkpoint.finish("failed", str(e))
 
             await self.notify_telegram(
                 message=f"❌ *SESLİ REELS* - Hata\n\n{_escape_md(str(e))}",
                 data={"error": str(e)},
-                buttons=[]
+                buttons=self._resume_buttons(checkpoint)
             )
 
             return result
 
+    @pipeline_run("carousel")
     async def run_carousel_pipeline(
         self,
         topic: str = None,
@@ -1986,7 +2151,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 for i, slide in enumerate(carousel_content.get("slides", [])):
                     image_prompt = slide.get("image_prompt", "")
                     if image_prompt:
-                        save_prompt(
+                        await async_crud.save_prompt(
                             post_id=post_id,
                             prompt_text=image_prompt,
                             prompt_type='image',
@@ -2024,12 +2189,12 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 )
 
                 if nano_result.get("success"):
-                    # Nano Banana başarılı - görselleri CDN'e yükle
+                    # Nano Banana başarılı - görselleri CDN'e yükle (paralel, sıra korunur)
                     image_paths = nano_result.get("image_paths", [])
-                    for i, image_path in enumerate(image_paths):
-                        slide_num = i + 1
-                        self.log(f"[CAROUSEL] Slide {slide_num}/{total_slides} CDN'e yükleniyor...")
-                        cdn_url = await upload_image_to_cdn(image_path)
+                    result["slide_timings"] = nano_result.get("slide_timings", [])
+                    self.log(f"[CAROUSEL] {len(image_paths)} slide CDN'e yükleniyor...")
+                    cdn_urls = await asyncio.gather(*(upload_image_to_cdn(path) for path in image_paths))
+                    for slide_num, cdn_url in enumerate(cdn_urls, 1):
                         if cdn_url:
                             image_urls.append(cdn_url)
                         else:
@@ -2041,85 +2206,109 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
             # HTML Template Carousel (veya fallback)
             if carousel_type == "html":
-                self.log("[CAROUSEL] Aşama 3: Görseller HTML ile üretiliyor...")
+                concurrency = max(1, settings.carousel_slide_concurrency)
+                self.log(f"[CAROUSEL] Aşama 3: Görseller HTML ile üretiliyor ({concurrency} paralel)...")
                 from app.claude_helper import generate_carousel_slide_html
                 from app.renderer import render_html_to_png
 
-            # HTML rendering loop (sadece html tipi için çalışır)
-            if carousel_type == "html":
-                for i, slide in enumerate(slides):
-                    slide_num = i + 1
-                    self.log(f"[CAROUSEL] Slide {slide_num}/{total_slides} HTML üretiliyor...")
-
-                    # Retry mekanizması
-                    for attempt in range(2):
-                        try:
-                            # HTML oluştur
-                            html_content = await generate_carousel_slide_html(
-                                slide_data=slide,
-                                slide_number=slide_num,
-                                total_slides=total_slides,
-                                topic=topic
-                            )
-
-                            # Text validation - typo kontrolü
-                            validation = validate_html_content(html_content)
-                            if not validation["can_render"]:
-                                self.log(f"[CAROUSEL] Slide {slide_num} yazım hatası tespit edildi")
-                                for issue in validation["issues"]:
-                                    if issue["severity"] == "high":
-                                        self.log(f"  - '{issue['found']}' -> '{issue['expected']}'")
-
-                                # Otomatik düzelt
-                                html_content, fixes = fix_common_issues(html_content)
-                                if fixes:
-                                    self.log(f"[CAROUSEL] Otomatik düzeltmeler: {fixes}")
+                slide_slots = asyncio.Semaphore(concurrency)
+                max_attempts = 1 + max(0, settings.carousel_slide_retries)
+
+                async def build_html_slide(slide_num: int, slide: Dict[str, Any]) -> Dict[str, Any]:
+                    """HTML üret, doğrula, render et, CDN'e yükle (sadece bu slide tekrar denenir)"""
+                    slide_start = time.monotonic()
+                    attempts = 0
+                    cdn_url = None
+                    async with slide_slots:
+                        self.log(f"[CAROUSEL] Slide {slide_num}/{total_slides} HTML üretiliyor...")
+
+                        # Retry mekanizması
+                        for attempt in range(max_attempts):
+                            attempts = attempt + 1
+                            try:
+                                # HTML oluştur (retry'da cache'ten aynı hatalı HTML gelmesin)
+                                html_content = await generate_carousel_slide_html(
+                                    slide_data=slide,
+                                    slide_number=slide_num,
+                                    total_slides=total_slides,
+                                    topic=topic,
+                                    use_cache=False
+                                )
 
-                                # Tekrar doğrula
+                                # Text validation - typo kontrolü
                                 validation = validate_html_content(html_content)
                                 if not validation["can_render"]:
-                                    self.log(f"[CAROUSEL] Slide {slide_num} hala hatalı, yeniden üretiliyor...")
-                                    html_content = await generate_carousel_slide_html(
-                                        slide_data=slide,
-                                        slide_number=slide_num,
-                                        total_slides=total_slides,
-                                        topic=topic
-                                    )
+                                    self.log(f"[CAROUSEL] Slide {slide_num} yazım hatası tespit edildi")
+                                    for issue in validation["issues"]:
+                                        if issue["severity"] == "high":
+                                            self.log(f"  - '{issue['found']}' -> '{issue['expected']}'")
+
+                                    # Otomatik düzelt
+                                    html_content, fixes = fix_common_issues(html_content)
+                                    if fixes:
+                                        self.log(f"[CAROUSEL] Otomatik düzeltmeler: {fixes}")
+
+                                    # Tekrar doğrula
+                                    validation = validate_html_content(html_content)
+                                    if not validation["can_render"]:
+                                        self.log(f"[CAROUSEL] Slide {slide_num} hala hatalı, yeniden üretiliyor...")
+                                        html_content = await generate_carousel_slide_html(
+                                            slide_data=slide,
+                                            slide_number=slide_num,
+                                            total_slides=total_slides,
+                                            topic=topic,
+                                            use_cache=False
+                                        )
+
+                                # PNG'ye render et
+                                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                                output_path = f"outputs/carousel_{timestamp}_{slide_num}.png"
+                                image_path = await render_html_to_png(
+                                    html_content=html_content,
+                                    output_path=output_path,
+                                    width=1080,
+                                    height=1080
+                                )
 
-                            # PNG'ye render et
-                            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            output_path = f"outputs/carousel_{timestamp}_{slide_num}.png"
-                            image_path = await render_html_to_png(
-                                html_content=html_content,
-                                output_path=output_path,
-                                width=1080,
-                                height=1080
-                            )
+                                if image_path:
+                                    # CDN'e yükle - retry logic ile
+                                    for upload_attempt in range(3):
+                                        cdn_url = await upload_image_to_cdn(image_path)
+                                        if cdn_url:
+                                            break
+                                        elif upload_attempt < 2:
+                                            self.log(f"[CAROUSEL] Slide {slide_num} CDN upload retry {upload_attempt + 1}...")
+                                            await asyncio.sleep(2)
 
-                            if image_path:
-                                # CDN'e yükle - retry logic ile
-                                cdn_url = None
-                                for upload_attempt in range(3):
-                                    cdn_url = await upload_image_to_cdn(image_path)
                                     if cdn_url:
                                         break
-                                    elif upload_attempt < 2:
-                                        self.log(f"[CAROUSEL] Slide {slide_num} CDN upload retry {upload_attempt + 1}...")
-                                        await asyncio.sleep(2)
-
-                                if cdn_url:
-                                    image_urls.append(cdn_url)
-                                    self.log(f"[CAROUSEL] Slide {slide_num} OK")
-                                    break
-                                else:
                                     self.log(f"[CAROUSEL] Slide {slide_num} CDN upload başarısız (3 deneme)")
-                            else:
-                                self.log(f"[CAROUSEL] Slide {slide_num} render hatası, retry...")
+                                else:
+                                    self.log(f"[CAROUSEL] Slide {slide_num} render hatası, retry...")
 
-                        except Exception as e:
-                            self.log(f"[CAROUSEL] Slide {slide_num} hata: {e}")
-                            if attempt == 1:
-                                self.log(f"[CAROUSEL] Slide {slide_num} atlanıyor")
+                            except Exception as e:
+                                self.log(f"[CAROUSEL] Slide {slide_num} hata: {e}")
+
+                    elapsed = time.monotonic() - slide_start
+                    if cdn_url:
+                        self.log(f"[CAROUSEL] Slide {slide_num} OK ({elapsed:.1f}s)")
+                    else:
+                        self.log(f"[CAROUSEL] Slide {slide_num} atlanıyor ({elapsed:.1f}s)")
+                    return {
+                        "slide": slide_num,
+                        "cdn_url": cdn_url,
+                        "attempts": attempts,
+                        "duration": round(elapsed, 2),
+                        "success": bool(cdn_url)
+                    }
+
+                slide_results = await asyncio.gather(
+                    *(build_html_slide(i, slide) for i, slide in enumerate(slides, 1))
+                )
+                image_urls = [r["cdn_url"] for r in slide_results if r["cdn_url"]]
+                result["slide_timings"] = [
+                    {k: r[k] for k in ("slide", "attempts", "duration", "success")} for r in slide_results
+                ]
 
             result["image_urls"] = image_urls
             result["images_generated"] = len(image_urls)
@@ -2263,6 +2452,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
             return result
 
+    @pipeline_run("ab_content")
     async def run_ab_content(self, topic: str = None, enable_ab: bool = True) -> Dict[str, Any]:
         """
         A/B Testing Pipeline - İki caption varyantı üret, karşılaştır, kazananı yayınla.
@@ -2400,12 +2590,11 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 tone = winning_variant.get("tone", "")
 
                 # A/B sonucu kaydet
-                from app.database import log_ab_test_result, update_post
 
                 variant_a_score = comparison_result.get("variant_a_scores", {}).get("total", 0)
                 variant_b_score = comparison_result.get("variant_b_scores", {}).get("total", 0)
 
-                ab_test_id = log_ab_test_result(
+                ab_test_id = await async_crud.log_ab_test_result(
                     topic=topic,
                     platform="instagram",
                     variant_a={
@@ -2433,7 +2622,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
                 # Post'u güncelle
                 if post_id:
-                    update_post(
+                    await async_crud.update_post(
                         post_id,
                         post_text=post_text,
                         hook_type=hook_type,
@@ -2560,8 +2749,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
                 # Hook performance güncelle
                 if hook_type:
-                    from app.database import update_hook_performance
-                    update_hook_performance(
+                    await async_crud.update_hook_performance(
                         hook_type=hook_type,
                         topic_category=topic_data.get("category", "egitici"),
                         platform="instagram",
@@ -2602,6 +2790,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
             return result
 
+    @pipeline_run("long_video")
     async def run_long_video_pipeline(
         self,
         topic: str = None,
@@ -2610,7 +2799,8 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
         transition_type: str = "crossfade",
         transition_duration: float = 0.5,
         manual_topic_mode: bool = False,
-        visual_style: str = "cinematic_4k"
+        visual_style: str = "cinematic_4k",
+        resume_post_id: int = None
     ) -> Dict[str, Any]:
         """
         Multi-segment uzun video pipeline.
@@ -2618,15 +2808,15 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
         Birden fazla video segmenti üretip birleştirerek uzun videolar oluşturur.
         Segment süresi modele göre dinamik belirlenir.
 
-        Pipeline Akışı:
+        Pipeline Akışı (StageGraph - bağımsız aşamalar eşzamanlı):
         1. Konu seçimi (Planner/Creator)
-        2. Caption üretimi (Creator)
-        3. Speech script üretimi
-        4. TTS ses üretimi (ElevenLabs)
-        5. Multi-scene prompt üretimi (Creator)
-        6. Paralel video üretimi (N segment)
+        2. Caption üretimi (Creator)           ┐ konuya bağlı, paralel
+        3. Speech script üretimi               ┘
+        4. TTS ses üretimi (ElevenLabs)        ┐ script'e bağlı, paralel
+        5. Multi-scene prompt üretimi          ┘
+        6. Paralel video üretimi (N segment) - TTS ile eşzamanlı
         7. Video birleştirme (FFmpeg crossfade)
-        8. Audio-video merge (FFmpeg)
+        8. Audio-video merge (FFmpeg) + opsiyonel altyazı
         9. Kalite kontrol (Reviewer)
         10. Instagram Reels yayını (Publisher)
 
@@ -2638,17 +2828,13 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             transition_duration: Crossfade süresi (0.5s default)
             manual_topic_mode: True ise topic Creator ile işlenir
             visual_style: Görsel stil (cinematic_4k, anime, vb.)
+            resume_post_id: Yarıda kalan run'ın post_id'si (son tamamlanan aşamadan devam)
 
         Returns:
             Pipeline sonucu
         """
-        from app.sora_helper import generate_videos_parallel
-        from app.instagram_helper import (
-            concatenate_videos_with_crossfade,
-            merge_audio_video
-        )
+        from app.sora_helper import stream_videos_parallel
         from app.elevenlabs_helper import ElevenLabsHelper
-        from app.database.crud import create_post, update_post
 
         # Model'in max süresine göre segment süresi belirlenir
         actual_segment_duration = get_max_duration(model_id)
@@ -2680,8 +2866,9 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
         # Orijinal kullanıcı metnini pipeline boyunca taşı (teknik detaylar korunsun)
         original_user_brief = topic if (topic and manual_topic_mode) else None
 
-        try:
-            # ========== AŞAMA 1: Konu Seçimi ==========
+        # ========== AŞAMA 1: Konu Seçimi ==========
+        async def stage_topic(ctx):
+            topic = ctx["topic_input"]
             if topic and manual_topic_mode:
                 self.log(f"[LONG VIDEO] Manuel konu işleniyor: {topic[:50]}...")
 
@@ -2717,17 +2904,19 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
             self.log(f"[LONG VIDEO] Konu: {topic[:50]}...")
             result["stages_completed"].append("topic_selection")
+            return {"topic": topic, "topic_data": topic_data}
 
-            # ========== AŞAMA 2: Caption Üretimi ==========
+        # ========== AŞAMA 2: Caption Üretimi ==========
+        async def stage_caption(ctx):
             self.log("[LONG VIDEO] Aşama 2: Caption üretiliyor...")
             self.state = PipelineState.CREATING_CONTENT
 
             content_result = await self.creator.execute({
                 "action": "create_post",
-                "topic": topic,
+                "topic": ctx["topic"],
                 "platform": "instagram",
                 "visual_type": "reels",
-                "category": topic_data.get("category", "tanitim"),
+                "category": ctx["topic_data"].get("category", "tanitim"),
                 "original_user_brief": original_user_brief,
             })
 
@@ -2743,22 +2932,24 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             self.log(f"[LONG VIDEO] Caption oluşturuldu (Post ID: {post_id})")
             result["stages_completed"].append("caption_creation")
             result["post_id"] = post_id
+            return {"caption": caption, "post_id": post_id}
 
-            # ========== AŞAMA 3: Speech Script Üretimi ==========
+        # ========== AŞAMA 3: Speech Script Üretimi ==========
+        async def stage_speech(ctx):
             self.log(f"[LONG VIDEO] Aşama 3: Voiceover scripti üretiliyor ({actual_video_duration}s)...")
 
             # Kelime hedefi: ~1.8 kelime/saniye (ElevenLabs Türkçe TTS ölçümü)
             target_words = int(actual_video_duration * 1.8)
 
+            # Caption ile paralel çalışır; script post'a persist aşamasında yazılır
             speech_result = await self.creator.execute({
                 "action": "create_speech_script",
-                "topic": topic,
+                "topic": ctx["topic"],
                 "target_duration": actual_video_duration,
                 "target_words": target_words,
                 "segment_count": segment_count,
                 "segment_duration": actual_segment_duration,
                 "tone": "friendly",  # Samimi ton (voice reels ile aynı)
-                "post_id": post_id,
                 "original_user_brief": original_user_brief,
             })
 
@@ -2768,9 +2959,12 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             speech_script = speech_result.get("speech_script", "")
             self.log(f"[LONG VIDEO] Script: {len(speech_script.split())} kelime")
             result["stages_completed"].append("speech_script")
+            return {"speech_script": speech_script}
 
-            # ========== AŞAMA 4: TTS Ses Üretimi ==========
+        # ========== AŞAMA 4: TTS Ses Üretimi ==========
+        async def stage_tts(ctx):
             self.log("[LONG VIDEO] Aşama 4: TTS ses üretiliyor...")
+            speech_script = ctx["speech_script"]
 
             # Voice reels ile aynı fonksiyon - ENV'deki voice ID'yi kullanır
             from app.elevenlabs_helper import generate_speech_with_retry
@@ -2785,9 +2979,9 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             audio_path = tts_result.get("audio_path")
             estimated_duration = tts_result.get("duration", actual_video_duration)
 
-            # GERÇEK audio süresini ffprobe ile ölç (Voice Reels ile aynı)
+            # GERÇEK audio süresi (Voice Reels ile aynı: TTS cache ölçümü, yoksa ffprobe)
             from app.instagram_helper import get_audio_duration
-            actual_audio_duration = await get_audio_duration(audio_path)
+            actual_audio_duration = tts_result.get("measured_duration") or await get_audio_duration(audio_path)
             self.log(f"[LONG VIDEO] TTS süre - Tahmini: {estimated_duration:.1f}s, Gerçek: {actual_audio_duration:.1f}s")
 
             # Gerçek süreyi kullan (tahmini değil)
@@ -2800,21 +2994,18 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             # Post-TTS süre validasyonu
             min_acceptable_duration = actual_video_duration * 0.85  # %15 tolerans
             if audio_duration < min_acceptable_duration:
-                duration_deficit = actual_video_duration - audio_duration
-                deficit_percent = (duration_deficit / actual_video_duration) * 100
                 self.log(f"⚠️ [LONG VIDEO] Audio kısa ({audio_duration:.1f}s / {actual_video_duration}s), script uzatılıyor...")
 
                 # Script'i uzat (1.8 WPS - ElevenLabs Türkçe TTS ölçümü)
                 extended_target_words = int(actual_video_duration * 1.8)
                 extended_result = await self.creator.execute({
                     "action": "create_speech_script",
-                    "topic": topic,
+                    "topic": ctx["topic"],
                     "target_duration": actual_video_duration,
                     "target_words": extended_target_words,
                     "segment_count": segment_count,
                     "segment_duration": actual_segment_duration,
-                    "tone": "friendly",
-                    "post_id": post_id
+                    "tone": "friendly"
                 })
 
                 if extended_result.get("success") and extended_result.get("speech_script"):
@@ -2829,7 +3020,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
                     if new_tts_result.get("success"):
                         audio_path = new_tts_result.get("audio_path")
-                        new_audio_duration = await get_audio_duration(audio_path)
+                        new_audio_duration = new_tts_result.get("measured_duration") or await get_audio_duration(audio_path)
                         self.log(f"✅ Yeni audio: {new_audio_duration:.1f}s")
 
                         # Değişkenleri güncelle
@@ -2841,15 +3032,18 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 else:
                     self.log(f"⚠️ Script extension başarısız, orijinal audio kullanılacak")
 
-            # ========== AŞAMA 5: Multi-Scene Prompt Üretimi ==========
+            return {"audio_path": audio_path, "audio_duration": audio_duration, "voice_script": speech_script}
+
+        # ========== AŞAMA 5: Multi-Scene Prompt Üretimi ==========
+        async def stage_scenes(ctx):
             self.log(f"[LONG VIDEO] Aşama 5: {segment_count} sahne promptu üretiliyor...")
 
-            # Shot structure'ı çıkar
-            shot_structure = extract_shot_structure(speech_script, actual_video_duration)
+            # Shot structure'ı çıkar (TTS ile paralel - ilk script üzerinden)
+            shot_structure = extract_shot_structure(ctx["speech_script"], actual_video_duration)
 
             scene_result = await self.creator.execute({
                 "action": "create_multi_scene_prompts",
-                "topic": topic,
+                "topic": ctx["topic"],
                 "segment_count": segment_count,
                 "segment_duration": actual_segment_duration,
                 "speech_structure": shot_structure,
@@ -2862,67 +3056,73 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 raise Exception(f"Scene planning hatası: {scene_result.get('error')}")
 
             scenes = scene_result.get("scenes", [])
-            style_prefix = scene_result.get("style_prefix", "")
 
             self.log(f"[LONG VIDEO] {len(scenes)} sahne planlandı")
             result["stages_completed"].append("scene_planning")
+            return {"scenes": scenes, "style_prefix": scene_result.get("style_prefix", "")}
 
-            # Segment promptlarını JSON olarak kaydet
-            segment_prompts = json.dumps([s.get("prompt", "") for s in scenes], ensure_ascii=False)
+        # Nihai script ve segment promptlarını post'a kaydet (kritik yolda değil)
+        async def stage_persist_plan(ctx):
+            post_id = ctx["post_id"]
             if post_id:
-                update_post(
+                segment_prompts = json.dumps([s.get("prompt", "") for s in ctx["scenes"]], ensure_ascii=False)
+                await async_crud.update_post(
                     post_id,
+                    speech_script=ctx["voice_script"],
                     segment_prompts=segment_prompts,
                     video_segment_count=segment_count,
                     video_model=model_id
                 )
+            return {}
 
-            # ========== AŞAMA 6: Paralel Video Üretimi ==========
+        # ========== AŞAMA 6: Paralel Video Üretimi ==========
+        async def stage_videos(ctx):
             self.log(f"[LONG VIDEO] Aşama 6: {segment_count} video segmenti üretiliyor (paralel)...")
             self.state = PipelineState.CREATING_VISUAL
 
             # Her sahnenin prompt'unu al
-            prompts = [scene.get("prompt", "") for scene in scenes]
+            prompts = [scene.get("prompt", "") for scene in ctx["scenes"]]
 
-            video_result = await generate_videos_parallel(
+            # Segmentler bittikçe gelir (probe edilmiş, süreleriyle); başarısızlar arka planda yeniden denenir
+            completed = {}
+            async for index, segment in stream_videos_parallel(
                 prompts=prompts,
                 model=model_id,
                 duration=actual_segment_duration,
-                style_prefix=style_prefix,
+                style_prefix=ctx["style_prefix"],
                 max_concurrent=3,
                 max_retries=3
-            )
+            ):
+                if segment.get("success"):
+                    completed[index] = segment
+                    self.log(f"[LONG VIDEO] Segment {index + 1} hazır ({segment['duration']:.1f}s) - "
+                             f"{len(completed)}/{len(prompts)}")
+                else:
+                    self.log(f"[LONG VIDEO] Segment {index + 1} {segment.get('attempts')} denemede üretilemedi: "
+                             f"{segment.get('error')}")
 
-            if not video_result.get("success"):
-                raise Exception(f"Video üretim hatası: {video_result.get('error', 'Yetersiz segment')}")
+            if len(completed) < 2:
+                raise Exception(f"Video üretim hatası: Yetersiz segment ({len(completed)}/{len(prompts)})")
 
-            video_paths = video_result.get("video_paths", [])
+            ordered = [completed[i] for i in sorted(completed)]
+            video_paths = [segment["video_path"] for segment in ordered]
             self.log(f"[LONG VIDEO] {len(video_paths)} segment üretildi")
             result["stages_completed"].append("parallel_video_generation")
             result["segments_generated"] = len(video_paths)
+            return {"video_paths": video_paths, "segment_durations": [segment["duration"] for segment in ordered]}
 
-            # ========== AŞAMA 7: Video Birleştirme ==========
-            self.log(f"[LONG VIDEO] Aşama 7: {len(video_paths)} video birleştiriliyor ({transition_type})...")
-
-            concat_result = await concatenate_videos_with_crossfade(
-                video_paths=video_paths,
-                crossfade_duration=transition_duration if transition_type == "crossfade" else 0,
-                segment_duration=float(actual_segment_duration)
-            )
-
-            if not concat_result.get("success"):
-                raise Exception(f"Video concat hatası: {concat_result.get('error')}")
-
-            concat_video_path = concat_result.get("output_path")
-            concat_duration = concat_result.get("total_duration", 0)
+        # ========== AŞAMA 7: Segment Süreleri + Audio/Video Sync ==========
+        async def stage_audio_sync(ctx):
+            from app.audio_sync_helper import sync_audio_to_video
 
-            self.log(f"[LONG VIDEO] Birleşik video: {concat_duration:.1f}s")
-            result["stages_completed"].append("video_concatenation")
+            crossfade = transition_duration if transition_type == "crossfade" else 0
 
-            # ========== AŞAMA 8: Audio-Video Merge ==========
-            self.log("[LONG VIDEO] Aşama 8: Ses ve video birleştiriliyor...")
+            # Segment süreleri üretim sırasında probe edildi (birleşik süre = toplam - geçiş overlap'leri)
+            segment_durations = ctx["segment_durations"]
+            concat_duration = sum(segment_durations) - (len(segment_durations) - 1) * crossfade
 
-            from app.audio_sync_helper import sync_audio_to_video
+            audio_path = ctx["audio_path"]
+            audio_duration = ctx["audio_duration"]
 
             # Audio/Video sync - video loop yapmadan audio'yu adapte et
             if audio_duration > concat_duration:
@@ -2931,7 +3131,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 sync_result = await sync_audio_to_video(
                     audio_path=audio_path,
                     video_duration=concat_duration,
-                    original_script=speech_script
+                    original_script=ctx["voice_script"]
                 )
 
                 if sync_result.get("success"):
@@ -2939,122 +3139,187 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                     audio_duration = sync_result["final_duration"]
                     self.log(f"[LONG VIDEO] Sync: {sync_result['action']} ({sync_result.get('trimmed_seconds', 0):.1f}s kırpıldı)")
 
-            merge_result = await merge_audio_video(
-                video_path=concat_video_path,
-                audio_path=audio_path,
-                target_duration=concat_duration
-            )
-
-            if not merge_result.get("success"):
-                raise Exception(f"Merge hatası: {merge_result.get('error')}")
-
-            final_video_path = merge_result.get("output_path")
-            final_duration = merge_result.get("duration", 0)
-
-            self.log(f"[LONG VIDEO] Final video: {final_duration:.1f}s")
-            result["stages_completed"].append("audio_video_merge")
+            return {
+                "final_audio_path": audio_path,
+                "final_audio_duration": audio_duration
+            }
 
-            # ========== SUBTITLE GENERATION (Optional) ==========
-            if os.getenv("SUBTITLE_ENABLED", "false").lower() == "true":
-                self.log("[LONG VIDEO] Altyazı ekleniyor...")
-                try:
-                    from app.subtitle_helper import create_subtitle_file
-                    from app.instagram_helper import add_subtitles_to_video
+        # ========== SUBTITLE GENERATION (Optional) ==========
+        async def stage_subtitle_file(ctx):
+            if os.getenv("SUBTITLE_ENABLED", "false").lower() != "true":
+                return {"ass_path": None, "subtitle_count": 0}
 
-                    # Generate ASS subtitle from audio (hybrid: original script + Whisper timing)
-                    sub_result = await create_subtitle_file(
-                        audio_path=audio_path,
-                        original_script=speech_script,
-                        model_size=os.getenv("WHISPER_MODEL_SIZE", "base"),
-                        language="tr"
-                    )
+            self.log("[LONG VIDEO] Altyazı dosyası oluşturuluyor...")
+            try:
+                from app.subtitle_helper import create_subtitle_file
 
-                    if sub_result.get("success"):
-                        # Burn subtitles into video
-                        burn_result = await add_subtitles_to_video(
-                            video_path=final_video_path,
-                            ass_path=sub_result["ass_path"]
-                        )
+                # Generate ASS subtitle from audio (hybrid: original script + Whisper timing)
+                sub_result = await create_subtitle_file(
+                    audio_path=ctx["final_audio_path"],
+                    original_script=ctx["voice_script"],
+                    model_size=os.getenv("WHISPER_MODEL_SIZE", "base"),
+                    language="tr"
+                )
 
-                        if burn_result.get("success"):
-                            final_video_path = burn_result["output_path"]
-                            result["stages_completed"].append("subtitles")
-                            result["subtitle_count"] = sub_result["subtitle_count"]
-                            self.log(f"[LONG VIDEO] Altyazı eklendi: {sub_result['subtitle_count']} satır")
-                        else:
-                            self.log(f"[LONG VIDEO] Altyazı burn hatası: {burn_result.get('error')}")
-                    else:
-                        self.log(f"[LONG VIDEO] Altyazı üretim hatası: {sub_result.get('error')}")
-                except Exception as e:
-                    self.log(f"[LONG VIDEO] Altyazı exception: {e}")
-                    # Continue without subtitles - graceful degradation
+                if sub_result.get("success"):
+                    return {"ass_path": sub_result["ass_path"], "subtitle_count": sub_result["subtitle_count"]}
+                self.log(f"[LONG VIDEO] Altyazı üretim hatası: {sub_result.get('error')}")
+            except Exception as e:
+                self.log(f"[LONG VIDEO] Altyazı exception: {e}")
+                # Continue without subtitles - graceful degradation
+
+            return {"ass_path": None, "subtitle_count": 0}
+
+        # ========== AŞAMA 8: Final Render (concat + ses + altyazı tek encode) ==========
+        async def stage_render(ctx):
+            video_paths = ctx["video_paths"]
+            self.log(f"[LONG VIDEO] Aşama 8: {len(video_paths)} video, ses ve altyazı render ediliyor ({transition_type})...")
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            render_result = await finalize_video(RenderPlan(
+                segments=[RenderSegment(path, duration=d) for path, d in zip(video_paths, ctx["segment_durations"])],
+                output_path=os.path.join(str(settings.outputs_dir), f"long_video_{timestamp}.mp4"),
+                crossfade=transition_duration if transition_type == "crossfade" else 0,
+                audio_path=ctx["final_audio_path"],
+                fade_out=0.5,
+                ass_path=ctx["ass_path"]
+            ))
+
+            if not render_result.get("success"):
+                raise Exception(f"Render hatası: {render_result.get('error')}")
+
+            final_video_path = render_result["output_path"]
+            final_duration = render_result.get("duration", 0)
+            result["stages_completed"].extend(["video_concatenation", "audio_video_merge"])
+            result["single_pass_render"] = render_result["single_pass"]
+            self.log(f"[LONG VIDEO] Final video: {final_duration:.1f}s "
+                     f"({'tek geçiş' if render_result['single_pass'] else 'adım adım'}, {render_result['encode_s']:.1f}s)")
+
+            if render_result["subtitles"]:
+                result["stages_completed"].append("subtitles")
+                result["subtitle_count"] = ctx["subtitle_count"]
+                self.log(f"[LONG VIDEO] Altyazı eklendi: {ctx['subtitle_count']} satır")
+            elif ctx["ass_path"]:
+                self.log(f"[LONG VIDEO] Altyazı burn hatası: {render_result.get('subtitle_error')}")
 
             # Post'u güncelle
-            if post_id:
-                update_post(
-                    post_id,
+            if ctx["post_id"]:
+                await async_crud.update_post(
+                    ctx["post_id"],
                     visual_path=final_video_path,
                     total_video_duration=final_duration,
-                    audio_path=audio_path,
-                    audio_duration=audio_duration,
+                    audio_path=ctx["final_audio_path"],
+                    audio_duration=ctx["final_audio_duration"],
                     voice_mode=True
                 )
 
-            # ========== AŞAMA 9: Review ==========
+            return {"final_video_path": final_video_path, "final_duration": final_duration}
+
+        # ========== AŞAMA 9: Review ==========
+        async def stage_review(ctx):
             self.log("[LONG VIDEO] Aşama 9: Kalite kontrol...")
             self.state = PipelineState.REVIEWING
 
             review_result = await self.reviewer.execute({
                 "action": "review_content",
-                "post_id": post_id,
+                "post_id": ctx["post_id"],
                 "content_type": "reels",
-                "caption": caption,
-                "video_path": final_video_path
+                "caption": ctx["caption"],
+                "video_path": ctx["final_video_path"]
             })
 
             score = review_result.get("score", 7)
             self.log(f"[LONG VIDEO] Review skoru: {score}/10")
             result["stages_completed"].append("review")
             result["review_score"] = score
+            return {"review_score": score}
 
-            # ========== AŞAMA 10: Yayın ==========
+        # ========== AŞAMA 10: Yayın ==========
+        async def stage_publish(ctx):
             self.log("[LONG VIDEO] Aşama 10: Instagram'a yayınlanıyor...")
             self.state = PipelineState.PUBLISHING
 
+            caption = ctx["caption"]
             # DEBUG: Publish öncesi caption kontrolü
             self.log(f"[LONG VIDEO] Publish edilecek caption: {len(caption)} karakter")
 
             publish_result = await self.publisher.execute({
                 "action": "publish_reels",
-                "post_id": post_id,
-                "video_path": final_video_path,
+                "post_id": ctx["post_id"],
+                "video_path": ctx["final_video_path"],
                 "post_text": caption,
                 "audio_path": None  # Ses video'ya gömülü
             })
 
-            if publish_result.get("success"):
-                instagram_id = publish_result.get("instagram_post_id")
-                self.log(f"[LONG VIDEO] ✓ Yayınlandı! ID: {instagram_id}")
+            if not publish_result.get("success"):
+                raise Exception(f"Publish error: {publish_result.get('error')}")
 
-                result["success"] = True
-                result["instagram_post_id"] = instagram_id
-                result["stages_completed"].append("publish")
+            instagram_id = publish_result.get("instagram_post_id")
+            self.log(f"[LONG VIDEO] ✓ Yayınlandı! ID: {instagram_id}")
 
-                # Telegram bildirimi
-                await self.notify_telegram(
-                    message=f"🎬 *UZUN VIDEO* - Yayınlandı!\n\n"
-                    f"📝 Konu: {_escape_md(topic[:50])}...\n"
-                    f"⏱️ Süre: {final_duration:.0f}s ({segment_count} segment)\n"
-                    f"🎥 Model: {_escape_md(model_id)}\n"
-                    f"⭐ Puan: {score}/10",
-                    data=publish_result,
-                    buttons=[]
-                )
-            else:
-                raise Exception(f"Publish error: {publish_result.get('error')}")
+            result["success"] = True
+            result["instagram_post_id"] = instagram_id
+            result["stages_completed"].append("publish")
+
+            # Telegram bildirimi
+            await self.notify_telegram(
+                message=f"🎬 *UZUN VIDEO* - Yayınlandı!\n\n"
+                f"📝 Konu: {_escape_md(ctx['topic'][:50])}...\n"
+                f"⏱️ Süre: {ctx['final_duration']:.0f}s ({segment_count} segment)\n"
+                f"🎥 Model: {_escape_md(model_id)}\n"
+                f"⭐ Puan: {ctx['review_score']}/10",
+                data=publish_result,
+                buttons=[]
+            )
+            return {"publish_result": publish_result}
+
+        graph = StageGraph("long_video", [
+            Stage("topic", stage_topic, ("topic_input",), ("topic", "topic_data")),
+            Stage("caption", stage_caption, ("topic", "topic_data"), ("caption", "post_id")),
+            Stage("speech_script", stage_speech, ("topic",), ("speech_script",)),
+            Stage("tts", stage_tts, ("topic", "speech_script"),
+                  ("audio_path", "audio_duration", "voice_script"), resource="tts"),
+            Stage("scenes", stage_scenes, ("topic", "speech_script"), ("scenes", "style_prefix")),
+            Stage("persist_plan", stage_persist_plan, ("post_id", "voice_script", "scenes"), ()),
+            Stage("videos", stage_videos, ("scenes", "style_prefix"), ("video_paths", "segment_durations"),
+                  resource="video"),
+            Stage("audio_sync", stage_audio_sync, ("segment_durations", "audio_path", "audio_duration", "voice_script"),
+                  ("final_audio_path", "final_audio_duration"), resource="ffmpeg"),
+            Stage("subtitle_file", stage_subtitle_file, ("final_audio_path", "voice_script"),
+                  ("ass_path", "subtitle_count"), resource="whisper"),
+            Stage("render", stage_render,
+                  ("video_paths", "segment_durations", "final_audio_path", "final_audio_duration",
+                   "ass_path", "subtitle_count", "post_id"),
+                  ("final_video_path", "final_duration"), resource="ffmpeg"),
+            Stage("review", stage_review, ("post_id", "caption", "final_video_path"), ("review_score",)),
+            Stage("publish", stage_publish,
+                  ("topic", "post_id", "caption", "final_video_path", "final_duration", "review_score"),
+                  ("publish_result",)),
+        ])
+
+        checkpoint = PipelineCheckpoint(
+            "long_video",
+            params={
+                "topic": topic,
+                "segment_count": segment_count,
+                "model_id": model_id,
+                "transition_type": transition_type,
+                "transition_duration": transition_duration,
+                "manual_topic_mode": manual_topic_mode,
+                "visual_style": visual_style
+            },
+            result=result,
+            post_id=resume_post_id
+        )
+
+        try:
+            skip = await checkpoint.load(graph)
+            await graph.run({"topic_input": topic}, on_stage_complete=checkpoint.on_stage_complete, skip=skip)
+            self.log(f"[LONG VIDEO] {graph.summary()}")
 
             self.state = PipelineState.COMPLETED
             result["final_state"] = self.state.value
+            await checkpoint.finish("completed")
 
             self.log("[LONG VIDEO] Pipeline tamamlandı!")
             return result
@@ -3064,21 +3329,24 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             self.state = PipelineState.ERROR
             result["error"] = str(e)
             result["final_state"] = self.state.value
+            await checkpoint.finish("failed", str(e))
 
             await self.notify_telegram(
                 message=f"❌ *UZUN VIDEO* - Hata\n\n{_escape_md(str(e))}",
                 data={"error": str(e)},
-                buttons=[]
+                buttons=self._resume_buttons(checkpoint)
             )
 
             return result
 
+    @pipeline_run("conversational_reels")
     async def run_conversational_reels(
         self,
         topic: str = None,
         manual_topic_mode: bool = False,
         visual_style: str = "cinematic_4k",
-        model_id: str = "sora-2"
+        model_id: str = "sora-2",
+        resume_post_id: int = None
     ) -> Dict[str, Any]:
         """
         Conversational Reels pipeline with multi-model support.
@@ -3086,15 +3354,15 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
         Creates two-character dialog video (male problem, female solution)
         followed by B-roll segment with voiceover.
 
-        Pipeline Steps (Simplified):
+        Pipeline Steps (StageGraph - conversation and B-roll branches run concurrently):
         1. Topic selection (Planner/manual)
         2. Conversation content generation (Creator)
         3. Conversation video generation:
            - Sora 2: Native Turkish speech (12s)
            - Other models: TTS + Video + Lipsync API
-        4. B-roll video generation (8-12s)
-        5. B-roll voiceover generation (ElevenLabs narrator)
-        6. B-roll merge (FFmpeg)
+        4. B-roll voiceover generation (ElevenLabs narrator)  ┐ parallel to 3
+        5. B-roll video generation (8-12s)                    │
+        6. B-roll merge (FFmpeg)                              ┘
         7. Concat conversation + B-roll
         8. Whisper transcription + subtitles
         9. Review + Publish
@@ -3104,6 +3372,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             manual_topic_mode: Process topic through Creator if True
             visual_style: Görsel stil (cinematic_4k, anime, vb.)
             model_id: Video model (sora-2, veo-2, kling-2.5-pro)
+            resume_post_id: post_id of an interrupted run (resumes from its last completed stage)
 
         Returns:
             Pipeline result dict
@@ -3119,10 +3388,11 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             "model_id": model_id
         }
 
-        post_id = None
+        native_speech_models = ["sora-2", "sora-2-pro", "veo-3.1"]
 
-        try:
-            # ========== STAGE 1: Topic Selection ==========
+        # ========== STAGE 1: Topic Selection ==========
+        async def stage_topic(ctx):
+            topic = ctx["topic_input"]
             if not topic:
                 self.log("[CONV REELS] Aşama 1: Konu seçimi...")
                 planner_result = await self.planner.execute({
@@ -3153,13 +3423,15 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             result["topic"] = topic
             result["category"] = category
             result["stages_completed"].append("topic_selection")
+            return {"topic": topic, "category": category}
 
+        # ========== STAGE 2: Conversation Content ==========
+        async def stage_conversation(ctx):
             # Model'e göre dialog süresi ayarla
             from app.video_models import get_model_config
             model_config = get_model_config(model_id)
             max_duration = model_config.get("max_duration", 12)
 
-            native_speech_models = ["sora-2", "sora-2-pro", "veo-3.1"]
             if model_id in native_speech_models:
                 if model_id in ["sora-2", "sora-2-pro"]:
                     target_duration = min(12, max_duration)  # Sora API max 12s
@@ -3170,14 +3442,13 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
             self.log(f"[CONV REELS] Target duration: {target_duration}s (model: {model_id})")
 
-            # ========== STAGE 2: Conversation Content ==========
             self.log("[CONV REELS] Aşama 2: Dialog içeriği oluşturuluyor...")
             self.state = PipelineState.CREATING_CONTENT
 
             conv_result = await self.creator.execute({
                 "action": "create_conversation_content",
-                "topic": topic,
-                "category": category,
+                "topic": ctx["topic"],
+                "category": ctx["category"],
                 "target_duration": target_duration,  # Model'e göre dinamik
                 "visual_style": visual_style
             })
@@ -3185,33 +3456,38 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             if not conv_result.get("success"):
                 raise Exception(f"Dialog içerik hatası: {conv_result.get('error')}")
 
-            dialog_lines = conv_result.get("dialog_lines", [])
-            video_prompt = conv_result.get("video_prompt", "")
-            broll_prompt = conv_result.get("broll_prompt", "")
-            broll_voiceover = conv_result.get("broll_voiceover", "")
-            caption = conv_result.get("caption", "")
-            hashtags = conv_result.get("hashtags", [])
+            conv = {
+                "dialog_lines": conv_result.get("dialog_lines", []),
+                "video_prompt": conv_result.get("video_prompt", ""),
+                "broll_prompt": conv_result.get("broll_prompt", ""),
+                "broll_voiceover": conv_result.get("broll_voiceover", ""),
+                "caption": conv_result.get("caption", ""),
+                "hashtags": conv_result.get("hashtags", []),
+            }
 
-            self.log(f"[CONV REELS] Dialog oluşturuldu: {len(dialog_lines)} satır")
-            result["dialog_line_count"] = len(dialog_lines)
+            self.log(f"[CONV REELS] Dialog oluşturuldu: {len(conv['dialog_lines'])} satır")
+            result["dialog_line_count"] = len(conv["dialog_lines"])
             result["stages_completed"].append("conversation_content")
 
             # Create post in database
-            from app.database import create_post, update_post
-            post_id = create_post(
-                topic=topic,
-                post_text=caption,
-                post_text_ig=caption,
+            post_id = await async_crud.create_post(
+                topic=ctx["topic"],
+                post_text=conv["caption"],
+                post_text_ig=conv["caption"],
                 visual_type="reels",
                 platform="instagram",
-                topic_category=category,
+                topic_category=ctx["category"],
                 voice_mode=True
             )
             result["post_id"] = post_id
+            return {"conv": conv, "post_id": post_id}
 
-            # ========== STAGE 3: Conversation Video Generation ==========
+        # ========== STAGE 3: Conversation Video Generation ==========
+        async def stage_conversation_video(ctx):
             self.log(f"[CONV REELS] Aşama 3: Conversation video ({model_id})...")
             self.state = PipelineState.CREATING_VISUAL
+            conv = ctx["conv"]
+            video_prompt = conv["video_prompt"]
 
             if model_id in native_speech_models:
                 # ===== NATIVE SPEECH MODELS (Sora 2, Veo 3.1) =====
@@ -3265,7 +3541,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                     self.log(f"[CONV REELS] Realistic voices kullanılıyor")
 
                 dialog_tts_result = await generate_dialog_audio(
-                    dialog_lines=dialog_lines,
+                    dialog_lines=conv["dialog_lines"],
                     male_voice_id=male_voice,
                     female_voice_id=female_voice
                 )
@@ -3284,7 +3560,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 from app.sora_helper import generate_video_smart
                 avatar_result = await generate_video_smart(
                     prompt=avatar_prompt,
-                    topic=topic,
+                    topic=ctx["topic"],
                     force_model=model_id,
                     duration=min(int(dialog_duration) + 2, 12),
                     voice_mode=True
@@ -3323,8 +3599,10 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 result["stages_completed"].append("lipsync")
 
             result["stages_completed"].append("conversation_video")
+            return {"conversation_video_path": conversation_video_path}
 
-            # ========== STAGE 4: B-roll Voiceover (TTS önce) ==========
+        # ========== STAGE 4: B-roll Voiceover (TTS önce) ==========
+        async def stage_broll_voiceover(ctx):
             self.log("[CONV REELS] Aşama 4: B-roll voiceover...")
 
             from app.elevenlabs_helper import generate_speech_with_retry
@@ -3340,7 +3618,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 self.log(f"[CONV REELS] Realistic narrator voice kullanılıyor")
 
             broll_audio_result = await generate_speech_with_retry(
-                text=broll_voiceover,
+                text=ctx["conv"]["broll_voiceover"],
                 voice_id=narrator_voice,
                 max_retries=3
             )
@@ -3349,7 +3627,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 broll_audio_path = broll_audio_result.get("audio_path")
                 # TTS süresini ölç
                 from app.instagram_helper import get_audio_duration
-                tts_duration = await get_audio_duration(broll_audio_path)
+                tts_duration = broll_audio_result.get("measured_duration") or await get_audio_duration(broll_audio_path)
                 # Sora duration: 8 veya 12 (4'ün katları)
                 if tts_duration <= 6:
                     broll_video_duration = 8
@@ -3364,15 +3642,18 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 broll_video_duration = 8  # fallback
 
             result["stages_completed"].append("broll_voiceover")
+            return {"broll_audio_path": broll_audio_path, "broll_video_duration": broll_video_duration}
 
-            # ========== STAGE 5: B-roll Video (TTS süresine göre dinamik) ==========
+        # ========== STAGE 5: B-roll Video (TTS süresine göre dinamik) ==========
+        async def stage_broll_video(ctx):
+            broll_video_duration = ctx["broll_video_duration"]
             self.log(f"[CONV REELS] Aşama 5: B-roll video üretimi (Sora {broll_video_duration}s)...")
 
             # Import Sora for B-roll (her zaman Sora kullanılır)
             from app.sora_helper import generate_video_sora
 
             broll_video_result = await generate_video_sora(
-                prompt=broll_prompt,
+                prompt=ctx["conv"]["broll_prompt"],
                 duration=broll_video_duration,  # Dinamik süre
                 size="720x1280"  # 9:16 aspect ratio
             )
@@ -3380,16 +3661,20 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             if not broll_video_result.get("success"):
                 raise Exception(f"B-roll video hatası: {broll_video_result.get('error')}")
 
-            broll_video_path = broll_video_result.get("video_path")
             self.log(f"[CONV REELS] B-roll video üretildi")
             result["stages_completed"].append("broll_video")
+            return {"broll_video_path": broll_video_result.get("video_path")}
 
-            # ========== STAGE 6: B-roll Merge ==========
+        # ========== STAGE 6: B-roll Merge ==========
+        async def stage_broll_merge(ctx):
             self.log("[CONV REELS] Aşama 6: B-roll merge...")
 
             from app.instagram_helper import merge_audio_video
             from app.audio_utils import add_silence_prefix
 
+            broll_audio_path = ctx["broll_audio_path"]
+            broll_video_path = ctx["broll_video_path"]
+
             if broll_audio_path:
                 # Add delay to B-roll audio (standard 1.5s silence at start)
                 self.log(f"[CONV REELS] B-roll audio'ya {BROLL_AUDIO_DELAY}s delay ekleniyor...")
@@ -3406,16 +3691,19 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 broll_merge_result = await merge_audio_video(
                     video_path=broll_video_path,
                     audio_path=delayed_broll_audio,
-                    target_duration=broll_video_duration
+                    target_duration=ctx["broll_video_duration"]
                 )
                 broll_final_path = broll_merge_result.get("output_path", broll_video_path)
             else:
                 broll_final_path = broll_video_path
 
             result["stages_completed"].append("broll_merge")
+            return {"broll_final_path": broll_final_path}
 
-            # ========== STAGE 6.5: Dynamic Freeze Frame (if needed) ==========
+        # ========== STAGE 6.5: Dynamic Freeze Frame (if needed) ==========
+        async def stage_freeze_frame(ctx):
             # Apply freeze frame to conversation video if audio extends beyond video
+            conversation_video_path = ctx["conversation_video_path"]
             try:
                 from app.subtitle_helper import extract_word_timestamps, get_last_word_end_time
                 from app.instagram_helper import get_video_duration
@@ -3447,39 +3735,51 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             except Exception as e:
                 self.log(f"[CONV REELS] Freeze frame kontrolü başarısız: {e}")
 
-            # ========== STAGE 7: Concat Videos ==========
+            return {"conversation_final_path": conversation_video_path}
+
+        # ========== STAGE 7: Concat Videos ==========
+        async def stage_concat(ctx):
             self.log("[CONV REELS] Aşama 7: Video birleştirme...")
 
             from app.instagram_helper import concatenate_videos_with_crossfade
 
             concat_result = await concatenate_videos_with_crossfade(
-                video_paths=[conversation_video_path, broll_final_path],
+                video_paths=[ctx["conversation_final_path"], ctx["broll_final_path"]],
                 crossfade_duration=0.5
             )
 
             if not concat_result.get("success"):
                 raise Exception(f"Video concat hatası: {concat_result.get('error')}")
 
-            final_video_path = concat_result.get("output_path")
             final_duration = concat_result.get("total_duration", 15)
 
             self.log(f"[CONV REELS] Final video: {final_duration:.1f}s")
             result["final_duration"] = final_duration
             result["stages_completed"].append("concat")
+            return {"concat_video_path": concat_result.get("output_path"), "final_duration": final_duration}
 
-            # ========== STAGE 8: Two-Phase Subtitle Generation ==========
-            self.log("[CONV REELS] Aşama 8: İki aşamalı altyazı oluşturuluyor...")
+        # ========== STAGE 8a: Conversation Subtitle (concat ile paralel) ==========
+        async def stage_conversation_subtitle(ctx):
+            conv_sub_path = None
+            conv_sub_count = 0
+            conv_duration = 12.0  # Default fallback
             try:
-                from app.subtitle_helper import create_subtitle_file, extract_audio_from_video, merge_ass_files
-                from app.instagram_helper import add_subtitles_to_video
-
-                conv_sub_path = None
-                broll_sub_path = None
-                conv_duration = 12.0  # Default fallback
-
-                # Phase 1: Conversation Subtitle (Pure Whisper - Sora native speech)
-                self.log("[CONV REELS] Phase 1: Conversation altyazısı (Pure Whisper)...")
-                conv_audio = await extract_audio_from_video(conversation_video_path)
+                from app.subtitle_helper import create_subtitle_file, extract_audio_from_video
+
+                self.log("[CONV REELS] Aşama 8: İki aşamalı altyazı oluşturuluyor...")
+
+                # Phase 1: Conversation Subtitle
+                # Native speech (Sora): pure Whisper + medium doğrulama
+                # TTS + lipsync: dialog metni biliniyor -> script alignment, ikinci transcription yok
+                # Mod model'den türetilir (video aşaması checkpoint'ten atlanmış olabilir)
+                dialog_script = None
+                if model_id not in native_speech_models:
+                    dialog_script = " ".join(
+                        line.get("text", "") for line in ctx["conv"].get("dialog_lines", [])
+                    ).strip() or None
+                mode = "dialog script alignment" if dialog_script else "Pure Whisper"
+                self.log(f"[CONV REELS] Phase 1: Conversation altyazısı ({mode})...")
+                conv_audio = await extract_audio_from_video(ctx["conversation_final_path"])
 
                 if conv_audio.get("success"):
                     conv_duration = conv_audio.get("duration", 12.0)
@@ -3487,15 +3787,17 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
                     conv_sub = await create_subtitle_file(
                         audio_path=conv_audio["audio_path"],
-                        original_script=None,  # Pure Whisper - Sora generates its own speech
+                        original_script=dialog_script,
                         model_size=os.getenv("WHISPER_MODEL_SIZE", "base"),
                         language="tr"
                     )
 
                     if conv_sub.get("success"):
                         conv_sub_path = conv_sub["ass_path"]
-                        self.log(f"[CONV REELS] Conversation subtitle: {conv_sub.get('subtitle_count', 0)} satır")
+                        conv_sub_count = conv_sub.get("subtitle_count", 0)
+                        self.log(f"[CONV REELS] Conversation subtitle: {conv_sub_count} satır")
 
+                    if conv_sub.get("success") and not dialog_script:
                         # Subtitle verification with larger model
                         try:
                             from app.subtitle_helper import verify_and_correct_subtitles
@@ -3520,33 +3822,61 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                                     )
                                     if conv_sub.get("success"):
                                         conv_sub_path = conv_sub["ass_path"]
+                                        conv_sub_count = conv_sub.get("subtitle_count", 0)
                                         self.log(f"[CONV REELS] Düzeltilmiş subtitle oluşturuldu")
                                 else:
                                     self.log(f"[CONV REELS] Altyazı doğrulandı (benzerlik: {verify_result.get('similarity', 0):.1%})")
                         except Exception as e:
                             self.log(f"[CONV REELS] Altyazı doğrulama atlandı: {e}")
-                    else:
+                    elif not conv_sub.get("success"):
                         self.log(f"[CONV REELS] Conversation subtitle hatası: {conv_sub.get('error')}")
                 else:
                     self.log(f"[CONV REELS] Conversation audio extract hatası: {conv_audio.get('error')}")
+            except Exception as e:
+                import traceback
+                self.log(f"[CONV REELS] Altyazı hatası: {e}")
+                self.log(f"[CONV REELS] Traceback: {traceback.format_exc()}")
+
+            return {"conv_subtitle": {"path": conv_sub_path, "count": conv_sub_count, "duration": conv_duration}}
+
+        # ========== STAGE 8b: B-roll Subtitle (TTS text - hybrid mode) ==========
+        async def stage_broll_subtitle(ctx):
+            broll_sub_path = None
+            broll_sub_count = 0
+            broll_audio_path = ctx["broll_audio_path"]
+            try:
+                from app.subtitle_helper import create_subtitle_file
 
-                # Phase 2: B-roll Subtitle (TTS text - hybrid mode)
                 self.log("[CONV REELS] Phase 2: B-roll altyazısı (TTS metni)...")
                 if broll_audio_path:
                     broll_sub = await create_subtitle_file(
-                        audio_path=broll_audio_path,  # TTS audio from Stage 5
-                        original_script=broll_voiceover,  # TTS text - hybrid mode works here
+                        audio_path=broll_audio_path,  # TTS audio from Stage 4
+                        original_script=ctx["conv"]["broll_voiceover"],  # TTS text - hybrid mode works here
                         model_size=os.getenv("WHISPER_MODEL_SIZE", "base"),
                         language="tr"
                     )
 
                     if broll_sub.get("success"):
                         broll_sub_path = broll_sub["ass_path"]
-                        self.log(f"[CONV REELS] B-roll subtitle: {broll_sub.get('subtitle_count', 0)} satır")
+                        broll_sub_count = broll_sub.get("subtitle_count", 0)
+                        self.log(f"[CONV REELS] B-roll subtitle: {broll_sub_count} satır")
                     else:
                         self.log(f"[CONV REELS] B-roll subtitle hatası: {broll_sub.get('error')}")
                 else:
                     self.log("[CONV REELS] B-roll audio yok, B-roll subtitle atlanıyor")
+            except Exception as e:
+                self.log(f"[CONV REELS] B-roll altyazı hatası: {e}")
+
+            return {"broll_subtitle": {"path": broll_sub_path, "count": broll_sub_count}}
+
+        # ========== STAGE 8c: Merge + Burn Subtitles ==========
+        async def stage_burn_subtitles(ctx):
+            final_video_path = ctx["concat_video_path"]
+            conv_sub_path = ctx["conv_subtitle"]["path"]
+            broll_sub_path = ctx["broll_subtitle"]["path"]
+            try:
+                from app.subtitle_helper import merge_ass_files
+                from app.instagram_helper import add_subtitles_to_video
 
                 # Phase 3: Merge ASS files with timing offset
                 if conv_sub_path or broll_sub_path:
@@ -3560,7 +3890,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
                     if broll_sub_path:
                         # B-roll starts at conversation_duration - crossfade
-                        broll_offset = conv_duration - crossfade_duration
+                        broll_offset = ctx["conv_subtitle"]["duration"] - crossfade_duration
                         ass_files_to_merge.append({"path": broll_sub_path, "offset": broll_offset})
                         self.log(f"[CONV REELS] B-roll offset: {broll_offset:.1f}s")
 
@@ -3570,7 +3900,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                         total_subtitle_count = merged_ass.get("subtitle_count", 0)
                     else:
                         final_ass_path = ass_files_to_merge[0]["path"] if ass_files_to_merge else None
-                        total_subtitle_count = conv_sub.get("subtitle_count", 0) if conv_sub_path else broll_sub.get("subtitle_count", 0)
+                        total_subtitle_count = ctx["conv_subtitle"]["count"] if conv_sub_path else ctx["broll_subtitle"]["count"]
 
                     # Phase 4: Burn merged subtitles
                     if final_ass_path:
@@ -3595,27 +3925,34 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
                 self.log(f"[CONV REELS] Traceback: {traceback.format_exc()}")
 
             # Update post
-            if post_id:
-                update_post(
-                    post_id,
+            if ctx["post_id"]:
+                await async_crud.update_post(
+                    ctx["post_id"],
                     visual_path=final_video_path,
-                    total_video_duration=final_duration,
+                    total_video_duration=ctx["final_duration"],
                     voice_mode=True
                 )
 
-            # ========== STAGE 9: Review & Approval ==========
+            return {"final_video_path": final_video_path}
+
+        # ========== STAGE 9: Review & Approval ==========
+        async def stage_request_approval(ctx):
             self.log("[CONV REELS] Aşama 9: Onay bekleniyor...")
             self.state = PipelineState.AWAITING_FINAL_APPROVAL
 
+            conv = ctx["conv"]
+            post_id = ctx["post_id"]
+            final_video_path = ctx["final_video_path"]
+
             # Hashtag string
-            hashtag_str = " ".join(hashtags) if hashtags else "#Olivenet #KKTC #IoT"
-            full_caption = f"{caption}\n\n{hashtag_str}"
+            hashtag_str = " ".join(conv["hashtags"]) if conv["hashtags"] else "#Olivenet #KKTC #IoT"
+            full_caption = f"{conv['caption']}\n\n{hashtag_str}"
 
             await self.notify_telegram(
                 message=f"🎭 *CONVERSATIONAL REELS* - Onay Bekliyor\n\n"
-                f"📋 *Konu:* {_escape_md(topic[:50])}...\n"
-                f"💬 *Dialog:* {len(dialog_lines)} satır\n"
-                f"⏱️ *Süre:* {final_duration:.0f}s\n"
+                f"📋 *Konu:* {_escape_md(ctx['topic'][:50])}...\n"
+                f"💬 *Dialog:* {len(conv['dialog_lines'])} satır\n"
+                f"⏱️ *Süre:* {ctx['final_duration']:.0f}s\n"
                 f"🗣️ *Sora Native Speech:* ✓\n\n"
                 f"*Caption:*\n{_escape_md(full_caption[:200])}...",
                 data={"video_path": final_video_path},
@@ -3631,6 +3968,52 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             result["final_video_path"] = final_video_path
             result["caption"] = full_caption
             result["stages_completed"].append("awaiting_approval")
+            return {}
+
+        graph = StageGraph("conversational_reels", [
+            Stage("topic", stage_topic, ("topic_input",), ("topic", "category")),
+            Stage("conversation", stage_conversation, ("topic", "category"), ("conv", "post_id")),
+            Stage("conversation_video", stage_conversation_video, ("topic", "conv"),
+                  ("conversation_video_path",), resource="video"),
+            Stage("broll_voiceover", stage_broll_voiceover, ("conv",),
+                  ("broll_audio_path", "broll_video_duration"), resource="tts"),
+            Stage("broll_video", stage_broll_video, ("conv", "broll_video_duration"),
+                  ("broll_video_path",), resource="video"),
+            Stage("broll_merge", stage_broll_merge,
+                  ("broll_video_path", "broll_audio_path", "broll_video_duration"),
+                  ("broll_final_path",), resource="ffmpeg"),
+            Stage("freeze_frame", stage_freeze_frame, ("conversation_video_path",),
+                  ("conversation_final_path",), resource="whisper"),
+            Stage("concat", stage_concat, ("conversation_final_path", "broll_final_path"),
+                  ("concat_video_path", "final_duration"), resource="ffmpeg"),
+            Stage("conversation_subtitle", stage_conversation_subtitle, ("conv", "conversation_final_path"),
+                  ("conv_subtitle",), resource="whisper"),
+            Stage("broll_subtitle", stage_broll_subtitle, ("conv", "broll_audio_path"),
+                  ("broll_subtitle",), resource="whisper"),
+            Stage("subtitles", stage_burn_subtitles,
+                  ("concat_video_path", "final_duration", "conv_subtitle", "broll_subtitle", "post_id"),
+                  ("final_video_path",), resource="ffmpeg"),
+            Stage("request_approval", stage_request_approval,
+                  ("topic", "conv", "post_id", "final_video_path", "final_duration"), ()),
+        ])
+
+        checkpoint = PipelineCheckpoint(
+            "conversational_reels",
+            params={
+                "topic": topic,
+                "manual_topic_mode": manual_topic_mode,
+                "visual_style": visual_style,
+                "model_id": model_id
+            },
+            result=result,
+            post_id=resume_post_id
+        )
+
+        try:
+            skip = await checkpoint.load(graph)
+            await graph.run({"topic_input": topic}, on_stage_complete=checkpoint.on_stage_complete, skip=skip)
+            self.log(f"[CONV REELS] {graph.summary()}")
+            await checkpoint.finish("completed")
 
             self.log("[CONV REELS] Pipeline tamamlandı - onay bekleniyor")
             return result
@@ -3640,18 +4023,19 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
             self.state = PipelineState.ERROR
             result["error"] = str(e)
             result["final_state"] = self.state.value
+            await checkpoint.finish("failed", str(e))
 
             await self.notify_telegram(
                 message=f"❌ *CONVERSATIONAL REELS* - Hata\n\n{_escape_md(str(e))}",
                 data={"error": str(e)},
-                buttons=[]
+                buttons=self._resume_buttons(checkpoint)
             )
 
             return result
 
+    @pipeline_run("conversational_publish")
     async def publish_conversational_reels(self, post_id: int) -> Dict[str, Any]:
         """Conversational Reels'i Instagram'a yayınla (Telegram onayı sonrası)"""
-        from app.database.crud import get_post, update_post
 
         result = {
             "success": False,
@@ -3662,7 +4046,7 @@ Prompt: _{visual_prompt_result.get('visual_prompt', 'N/A')[:200]}..._
 
         try:
             # Database'den post bilgilerini al
-            post = get_post(post_id)
+            post = await async_crud.get_post(post_id)
             if not post:
                 raise Exception(f"Post bulunamadı: {post_id}")
 
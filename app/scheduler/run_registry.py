@@ -0,0 +1,181 @@
+"""
+Run Registry - Eşzamanlı pipeline run'ları
+
+Her pipeline çağrısı kendi run ID'si, durumu ve onay future'ı olan bir
+PipelineRun olarak çalışır; onay bekleyen bir Reel diğer içerik üretimini
+bloklamaz. Aktif run contextvar ile taşınır (StageGraph task'ları dahil),
+ContentPipeline'ın state / current_data / wait_for_approval erişimleri
+otomatik olarak o run'a gider:
+
+    async with registry.start("voice_reels") as run:
+        ...  # current_run() is run
+
+Aynı anda en fazla `max_concurrent` run çalışır, fazlası sırada bekler.
+Telegram butonları `<callback>@<run_id>` formatında run ID'sini taşır.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+_current_run: ContextVar[Optional["PipelineRun"]] = ContextVar("pipeline_run", default=None)
+
+# Telegram callback_data içinde run ID ayırıcısı
+RUN_ID_SEPARATOR = "@"
+
+
+def current_run() -> Optional["PipelineRun"]:
+    """Geçerli task bağlamındaki pipeline run'ı (yoksa None)"""
+    return _current_run.get()
+
+
+def tag_callback(callback: str, run_id: str) -> str:
+    """Callback verisine run ID ekle (örn. approve_topic@3fa2c1)"""
+    return f"{callback}{RUN_ID_SEPARATOR}{run_id}"
+
+
+def split_callback(data: str) -> Tuple[str, Optional[str]]:
+    """Callback verisini (action, run_id) olarak ayır; run ID yoksa None"""
+    action, _, run_id = data.partition(RUN_ID_SEPARATOR)
+    return action, run_id or None
+
+
+class PipelineRun:
+    """Tek bir pipeline çalıştırması: durum, veri ve onay future'ı"""
+
+    def __init__(self, kind: str, state: Any = None):
+        self.run_id = uuid.uuid4().hex[:6]
+        self.kind = kind
+        self.current_data: Dict[str, Any] = {}
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.history: List[Tuple[float, Any]] = []
+        self._state = None
+        self._approval: Optional[asyncio.Future] = None
+        self.state = state
+
+    @property
+    def state(self) -> Any:
+        return self._state
+
+    @state.setter
+    def state(self, value: Any):
+        if value != self._state:
+            self._state = value
+            self.history.append((time.time(), value))
+
+    @property
+    def awaiting_approval(self) -> bool:
+        return self._approval is not None and not self._approval.done()
+
+    @property
+    def current_state(self) -> Dict[str, Any]:
+        """Audit logging için current_data'dan state çıkar"""
+        content = self.current_data.get("content", {})
+        topic = self.current_data.get("topic_suggestion", {})
+        visual = self.current_data.get("visual_result", {})
+
+        return {
+            "post_id": content.get("post_id"),
+            "topic": topic.get("topic"),
+            "visual_type": visual.get("visual_type", "post")
+        }
+
+    async def wait_for_approval(self, timeout: float) -> Dict[str, Any]:
+        """Bu run için Telegram onayı bekle"""
+        self._approval = asyncio.get_running_loop().create_future()
+        try:
+            return await asyncio.wait_for(self._approval, timeout=timeout) or {"action": "timeout"}
+        except asyncio.TimeoutError:
+            return {"action": "timeout"}
+        finally:
+            self._approval = None
+
+    def set_approval(self, response: Dict[str, Any]) -> bool:
+        """Onay yanıtını ilet; run onay beklemiyorsa False"""
+        if not self.awaiting_approval:
+            return False
+        self._approval.set_result(response)
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = getattr(self.state, "value", self.state)
+        end = self.finished_at or time.time()
+        return {
+            "run_id": self.run_id,
+            "kind": self.kind,
+            "state": state,
+            "awaiting_approval": self.awaiting_approval,
+            "elapsed_s": round(end - (self.started_at or self.created_at), 1),
+        }
+
+
+class RunRegistry:
+    """Aktif pipeline run'ları ve eşzamanlılık limiti"""
+
+    def __init__(self, max_concurrent: int = 3, history: int = 20):
+        self.max_concurrent = max(1, max_concurrent)
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self.runs: Dict[str, PipelineRun] = {}
+        self.finished: Deque[PipelineRun] = deque(maxlen=history)
+
+    @asynccontextmanager
+    async def start(
+        self,
+        kind: str,
+        state: Any = None,
+        on_queued: Optional[Callable[[PipelineRun], Awaitable[None]]] = None
+    ):
+        """
+        Yeni run kaydet, slot boşalınca başlat; blok süresince current_run() bu run'dır.
+
+        Args:
+            kind: Pipeline adı (voice_reels, carousel, ...)
+            state: Başlangıç durumu (slot beklerken)
+            on_queued: Tüm slotlar doluysa beklemeden önce çağrılır
+        """
+        run = PipelineRun(kind, state)
+        self.runs[run.run_id] = run
+        token = _current_run.set(run)
+        try:
+            if self._slots.locked() and on_queued:
+                await on_queued(run)
+            async with self._slots:
+                run.started_at = time.time()
+                yield run
+        finally:
+            _current_run.reset(token)
+            run.finished_at = time.time()
+            self.runs.pop(run.run_id, None)
+            self.finished.append(run)
+
+    def get(self, run_id: Optional[str]) -> Optional[PipelineRun]:
+        return self.runs.get(run_id) if run_id else None
+
+    def resolve(self, run_id: Optional[str] = None) -> Optional[PipelineRun]:
+        """
+        Callback'in hedef run'ı: ID verilmişse o run, verilmemişse (eski
+        butonlar) onay bekleyen en eski run.
+        """
+        if run_id:
+            return self.runs.get(run_id)
+        waiting = [r for r in self.runs.values() if r.awaiting_approval]
+        return min(waiting, key=lambda r: r.created_at) if waiting else None
+
+    def set_approval(self, response: Dict[str, Any], run_id: Optional[str] = None) -> bool:
+        run = self.resolve(run_id)
+        return run.set_approval(response) if run else False
+
+    def get_status(self) -> Dict[str, Any]:
+        running = sum(1 for r in self.runs.values() if r.started_at is not None)
+        return {
+            "max_concurrent": self.max_concurrent,
+            "running": running,
+            "queued": len(self.runs) - running,
+            "runs": [r.to_dict() for r in sorted(self.runs.values(), key=lambda r: r.created_at)],
+        }
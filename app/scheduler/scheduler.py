@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Callable, List
 import json
 
+from app.llm.dispatcher import Priority, llm_priority
+
 def get_kktc_now():
     """KKTC saatini al (UTC+3)"""
     return datetime.utcnow() + timedelta(hours=3)
@@ -29,7 +31,8 @@ class ScheduledTask:
         hour: int = None,
         minute: int = 0,
         days: List[str] = None,
-        interval_minutes: int = None
+        interval_minutes: int = None,
+        priority: Priority = Priority.SCHEDULED
     ):
         self.name = name
         self.callback = callback
@@ -37,6 +40,7 @@ class ScheduledTask:
         self.minute = minute
         self.days = days or ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
         self.interval_minutes = interval_minutes
+        self.priority = priority  # Görevin LLM çağrılarının kuyruk önceliği
         self.last_run = None
         self.enabled = True
     
@@ -71,10 +75,11 @@ class ScheduledTask:
         """Görevi çalıştır"""
         self.last_run = get_kktc_now()
         try:
-            if asyncio.iscoroutinefunction(self.callback):
-                return await self.callback()
-            else:
-                return self.callback()
+            with llm_priority(self.priority):
+                if asyncio.iscoroutinefunction(self.callback):
+                    return await self.callback()
+                else:
+                    return self.callback()
         except Exception as e:
             print(f"[SCHEDULER] Task '{self.name}' error: {e}")
             return {"error": str(e)}
@@ -100,13 +105,13 @@ class ContentScheduler:
     
     async def check_calendar_and_publish(self):
         """Content calendar'ı kontrol et ve zamanı gelen içeriği paylaş"""
-        from app.database import get_todays_calendar, update_calendar_status, should_run_scheduled_content
+        from app.database import async_crud
 
         now = get_kktc_now()
         current_day = now.weekday()  # 0=Monday, 6=Sunday
 
         # Bugünün planlarını al
-        todays_plans = get_todays_calendar(current_day)
+        todays_plans = await async_crud.get_todays_calendar(current_day)
 
         for plan in todays_plans:
             plan_time = plan.get('scheduled_time', '')
@@ -132,20 +137,21 @@ class ContentScheduler:
                         print(f"[SCHEDULER] Konu: {plan.get('topic_suggestion', 'N/A')}")
 
                         # Duplicate kontrolü - bugün bu tipte içerik var mı?
-                        check_result = should_run_scheduled_content(content_type)
+                        check_result = await async_crud.should_run_scheduled_content(content_type)
 
                         if not check_result['should_run']:
                             print(f"[SCHEDULER] ⏭️ SKIP: {check_result['message']}")
                             # Calendar'ı skip olarak işaretle
-                            update_calendar_status(plan_id, 'skipped', None)
+                            await async_crud.update_calendar_status(plan_id, 'skipped', None)
                             continue
 
                         # Otonom içerik üret ve paylaş
                         if self.pipeline:
-                            result = await self.pipeline.run_autonomous_content_with_plan(plan)
+                            with llm_priority(Priority.SCHEDULED):
+                                result = await self.pipeline.run_autonomous_content_with_plan(plan)
 
                             if result.get('success'):
-                                update_calendar_status(plan_id, 'published', result.get('post_id'))
+                                await async_crud.update_calendar_status(plan_id, 'published', result.get('post_id'))
                                 print(f"[SCHEDULER] ✅ Planlı içerik paylaşıldı!")
                             else:
                                 print(f"[SCHEDULER] ❌ Paylaşım hatası: {result.get('error')}")
@@ -232,7 +238,8 @@ def create_default_scheduler(pipeline) -> ContentScheduler:
         callback=weekly_planning,
         hour=8,
         minute=0,
-        days=["monday"]
+        days=["monday"],
+        priority=Priority.BACKGROUND
     ))
     
     # Günlük analytics raporu (20:00 KKTC)
@@ -245,7 +252,8 @@ def create_default_scheduler(pipeline) -> ContentScheduler:
         name="daily_analytics",
         callback=daily_analytics,
         hour=20,
-        minute=0
+        minute=0,
+        priority=Priority.BACKGROUND
     ))
     
     # Haftalık strateji güncelleme (Pazar 21:00 KKTC)
@@ -259,12 +267,13 @@ def create_default_scheduler(pipeline) -> ContentScheduler:
         callback=strategy_update,
         hour=21,
         minute=0,
-        days=["sunday"]
+        days=["sunday"],
+        priority=Priority.BACKGROUND
     ))
 
     # Metrik senkronizasyonu (02:00 ve 14:00 KKTC - günde 2x)
     async def sync_metrics():
-        from app.database import get_posts_by_status
+        from app.database import async_crud
         from app.agents import AnalyticsAgent
 
         print("[SCHEDULER] 📊 Metrik senkronizasyonu başlatılıyor...")
@@ -272,7 +281,7 @@ def create_default_scheduler(pipeline) -> ContentScheduler:
 
         # Son 7 günün published post'ları
         cutoff = datetime.now() - timedelta(days=7)
-        posts = get_posts_by_status('published')
+        posts = await async_crud.get_posts_by_status('published')
         recent_posts = [p for p in posts if p.get('published_at') and
                        datetime.fromisoformat(str(p['published_at']).replace('Z', '')) > cutoff]
 
@@ -302,14 +311,16 @@ def create_default_scheduler(pipeline) -> ContentScheduler:
         name="metrics_sync_morning",
         callback=sync_metrics,
         hour=2,
-        minute=0
+        minute=0,
+        priority=Priority.BACKGROUND
     ))
 
     scheduler.add_task(ScheduledTask(
         name="metrics_sync_afternoon",
         callback=sync_metrics,
         hour=14,
-        minute=0
+        minute=0,
+        priority=Priority.BACKGROUND
     ))
 
     return scheduler
@@ -0,0 +1,210 @@
+"""
+Stage Graph - ContentPipeline için bağımlılık tabanlı aşama yürütücü
+
+Her aşama hangi değerleri okuduğunu (inputs) ve hangilerini ürettiğini
+(outputs) bildirir. Girdileri hazır olan aşamalar hemen başlatılır, böylece
+birbirinden bağımsız aşamalar (örn. TTS ve video prompt) eşzamanlı çalışır
+ve toplam süre kritik yola iner.
+
+    graph = StageGraph("voice_reels", [
+        Stage("caption", caption_fn, inputs=("topic",), outputs=("content",)),
+        Stage("speech", speech_fn, inputs=("topic",), outputs=("speech_script",)),
+        Stage("tts", tts_fn, inputs=("speech_script",), outputs=("audio",), resource="tts"),
+    ])
+    ctx = await graph.run({"topic": "..."})
+
+Aşama fonksiyonu `async def fn(ctx) -> dict` imzasındadır ve bildirdiği tüm
+output'ları döndürmelidir. Resource sınıfları (video, tts, ffmpeg, whisper)
+süreç genelinde paylaşılan semaphore'larla sınırlanır; LLM çağrıları zaten
+app/llm/dispatcher.py kuyruğundan geçer.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Resource sınıfı başına eşzamanlı aşama limiti (tüm pipeline run'ları için ortak)
+RESOURCE_LIMITS: Dict[str, int] = {
+    "video": 3,
+    "tts": 2,
+    "ffmpeg": 2,
+    "whisper": 1,
+}
+
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _get_semaphore(resource: str) -> asyncio.Semaphore:
+    if resource not in _semaphores:
+        _semaphores[resource] = asyncio.Semaphore(RESOURCE_LIMITS.get(resource, 1))
+    return _semaphores[resource]
+
+
+class StageGraphError(Exception):
+    """Graph tanımı geçersiz (eksik input, döngü, çakışan output)"""
+
+
+class StageFailed(Exception):
+    """Bir aşama hata verdi; orijinal exception __cause__ içinde"""
+
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(str(error))
+        self.stage = stage
+        self.error = error
+
+
+@dataclass
+class Stage:
+    """Pipeline aşaması"""
+    name: str
+    func: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    resource: Optional[str] = None
+
+
+class StageGraph:
+    """Bildirimsel aşama grafiği"""
+
+    def __init__(self, name: str, stages: List[Stage]):
+        self.name = name
+        self.stages = {s.name: s for s in stages}
+        if len(self.stages) != len(stages):
+            raise StageGraphError(f"{name}: duplicate stage names")
+
+        self.producers: Dict[str, str] = {}
+        for stage in stages:
+            for key in stage.outputs:
+                if key in self.producers:
+                    raise StageGraphError(f"{name}: '{key}' produced by both {self.producers[key]} and {stage.name}")
+                self.producers[key] = stage.name
+
+        self.timings: Dict[str, Tuple[float, float]] = {}
+
+    def _validate(self, initial: Dict[str, Any]):
+        for stage in self.stages.values():
+            for key in stage.inputs:
+                if key not in self.producers and key not in initial:
+                    raise StageGraphError(f"{self.name}: input '{key}' of {stage.name} is never produced")
+
+        # Döngü kontrolü (DFS)
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise StageGraphError(f"{self.name}: cycle at {name}")
+            visiting.add(name)
+            for key in self.stages[name].inputs:
+                if key in self.producers and key not in initial:
+                    visit(self.producers[key])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def run(
+        self,
+        initial: Dict[str, Any],
+        on_stage_complete: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+        skip: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Grafiği çalıştır.
+
+        Args:
+            initial: Başlangıç değerleri (hiçbir aşamanın üretmediği input'lar)
+            on_stage_complete: Her aşama bittiğinde `await cb(stage_name, outputs)`
+            skip: Önceden tamamlanmış aşamalar {stage_name: outputs} (çalıştırılmaz)
+
+        Returns:
+            Tüm output'ları içeren context
+
+        Raises:
+            StageFailed: İlk hata veren aşama (çalışan diğer aşamalar iptal edilir)
+        """
+        self._validate(initial)
+        ctx: Dict[str, Any] = dict(initial)
+        pending = dict(self.stages)
+        running: Dict[asyncio.Task, str] = {}
+        self.timings = {}
+        started_at = time.perf_counter()
+
+        for name, outputs in (skip or {}).items():
+            if name in pending:
+                ctx.update(outputs)
+                del pending[name]
+                self.timings[name] = (0.0, 0.0)
+
+        async def execute(stage: Stage) -> Dict[str, Any]:
+            if stage.resource:
+                async with _get_semaphore(stage.resource):
+                    start = time.perf_counter() - started_at
+                    out = await stage.func(ctx)
+            else:
+                start = time.perf_counter() - started_at
+                out = await stage.func(ctx)
+            out = out or {}
+            missing = [k for k in stage.outputs if k not in out]
+            if missing:
+                raise StageGraphError(f"{stage.name} did not return {missing}")
+            self.timings[stage.name] = (start, time.perf_counter() - started_at)
+            return out
+
+        try:
+            while pending or running:
+                ready = [s for s in pending.values() if all(k in ctx for k in s.inputs)]
+                for stage in ready:
+                    del pending[stage.name]
+                    running[asyncio.create_task(execute(stage))] = stage.name
+
+                if not running:
+                    raise StageGraphError(f"{self.name}: stalled, waiting stages {list(pending)}")
+
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    try:
+                        outputs = task.result()
+                    except Exception as e:
+                        raise StageFailed(name, e) from e
+                    ctx.update({k: outputs[k] for k in self.stages[name].outputs})
+                    if on_stage_complete:
+                        await on_stage_complete(name, outputs)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return ctx
+
+    def critical_path(self) -> List[str]:
+        """Son biten aşamadan geriye, en geç biten bağımlılıkları izleyerek kritik yol"""
+        if not self.timings:
+            return []
+        path = []
+        current = max(self.timings, key=lambda n: self.timings[n][1])
+        while current:
+            path.append(current)
+            deps = [
+                self.producers[k] for k in self.stages[current].inputs
+                if k in self.producers and self.producers[k] in self.timings
+            ]
+            current = max(deps, key=lambda n: self.timings[n][1]) if deps else None
+        return list(reversed(path))
+
+    def summary(self) -> str:
+        """Aşama süreleri ve kritik yol (log için)"""
+        if not self.timings:
+            return f"{self.name}: no stages run"
+        total = max(end for _, end in self.timings.values())
+        serial = sum(end - start for start, end in self.timings.values())
+        parts = [f"{n}={end - start:.1f}s" for n, (start, end) in sorted(self.timings.items(), key=lambda i: i[1][0])]
+        return (
+            f"{self.name}: {total:.1f}s wall / {serial:.1f}s serial | "
+            f"critical: {' → '.join(self.critical_path())} | {', '.join(parts)}"
+        )
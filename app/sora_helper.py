@@ -8,9 +8,19 @@ import random
 import httpx
 import asyncio
 from datetime import datetime
-from typing import Dict, Any, List, Tuple
+from typing import AsyncIterator, Dict, Any, List, Tuple
 
 from app.config import settings
+from app.jobs import (
+    JobFailed,
+    JobTimeout,
+    PollResult,
+    Submission,
+    register_canceller,
+    register_poller,
+    run_remote_job,
+)
+from app.net import get_http_client
 from app.utils.logger import get_logger
 
 logger = get_logger("sora")
@@ -42,6 +52,39 @@ AUDIO/DIALOGUE RULES (voiceover will be added separately):
 """
 
 
+async def _poll_sora(client: httpx.AsyncClient, video_id: str, poll_data: Dict[str, Any]) -> PollResult:
+    """GET /videos/{video_id} - job tracker poller'ı"""
+    response = await client.get(
+        f"{OPENAI_API_URL}/videos/{video_id}",
+        headers={"Authorization": f"Bearer {OPENAI_API_KEY}"}
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Status check failed: {response.status_code}")
+
+    status_data = response.json()
+    current_status = status_data.get("status")
+    if current_status == "completed":
+        return PollResult.completed({"video_id": video_id})
+    if current_status == "failed":
+        error = status_data.get("error", {})
+        return PollResult.failed(error.get("message", "Unknown") if isinstance(error, dict) else str(error))
+    return PollResult.pending(progress=status_data.get("progress"))
+
+
+async def _cancel_sora(client: httpx.AsyncClient, video_id: str, poll_data: Dict[str, Any]):
+    """DELETE /videos/{video_id} - job tracker canceller'ı"""
+    response = await client.delete(
+        f"{OPENAI_API_URL}/videos/{video_id}",
+        headers={"Authorization": f"Bearer {OPENAI_API_KEY}"}
+    )
+    if response.status_code not in (200, 204):
+        raise RuntimeError(f"Delete failed: {response.status_code}")
+
+
+register_poller("sora", _poll_sora, default_interval=10.0, http_service="openai")
+register_canceller("sora", _cancel_sora)
+
+
 async def generate_video_sora(
     prompt: str,
     duration: int = 8,
@@ -95,101 +138,83 @@ async def generate_video_sora(
         "size": (None, size)
     }
 
-    try:
-        async with httpx.AsyncClient(timeout=60) as client:
-            print(f"[SORA] API'ye istek gonderiliyor (multipart/form-data)...")
-
-            # POST with files= for true multipart/form-data
-            response = await client.post(
-                f"{OPENAI_API_URL}/videos",
-                headers=headers,
-                files=files  # files= for multipart/form-data
-            )
-
-            print(f"[SORA] Response: {response.status_code}")
-
-            if response.status_code not in [200, 201]:
-                error_text = response.text[:500]
-                print(f"[SORA] ❌ API hatasi: {error_text}")
-                return {"success": False, "error": error_text, "fallback": "veo3"}
-
-            job_data = response.json()
-            video_id = job_data.get("id")
-            status = job_data.get("status")
-
-            print(f"[SORA] ✅ Job baslatildi: {video_id}")
-            print(f"[SORA] Status: {status}")
-
-        # 2. Job tamamlanana kadar bekle (polling)
-        async with httpx.AsyncClient(timeout=600) as client:
-            start_time = datetime.now()
-            max_wait = 600  # 10 dakika (Sora kuyruk yoğunluğu için)
-
-            while True:
-                await asyncio.sleep(10)
-
-                elapsed = (datetime.now() - start_time).total_seconds()
-                if elapsed > max_wait:
-                    return {"success": False, "error": "Timeout", "fallback": "veo3"}
-
-                # GET /videos/{video_id}
-                status_response = await client.get(
-                    f"{OPENAI_API_URL}/videos/{video_id}",
-                    headers=headers
-                )
-
-                if status_response.status_code != 200:
-                    print(f"[SORA] Status check failed: {status_response.status_code}")
-                    continue
+    async def submit() -> Submission:
+        client = get_http_client("openai")
+        print(f"[SORA] API'ye istek gonderiliyor (multipart/form-data)...")
 
-                status_data = status_response.json()
-                current_status = status_data.get("status")
-                progress = status_data.get("progress", 0)
+        # POST with files= for true multipart/form-data
+        response = await client.post(
+            f"{OPENAI_API_URL}/videos",
+            headers=headers,
+            files=files,  # files= for multipart/form-data
+            timeout=60
+        )
 
-                print(f"[SORA] Status: {current_status}, Progress: {progress}% ({int(elapsed)}s)")
+        print(f"[SORA] Response: {response.status_code}")
 
-                if current_status == "completed":
-                    print(f"[SORA] ✅ Video tamamlandi!")
-                    break
-                elif current_status == "failed":
-                    error = status_data.get("error", {})
-                    error_msg = error.get("message", "Unknown") if isinstance(error, dict) else str(error)
-                    print(f"[SORA] ❌ Failed: {error_msg}")
-                    return {"success": False, "error": error_msg, "fallback": "veo3"}
+        if response.status_code not in [200, 201]:
+            raise JobFailed(response.text[:500])
 
-        # 3. Video'yu indir - GET /videos/{video_id}/content
-        async with httpx.AsyncClient(timeout=120, follow_redirects=True) as client:
-            print(f"[SORA] Video indiriliyor...")
+        job_data = response.json()
+        print(f"[SORA] ✅ Job baslatildi: {job_data.get('id')}")
+        print(f"[SORA] Status: {job_data.get('status')}")
+        return Submission(remote_id=job_data.get("id"))
 
-            content_response = await client.get(
-                f"{OPENAI_API_URL}/videos/{video_id}/content",
-                headers=headers
+    try:
+        # 1-2. Job gönder, tamamlanmasını job tracker üzerinden bekle
+        # (restart sonrası aynı istek bekleyen job'a yeniden bağlanır)
+        try:
+            job = await run_remote_job(
+                provider="sora",
+                label=model,
+                submit=submit,
+                key_data={"prompt": prompt, "seconds": duration, "size": size},
+                timeout=600  # 10 dakika (Sora kuyruk yoğunluğu için)
             )
+        except JobTimeout:
+            return {"success": False, "error": "Timeout", "fallback": "veo3"}
+        except JobFailed as e:
+            print(f"[SORA] ❌ Failed: {e}")
+            return {"success": False, "error": str(e), "fallback": "veo3"}
 
-            if content_response.status_code != 200:
-                print(f"[SORA] ❌ Download failed: {content_response.status_code}")
-                return {"success": False, "error": f"Download failed: {content_response.status_code}"}
-
-            # Dosyaya kaydet
-            os.makedirs(OUTPUT_DIR, exist_ok=True)
-            output_path = f"{OUTPUT_DIR}/sora_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
-
-            with open(output_path, 'wb') as f:
-                f.write(content_response.content)
+        video_id = job["video_id"]
+        print(f"[SORA] ✅ Video tamamlandi!")
 
-            file_size = os.path.getsize(output_path) / 1024 / 1024
-            print(f"[SORA] ✅ Kaydedildi: {output_path}")
-            print(f"[SORA] Boyut: {file_size:.2f} MB")
-
-            return {
-                "success": True,
-                "video_path": output_path,
-                "video_id": video_id,
-                "duration": duration,
-                "model": model,
-                "model_used": model,
-                "file_size_mb": round(file_size, 2)
-            }
+        # 3. Video'yu indir - GET /videos/{video_id}/content
+        client = get_http_client("openai")
+        print(f"[SORA] Video indiriliyor...")
+
+        content_response = await client.get(
+            f"{OPENAI_API_URL}/videos/{video_id}/content",
+            headers=headers,
+            timeout=120,
+            follow_redirects=True
+        )
+
+        if content_response.status_code != 200:
+            print(f"[SORA] ❌ Download failed: {content_response.status_code}")
+            return {"success": False, "error": f"Download failed: {content_response.status_code}"}
+
+        # Dosyaya kaydet
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        output_path = f"{OUTPUT_DIR}/sora_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
+
+        with open(output_path, 'wb') as f:
+            f.write(content_response.content)
+
+        file_size = os.path.getsize(output_path) / 1024 / 1024
+        print(f"[SORA] ✅ Kaydedildi: {output_path}")
+        print(f"[SORA] Boyut: {file_size:.2f} MB")
+
+        return {
+            "success": True,
+            "video_path": output_path,
+            "video_id": video_id,
+            "duration": duration,
+            "model": model,
+            "model_used": model,
+            "file_size_mb": round(file_size, 2)
+        }
 
     except httpx.TimeoutException:
         print(f"[SORA] ⚠️ Timeout")
@@ -224,233 +249,80 @@ async def generate_video_smart(
     duration: int = 8,
     voice_mode: bool = False
 ) -> Dict[str, Any]:
-    """Akilli video uretimi - Kling / Sora / Veo secimi
+    """Akilli video uretimi - Kling / Sora / Veo / Wan secimi
+
+    Model zorlanmazsa gozlenen sure ve hata oranina gore en hizli saglikli
+    model secilir; hata (veya hedge acikken p90 asimi) durumunda baska
+    modele gecilir (app/video_router.py).
 
     Args:
         voice_mode: True ise TTS voiceover eklenecek, Sora'ya NO dialogue suffix eklenir
     """
+    from app.video_router import generate_video_routed, resolve_model_id
 
     if force_model:
-        model = force_model
         complexity = {"complexity": "forced", "model": force_model, "duration": duration}
     else:
         complexity = analyze_prompt_complexity(prompt, topic)
-        model = complexity.get("model", "veo3")
         duration = complexity.get("duration", duration)
 
-    # Model isim normalizasyonu (UI'dan gelen kısa isimler ve video_models.py ID'leri)
-    model_aliases = {
-        "sora2": "sora-2",
-        "sora2-pro": "sora-2-pro",
-        "veo": "veo3",
-        # Multi-model voice reels ID'leri (video_models.py → fal_helper.py)
-        "kling-2.5-pro": "kling_pro",
-        "kling-2.6-pro": "kling_26_pro",
-        "kling-3.0-pro": "kling_v3_pro",
-        "kling-2.1": "kling_pro",  # Backward compatibility
-        "wan-2.1": "wan_26",
-        "veo-2": "veo3",
-        "minimax": "hailuo_pro"
-    }
-    if model in model_aliases:
-        model = model_aliases[model]
+    # Model isim normalizasyonu (UI'dan gelen kısa isimler ve fal_helper model adları)
+    model = resolve_model_id(force_model)
+    if force_model and not model:
+        print(f"[VIDEO] ⚠️ Bilinmeyen model: {force_model}, otomatik secim yapilacak")
 
     print(f"[VIDEO] 🎯 Complexity: {complexity.get('complexity')}")
-    print(f"[VIDEO] Model: {model}")
-
-    # Kling modelleri icin fal.ai kullan
-    if model and model.startswith("kling"):
-        print(f"[VIDEO] → Kling AI ({model}) kullaniliyor...")
-        try:
-            from app.fal_helper import FalVideoGenerator
-            # Voice mode'da native audio KAPATILIR (TTS voiceover eklenecek)
-            # Kling 2.6 için normalde audio aktif, ama voice_mode'da kapalı
-            if voice_mode:
-                generate_audio = False  # TTS voiceover için native audio kapat
-                print(f"[VIDEO] → Voice mode: Native audio KAPALI")
-            else:
-                generate_audio = True if model in ("kling_26_pro", "kling_v3_pro") else None
-            result = await FalVideoGenerator.generate_video(
-                prompt=prompt,
-                model=model,
-                duration=min(duration, 15 if model in ("kling_v3_pro",) else 10),
-                aspect_ratio="9:16",
-                generate_audio=generate_audio
-            )
-            if result.get("success"):
-                return result
-            # Kling basarisiz - Veo'ya fallback
-            print(f"[VIDEO] ⚠️ Kling basarisiz: {result.get('error')}, Veo'ya geciliyor...")
-        except Exception as e:
-            print(f"[VIDEO] ⚠️ Kling hatasi: {e}, Veo'ya geciliyor...")
-
-        # Fallback to Veo
-        from app.veo_helper import generate_video_veo3
-        result = await generate_video_veo3(prompt, aspect_ratio="9:16", duration_seconds=duration)
-        if result.get("success"):
-            result["fallback_from"] = model
-            result["model_used"] = result.get("model", "veo-3")
-        return result
+    print(f"[VIDEO] Model: {model or 'auto'}")
 
-    # Hailuo modelleri icin fal.ai kullan
-    if model and model.startswith("hailuo"):
-        print(f"[VIDEO] → Hailuo AI ({model}) kullaniliyor...")
-        try:
-            from app.fal_helper import FalVideoGenerator
-            result = await FalVideoGenerator.generate_video(
-                prompt=prompt,
-                model=model,
-                duration=min(duration, 6),  # Hailuo max 6s
-                aspect_ratio="9:16"
-            )
-            if result.get("success"):
-                return result
-            print(f"[VIDEO] ⚠️ Hailuo basarisiz: {result.get('error')}, Veo'ya geciliyor...")
-        except Exception as e:
-            print(f"[VIDEO] ⚠️ Hailuo hatasi: {e}, Veo'ya geciliyor...")
-
-        # Fallback to Veo
-        from app.veo_helper import generate_video_veo3
-        result = await generate_video_veo3(prompt, aspect_ratio="9:16", duration_seconds=duration)
-        if result.get("success"):
-            result["fallback_from"] = model
-            result["model_used"] = result.get("model", "veo-3")
-        return result
-
-    # Wan modeli icin fal.ai kullan
-    if model == "wan_26":
-        print(f"[VIDEO] → Wan 2.6 kullaniliyor...")
-        try:
-            from app.fal_helper import FalVideoGenerator
-            result = await FalVideoGenerator.generate_video(
-                prompt=prompt,
-                model="wan_26",
-                duration=min(duration, 15),  # Wan max 15s
-                aspect_ratio="9:16"
-            )
-            if result.get("success"):
-                return result
-            print(f"[VIDEO] ⚠️ Wan basarisiz: {result.get('error')}, Veo'ya geciliyor...")
-        except Exception as e:
-            print(f"[VIDEO] ⚠️ Wan hatasi: {e}, Veo'ya geciliyor...")
-
-        # Fallback to Veo
-        from app.veo_helper import generate_video_veo3
-        result = await generate_video_veo3(prompt, aspect_ratio="9:16", duration_seconds=duration)
-        if result.get("success"):
-            result["fallback_from"] = model
-            result["model_used"] = result.get("model", "veo-3")
-        return result
-
-    # Veo secildiyse direkt Veo'ya git
-    if model == "veo3" or model.startswith("veo"):
-        print(f"[VIDEO] → Veo kullaniliyor...")
-        from app.veo_helper import generate_video_veo3
-        result = await generate_video_veo3(prompt, aspect_ratio="9:16", duration_seconds=duration)
-        if result.get("success"):
-            result["model_used"] = result.get("model", "veo-3")
-        return result
-
-    # Sora dene
-    print(f"[VIDEO] → {model} deneniyor...")
-
-    sora_result = await generate_video_sora(
+    return await generate_video_routed(
         prompt=prompt,
         duration=duration,
-        size="720x1280",
-        model=model if model in ["sora-2", "sora-2-pro"] else "sora-2",
-        voice_mode=voice_mode
+        voice_mode=voice_mode,
+        preferred=model
     )
 
-    if sora_result.get("success"):
-        return sora_result
-
-    # Sora basarisiz - Veo'ya fallback
-    if sora_result.get("fallback") == "veo3":
-        print(f"[VIDEO] ⚠️ Sora basarisiz, Veo'ya geciliyor...")
-        from app.veo_helper import generate_video_veo3
-        result = await generate_video_veo3(prompt, aspect_ratio="9:16", duration_seconds=duration)
-        if result.get("success"):
-            result["fallback_from"] = model
-            result["model_used"] = result.get("model", "veo-3")
-        return result
-
-    return sora_result
-
-
-async def generate_videos_parallel(
-    prompts: List[str],
-    model: str = "kling-2.6-pro",
-    duration: int = 10,
-    style_prefix: str = "",
-    max_concurrent: int = 3,
-    max_retries: int = 3
-) -> Dict[str, Any]:
-    """
-    Birden fazla videoyu paralel olarak üret.
-
-    Args:
-        prompts: Her segment için video promptları listesi
-        model: Kullanılacak video modeli
-        duration: Her segment'in süresi (saniye)
-        style_prefix: Tüm promptlara eklenecek stil prefix'i
-        max_concurrent: Aynı anda çalışacak maksimum API çağrısı
-        max_retries: Başarısız segment için yeniden deneme sayısı
-
-    Returns:
-        {
-            "success": bool,
-            "video_paths": [str],  # Sıralı video yolları
-            "failed_indices": [int],  # Başarısız segment indeksleri
-            "model_used": str,
-            "total_duration": float
-        }
-    """
-    if not prompts:
-        return {"success": False, "error": "Prompt listesi boş"}
-
-    print(f"[PARALLEL VIDEO] {len(prompts)} segment üretiliyor...")
-    print(f"[PARALLEL VIDEO] Model: {model}, Segment süresi: {duration}s")
-    print(f"[PARALLEL VIDEO] Max concurrent: {max_concurrent}")
-
-    # Rol-bazlı kamera havuzları (görsel çeşitlilik için)
-    OPENING_SHOTS = [
-        "WIDE ESTABLISHING SHOT, slow dolly forward, cinematic depth of field, ",
-        "AERIAL DRONE SHOT, descending reveal, sweeping landscape, ",
-        "LOW-ANGLE HERO SHOT, steady push in, dramatic perspective, ",
-        "SILHOUETTE WIDE SHOT, golden hour backlight, atmospheric haze, ",
-        "CRANE SHOT, rising from ground level, expansive reveal, ",
-        "DUTCH ANGLE WIDE SHOT, slow rotation to level, tension build, ",
-        "TRACKING WIDE SHOT, lateral dolly, layered parallax depth, ",
-        "OVERHEAD BIRD'S-EYE SHOT, slow descend, geometric composition, ",
-    ]
-
-    DEVELOPMENT_SHOTS = [
-        "MEDIUM SHOT, tracking alongside subject, dynamic camera movement, ",
-        "OVER-THE-SHOULDER SHOT, shallow depth of field, intimate framing, ",
-        "STEADICAM FOLLOW SHOT, fluid motion, immersive perspective, ",
-        "WHIP PAN, fast transition, energetic motion blur, ",
-        "RACK FOCUS MEDIUM SHOT, foreground-to-background shift, layered storytelling, ",
-        "ORBIT SHOT, 180-degree arc around subject, dimensional reveal, ",
-        "HANDHELD MEDIUM SHOT, subtle movement, documentary authenticity, ",
-        "DOLLY ZOOM SHOT, vertigo effect, psychological tension, ",
-        "SLIDER SHOT, smooth lateral glide, parallax movement, ",
-        "TILT-UP MEDIUM SHOT, revealing subject top-to-bottom, gradual disclosure, ",
-        "PUSH-IN MEDIUM SHOT, steady advance, increasing intimacy, ",
-        "PULL-BACK REVEAL SHOT, widening frame, contextual surprise, ",
-    ]
-
-    CLOSING_SHOTS = [
-        "CLOSE-UP DETAIL SHOT, smooth push in, macro focus, emotional impact, ",
-        "EXTREME CLOSE-UP, slow drift, textural detail, sensory immersion, ",
-        "PULL-BACK WIDE SHOT, gradual reveal, sense of closure, ",
-        "SLOW-MOTION CLOSE-UP, dreamy quality, emotional resonance, ",
-        "CRANE SHOT rising, ascending farewell, expanding horizon, ",
-        "GOLDEN HOUR CLOSE-UP, warm backlight, soft bokeh, nostalgic feel, ",
-        "STATIC LOCK-OFF SHOT, composed stillness, contemplative ending, ",
-        "RACK FOCUS TO DISTANCE, foreground blur, symbolic departure, ",
-    ]
 
+# Rol-bazlı kamera havuzları (görsel çeşitlilik için)
+OPENING_SHOTS = [
+    "WIDE ESTABLISHING SHOT, slow dolly forward, cinematic depth of field, ",
+    "AERIAL DRONE SHOT, descending reveal, sweeping landscape, ",
+    "LOW-ANGLE HERO SHOT, steady push in, dramatic perspective, ",
+    "SILHOUETTE WIDE SHOT, golden hour backlight, atmospheric haze, ",
+    "CRANE SHOT, rising from ground level, expansive reveal, ",
+    "DUTCH ANGLE WIDE SHOT, slow rotation to level, tension build, ",
+    "TRACKING WIDE SHOT, lateral dolly, layered parallax depth, ",
+    "OVERHEAD BIRD'S-EYE SHOT, slow descend, geometric composition, ",
+]
+
+DEVELOPMENT_SHOTS = [
+    "MEDIUM SHOT, tracking alongside subject, dynamic camera movement, ",
+    "OVER-THE-SHOULDER SHOT, shallow depth of field, intimate framing, ",
+    "STEADICAM FOLLOW SHOT, fluid motion, immersive perspective, ",
+    "WHIP PAN, fast transition, energetic motion blur, ",
+    "RACK FOCUS MEDIUM SHOT, foreground-to-background shift, layered storytelling, ",
+    "ORBIT SHOT, 180-degree arc around subject, dimensional reveal, ",
+    "HANDHELD MEDIUM SHOT, subtle movement, documentary authenticity, ",
+    "DOLLY ZOOM SHOT, vertigo effect, psychological tension, ",
+    "SLIDER SHOT, smooth lateral glide, parallax movement, ",
+    "TILT-UP MEDIUM SHOT, revealing subject top-to-bottom, gradual disclosure, ",
+    "PUSH-IN MEDIUM SHOT, steady advance, increasing intimacy, ",
+    "PULL-BACK REVEAL SHOT, widening frame, contextual surprise, ",
+]
+
+CLOSING_SHOTS = [
+    "CLOSE-UP DETAIL SHOT, smooth push in, macro focus, emotional impact, ",
+    "EXTREME CLOSE-UP, slow drift, textural detail, sensory immersion, ",
+    "PULL-BACK WIDE SHOT, gradual reveal, sense of closure, ",
+    "SLOW-MOTION CLOSE-UP, dreamy quality, emotional resonance, ",
+    "CRANE SHOT rising, ascending farewell, expanding horizon, ",
+    "GOLDEN HOUR CLOSE-UP, warm backlight, soft bokeh, nostalgic feel, ",
+    "STATIC LOCK-OFF SHOT, composed stillness, contemplative ending, ",
+    "RACK FOCUS TO DISTANCE, foreground blur, symbolic departure, ",
+]
+
+
+def build_segment_prompts(prompts: List[str], style_prefix: str = "") -> List[str]:
+    """Her segment promptuna rol-bazlı kamera prefix'i ve stil prefix'i ekle"""
     # Her segment için rol-bazlı random seçim (ardışık tekrar engelli)
     n = len(prompts)
     full_prompts = []
@@ -478,92 +350,128 @@ async def generate_videos_parallel(
         full_prompts.append(full_prompt)
         print(f"   Prompt {i+1}: {full_prompt[:80]}...")
 
-    # Semaphore ile concurrent limit
-    semaphore = asyncio.Semaphore(max_concurrent)
+    return full_prompts
 
-    async def generate_single_with_limit(
-        index: int,
-        prompt: str
-    ) -> Tuple[int, Dict[str, Any]]:
-        """Tek bir video üret (semaphore ile sınırlı)"""
-        async with semaphore:
-            print(f"[PARALLEL VIDEO] Segment {index + 1}/{len(prompts)} başlıyor...")
-
-            result = await generate_video_smart(
-                prompt=prompt,
-                force_model=model,
-                duration=duration,
-                voice_mode=True
-            )
 
-            if result.get("success"):
-                print(f"[PARALLEL VIDEO] ✓ Segment {index + 1} tamamlandı")
-            else:
-                print(f"[PARALLEL VIDEO] ✗ Segment {index + 1} başarısız: {result.get('error', 'Unknown')}")
+async def stream_videos_parallel(
+    prompts: List[str],
+    model: str = "kling-2.6-pro",
+    duration: int = 10,
+    style_prefix: str = "",
+    max_concurrent: int = 3,
+    max_retries: int = 3
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Segmentleri paralel üret, biten her segmenti tamamlanma sırasıyla yield et.
 
-            return (index, result)
+    Başarısız segment diğerlerini beklemeden hemen yeniden denenir; bu sırada
+    biten segmentler tüketiciye (normalizasyon, süre ölçümü vb.) akmaya devam
+    eder. Üretilen dosya probe edilir, okunamayan / video stream'i olmayan
+    dosya da başarısız sayılır. Başarılı sonuçlarda "duration" (saniye) vardır.
 
-    # İlk deneme - tüm segmentleri paralel başlat
-    tasks = [
-        generate_single_with_limit(i, prompt)
-        for i, prompt in enumerate(full_prompts)
-    ]
+    Yields:
+        (segment_index, result) - result generate_video_smart formatında;
+        tüm denemeleri tükenen segmentler success=False ile yield edilir
+    """
+    from app.media import probe_media
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    full_prompts = build_segment_prompts(prompts, style_prefix)
+    semaphore = asyncio.Semaphore(max_concurrent)
 
-    # Sonuçları işle
-    video_paths: List[Tuple[int, str]] = []
-    failed_indices: List[int] = []
+    async def generate_segment(index: int, prompt: str) -> Tuple[int, Dict[str, Any]]:
+        """Tek segment: semaphore ile sınırlı üretim + probe, başarısızsa yeniden dene"""
+        result: Dict[str, Any] = {"success": False, "error": "Denenmedi"}
+        for attempt in range(max_retries + 1):
+            if attempt:
+                print(f"[PARALLEL VIDEO] Segment {index + 1} retry {attempt}/{max_retries}")
+            try:
+                async with semaphore:
+                    print(f"[PARALLEL VIDEO] Segment {index + 1}/{len(prompts)} başlıyor...")
+                    result = await generate_video_smart(
+                        prompt=prompt,
+                        force_model=model,
+                        duration=duration,
+                        voice_mode=True
+                    )
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
 
-    for i, item in enumerate(results):
-        if isinstance(item, Exception):
-            # Task exception fırlattı - index'i koru
-            failed_indices.append(i)
-            print(f"[PARALLEL VIDEO] ✗ Segment {i + 1} exception: {item}")
-            continue
+            if result.get("success") and result.get("video_path"):
+                info = await probe_media(result["video_path"])
+                if info and info.has_video and info.duration:
+                    result["duration"] = info.duration
+                    result["attempts"] = attempt + 1
+                    print(f"[PARALLEL VIDEO] ✓ Segment {index + 1} tamamlandı ({info.duration:.1f}s)")
+                    return index, result
+                result = {"success": False, "error": f"Okunamayan video: {result['video_path']}"}
 
-        index, result = item
+            print(f"[PARALLEL VIDEO] ✗ Segment {index + 1} başarısız: {result.get('error', 'Unknown')}")
 
-        if result.get("success") and result.get("video_path"):
-            video_paths.append((index, result["video_path"]))
-        else:
-            failed_indices.append(index)
+        result["attempts"] = max_retries + 1
+        return index, result
 
-    # Başarısız segmentleri yeniden dene
-    for retry in range(max_retries):
-        if not failed_indices:
-            break
+    tasks = [asyncio.create_task(generate_segment(i, p)) for i, p in enumerate(full_prompts)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-        print(f"[PARALLEL VIDEO] Retry {retry + 1}/{max_retries} - {len(failed_indices)} segment")
 
-        retry_tasks = [
-            generate_single_with_limit(idx, full_prompts[idx])
-            for idx in failed_indices
-            if isinstance(idx, int)  # Exception olanları atla
-        ]
+async def generate_videos_parallel(
+    prompts: List[str],
+    model: str = "kling-2.6-pro",
+    duration: int = 10,
+    style_prefix: str = "",
+    max_concurrent: int = 3,
+    max_retries: int = 3
+) -> Dict[str, Any]:
+    """
+    Birden fazla videoyu paralel olarak üret.
 
-        retry_results = await asyncio.gather(*retry_tasks, return_exceptions=True)
+    Tüm segmentleri bekler; segmentleri geldikçe işlemek için
+    stream_videos_parallel kullanın.
 
-        new_failed = []
-        for item in retry_results:
-            if isinstance(item, Exception):
-                continue
+    Args:
+        prompts: Her segment için video promptları listesi
+        model: Kullanılacak video modeli
+        duration: Her segment'in süresi (saniye)
+        style_prefix: Tüm promptlara eklenecek stil prefix'i
+        max_concurrent: Aynı anda çalışacak maksimum API çağrısı
+        max_retries: Başarısız segment için yeniden deneme sayısı
 
-            index, result = item
+    Returns:
+        {
+            "success": bool,
+            "video_paths": [str],  # Sıralı video yolları
+            "segment_durations": [float],  # video_paths ile aynı sırada
+            "failed_indices": [int],  # Başarısız segment indeksleri
+            "model_used": str,
+            "total_duration": float
+        }
+    """
+    if not prompts:
+        return {"success": False, "error": "Prompt listesi boş"}
 
-            if result.get("success") and result.get("video_path"):
-                video_paths.append((index, result["video_path"]))
-                # Başarılı olanları failed listesinden çıkar
-                if index in failed_indices:
-                    failed_indices.remove(index)
-            else:
-                new_failed.append(index)
+    print(f"[PARALLEL VIDEO] {len(prompts)} segment üretiliyor...")
+    print(f"[PARALLEL VIDEO] Model: {model}, Segment süresi: {duration}s")
+    print(f"[PARALLEL VIDEO] Max concurrent: {max_concurrent}")
 
-        failed_indices = [idx for idx in failed_indices if idx in new_failed]
+    completed: Dict[int, Dict[str, Any]] = {}
+    failed_indices: List[int] = []
+    async for index, result in stream_videos_parallel(
+        prompts, model, duration, style_prefix, max_concurrent, max_retries
+    ):
+        if result.get("success"):
+            completed[index] = result
+        else:
+            failed_indices.append(index)
 
     # Sıraya göre düzenle
-    video_paths.sort(key=lambda x: x[0])
-    ordered_paths = [path for _, path in video_paths]
+    ordered = [completed[i] for i in sorted(completed)]
+    ordered_paths = [r["video_path"] for r in ordered]
 
     # Başarı durumu - en az 2 segment gerekli
     success = len(ordered_paths) >= 2
@@ -576,9 +484,10 @@ async def generate_videos_parallel(
     return {
         "success": success,
         "video_paths": ordered_paths,
-        "failed_indices": list(set([idx for idx in failed_indices if isinstance(idx, int)])),
+        "segment_durations": [r["duration"] for r in ordered],
+        "failed_indices": sorted(failed_indices),
         "model_used": model,
-        "total_duration": len(ordered_paths) * duration,
+        "total_duration": sum(r["duration"] for r in ordered),
         "segment_count": len(ordered_paths),
         "requested_count": len(prompts)
     }
@@ -102,11 +102,11 @@ async def _execute_story_boost(
     delay: int
 ):
     """Background task: Story boost execute"""
-    from app.database.crud import log_story_boost, update_story_boost
+    from app.database import async_crud
 
     try:
         # DB kayıt oluştur
-        boost_id = log_story_boost(
+        boost_id = await async_crud.log_story_boost(
             post_id=post_id,
             instagram_post_id=instagram_post_id,
             post_type=post_type,
@@ -127,7 +127,7 @@ async def _execute_story_boost(
         )
 
         if api_result.get("success"):
-            update_story_boost(
+            await async_crud.update_story_boost(
                 boost_id=boost_id,
                 status="published",
                 method="api",
@@ -147,14 +147,14 @@ async def _execute_story_boost(
                     caption_preview=caption_preview,
                     api_error=api_result.get("error", "Unknown error")
                 )
-                update_story_boost(
+                await async_crud.update_story_boost(
                     boost_id=boost_id,
                     status="manual_sent",
                     method="telegram",
                     error=api_result.get("error")
                 )
             else:
-                update_story_boost(
+                await async_crud.update_story_boost(
                     boost_id=boost_id,
                     status="failed",
                     error=api_result.get("error")
@@ -178,7 +178,8 @@ async def _try_instagram_story_api(
     NOT: Instagram Graph API Story desteği sınırlı.
     Çoğu Business hesapta çalışmayabilir.
     """
-    import aiohttp
+    import httpx
+    from app.net import get_http_client
 
     access_token = os.getenv("INSTAGRAM_ACCESS_TOKEN", "")
     user_id = os.getenv("INSTAGRAM_USER_ID", "")
@@ -203,22 +204,20 @@ async def _try_instagram_story_api(
         data["image_url"] = image_url
 
     try:
-        timeout = aiohttp.ClientTimeout(total=60)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(url, data=data) as resp:
-                result = await resp.json()
+        resp = await get_http_client("instagram").post(url, data=data, timeout=60)
+        result = resp.json()
 
-                if "error" in result:
-                    error = result["error"]
-                    error_msg = f"[{error.get('code', 'N/A')}] {error.get('message', 'Unknown')}"
-                    return {"success": False, "error": error_msg}
+        if "error" in result:
+            error = result["error"]
+            error_msg = f"[{error.get('code', 'N/A')}] {error.get('message', 'Unknown')}"
+            return {"success": False, "error": error_msg}
 
-                if result.get("id"):
-                    return {"success": True, "story_id": result["id"]}
+        if result.get("id"):
+            return {"success": True, "story_id": result["id"]}
 
-                return {"success": False, "error": "No story_id in response"}
+        return {"success": False, "error": "No story_id in response"}
 
-    except aiohttp.ClientError as e:
+    except httpx.HTTPError as e:
         return {"success": False, "error": f"HTTP error: {str(e)}"}
     except Exception as e:
         return {"success": False, "error": f"Exception: {str(e)}"}
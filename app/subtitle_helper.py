@@ -8,10 +8,21 @@ ASS subtitle files for Instagram/TikTok style subtitles.
 import os
 import asyncio
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import re
 
+from app.config import settings
+from app.media import probe_duration, run_media
+from app.transcription import (
+    ModelCache,
+    TranscriptionBackend,
+    WorkerError,
+    get_backend,
+    get_transcription_service,
+    transcribe_with_cache,
+)
+
 # Output directory
 SUBTITLE_OUTPUT_DIR = Path("/opt/olivenet-social-bot/outputs/subtitles")
 
@@ -33,13 +44,28 @@ DEFAULT_SUBTITLE_CONFIG = {
 }
 
 
+# Backend and models for in-process transcription (worker disabled, or whisper_inprocess_fallback)
+_local_backend: Optional[TranscriptionBackend] = None
+_local_models: Optional[ModelCache] = None
+
+
+def get_local_backend() -> Tuple[TranscriptionBackend, ModelCache]:
+    """Configured transcription backend (WHISPER_BACKEND) and its in-process model cache."""
+    global _local_backend, _local_models
+    if _local_backend is None:
+        _local_backend = get_backend(
+            settings.whisper_backend,
+            compute_type=settings.whisper_compute_type,
+            cpu_threads=settings.whisper_cpu_threads
+        )
+        _local_models = ModelCache(_local_backend.load, idle_timeout=settings.whisper_model_idle_timeout)
+    return _local_backend, _local_models
+
+
 def check_whisper_installed() -> bool:
-    """Check if openai-whisper is installed."""
-    try:
-        import whisper
-        return True
-    except ImportError:
-        return False
+    """Check if the configured transcription backend (openai-whisper / faster-whisper) is installed."""
+    backend, _ = get_local_backend()
+    return backend.is_available()
 
 
 async def extract_audio_from_video(video_path: str, output_path: Optional[str] = None) -> Dict[str, Any]:
@@ -64,24 +90,13 @@ async def extract_audio_from_video(video_path: str, output_path: Optional[str] =
             output_path
         ]
 
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await process.communicate()
+        result = await run_media(cmd, timeout=120)
 
-        if process.returncode != 0:
-            return {"success": False, "error": stderr.decode()}
+        if not result.success:
+            return {"success": False, "error": result.error}
 
         # Get duration
-        probe_cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-                     "-of", "default=noprint_wrappers=1:nokey=1", output_path]
-        probe_process = await asyncio.create_subprocess_exec(
-            *probe_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        probe_stdout, _ = await probe_process.communicate()
-        duration = float(probe_stdout.decode().strip()) if probe_stdout else 0.0
+        duration = await probe_duration(output_path) or 0.0
 
         return {"success": True, "audio_path": output_path, "duration": duration}
     except Exception as e:
@@ -114,6 +129,8 @@ def extract_word_timestamps_sync(
     """
     Extract word-level timestamps from audio using Whisper (synchronous).
 
+    Runs the configured backend (WHISPER_BACKEND) in this process.
+
     Args:
         audio_path: Path to audio file (MP3, WAV, etc.)
         model_size: Whisper model size (tiny, base, small, medium, large)
@@ -132,58 +149,20 @@ def extract_word_timestamps_sync(
     if not os.path.exists(audio_path):
         return {"success": False, "error": f"Audio file not found: {audio_path}"}
 
-    if not check_whisper_installed():
-        return {"success": False, "error": "openai-whisper not installed. Run: pip install openai-whisper"}
+    backend, models = get_local_backend()
+    if not backend.is_available():
+        return {"success": False, "error": f"{backend.name} not installed. Run: {backend.install_hint}"}
 
     print(f"[WHISPER] Extracting timestamps from: {audio_path}")
-    print(f"[WHISPER] Model: {model_size}, Language: {language}")
+    print(f"[WHISPER] Model: {model_size}, Language: {language}, Backend: {backend.name}")
 
     try:
-        import whisper
-
-        # Load model (cached after first load)
-        model = whisper.load_model(model_size)
-
-        # Transcribe with word-level timestamps
-        result = model.transcribe(
-            audio_path,
-            language=language,
-            word_timestamps=True,
-            verbose=False
-        )
-
-        # Extract words from all segments
-        words = []
-        for segment in result.get("segments", []):
-            for word_info in segment.get("words", []):
-                words.append({
-                    "word": word_info["word"].strip(),
-                    "start": word_info["start"],
-                    "end": word_info["end"]
-                })
-
-        # Get segments (sentence-level)
-        segments = [
-            {
-                "text": seg["text"].strip(),
-                "start": seg["start"],
-                "end": seg["end"]
-            }
-            for seg in result.get("segments", [])
-        ]
-
-        # Calculate duration
-        duration = segments[-1]["end"] if segments else 0.0
-
-        print(f"[WHISPER] Extracted {len(words)} words, {len(segments)} segments")
-
-        return {
-            "success": True,
-            "words": words,
-            "segments": segments,
-            "full_text": result.get("text", ""),
-            "duration": duration
-        }
+        # In-process fallback: models stay cached here too, idle ones are dropped lazily
+        models.evict_idle()
+        result = transcribe_with_cache(models, backend, audio_path, model_size, language)
+        print(f"[WHISPER] Extracted {len(result.get('words', []))} words, {len(result.get('segments', []))} segments "
+              f"(load {result.get('load_s', 0):.1f}s, inference {result.get('inference_s', 0):.1f}s)")
+        return result
 
     except Exception as e:
         print(f"[WHISPER] Error: {e}")
@@ -196,12 +175,33 @@ async def extract_word_timestamps(
     language: str = "tr"
 ) -> Dict[str, Any]:
     """
-    Extract word-level timestamps from audio using Whisper (async wrapper).
+    Extract word-level timestamps from audio using Whisper (async).
 
-    Runs the CPU-intensive Whisper transcription in a thread pool to avoid
-    blocking the async event loop.
+    Jobs go to the resident transcription worker (models stay loaded between
+    requests). If the worker is disabled, transcription runs in a thread pool
+    in this process. If the worker is enabled but cannot run, an error is
+    returned unless whisper_inprocess_fallback opts in to loading the model
+    here.
     """
-    loop = asyncio.get_event_loop()
+    service = get_transcription_service()
+    if service is not None:
+        if not os.path.exists(audio_path):
+            return {"success": False, "error": f"Audio file not found: {audio_path}"}
+        try:
+            result = await service.transcribe(audio_path, model_size=model_size, language=language)
+            if result.get("success"):
+                print(f"[WHISPER] Extracted {len(result['words'])} words, {len(result['segments'])} segments "
+                      f"(worker: load {result['load_s']:.1f}s, inference {result['inference_s']:.1f}s)")
+            return result
+        except asyncio.TimeoutError:
+            return {"success": False, "error": f"Whisper job timeout ({service.job_timeout:.0f}s)"}
+        except (WorkerError, OSError) as e:
+            if not settings.whisper_inprocess_fallback:
+                print(f"[WHISPER] Worker unavailable: {e}")
+                return {"success": False, "error": f"Transcription worker unavailable: {e}"}
+            print(f"[WHISPER] Worker unavailable ({e}), transcribing in-process")
+
+    loop = asyncio.get_running_loop()
     return await loop.run_in_executor(
         None,
         extract_word_timestamps_sync,
@@ -211,6 +211,237 @@ async def extract_word_timestamps(
     )
 
 
+# ============ FORCED ALIGNMENT (known script) ============
+
+# Below this share of script words matched in the ASR output, the script is
+# treated as not spoken verbatim (create_subtitle_file then uses ASR text)
+MIN_ALIGNMENT_MATCH_RATIO = 0.5
+
+_TURKISH_UPPER = str.maketrans({"I": "ı", "İ": "i"})
+
+
+def normalize_word(word: str) -> str:
+    """Lowercase (Turkish-aware) and strip punctuation for matching."""
+    return re.sub(r"[^\w]", "", word.translate(_TURKISH_UPPER).lower())
+
+
+def _spread_words(words: List[str], start: float, end: float) -> List[Dict[str, Any]]:
+    """Distribute words over [start, end] proportionally to their length."""
+    weights = [len(normalize_word(w)) + 1 for w in words]
+    total = sum(weights)
+    span = max(end - start, 0.0)
+    spread = []
+    t = start
+    for word, weight in zip(words, weights):
+        next_t = t + span * weight / total
+        spread.append({"word": word, "start": round(t, 3), "end": round(next_t, 3)})
+        t = next_t
+    return spread
+
+
+def align_script_to_words(
+    script_words: List[str],
+    asr_words: List[Dict[str, Any]],
+    duration: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Align known script words to ASR word timestamps.
+
+    Words are matched on normalized text (difflib opcodes), so a missing,
+    merged or misheard ASR word only affects its own neighbourhood instead
+    of shifting every following word. Matched words take ASR timing,
+    replaced runs share the ASR span they replace, and script words absent
+    from the ASR output are spread between the surrounding anchors.
+
+    Returns:
+        {"words": [{"word", "start", "end"}], "match_ratio": float}
+    """
+    from difflib import SequenceMatcher
+
+    if not script_words:
+        return {"words": [], "match_ratio": 0.0}
+
+    timed: List[Optional[Dict[str, Any]]] = [None] * len(script_words)
+    matched = 0
+    matcher = SequenceMatcher(
+        None,
+        [normalize_word(w) for w in script_words],
+        [normalize_word(w["word"]) for w in asr_words],
+        autojunk=False
+    )
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for k in range(i2 - i1):
+                asr = asr_words[j1 + k]
+                timed[i1 + k] = {"word": script_words[i1 + k], "start": asr["start"], "end": asr["end"]}
+            matched += i2 - i1
+        elif tag == "replace":
+            spread = _spread_words(script_words[i1:i2], asr_words[j1]["start"], asr_words[j2 - 1]["end"])
+            timed[i1:i2] = spread
+
+    # Fill script words the ASR missed entirely, between neighbouring anchors
+    end_bound = duration or (asr_words[-1]["end"] if asr_words else 0.0)
+    i = 0
+    while i < len(timed):
+        if timed[i] is not None:
+            i += 1
+            continue
+        j = i
+        while j < len(timed) and timed[j] is None:
+            j += 1
+        start = timed[i - 1]["end"] if i > 0 else (asr_words[0]["start"] if asr_words else 0.0)
+        end = timed[j]["start"] if j < len(timed) else max(end_bound, start + 0.3 * (j - i))
+        timed[i:j] = _spread_words(script_words[i:j], start, max(end, start))
+        i = j
+
+    return {"words": timed, "match_ratio": matched / len(script_words)}
+
+
+async def detect_speech_regions(
+    audio_path: str,
+    noise_db: float = -35.0,
+    min_silence: float = 0.2
+) -> List[Tuple[float, float]]:
+    """
+    Energy-based voice activity: speech regions between ffmpeg silencedetect silences.
+
+    Returns:
+        [(start, end), ...] in seconds (empty if the audio could not be read)
+    """
+    duration = await probe_duration(audio_path)
+    if not duration:
+        return []
+
+    result = await run_media([
+        "ffmpeg", "-hide_banner", "-i", audio_path,
+        "-af", f"silencedetect=noise={noise_db}dB:d={min_silence}",
+        "-f", "null", "-"
+    ], timeout=120)
+    if not result.success:
+        return []
+
+    regions = []
+    speech_start = 0.0
+    for match in re.finditer(r"silence_(start|end): (-?[\d.]+)", result.stderr):
+        kind, t = match.group(1), max(0.0, float(match.group(2)))
+        if kind == "start":
+            if t - speech_start > 0.05:
+                regions.append((speech_start, t))
+        else:
+            speech_start = t
+    if duration - speech_start > 0.05 and (not regions or regions[-1][1] < speech_start):
+        regions.append((speech_start, duration))
+    return regions
+
+
+def align_script_to_speech(
+    script_words: List[str],
+    regions: List[Tuple[float, float]]
+) -> List[Dict[str, Any]]:
+    """
+    Spread script words over detected speech regions (no ASR).
+
+    Each region gets a share of words proportional to its length, so pauses
+    between sentences fall on silence instead of inside a word.
+    """
+    if not script_words or not regions:
+        return []
+
+    weights = [len(normalize_word(w)) + 1 for w in script_words]
+    total_weight = sum(weights)
+    total_speech = sum(end - start for start, end in regions)
+
+    words = []
+    index = 0
+    consumed = 0.0
+    for r, (start, end) in enumerate(regions):
+        if r == len(regions) - 1:
+            count = len(script_words) - index
+        else:
+            target = (consumed + (end - start)) / total_speech * total_weight
+            count = 0
+            running = sum(weights[:index])
+            while index + count < len(script_words) and running + weights[index + count] / 2 <= target:
+                running += weights[index + count]
+                count += 1
+        consumed += end - start
+        if count:
+            words.extend(_spread_words(script_words[index:index + count], start, end))
+            index += count
+    return words
+
+
+async def align_script(
+    audio_path: str,
+    script: str,
+    model_size: str = "small",
+    language: str = "tr",
+    method: str = "auto"
+) -> Dict[str, Any]:
+    """
+    Word timestamps for a known script (TTS audio) in one pass.
+
+    The spoken text is already known, so no second (larger model)
+    transcription is needed to verify it: the script is aligned against
+    the small model's word timings, or against energy-based speech regions.
+
+    Args:
+        audio_path: TTS audio file
+        script: Exact text that was synthesized
+        model_size: Whisper model used for timing
+        method: "whisper" (ASR timing), "vad" (speech regions only),
+                "auto" (whisper, falling back to vad if transcription fails)
+
+    Returns:
+        {
+            "success": bool,
+            "words": [{"word": str, "start": float, "end": float}, ...],
+            "full_text": str,  # the script
+            "duration": float,
+            "method": "whisper" | "vad",
+            "match_ratio": float,  # share of script words found in the ASR output (whisper)
+            "asr_words": list, "asr_text": str  # raw ASR output (whisper)
+        }
+    """
+    script_words = tokenize_script(script)
+    if not script_words:
+        return {"success": False, "error": "Empty script"}
+
+    if method in ("auto", "whisper"):
+        asr = await extract_word_timestamps(audio_path=audio_path, model_size=model_size, language=language)
+        if asr.get("success") and asr.get("words"):
+            duration = await probe_duration(audio_path) or asr["duration"]
+            alignment = align_script_to_words(script_words, asr["words"], duration)
+            print(f"[ALIGN] Whisper alignment: {alignment['match_ratio']:.0%} of {len(script_words)} words matched")
+            return {
+                "success": True,
+                "words": alignment["words"],
+                "full_text": script,
+                "duration": duration,
+                "method": "whisper",
+                "match_ratio": alignment["match_ratio"],
+                "asr_words": asr["words"],
+                "asr_text": asr.get("full_text", ""),
+            }
+        if method == "whisper":
+            return {"success": False, "error": f"Whisper transcription failed: {asr.get('error', 'no words')}"}
+        print(f"[ALIGN] Whisper unavailable ({asr.get('error', 'no words')}), using speech regions")
+
+    regions = await detect_speech_regions(audio_path)
+    words = align_script_to_speech(script_words, regions)
+    if not words:
+        return {"success": False, "error": "No speech regions detected"}
+    print(f"[ALIGN] VAD alignment: {len(script_words)} words over {len(regions)} speech regions")
+    return {
+        "success": True,
+        "words": words,
+        "full_text": script,
+        "duration": await probe_duration(audio_path) or words[-1]["end"],
+        "method": "vad",
+        "match_ratio": 0.0,
+    }
+
+
 def group_words_into_sentences(
     words: List[Dict],
     max_chars: int = 35,
@@ -475,7 +706,8 @@ async def create_subtitle_file(
 
     This is the main entry point for subtitle generation. It:
     1. Runs Whisper transcription to get word-level timestamps
-    2. If original_script provided, aligns original words with Whisper timing (hybrid mode)
+    2. If original_script provided, aligns the script to the audio instead
+       (align_script: small-model timing, or speech regions if Whisper fails)
     3. Groups words into readable sentences
     4. Generates an ASS subtitle file
 
@@ -502,61 +734,48 @@ async def create_subtitle_file(
 
     print(f"[SUBTITLE] Starting subtitle generation for: {audio_path}")
 
-    # Step 1: Extract word timestamps using Whisper
-    whisper_result = await extract_word_timestamps(
-        audio_path=audio_path,
-        model_size=model_size,
-        language=language
-    )
-
-    if not whisper_result.get("success"):
-        return {
-            "success": False,
-            "error": f"Whisper transcription failed: {whisper_result.get('error')}"
-        }
+    if original_script and original_script.strip():
+        # Known script (TTS): align script words to audio in a single pass
+        alignment = await align_script(
+            audio_path=audio_path,
+            script=original_script,
+            model_size=model_size,
+            language=language
+        )
+        if not alignment.get("success"):
+            return {
+                "success": False,
+                "error": f"Script alignment failed: {alignment.get('error')}"
+            }
 
-    # Step 2: Hybrid alignment - use original script text with Whisper timing
-    whisper_words = whisper_result["words"]
-    final_text = whisper_result.get("full_text", "")
+        whisper_words = alignment["words"]
+        final_text = original_script
+        duration = alignment["duration"]
 
-    if original_script and original_script.strip():
-        original_words = tokenize_script(original_script)
-        print(f"[SUBTITLE] Hybrid mode: {len(original_words)} original words, {len(whisper_words)} Whisper words")
-
-        # Calculate word count mismatch ratio
-        max_words = max(len(original_words), len(whisper_words), 1)
-        word_diff_ratio = abs(len(original_words) - len(whisper_words)) / max_words
-
-        if word_diff_ratio > 0.3:
-            # Word count mismatch too large - use pure Whisper transcription
-            print(f"[SUBTITLE] Hybrid mode SKIPPED - word mismatch {word_diff_ratio:.0%} > 30%")
-            print(f"[SUBTITLE] Using Whisper transcription directly")
-            # whisper_words and final_text remain unchanged (from Whisper)
+        if alignment["method"] == "whisper" and alignment["match_ratio"] < MIN_ALIGNMENT_MATCH_RATIO:
+            # Script was not spoken as written - use Whisper transcription directly
+            print(f"[SUBTITLE] Script alignment SKIPPED - only {alignment['match_ratio']:.0%} of words matched")
+            whisper_words = alignment["asr_words"]
+            final_text = alignment["asr_text"]
         else:
-            # Word counts similar - align original text with Whisper timing
-            aligned_words = []
-            for i, orig_word in enumerate(original_words):
-                if i < len(whisper_words):
-                    # Use original text with Whisper timing
-                    aligned_words.append({
-                        "word": orig_word,
-                        "start": whisper_words[i]["start"],
-                        "end": whisper_words[i]["end"]
-                    })
-                else:
-                    # Extra original words - extend from last timing
-                    if aligned_words:
-                        last_end = aligned_words[-1]["end"]
-                        # Estimate ~0.3s per extra word
-                        aligned_words.append({
-                            "word": orig_word,
-                            "start": last_end,
-                            "end": last_end + 0.3
-                        })
+            print(f"[SUBTITLE] Using original script text with {alignment['method']} timing")
+    else:
+        # Step 1: Extract word timestamps using Whisper
+        whisper_result = await extract_word_timestamps(
+            audio_path=audio_path,
+            model_size=model_size,
+            language=language
+        )
+
+        if not whisper_result.get("success"):
+            return {
+                "success": False,
+                "error": f"Whisper transcription failed: {whisper_result.get('error')}"
+            }
 
-            whisper_words = aligned_words
-            final_text = original_script
-            print(f"[SUBTITLE] Using original script text for subtitles")
+        whisper_words = whisper_result["words"]
+        final_text = whisper_result.get("full_text", "")
+        duration = whisper_result["duration"]
 
     # Step 3: Group words into sentences
     subtitle_config = {**DEFAULT_SUBTITLE_CONFIG, **(config or {})}
@@ -587,13 +806,13 @@ async def create_subtitle_file(
 
     print(f"[SUBTITLE] Created ASS file: {output_path}")
     print(f"[SUBTITLE] Subtitle count: {len(subtitles)}")
-    print(f"[SUBTITLE] Duration: {whisper_result['duration']:.1f}s")
+    print(f"[SUBTITLE] Duration: {duration:.1f}s")
 
     return {
         "success": True,
         "ass_path": output_path,
         "subtitle_count": len(subtitles),
-        "duration": whisper_result["duration"],
+        "duration": duration,
         "full_text": final_text
     }
 
@@ -784,7 +1003,8 @@ def get_last_word_end_time(words: List[Dict]) -> float:
 async def verify_and_correct_subtitles(
     audio_path: str,
     initial_transcript: str,
-    model_size_verify: str = "medium"
+    model_size_verify: str = "medium",
+    script: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Verify and correct subtitles by comparing with a larger Whisper model.
@@ -792,10 +1012,16 @@ async def verify_and_correct_subtitles(
     Compares the initial transcript with a re-transcription using a larger model.
     If similarity is below threshold, returns the corrected version.
 
+    When the spoken text is known (TTS audio), pass it as `script`: the
+    transcript is compared against the script directly and no second
+    transcription runs. Regenerate subtitles with
+    create_subtitle_file(original_script=script) to align it.
+
     Args:
         audio_path: Path to the audio file
         initial_transcript: The initial Whisper transcript to verify
         model_size_verify: Whisper model for verification (default: medium)
+        script: Exact spoken text, if known (skips the verification transcription)
 
     Returns:
         {
@@ -807,14 +1033,18 @@ async def verify_and_correct_subtitles(
             "words": list  # Word timestamps (if corrected)
         }
     """
-    print(f"[SUBTITLE VERIFY] Verifying subtitles with {model_size_verify} model...")
+    if script and script.strip():
+        print(f"[SUBTITLE VERIFY] Verifying subtitles against known script...")
+        verify_result = {"success": True, "full_text": script}
+    else:
+        print(f"[SUBTITLE VERIFY] Verifying subtitles with {model_size_verify} model...")
 
-    # Re-transcribe with larger model
-    verify_result = await extract_word_timestamps(
-        audio_path=audio_path,
-        model_size=model_size_verify,
-        language="tr"
-    )
+        # Re-transcribe with larger model
+        verify_result = await extract_word_timestamps(
+            audio_path=audio_path,
+            model_size=model_size_verify,
+            language="tr"
+        )
 
     if not verify_result.get("success"):
         print(f"[SUBTITLE VERIFY] Verification failed, using original")
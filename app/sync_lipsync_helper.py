@@ -6,14 +6,15 @@ Uses active speaker detection for natural lip movements.
 """
 
 import os
-import asyncio
-import httpx
 import uuid
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 
 from app.config import settings
+from app.fal_helper import poll_fal_queue  # noqa: F401 - registers the "fal" poller
+from app.jobs import JobFailed, JobTimeout, Submission, run_remote_job
+from app.net import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -127,19 +128,20 @@ class SyncLipsyncHelper:
             "Content-Type": "application/json"
         }
 
-        async with httpx.AsyncClient(timeout=700.0) as client:
+        async def submit() -> Submission:
+            client = get_http_client("fal")
             # Submit request
             submit_url = f"{SyncLipsyncHelper.BASE_URL}/{endpoint}"
             logger.debug(f"[LIPSYNC] Submitting to: {submit_url}")
 
-            response = await client.post(submit_url, json=request_body, headers=headers)
+            response = await client.post(submit_url, json=request_body, headers=headers, timeout=700.0)
             response.raise_for_status()
 
             result = response.json()
 
             # If result is ready immediately (sync response)
             if "video" in result or "video_url" in result:
-                return result
+                return Submission(result=result)
 
             # Queue response - need to poll for result
             request_id = result.get("request_id")
@@ -159,33 +161,24 @@ class SyncLipsyncHelper:
 
             logger.debug(f"[LIPSYNC] Status URL: {status_url}")
             logger.debug(f"[LIPSYNC] Result URL: {result_url}")
+            return Submission(
+                remote_id=request_id,
+                poll_data={"status_url": status_url, "result_url": result_url}
+            )
 
-            # Poll for result (10 minutes max, 5 second intervals)
-            max_attempts = 120  # 10 minutes with 5 second intervals
-            for attempt in range(max_attempts):
-                await asyncio.sleep(5)
-
-                # Check status
-                status_response = await client.get(status_url, headers=headers)
-                status_response.raise_for_status()
-                status = status_response.json()
-
-                current_status = status.get("status", "unknown")
-                logger.debug(f"[LIPSYNC] Status [{attempt + 1}/{max_attempts}]: {current_status}")
-
-                if current_status == "COMPLETED":
-                    # Get result
-                    result_response = await client.get(result_url, headers=headers)
-                    result_response.raise_for_status()
-                    return result_response.json()
-
-                elif current_status in ["FAILED", "CANCELLED"]:
-                    error_msg = status.get("error", "Unknown error")
-                    raise Exception(f"Lip-sync failed: {error_msg}")
-
-                # IN_QUEUE or IN_PROGRESS - continue polling
-
+        # Polled by the shared job tracker (fal.ai queue poller)
+        try:
+            return await run_remote_job(
+                provider="fal",
+                label=endpoint,
+                submit=submit,
+                key_data=request_body,
+                timeout=600  # 10 minutes
+            )
+        except JobTimeout:
             raise Exception("Lip-sync generation timed out (10 minutes)")
+        except JobFailed as e:
+            raise Exception(f"Lip-sync failed: {e}")
 
     @staticmethod
     async def _download_video(video_url: str) -> str:
@@ -196,12 +189,12 @@ class SyncLipsyncHelper:
         unique_suffix = uuid.uuid4().hex[:6]
         output_path = settings.outputs_dir / f"lipsync_{timestamp}_{unique_suffix}.mp4"
 
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.get(video_url)
-            response.raise_for_status()
+        client = get_http_client("fal")
+        response = await client.get(video_url, timeout=120.0, follow_redirects=True)
+        response.raise_for_status()
 
-            with open(output_path, "wb") as f:
-                f.write(response.content)
+        with open(output_path, "wb") as f:
+            f.write(response.content)
 
         file_size_mb = output_path.stat().st_size / (1024 * 1024)
         logger.info(f"[LIPSYNC] Video downloaded: {output_path} ({file_size_mb:.2f} MB)")
@@ -11,19 +11,17 @@ from datetime import datetime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application, CommandHandler, CallbackQueryHandler,
-    MessageHandler, filters, ContextTypes
+    MessageHandler, TypeHandler, filters, ContextTypes
 )
 from telegram.request import HTTPXRequest
 from telegram.error import NetworkError, TimedOut, RetryAfter
 from telegram.helpers import escape_markdown
 from app.scheduler import ContentPipeline, ContentScheduler, create_default_scheduler
-from app.database import (
-    get_current_strategy, get_analytics_summary, log_approval_decision,
-    get_week_calendar, get_published_posts,
-    get_todays_summary, get_weekly_progress, get_next_scheduled,
-    get_best_performing_content, get_next_schedule_slot,
-    get_recent_prompts, get_top_performing_prompts, get_prompt_style_stats
-)
+from app.scheduler.run_registry import split_callback, tag_callback
+from app.database import async_crud
+from app.llm import get_llm_cache, get_worker_pool, get_dispatcher, Priority, set_llm_priority
+from app.jobs import shutdown_job_tracker
+from app.net import close_http_clients, get_http_stats
 from app.config import settings
 from app.video_models import VIDEO_MODELS, get_model_config, get_model_durations, get_max_duration
 from app.video_styles import VIDEO_STYLES, STYLE_CATEGORIES, get_style_config, get_styles_by_category
@@ -33,6 +31,14 @@ pipeline: ContentPipeline = None
 scheduler: ContentScheduler = None
 admin_chat_id: int = None
 pending_input: dict = {}  # Kullanıcıdan beklenen input
+notify_bot = None  # telegram_notify'ın paylaşılan Bot'u (get_notify_bot)
+
+# Checkpoint'li pipeline'ların görünen adları (/resume)
+PIPELINE_LABELS = {
+    "voice_reels": "🎙️ Sesli Reels",
+    "long_video": "🎥 Uzun Video",
+    "conversational_reels": "🎭 Conversational",
+}
 
 
 # ============ AUTHORIZATION ============
@@ -56,6 +62,28 @@ async def send_unauthorized_message(query):
         parse_mode="Markdown"
     )
 
+def get_notify_bot():
+    """
+    Bildirimler için paylaşılan Bot (her bildirimde yeni HTTP bağlantı havuzu açılmaz).
+
+    Bot çalışırken main() Application'ın bot'unu atar; pipeline bot dışında
+    çalışıyorsa ilk bildirimde ayrı bir Bot oluşturulur.
+    """
+    global notify_bot
+    if notify_bot is None:
+        from telegram import Bot
+        import os
+
+        request = HTTPXRequest(
+            connection_pool_size=4,
+            read_timeout=30.0,
+            write_timeout=30.0,
+            connect_timeout=30.0,
+        )
+        notify_bot = Bot(token=os.getenv("TELEGRAM_BOT_TOKEN"), request=request)
+    return notify_bot
+
+
 async def telegram_notify(message: str, data: dict = None, buttons: list = None):
     """Pipeline'dan Telegram'a bildirim - retry mekanizması ile"""
     global admin_chat_id
@@ -64,20 +92,11 @@ async def telegram_notify(message: str, data: dict = None, buttons: list = None)
         print("[TELEGRAM] Admin chat ID not set!")
         return
 
-    from telegram import Bot
-    import os
-
     # Retry ayarları
     max_retries = 3
     retry_delay = 5  # saniye
 
-    request = HTTPXRequest(
-        connection_pool_size=4,
-        read_timeout=30.0,
-        write_timeout=30.0,
-        connect_timeout=30.0,
-    )
-    bot = Bot(token=os.getenv("TELEGRAM_BOT_TOKEN"), request=request)
+    bot = get_notify_bot()
 
     # Keyboard oluştur
     keyboard = []
@@ -230,14 +249,58 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Sistem durumu"""
     global pipeline, scheduler
 
-    pipeline_state = pipeline.state.value if pipeline else "not_initialized"
+    if pipeline:
+        run_status = pipeline.runs.get_status()
+        pipeline_state = (
+            f"{run_status['running']}/{run_status['max_concurrent']} run çalışıyor, "
+            f"{run_status['queued']} sırada"
+        )
+        for run in run_status["runs"]:
+            waiting = " ⏸️ onay bekliyor" if run["awaiting_approval"] else ""
+            pipeline_state += f"\n  • `{run['kind']}#{run['run_id']}` `{run['state']}` ({run['elapsed_s']:.0f}s){waiting}"
+    else:
+        pipeline_state = "not_initialized"
     scheduler_status = scheduler.get_status() if scheduler else {"running": False}
 
+    llm_cache = get_llm_cache()
+    if llm_cache:
+        cache_stats = await asyncio.to_thread(llm_cache.get_stats)
+        cache_line = (
+            f"*LLM Cache:* {cache_stats['hits']} hit / {cache_stats['misses']} miss "
+            f"(%{cache_stats['hit_rate'] * 100:.0f}), {cache_stats['entries']} kayıt\n"
+        )
+    else:
+        cache_line = "*LLM Cache:* Kapalı\n"
+
+    dispatch = get_dispatcher().get_stats()
+    cache_line += (
+        f"*LLM Kuyruğu:* {dispatch['active']}/{dispatch['max_concurrency']} aktif, "
+        f"{dispatch['queued']} bekleyen\n"
+    )
+
+    worker_pool = get_worker_pool()
+    if worker_pool:
+        pool_status = worker_pool.get_status()
+        cache_line += (
+            f"*Claude Workers:* {pool_status['alive']}/{pool_status['size']} canlı, "
+            f"{pool_status['idle']} boşta, {pool_status['waiting']} bekleyen\n"
+        )
+
+    http_stats = get_http_stats()
+    if http_stats:
+        requests = sum(stats.get("requests", 0) for stats in http_stats.values())
+        reused = sum(stats["reused"] for stats in http_stats.values())
+        cache_line += (
+            f"*HTTP:* {requests} istek, %{reused / requests * 100 if requests else 0:.0f} "
+            f"bağlantı yeniden kullanıldı ({len(http_stats)} servis)\n"
+        )
+
     await update.message.reply_text(
         f"📊 *Sistem Durumu*\n\n"
         f"*Pipeline:* {pipeline_state}\n"
         f"*Scheduler:* {'Çalışıyor' if scheduler_status.get('running') else 'Durdu'}\n"
-        f"*Aktif Görevler:* {len(scheduler_status.get('tasks', []))}\n",
+        f"*Aktif Görevler:* {len(scheduler_status.get('tasks', []))}\n"
+        f"{cache_line}",
         parse_mode="Markdown"
     )
 
@@ -264,8 +327,8 @@ async def cmd_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
     global admin_chat_id
     admin_chat_id = update.effective_chat.id
 
-    summary = get_todays_summary()
-    weekly = get_weekly_progress()
+    summary = await async_crud.get_todays_summary()
+    weekly = await async_crud.get_weekly_progress()
 
     text = "📊 *BUGÜNÜN DURUMU*\n━━━━━━━━━━━━━━━━━━━\n\n"
     text += f"✅ Yayınlanan: {summary.get('published', 0)}\n"
@@ -288,7 +351,7 @@ async def cmd_next(update: Update, context: ContextTypes.DEFAULT_TYPE):
     admin_chat_id = update.effective_chat.id
 
     from datetime import datetime
-    next_post = get_next_scheduled()
+    next_post = await async_crud.get_next_scheduled()
 
     type_icons = {"reels": "🎬", "carousel": "🎠", "post": "📝", "flux": "📝"}
 
@@ -322,7 +385,7 @@ async def cmd_next(update: Update, context: ContextTypes.DEFAULT_TYPE):
             text += f"📋 {next_post['topic'][:40]}..."
     else:
         # Slot bilgisini göster
-        next_slot = get_next_schedule_slot()
+        next_slot = await async_crud.get_next_schedule_slot()
         if next_slot:
             icon = type_icons.get(next_slot['type'], '📌')
             mins = next_slot['minutes_until']
@@ -407,13 +470,13 @@ async def cmd_prompts(update: Update, context: ContextTypes.DEFAULT_TYPE):
     admin_chat_id = update.effective_chat.id
 
     # Son 7 günün prompt'ları
-    recent = get_recent_prompts(days=7)
+    recent = await async_crud.get_recent_prompts(days=7)
 
     # Top performers
-    top = get_top_performing_prompts(limit=3)
+    top = await async_crud.get_top_performing_prompts(limit=3)
 
     # Stil istatistikleri
-    stats = get_prompt_style_stats(days=30)
+    stats = await async_crud.get_prompt_style_stats(days=30)
 
     message = "📝 *PROMPT İSTATİSTİKLERİ*\n"
     message += "━━━━━━━━━━━━━━━━━━━\n\n"
@@ -462,8 +525,71 @@ async def cmd_prompts(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(message, parse_mode="Markdown")
 
 
+def format_interrupted_runs(runs: list) -> tuple:
+    """Yarıda kalan run listesi için mesaj metni ve devam butonları"""
+    lines = []
+    keyboard = []
+    for run in runs:
+        label = PIPELINE_LABELS.get(run["pipeline"], run["pipeline"])
+        status = "kesildi" if run["status"] == "running" else "hata"
+        lines.append(f"• #{run['post_id']} {label} - {run['stage_count']} aşama tamam ({status})")
+        keyboard.append([InlineKeyboardButton(
+            f"▶️ #{run['post_id']} devam et", callback_data=f"resume_run:{run['post_id']}"
+        )])
+    return "\n".join(lines), keyboard
+
+
+async def cmd_resume(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Yarıda kalan pipeline run'ları - /resume"""
+    global admin_chat_id
+    admin_chat_id = update.effective_chat.id
+
+    runs = await async_crud.get_interrupted_runs()
+    if not runs:
+        await update.message.reply_text("✅ Yarıda kalan pipeline yok.")
+        return
+
+    text, keyboard = format_interrupted_runs(runs)
+    await update.message.reply_text(
+        f"⏸️ *Yarıda Kalan Pipeline'lar*\n\n{text}",
+        parse_mode="Markdown",
+        reply_markup=InlineKeyboardMarkup(keyboard)
+    )
+
+
+async def notify_interrupted_runs():
+    """Başlangıçta restart ile kesilmiş run'ları bildir"""
+    try:
+        runs = [r for r in await async_crud.get_interrupted_runs() if r["status"] == "running"]
+    except Exception as e:
+        print(f"[RESUME] Interrupted run sorgusu başarısız: {e}")
+        return
+    if not runs:
+        return
+
+    text, _ = format_interrupted_runs(runs)
+    await telegram_notify(
+        message=f"⏸️ *Restart ile kesilen pipeline'lar*\n\n{text}",
+        buttons=[
+            {"text": f"▶️ #{r['post_id']} devam et", "callback": f"resume_run:{r['post_id']}"}
+            for r in runs
+        ]
+    )
+
+
 # ============ CALLBACK HANDLER'LAR ============
 
+async def route_approval(message, response: dict, run_id: str = None) -> bool:
+    """Onay yanıtını ilgili pipeline run'ına ilet; bekleyen run yoksa kullanıcıyı uyar"""
+    if pipeline.set_approval(response, run_id):
+        return True
+    await message.reply_text(
+        f"⚠️ Run `{run_id or '-'}` onay beklemiyor (tamamlandı veya zaman aşımı).",
+        parse_mode="Markdown"
+    )
+    return False
+
+
 async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Tüm callback'leri yönet - Authorization kontrolü ile"""
     global pipeline, scheduler, pending_input
@@ -477,7 +603,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     await query.answer()
-    action = query.data
+    # Pipeline butonları "<action>@<run_id>" formatında run ID'si taşır
+    action, run_id = split_callback(query.data)
 
     # ===== ANA MENÜ =====
     if action == "main_menu":
@@ -1482,7 +1609,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         today = datetime.now()
         week_start = today - timedelta(days=today.weekday())
 
-        existing_calendar = get_week_calendar(week_start.date())
+        existing_calendar = await async_crud.get_week_calendar(week_start.date())
 
         if existing_calendar:
             # Mevcut planı göster
@@ -1589,7 +1716,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         text += f"  • Revizyon: {settings.min_review_score_revise}/10\n\n"
 
         # Analytics'ten öğrenilen veriler
-        strategy = get_current_strategy() or {}
+        strategy = await async_crud.get_current_strategy() or {}
         if strategy.get('avg_engagement_rate') or strategy.get('avg_reach'):
             text += "━━━━━━━━━━━━━━━━━━━\n"
             text += "📈 *Öğrenilen (30 gün):*\n"
@@ -1611,8 +1738,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # ===== ANALYTICS RAPORU =====
     elif action == "analytics_report":
-        summary = get_analytics_summary(days=7) or {}
-        published = get_published_posts(days=7) or []
+        summary = await async_crud.get_analytics_summary(days=7) or {}
+        published = await async_crud.get_published_posts(days=7) or []
 
         text = "📈 *SON 7 GÜN PERFORMANSI*\n━━━━━━━━━━━━━━━━━━━\n\n"
 
@@ -1634,7 +1761,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 text += "Insights'ları güncellemek için 🔄 butonuna basın.\n"
 
             # En iyi performans
-            best = get_best_performing_content(days=7)
+            best = await async_crud.get_best_performing_content(days=7)
             if best:
                 text += "\n━━━━━━━━━━━━━━━━━━━\n"
                 text += "🔥 *En İyi Performans:*\n"
@@ -1713,7 +1840,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # ===== SIRADAKİ İÇERİK =====
     elif action == "next_content":
         from datetime import datetime
-        next_post = get_next_scheduled()
+        next_post = await async_crud.get_next_scheduled()
 
         type_icons = {"reels": "🎬", "carousel": "🎠", "post": "📝", "flux": "📝"}
 
@@ -1759,7 +1886,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             ]
         else:
             # Scheduled post yok, slot bilgisini göster
-            next_slot = get_next_schedule_slot()
+            next_slot = await async_crud.get_next_schedule_slot()
 
             if next_slot:
                 icon = type_icons.get(next_slot['type'], '📌')
@@ -1808,8 +1935,8 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # ===== HIZLI DURUM =====
     elif action == "quick_status":
-        summary = get_todays_summary()
-        weekly = get_weekly_progress()
+        summary = await async_crud.get_todays_summary()
+        weekly = await async_crud.get_weekly_progress()
 
         text = "📊 *BUGÜNÜN DURUMU*\n━━━━━━━━━━━━━━━━━━━\n\n"
         text += f"✅ Yayınlanan: {summary.get('published', 0)}\n"
@@ -1825,7 +1952,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         text += f"📝 Post: {weekly.get('post', 0)}/{weekly.get('post_target', 3)}\n"
 
         # En iyi performans
-        best = get_best_performing_content(days=7)
+        best = await async_crud.get_best_performing_content(days=7)
         if best:
             text += "\n━━━━━━━━━━━━━━━━━━━\n"
             text += "🔥 *En iyi performans:*\n"
@@ -1897,6 +2024,7 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
         text += "/next - Sıradaki içerik\n"
         text += "/schedule - Haftalık program\n"
         text += "/sync - Metrics sync\n"
+        text += "/resume - Yarıda kalan pipeline'lar\n"
 
         keyboard = [[InlineKeyboardButton("🏠 Ana Menü", callback_data="main_menu")]]
         await query.edit_message_text(text, parse_mode="Markdown", reply_markup=InlineKeyboardMarkup(keyboard))
@@ -1978,37 +2106,41 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     # ===== PIPELINE ONAYLARI =====
     elif action == "approve_topic":
-        pipeline.set_approval({"action": "approve"})
+        await route_approval(query.message, {"action": "approve"}, run_id)
 
     elif action == "new_topic":
-        pipeline.set_approval({"action": "new_topic"})
+        await route_approval(query.message, {"action": "new_topic"}, run_id)
 
     elif action == "approve_content":
-        pipeline.set_approval({"action": "approve"})
+        await route_approval(query.message, {"action": "approve"}, run_id)
 
     elif action == "regenerate_content":
         await query.edit_message_text("✏️ *Geri bildiriminizi yazın:*", parse_mode="Markdown")
         pending_input["type"] = "content_feedback"
+        pending_input["run_id"] = run_id
 
     elif action == "approve_visual":
-        pipeline.set_approval({"action": "approve"})
+        await route_approval(query.message, {"action": "approve"}, run_id)
 
     elif action == "regenerate_visual":
-        pipeline.set_approval({"action": "regenerate"})
+        await route_approval(query.message, {"action": "regenerate"}, run_id)
 
     elif action == "retry_visual":
         # Hata sonrası tekrar deneme - aynı regenerate mantığı
-        pipeline.set_approval({"action": "regenerate"})
+        await route_approval(query.message, {"action": "regenerate"}, run_id)
 
     elif action == "change_visual_type":
-        # Görsel tipi seçim menüsü göster
+        # Görsel tipi seçim menüsü göster (seçim aynı run'a gider)
+        def for_run(callback: str) -> str:
+            return tag_callback(callback, run_id) if run_id else callback
+
         keyboard = [
-            [InlineKeyboardButton("📊 İnfografik", callback_data="set_type_infographic")],
-            [InlineKeyboardButton("🧠 AI Infographic", callback_data="set_type_nano_banana")],
-            [InlineKeyboardButton("🖼️ FLUX Görsel", callback_data="set_type_flux")],
-            [InlineKeyboardButton("🎬 Video (Veo)", callback_data="set_type_video")],
-            [InlineKeyboardButton("📱 Carousel", callback_data="set_type_carousel")],
-            [InlineKeyboardButton("❌ İptal", callback_data="cancel")]
+            [InlineKeyboardButton("📊 İnfografik", callback_data=for_run("set_type_infographic"))],
+            [InlineKeyboardButton("🧠 AI Infographic", callback_data=for_run("set_type_nano_banana"))],
+            [InlineKeyboardButton("🖼️ FLUX Görsel", callback_data=for_run("set_type_flux"))],
+            [InlineKeyboardButton("🎬 Video (Veo)", callback_data=for_run("set_type_video"))],
+            [InlineKeyboardButton("📱 Carousel", callback_data=for_run("set_type_carousel"))],
+            [InlineKeyboardButton("❌ İptal", callback_data=for_run("cancel"))]
         ]
         menu_text = (
             "🎨 *Görsel Tipi Seçin:*\n\n"
@@ -2057,25 +2189,25 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 status_text,
                 parse_mode="Markdown"
             )
-        pipeline.set_approval({"action": "change_type", "new_type": new_type})
+        await route_approval(query.message, {"action": "change_type", "new_type": new_type}, run_id)
 
     elif action == "publish_now":
-        pipeline.set_approval({"action": "publish_now"})
-        # Audit log
-        try:
-            current_state = pipeline.current_state or {}
-            log_approval_decision(
-                post_id=current_state.get("post_id"),
-                decision="approved",
-                user_id=query.from_user.id,
-                username=query.from_user.username or query.from_user.first_name,
-                topic=current_state.get("topic"),
-                content_type=current_state.get("visual_type", "post"),
-                scheduler_mode="manual",
-                new_status="publishing"
-            )
-        except Exception as e:
-            print(f"Audit log hatası: {e}")
+        current_state = pipeline.get_current_state(run_id)
+        if await route_approval(query.message, {"action": "publish_now"}, run_id):
+            # Audit log
+            try:
+                await async_crud.log_approval_decision(
+                    post_id=current_state.get("post_id"),
+                    decision="approved",
+                    user_id=query.from_user.id,
+                    username=query.from_user.username or query.from_user.first_name,
+                    topic=current_state.get("topic"),
+                    content_type=current_state.get("visual_type", "post"),
+                    scheduler_mode="manual",
+                    new_status="publishing"
+                )
+            except Exception as e:
+                print(f"Audit log hatası: {e}")
 
     elif action == "revise":
         await query.edit_message_text(
@@ -2084,40 +2216,45 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
             parse_mode="Markdown"
         )
         pending_input["type"] = "revise_feedback"
+        pending_input["run_id"] = run_id
         pending_input["user_id"] = query.from_user.id
         pending_input["username"] = query.from_user.username or query.from_user.first_name
 
     elif action == "schedule":
         await query.edit_message_text("⏰ *Saat girin (HH:MM):*", parse_mode="Markdown")
         pending_input["type"] = "schedule_time"
+        pending_input["run_id"] = run_id
         pending_input["user_id"] = query.from_user.id
         pending_input["username"] = query.from_user.username or query.from_user.first_name
 
+    elif action == "cancel" and run_id:
+        # Pipeline run'ının iptal butonu (menü iptalleri run ID taşımaz)
+        current_state = pipeline.get_current_state(run_id)
+        if await route_approval(query.message, {"action": "cancel"}, run_id):
+            # Audit log
+            try:
+                await async_crud.log_approval_decision(
+                    post_id=current_state.get("post_id"),
+                    decision="rejected",
+                    user_id=query.from_user.id,
+                    username=query.from_user.username or query.from_user.first_name,
+                    topic=current_state.get("topic"),
+                    content_type=current_state.get("visual_type", "post"),
+                    reason="User cancelled",
+                    scheduler_mode="manual",
+                    new_status="rejected"
+                )
+            except Exception as e:
+                print(f"Audit log hatası: {e}")
+            await query.edit_message_text("❌ İptal edildi.")
+
     elif action == "cancel":
-        pipeline.set_approval({"action": "cancel"})
-        # Audit log
-        try:
-            current_state = pipeline.current_state or {}
-            log_approval_decision(
-                post_id=current_state.get("post_id"),
-                decision="rejected",
-                user_id=query.from_user.id,
-                username=query.from_user.username or query.from_user.first_name,
-                topic=current_state.get("topic"),
-                content_type=current_state.get("visual_type", "post"),
-                reason="User cancelled",
-                scheduler_mode="manual",
-                new_status="rejected"
-            )
-        except Exception as e:
-            print(f"Audit log hatası: {e}")
         await query.edit_message_text("❌ İptal edildi.")
 
     # ===== STORY BOOST CALLBACKS =====
     elif action.startswith("story_done:"):
         boost_id = int(action.split(":")[1])
-        from app.database.crud import update_story_boost
-        update_story_boost(boost_id, "published", "manual")
+        await async_crud.update_story_boost(boost_id, "published", "manual")
         await query.edit_message_text(
             f"✅ Story boost #{boost_id} tamamlandı.",
             parse_mode="Markdown"
@@ -2125,13 +2262,22 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     elif action.startswith("story_skip:"):
         boost_id = int(action.split(":")[1])
-        from app.database.crud import update_story_boost
-        update_story_boost(boost_id, "skipped")
+        await async_crud.update_story_boost(boost_id, "skipped")
         await query.edit_message_text(
             f"⏭️ Story boost #{boost_id} atlandı.",
             parse_mode="Markdown"
         )
 
+    # ===== CHECKPOINT'TEN DEVAM =====
+    elif action.startswith("resume_run:"):
+        post_id = int(action.split(":")[1])
+        await query.edit_message_reply_markup(reply_markup=None)
+        await query.message.reply_text(
+            f"▶️ Post #{post_id} son tamamlanan aşamadan devam ediyor...",
+            parse_mode="Markdown"
+        )
+        asyncio.create_task(pipeline.resume_pipeline(post_id))
+
 
 async def handle_text_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Metin inputlarını işle - Authorization kontrolü ile"""
@@ -2148,38 +2294,42 @@ async def handle_text_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
 
     text = update.message.text
+    run_id = pending_input.get("run_id")
 
     if pending_input.get("type") == "content_feedback":
-        pipeline.set_approval({"action": "regenerate_content", "feedback": text})
+        routed = await route_approval(update.message, {"action": "regenerate_content", "feedback": text}, run_id)
         pending_input = {}
-        await update.message.reply_text("✅ Geri bildirim alındı, içerik revize ediliyor...")
+        if routed:
+            await update.message.reply_text("✅ Geri bildirim alındı, içerik revize ediliyor...")
 
     elif pending_input.get("type") == "schedule_time":
-        pipeline.set_approval({"action": "schedule", "time": text})
-        # Audit log for scheduling
-        try:
-            current_state = pipeline.current_state or {}
-            log_approval_decision(
-                post_id=current_state.get("post_id"),
-                decision="scheduled",
-                user_id=pending_input.get("user_id"),
-                username=pending_input.get("username"),
-                topic=current_state.get("topic"),
-                content_type=current_state.get("visual_type", "post"),
-                reason=f"Scheduled for {text}",
-                scheduler_mode="manual",
-                new_status="scheduled"
-            )
-        except Exception as e:
-            print(f"Audit log hatası: {e}")
+        current_state = pipeline.get_current_state(run_id)
+        routed = await route_approval(update.message, {"action": "schedule", "time": text}, run_id)
+        if routed:
+            # Audit log for scheduling
+            try:
+                await async_crud.log_approval_decision(
+                    post_id=current_state.get("post_id"),
+                    decision="scheduled",
+                    user_id=pending_input.get("user_id"),
+                    username=pending_input.get("username"),
+                    topic=current_state.get("topic"),
+                    content_type=current_state.get("visual_type", "post"),
+                    reason=f"Scheduled for {text}",
+                    scheduler_mode="manual",
+                    new_status="scheduled"
+                )
+            except Exception as e:
+                print(f"Audit log hatası: {e}")
+            await update.message.reply_text(f"✅ {text} için zamanlandı.")
         pending_input = {}
-        await update.message.reply_text(f"✅ {text} için zamanlandı.")
 
     elif pending_input.get("type") == "revise_feedback":
         # Direkt metin revizesi yap - görsel değiştirmek için ayrı buton var
-        pipeline.set_approval({"action": "revise_content", "feedback": text})
+        routed = await route_approval(update.message, {"action": "revise_content", "feedback": text}, run_id)
         pending_input = {}
-        await update.message.reply_text("✏️ İçerik revize ediliyor...")
+        if routed:
+            await update.message.reply_text("✏️ İçerik revize ediliyor...")
 
     elif pending_input.get("type") == "daily_manual_topic":
         # ATOMIC: Race condition önlemek için hemen pop et
@@ -2484,6 +2634,11 @@ async def handle_text_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
         ))
 
 
+async def mark_interactive(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Update işlenirken (ve başlattığı task'larda) LLM önceliğini INTERACTIVE yap"""
+    set_llm_priority(Priority.INTERACTIVE)
+
+
 async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Network hatalarını gracefully handle et"""
     error = context.error
@@ -2501,7 +2656,7 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
 
 async def main():
     """Ana fonksiyon"""
-    global pipeline, scheduler, admin_chat_id
+    global pipeline, scheduler, admin_chat_id, notify_bot
 
     import os
     from dotenv import load_dotenv
@@ -2534,6 +2689,12 @@ async def main():
         .build()
     )
 
+    # Pipeline bildirimleri bot'un bağlantı havuzunu kullanır
+    notify_bot = app.bot
+
+    # Telegram'dan tetiklenen tüm LLM çağrıları en yüksek öncelikle kuyruğa girer
+    app.add_handler(TypeHandler(Update, mark_interactive), group=-1)
+
     # Handler'lar - Komutlar
     app.add_handler(CommandHandler("start", cmd_start))
     app.add_handler(CommandHandler("status", cmd_status))
@@ -2543,6 +2704,7 @@ async def main():
     app.add_handler(CommandHandler("schedule", cmd_schedule))
     app.add_handler(CommandHandler("sync", cmd_sync))
     app.add_handler(CommandHandler("prompts", cmd_prompts))
+    app.add_handler(CommandHandler("resume", cmd_resume))
 
     # Handler'lar - Callback ve Mesaj
     app.add_handler(CallbackQueryHandler(handle_callback))
@@ -2567,9 +2729,19 @@ async def main():
 
     print("✅ Bot çalışıyor! (Retry mekanizması aktif)")
 
+    # Restart ile kesilen pipeline run'larını bildir
+    await notify_interrupted_runs()
+
     # Sonsuza kadar çalış
-    while True:
-        await asyncio.sleep(3600)
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        # Paylaşılan HTTP client'larını, uzak iş polling'ini ve render havuzunu kapat
+        await shutdown_job_tracker()
+        await close_http_clients()
+        from app.renderer import cleanup as close_renderer
+        await close_renderer()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,19 @@
+"""
+Olivenet Social Bot - Transcription altyapısı (resident Whisper worker)
+"""
+
+from .service import TranscriptionService, WorkerError, get_transcription_service, shutdown_transcription_service
+from .backends import BACKENDS, TranscriptionBackend, get_backend
+from .worker import ModelCache, transcribe_with_cache
+
+__all__ = [
+    "TranscriptionService",
+    "WorkerError",
+    "get_transcription_service",
+    "shutdown_transcription_service",
+    "BACKENDS",
+    "TranscriptionBackend",
+    "get_backend",
+    "ModelCache",
+    "transcribe_with_cache",
+]
@@ -0,0 +1,140 @@
+"""
+Transcription Backend'leri - Aynı çıktı formatında farklı inference motorları
+
+    backend = get_backend("faster-whisper", compute_type="int8")
+    model = backend.load("small")
+    result = backend.transcribe(model, audio_path, language="tr")
+    # {"success", "words", "segments", "full_text", "duration"}
+
+- whisper: openai-whisper (PyTorch, CPU'da fp32)
+- faster-whisper: CTranslate2 motoru; CPU'da int8 quantization ile aynı
+  modeller daha az bellek ve daha kısa sürede çalışır (pip install faster-whisper)
+
+Kütüphaneler sadece load() sırasında import edilir; kurulu olmayan backend
+seçilirse ImportError iş sonucuna hata olarak döner.
+"""
+
+import importlib.util
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+
+def build_result(segments: List[Dict[str, Any]], full_text: str) -> Dict[str, Any]:
+    """
+    Backend'den bağımsız sonuç formatı.
+
+    Args:
+        segments: [{"text", "start", "end", "words": [{"word", "start", "end"}]}]
+    """
+    words = [
+        {"word": w["word"].strip(), "start": w["start"], "end": w["end"]}
+        for seg in segments
+        for w in seg.get("words", [])
+    ]
+    segment_list = [
+        {"text": seg["text"].strip(), "start": seg["start"], "end": seg["end"]}
+        for seg in segments
+    ]
+    return {
+        "success": True,
+        "words": words,
+        "segments": segment_list,
+        "full_text": full_text,
+        "duration": segment_list[-1]["end"] if segment_list else 0.0
+    }
+
+
+class TranscriptionBackend(ABC):
+    """Backend arayüzü: load(model_size) -> model, transcribe(model, ...) -> sonuç dict"""
+
+    name = "base"
+    module = ""
+    install_hint = ""
+
+    def is_available(self) -> bool:
+        return importlib.util.find_spec(self.module) is not None
+
+    @abstractmethod
+    def load(self, model_size: str) -> Any:
+        """Modeli yükle - her backend implement etmeli"""
+        pass
+
+    @abstractmethod
+    def transcribe(self, model: Any, audio_path: str, language: str = "tr") -> Dict[str, Any]:
+        """Ses dosyasını kelime zamanlarıyla çöz - her backend implement etmeli"""
+        pass
+
+    def describe(self) -> Dict[str, Any]:
+        """Durum / log için backend özeti"""
+        return {"backend": self.name}
+
+
+class WhisperBackend(TranscriptionBackend):
+    """openai-whisper (PyTorch)"""
+
+    name = "whisper"
+    module = "whisper"
+    install_hint = "pip install openai-whisper"
+
+    def load(self, model_size: str) -> Any:
+        import whisper
+        return whisper.load_model(model_size)
+
+    def transcribe(self, model: Any, audio_path: str, language: str = "tr") -> Dict[str, Any]:
+        result = model.transcribe(audio_path, language=language, word_timestamps=True, verbose=False)
+        return build_result(result.get("segments", []), result.get("text", ""))
+
+
+class FasterWhisperBackend(TranscriptionBackend):
+    """faster-whisper (CTranslate2), CPU'da varsayılan int8"""
+
+    name = "faster-whisper"
+    module = "faster_whisper"
+    install_hint = "pip install faster-whisper"
+
+    def __init__(self, compute_type: str = "int8", cpu_threads: int = 0, device: str = "cpu"):
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.device = device
+
+    def describe(self) -> Dict[str, Any]:
+        return {"backend": self.name, "compute_type": self.compute_type, "device": self.device}
+
+    def load(self, model_size: str) -> Any:
+        from faster_whisper import WhisperModel
+        return WhisperModel(
+            model_size,
+            device=self.device,
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads
+        )
+
+    def transcribe(self, model: Any, audio_path: str, language: str = "tr") -> Dict[str, Any]:
+        segments_iter, _info = model.transcribe(audio_path, language=language, word_timestamps=True)
+        segments = [
+            {
+                "text": seg.text,
+                "start": seg.start,
+                "end": seg.end,
+                "words": [{"word": w.word, "start": w.start, "end": w.end} for w in (seg.words or [])]
+            }
+            for seg in segments_iter  # generator: inference iterasyon sırasında çalışır
+        ]
+        return build_result(segments, "".join(seg["text"] for seg in segments))
+
+
+BACKENDS = (WhisperBackend.name, FasterWhisperBackend.name)
+
+
+def get_backend(name: str = "whisper", compute_type: str = "int8", cpu_threads: int = 0) -> TranscriptionBackend:
+    """
+    Backend örneği.
+
+    Raises:
+        ValueError: Bilinmeyen backend adı
+    """
+    if name == WhisperBackend.name:
+        return WhisperBackend()
+    if name == FasterWhisperBackend.name:
+        return FasterWhisperBackend(compute_type=compute_type, cpu_threads=cpu_threads)
+    raise ValueError(f"Unknown transcription backend: {name} (available: {', '.join(BACKENDS)})")
@@ -0,0 +1,289 @@
+"""
+Transcription Service - Resident Whisper worker'ının asenkron istemcisi
+
+Worker süreci (app/transcription/worker.py) ilk istekte başlatılır ve
+modelleri bellekte tutar. İstekler stdin'e JSON satır olarak yazılır,
+yanıtlar id ile eşleştirilir; aynı anda birden fazla iş gönderilebilir,
+worker inference'ı kendi concurrency limitiyle sıraya koyar.
+
+    service = get_transcription_service()
+    result = await service.transcribe(audio_path, model_size="small", language="tr")
+    result["load_s"], result["inference_s"], result["queued_s"]
+
+- Worker beklenmedik şekilde kapanırsa bekleyen işler WorkerError alır,
+  sonraki istek worker'ı yeniden başlatır
+- İş zaman aşımında worker yenilenir (takılmış inference iptal edilemez);
+  aynı worker'da bekleyen diğer işler yeni worker'a yeniden gönderilir
+"""
+
+import asyncio
+import itertools
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("transcription")
+
+
+class WorkerError(Exception):
+    """Transcription worker'ı başlatılamadı, kapandı veya iş hata döndü"""
+
+
+class TranscriptionService:
+    """Tek resident worker süreci ile konuşan istemci"""
+
+    def __init__(
+        self,
+        backend: str = "whisper",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        preload: Optional[List[str]] = None,
+        concurrency: int = 1,
+        idle_timeout: float = 600.0,
+        job_timeout: float = 900.0,
+        cwd: Optional[str] = None
+    ):
+        self.backend = backend
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.preload = preload or []
+        self.concurrency = max(1, concurrency)
+        self.idle_timeout = idle_timeout
+        self.job_timeout = job_timeout
+        self.cwd = cwd
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        # job id -> (payload, gönderildiği süreç); worker yenilenirse yeniden gönderim için
+        self._jobs: Dict[int, Tuple[Dict[str, Any], asyncio.subprocess.Process]] = {}
+        self._ids = itertools.count(1)
+        self._start_lock: Optional[asyncio.Lock] = None
+        self.stats = {"jobs": 0, "errors": 0, "timeouts": 0, "restarts": 0,
+                      "load_s": 0.0, "inference_s": 0.0, "cache_hits": 0}
+
+    @property
+    def command(self) -> List[str]:
+        cmd = [sys.executable, "-m", "app.transcription.worker",
+               "--backend", self.backend, "--compute-type", self.compute_type, "--cpu-threads", str(self.cpu_threads),
+               "--concurrency", str(self.concurrency), "--idle-timeout", str(self.idle_timeout)]
+        if self.preload:
+            cmd.extend(["--preload", ",".join(self.preload)])
+        return cmd
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self):
+        """Worker'ı başlat (ilk istekte otomatik çağrılır)"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.is_alive():
+                return
+            if self.process is not None:
+                self.stats["restarts"] += 1
+            self.process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                cwd=self.cwd,
+                limit=16 * 1024 * 1024  # Uzun word listeleri için
+            )
+            self._reader_task = asyncio.create_task(self._read_loop(self.process))
+            logger.info(f"[TRANSCRIBE] Worker başlatıldı (pid {self.process.pid}, {self.backend}, "
+                        f"preload: {self.preload or '-'})")
+
+    async def _read_loop(self, process: asyncio.subprocess.Process):
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+
+        await process.wait()
+        if process is not self.process:
+            # _restart ile yenilendi: bekleyen işler yeni worker'a taşındı
+            return
+        logger.warning(f"[TRANSCRIBE] Worker kapandı (exit {process.returncode})")
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(WorkerError(f"worker exited (code {process.returncode})"))
+        self._pending.clear()
+
+    async def _send(self, job_id: int, payload: Dict[str, Any]):
+        process = self.process
+        self._jobs[job_id] = (payload, process)
+        process.stdin.write((json.dumps({"id": job_id, **payload}, ensure_ascii=False) + "\n").encode("utf-8"))
+        await process.stdin.drain()
+
+    async def _request(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        restart_on_timeout: bool = False
+    ) -> Dict[str, Any]:
+        await self.start()
+        job_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[job_id] = future
+        try:
+            await self._send(job_id, payload)
+        except (BrokenPipeError, ConnectionResetError) as e:
+            self._pending.pop(job_id, None)
+            self._jobs.pop(job_id, None)
+            raise WorkerError(f"worker pipe closed: {e}")
+
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(job_id, None)
+            _, process = self._jobs.pop(job_id, (None, None))
+            # İş zaten yenilenmiş bir worker'a gönderildiyse tekrar yenileme
+            if restart_on_timeout and process is not None and process is self.process:
+                await self._restart()
+            raise
+        finally:
+            self._jobs.pop(job_id, None)
+
+    async def _restart(self):
+        """
+        Takılmış worker'ı öldür, yenisini başlat ve bekleyen diğer işleri
+        yeni worker'a yeniden gönder (zaman aşımına uğrayan iş dışında).
+        """
+        old = self.process
+        resubmit = [(job_id, payload) for job_id, (payload, process) in self._jobs.items()
+                    if process is old and job_id in self._pending]
+        logger.warning(f"[TRANSCRIBE] Worker yenileniyor, {len(resubmit)} bekleyen iş yeniden gönderilecek")
+        self.process = None
+        self.stats["restarts"] += 1
+        if old is not None and old.returncode is None:
+            old.kill()
+
+        try:
+            await self.start()
+            for job_id, payload in resubmit:
+                if job_id in self._pending:
+                    await self._send(job_id, payload)
+        except (OSError, WorkerError) as e:
+            logger.error(f"[TRANSCRIBE] Worker yeniden başlatılamadı: {e}")
+            for job_id, _ in resubmit:
+                future = self._pending.pop(job_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(WorkerError(f"worker restart failed: {e}"))
+
+    async def transcribe(
+        self,
+        audio_path: str,
+        model_size: str = "small",
+        language: str = "tr"
+    ) -> Dict[str, Any]:
+        """
+        Word-level transcription (extract_word_timestamps formatında).
+
+        Sonuca load_s, inference_s, queued_s ve cached (model zaten yüklüydü) eklenir.
+
+        Raises:
+            WorkerError: Worker başlatılamadı veya iş sırasında kapandı
+            asyncio.TimeoutError: job_timeout aşıldı (worker yenilenir, diğer işler
+                yeni worker'da devam eder)
+        """
+        started = time.monotonic()
+        self.stats["jobs"] += 1
+        try:
+            message = await self._request(
+                {"op": "transcribe", "audio_path": audio_path, "model_size": model_size, "language": language},
+                timeout=self.job_timeout,
+                restart_on_timeout=True
+            )
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            logger.warning(f"[TRANSCRIBE] {model_size} işi {self.job_timeout:.0f}s'de bitmedi")
+            raise
+        except WorkerError:
+            self.stats["errors"] += 1
+            raise
+
+        self.stats["load_s"] += message.get("load_s", 0.0)
+        self.stats["inference_s"] += message.get("inference_s", 0.0)
+        if message.get("cached"):
+            self.stats["cache_hits"] += 1
+
+        timings = {key: message.get(key, 0.0) for key in ("load_s", "inference_s", "queued_s")}
+        logger.info(
+            f"[TRANSCRIBE] {model_size}: load {timings['load_s']:.1f}s, inference {timings['inference_s']:.1f}s, "
+            f"queue {timings['queued_s']:.1f}s (toplam {time.monotonic() - started:.1f}s)"
+        )
+
+        if not message.get("ok"):
+            self.stats["errors"] += 1
+            return {"success": False, "error": message.get("error", "unknown error"), **timings}
+        return {**message["result"], **timings, "cached": message.get("cached", False)}
+
+    async def status(self, timeout: float = 10) -> Dict[str, Any]:
+        """Worker'daki yüklü modeller ve iş sayaçları"""
+        message = await self._request({"op": "status"}, timeout=timeout)
+        return message.get("result", {})
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["alive"] = self.is_alive()
+        stats["pending"] = len(self._pending)
+        return stats
+
+    async def close(self):
+        """Worker'ı kapat (bekleyen işler WorkerError alır)"""
+        process = self.process
+        if process is None or process.returncode is not None:
+            return
+        try:
+            process.stdin.close()
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(process.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+
+
+_service: Optional[TranscriptionService] = None
+
+
+def get_transcription_service() -> Optional[TranscriptionService]:
+    """Global transcription servisi (devre dışıysa None)"""
+    global _service
+    if not settings.whisper_worker_enabled:
+        return None
+    if _service is None:
+        _service = TranscriptionService(
+            backend=settings.whisper_backend,
+            compute_type=settings.whisper_compute_type,
+            cpu_threads=settings.whisper_cpu_threads,
+            preload=[m.strip() for m in settings.whisper_worker_preload.split(",") if m.strip()],
+            concurrency=settings.whisper_worker_concurrency,
+            idle_timeout=settings.whisper_model_idle_timeout,
+            job_timeout=settings.whisper_job_timeout,
+            cwd=str(settings.base_dir)
+        )
+    return _service
+
+
+async def shutdown_transcription_service():
+    """Worker sürecini kapat"""
+    global _service
+    if _service is not None:
+        await _service.close()
+        _service = None
@@ -0,0 +1,264 @@
+"""
+Whisper Transcription Worker - Modelleri bellekte tutan uzun ömürlü süreç
+
+Her altyazı isteğinde `whisper.load_model()` çağırmak (ve doğrulama için
+ayrıca `medium` yüklemek) süreyi ve RAM'i model yüklemesine harcatıyordu.
+Bu süreç yüklenen modelleri bellekte tutar, işleri stdin'den alır:
+
+    python -m app.transcription.worker --preload small --concurrency 1 --idle-timeout 600
+    python -m app.transcription.worker --backend faster-whisper --compute-type int8
+
+Protokol (satır başına bir JSON):
+    stdin  -> {"id": 1, "op": "transcribe", "audio_path": "...", "model_size": "small", "language": "tr"}
+    stdout <- {"id": 1, "ok": true, "result": {...}, "model_size": "small",
+               "cached": true, "load_s": 0.0, "inference_s": 12.3, "queued_s": 0.1}
+    stdin  -> {"id": 2, "op": "status"}
+    stdout <- {"id": 2, "ok": true, "result": {"models": [...], "active": 0, "queued": 0, ...}}
+
+- --concurrency: aynı anda çalışan inference sayısı (fazlası kuyrukta bekler)
+- --idle-timeout: bu kadar saniye kullanılmayan model bellekten atılır
+- stdin kapanınca (parent süreç öldüğünde dahil) çalışan işler bitirilip çıkılır
+
+Whisper/tqdm çıktıları protokolü bozmasın diye sys.stdout stderr'e yönlendirilir.
+Ayarlar (preload, concurrency, idle timeout) komut satırı argümanı olarak gelir.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.transcription.backends import BACKENDS, TranscriptionBackend, get_backend
+
+
+class ModelCache:
+    """Thread-safe model cache: boyut başına tek yükleme, kullanılmayanlar zaman aşımıyla atılır"""
+
+    def __init__(self, loader: Callable[[str], Any], idle_timeout: float = 600.0):
+        self.idle_timeout = idle_timeout
+        self.loader = loader
+        self._models: Dict[str, Any] = {}
+        self._last_used: Dict[str, float] = {}
+        self._in_use: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def acquire(self, model_size: str) -> Tuple[Any, float, bool]:
+        """Modeli al (gerekirse yükle). Returns: (model, load_s, cached)"""
+        with self._lock:
+            self._in_use[model_size] = self._in_use.get(model_size, 0) + 1
+            load_lock = self._load_locks.setdefault(model_size, threading.Lock())
+
+        try:
+            with load_lock:
+                model = self._models.get(model_size)
+                if model is not None:
+                    return model, 0.0, True
+                started = time.monotonic()
+                model = self.loader(model_size)
+                with self._lock:
+                    self._models[model_size] = model
+                return model, time.monotonic() - started, False
+        except BaseException:
+            self.release(model_size)
+            raise
+
+    def release(self, model_size: str):
+        with self._lock:
+            self._in_use[model_size] = max(0, self._in_use.get(model_size, 1) - 1)
+            self._last_used[model_size] = time.monotonic()
+
+    def evict_idle(self) -> List[str]:
+        """idle_timeout'tan uzun süredir kullanılmayan modelleri at"""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            for model_size in list(self._models):
+                if self._in_use.get(model_size, 0):
+                    continue
+                if now - self._last_used.get(model_size, now) >= self.idle_timeout:
+                    del self._models[model_size]
+                    evicted.append(model_size)
+        if evicted:
+            gc.collect()
+            torch = sys.modules.get("torch")
+            if torch is not None and torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        return evicted
+
+    def loaded(self) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "model_size": model_size,
+                    "in_use": self._in_use.get(model_size, 0),
+                    "idle_s": round(now - self._last_used.get(model_size, now), 1),
+                }
+                for model_size in self._models
+            ]
+
+
+def transcribe_with_cache(
+    cache: ModelCache,
+    backend: TranscriptionBackend,
+    audio_path: str,
+    model_size: str,
+    language: str = "tr"
+) -> Dict[str, Any]:
+    """Cache'teki modelle word-level transcribe; sonuca load_s / inference_s / cached eklenir"""
+    if not os.path.exists(audio_path):
+        return {"success": False, "error": f"Audio file not found: {audio_path}"}
+
+    model, load_s, cached = cache.acquire(model_size)
+    try:
+        started = time.monotonic()
+        output = backend.transcribe(model, audio_path, language=language)
+        inference_s = time.monotonic() - started
+    finally:
+        cache.release(model_size)
+
+    output.update({"load_s": round(load_s, 3), "inference_s": round(inference_s, 3), "cached": cached})
+    return output
+
+
+class TranscriptionWorker:
+    """stdin/stdout JSON satır protokolü ile iş alan worker"""
+
+    def __init__(self, backend: TranscriptionBackend, cache: ModelCache, concurrency: int, out):
+        self.backend = backend
+        self.cache = cache
+        self.out = out
+        self.executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="whisper")
+        self._write_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self.active = 0
+        self.queued = 0
+        self.completed = 0
+        self.failed = 0
+
+    def send(self, message: Dict[str, Any]):
+        line = json.dumps(message, ensure_ascii=False) + "\n"
+        with self._write_lock:
+            self.out.write(line)
+            self.out.flush()
+
+    def status(self) -> Dict[str, Any]:
+        with self._state_lock:
+            counters = {"active": self.active, "queued": self.queued,
+                        "completed": self.completed, "failed": self.failed}
+        return {"models": self.cache.loaded(), "pid": os.getpid(), **self.backend.describe(), **counters}
+
+    def _run_job(self, job: Dict[str, Any], submitted: float):
+        with self._state_lock:
+            self.queued -= 1
+            self.active += 1
+        queued_s = time.monotonic() - submitted
+        model_size = job.get("model_size", "small")
+        try:
+            result = transcribe_with_cache(
+                self.cache, self.backend, job["audio_path"], model_size, job.get("language", "tr")
+            )
+            ok = bool(result.get("success"))
+            message = {
+                "id": job.get("id"), "ok": ok, "model_size": model_size, "queued_s": round(queued_s, 3),
+                "load_s": result.pop("load_s", 0.0), "inference_s": result.pop("inference_s", 0.0),
+                "cached": result.pop("cached", False),
+            }
+            if ok:
+                message["result"] = result
+            else:
+                message["error"] = result.get("error", "unknown error")
+        except Exception as e:
+            ok = False
+            message = {"id": job.get("id"), "ok": False, "model_size": model_size,
+                       "queued_s": round(queued_s, 3), "error": f"{type(e).__name__}: {e}"}
+        with self._state_lock:
+            self.active -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+        self.send(message)
+
+    def handle(self, job: Dict[str, Any]):
+        op = job.get("op")
+        if op == "transcribe":
+            with self._state_lock:
+                self.queued += 1
+            self.executor.submit(self._run_job, job, time.monotonic())
+        elif op == "status":
+            self.send({"id": job.get("id"), "ok": True, "result": self.status()})
+        else:
+            self.send({"id": job.get("id"), "ok": False, "error": f"unknown op: {op}"})
+
+    def preload(self, model_sizes: List[str]):
+        for model_size in model_sizes:
+            started = time.monotonic()
+            try:
+                self.cache.acquire(model_size)
+            except Exception as e:
+                print(f"[WHISPER WORKER] {model_size} yüklenemedi: {e}", file=sys.stderr)
+                continue
+            self.cache.release(model_size)
+            print(f"[WHISPER WORKER] {model_size} yüklendi ({time.monotonic() - started:.1f}s)", file=sys.stderr)
+
+    def evict_loop(self, stop: threading.Event, interval: float):
+        while not stop.wait(interval):
+            for model_size in self.cache.evict_idle():
+                print(f"[WHISPER WORKER] {model_size} boşta, bellekten atıldı", file=sys.stderr)
+
+    def serve(self, stdin):
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self.handle(job)
+        self.executor.shutdown(wait=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Resident Whisper transcription worker")
+    parser.add_argument("--backend", default="whisper", choices=BACKENDS, help="Inference motoru")
+    parser.add_argument("--compute-type", default="int8", help="faster-whisper quantization (int8, int8_float32, float32)")
+    parser.add_argument("--cpu-threads", type=int, default=0, help="faster-whisper CPU thread sayısı (0 = otomatik)")
+    parser.add_argument("--preload", default="", help="Başlangıçta yüklenecek modeller (virgülle ayrılmış)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Eşzamanlı inference sayısı")
+    parser.add_argument("--idle-timeout", type=float, default=600.0, help="Boştaki modelin atılma süresi (saniye)")
+    args = parser.parse_args(argv)
+
+    # Protokol kanalı gerçek stdout; whisper/tqdm print'leri stderr'e gider
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+
+    backend = get_backend(args.backend, compute_type=args.compute_type, cpu_threads=args.cpu_threads)
+    cache = ModelCache(backend.load, idle_timeout=args.idle_timeout)
+    worker = TranscriptionWorker(backend, cache, args.concurrency, protocol_out)
+
+    stop = threading.Event()
+    threading.Thread(
+        target=worker.evict_loop, args=(stop, max(1.0, min(30.0, args.idle_timeout / 2))), daemon=True
+    ).start()
+
+    worker.preload([m.strip() for m in args.preload.split(",") if m.strip()])
+    worker.send({"id": None, "ok": True, "event": "ready", "result": worker.status()})
+    try:
+        worker.serve(sys.stdin)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""
+Olivenet Social Bot - TTS altyapısı (ses cache'i)
+"""
+
+from .cache import TTSCache, get_tts_cache
+
+__all__ = [
+    "TTSCache",
+    "get_tts_cache",
+]
@@ -0,0 +1,251 @@
+"""
+TTS Audio Cache - Content-addressed, kalıcı ElevenLabs ses cache'i
+
+Aynı metin + ses + model + ses ayarları + hız için ElevenLabs'e tekrar
+istek atmak (ve karakter kotası harcamak) yerine daha önce üretilmiş ses
+dosyası kullanılır: pipeline retry'ları, resume edilen run'lar, değişmemiş
+script'le yeniden üretilen voiceover'lar, tekrar eden diyalog satırları.
+
+- Key: ElevenLabsHelper.get_cache_key (text + voice + model + settings + speed)
+- Ses dosyaları data/tts_cache/<key>.mp3, index data/tts_cache/index.db
+  (SQLite, key üzerinden tek satır lookup)
+- Ölçülen süre index'te saklanır; hit'te ffprobe gerekmez
+- LRU eviction: toplam boyut veya kayıt sayısı limiti aşılınca en uzun
+  süredir kullanılmayan dosyalar silinir
+- Hit'te dosya çağıranın yoluna kopyalanır; sonraki düzenlemeler
+  (trim, silence, export) cache'teki kopyayı bozmaz
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("tts_cache")
+
+
+class TTSCache:
+    """Dosya tabanlı, SQLite index'li ve boyut sınırlı LRU ses cache'i"""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 500 * 1024 * 1024,
+        max_entries: int = 2000,
+        extension: str = ".mp3"
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / "index.db"
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.extension = extension
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "stale": 0}
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS tts_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    size_bytes INTEGER NOT NULL,
+                    duration REAL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER DEFAULT 0,
+                    voice_id TEXT,
+                    character_count INTEGER
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_tts_cache_accessed ON tts_cache(last_accessed)')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.extension}"
+
+    def _remove_file(self, key: str):
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"TTS cache file could not be removed ({key[:12]}): {e}")
+
+    # ---------- Sync API ----------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Cache kaydı (yoksa None).
+
+        Returns:
+            {"path": str, "duration": float | None, "size_bytes": int}
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            row = conn.execute(
+                "SELECT size_bytes, duration FROM tts_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            path = self.path_for(key)
+            if not path.exists():
+                # Dosya elle silinmiş - index'i düzelt
+                conn.execute("DELETE FROM tts_cache WHERE cache_key = ?", (key,))
+                conn.commit()
+                self._stats["stale"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            conn.execute(
+                "UPDATE tts_cache SET last_accessed = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                (now, key)
+            )
+            conn.commit()
+            self._stats["hits"] += 1
+
+        size_bytes, duration = row
+        return {"path": str(path), "duration": duration, "size_bytes": size_bytes}
+
+    def put(
+        self,
+        key: str,
+        source_path: str,
+        duration: Optional[float] = None,
+        voice_id: Optional[str] = None,
+        character_count: Optional[int] = None
+    ) -> Optional[str]:
+        """Ses dosyasını cache'e kopyala ve gerekiyorsa evict et. Returns: cache'teki yol"""
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            return None
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        target = self.path_for(key)
+        # Yarım kopya okunmasın diye önce geçici dosyaya yaz
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, target)
+
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute('''
+                INSERT OR REPLACE INTO tts_cache
+                (cache_key, size_bytes, duration, created_at, last_accessed, hit_count, voice_id, character_count)
+                VALUES (?, ?, ?, ?, ?, 0, ?, ?)
+            ''', (key, size, duration, now, now, voice_id, character_count))
+            self._stats["stores"] += 1
+            self._evict(conn)
+            conn.commit()
+        return str(target)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """LRU sırasına göre boyut / kayıt limiti aşımını sil"""
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM tts_cache"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute(
+            "SELECT cache_key, size_bytes FROM tts_cache ORDER BY last_accessed ASC"
+        ).fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM tts_cache WHERE cache_key = ?", (key,))
+            self._remove_file(key)
+            count -= 1
+            total -= size
+            evicted += 1
+
+        self._stats["evictions"] += evicted
+
+    def clear(self):
+        """Tüm cache'i temizle"""
+        with self._lock:
+            conn = self._get_conn()
+            for (key,) in conn.execute("SELECT cache_key FROM tts_cache").fetchall():
+                self._remove_file(key)
+            conn.execute("DELETE FROM tts_cache")
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss metrikleri ve cache boyutu"""
+        with self._lock:
+            conn = self._get_conn()
+            count, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM tts_cache"
+            ).fetchone()
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["entries"] = count
+        stats["size_bytes"] = total
+        return stats
+
+    # ---------- Async API (event loop'u bloklamaz) ----------
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(
+        self,
+        key: str,
+        source_path: str,
+        duration: Optional[float] = None,
+        voice_id: Optional[str] = None,
+        character_count: Optional[int] = None
+    ) -> Optional[str]:
+        return await asyncio.to_thread(self.put, key, source_path, duration, voice_id, character_count)
+
+    async def restore(self, key: str, output_path: Path) -> Optional[Dict[str, Any]]:
+        """Cache hit'i output_path'e kopyala (miss ise None)"""
+        entry = await self.aget(key)
+        if entry is None:
+            return None
+        try:
+            await asyncio.to_thread(shutil.copyfile, entry["path"], output_path)
+        except OSError as e:
+            logger.warning(f"TTS cache restore failed ({key[:12]}): {e}")
+            return None
+        return {**entry, "path": str(output_path)}
+
+
+_cache: Optional[TTSCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> Optional[TTSCache]:
+    """Global TTS cache (devre dışıysa None)"""
+    global _cache
+    if not settings.tts_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TTSCache(
+                    settings.data_dir / "tts_cache",
+                    max_bytes=settings.tts_cache_max_mb * 1024 * 1024,
+                    max_entries=settings.tts_cache_max_entries
+                )
+    return _cache
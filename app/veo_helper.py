@@ -11,6 +11,7 @@ from datetime import datetime
 from typing import Dict, Any
 
 from app.config import settings
+from app.jobs import JobFailed, JobTimeout, PollResult, Submission, register_poller, run_remote_job
 from app.utils.logger import get_logger
 
 logger = get_logger("veo")
@@ -46,6 +47,30 @@ def get_client():
     return _client
 
 
+async def _poll_veo(http_client, operation_name: str, poll_data: Dict[str, Any]) -> PollResult:
+    """
+    Long-running operation durumu - job tracker poller'ı.
+
+    Operation adıyla yeniden kurulur (restart sonrası da çalışır); SDK
+    senkron olduğu için thread'de çağrılır, tracker'ın HTTP client'ı kullanılmaz.
+    """
+    from google.genai import types
+
+    client = get_client()
+    operation = await asyncio.to_thread(
+        client.operations.get, types.GenerateVideosOperation(name=operation_name)
+    )
+    if not operation.done:
+        return PollResult.pending()
+    if operation.error:
+        error = operation.error
+        return PollResult.failed(error.get("message", str(error)) if isinstance(error, dict) else str(error))
+    return PollResult.completed({"operation": operation})
+
+
+register_poller("veo", _poll_veo, default_interval=5.0)
+
+
 async def generate_video_veo3(
     prompt: str,
     aspect_ratio: str = "9:16",
@@ -137,33 +162,36 @@ async def _generate_with_veo_sdk(
             person_generation="allow_all"  # Text-to-video icin
         )
 
-        print(f"   API'ye istek gonderiliyor...")
-
-        # Video generation baslat
-        operation = client.models.generate_videos(
-            model=model_id,
-            prompt=prompt,
-            config=config
-        )
-
-        print(f"   Operation baslatildi, bekleniyor...")
-
-        # Islem tamamlanana kadar bekle
+        # Video generation baslat (SDK senkron - event loop'u bloklamasin)
+        async def submit() -> Submission:
+            print(f"   API'ye istek gonderiliyor...")
+            operation = await asyncio.to_thread(
+                client.models.generate_videos,
+                model=model_id,
+                prompt=prompt,
+                config=config
+            )
+            print(f"   Operation baslatildi, bekleniyor...")
+            if operation.done:
+                return Submission(result={"operation": operation})
+            return Submission(remote_id=operation.name)
+
+        # Islem tamamlanana kadar job tracker bekler
         start_time = datetime.now()
-        max_wait = 300  # 5 dakika
-
-        while not operation.done:
-            elapsed = (datetime.now() - start_time).total_seconds()
-
-            if elapsed > max_wait:
-                return {"success": False, "error": "Timeout - 5 dakika icinde tamamlanamadi"}
-
-            if int(elapsed) % 10 == 0:
-                print(f"   ⏳ Isleniyor... ({int(elapsed)}s)")
-
-            await asyncio.sleep(5)
-            operation = client.operations.get(operation)
-
+        try:
+            job = await run_remote_job(
+                provider="veo",
+                label=model_id,
+                submit=submit,
+                key_data={"prompt": prompt, "aspect_ratio": aspect_ratio, "duration_seconds": duration_seconds},
+                timeout=300  # 5 dakika
+            )
+        except JobTimeout:
+            return {"success": False, "error": "Timeout - 5 dakika icinde tamamlanamadi"}
+        except JobFailed as e:
+            return {"success": False, "error": str(e)}
+
+        operation = job["operation"]
         elapsed = (datetime.now() - start_time).total_seconds()
         print(f"   ✅ Video hazir! ({elapsed:.1f}s)")
 
@@ -21,6 +21,7 @@ VIDEO_MODELS: Dict[str, dict] = {
         "default_duration": 12,
         "max_duration": 12,
         "aspect_ratio": "9:16",
+        "cost_per_second": 0.10,  # Tahmini USD (hedge / maliyet limiti için)
         "prompt_key": "video_prompt_sora",
         "description": "En yüksek kalite, gerçekçi",
         "helper_module": "sora_helper",
@@ -34,6 +35,7 @@ VIDEO_MODELS: Dict[str, dict] = {
         "default_duration": 12,
         "max_duration": 12,
         "aspect_ratio": "9:16",
+        "cost_per_second": 0.30,  # Tahmini USD (hedge / maliyet limiti için)
         "prompt_key": "video_prompt_sora",
         "description": "Yüksek kalite, native speech (12s)",
         "helper_module": "sora_helper",
@@ -50,6 +52,7 @@ VIDEO_MODELS: Dict[str, dict] = {
         "default_duration": 8,
         "max_duration": 8,
         "aspect_ratio": "9:16",
+        "cost_per_second": 0.50,  # Tahmini USD (hedge / maliyet limiti için)
         "prompt_key": "video_prompt_veo",
         "description": "Hızlı ve tutarlı",
         "helper_module": "veo_helper",
@@ -64,6 +67,7 @@ VIDEO_MODELS: Dict[str, dict] = {
         "default_duration": 8,
         "max_duration": 8,
         "aspect_ratio": "9:16",
+        "cost_per_second": 0.40,  # Tahmini USD (hedge / maliyet limiti için)
         "prompt_key": "video_prompt_veo",
         "description": "Native audio + lip-sync (en iyi kalite)",
         "helper_module": "veo_helper",
@@ -80,6 +84,7 @@ VIDEO_MODELS: Dict[str, dict] = {
         "default_duration": 10,
         "max_duration": 10,
         "aspect_ratio": "9:16",
+        "cost_per_second": 0.07,  # Tahmini USD (hedge / maliyet limiti için)
         "prompt_key": "video_prompt_kling",
         "description": "Hızlı üretim, hareketli sahneler",
         "helper_module": "fal_helper",
@@ -95,6 +100,7 @@ VIDEO_MODELS: Dict[str, dict] = {
         "default_duration": 10,
         "max_duration": 10,
         "aspect_ratio": "9:16",
+        "cost_per_second": 0.14,  # Tahmini USD (hedge / maliyet limiti için)
         "prompt_key": "video_prompt_kling",
         "description": "Cinematic 1080p kalite ⭐",
         "helper_module": "fal_helper",
@@ -110,6 +116,7 @@ VIDEO_MODELS: Dict[str, dict] = {
         "default_duration": 10,
         "max_duration": 15,
         "aspect_ratio": "9:16",
+        "cost_per_second": 0.17,  # Tahmini USD (hedge / maliyet limiti için)
         "prompt_key": "video_prompt_kling3",
         "description": "Sinematik yönetmenlik, 15s, fizik tabanlı hareket ⭐",
         "helper_module": "fal_helper",
@@ -125,6 +132,7 @@ VIDEO_MODELS: Dict[str, dict] = {
         "default_duration": 15,
         "max_duration": 15,
         "aspect_ratio": "9:16",
+        "cost_per_second": 0.10,  # Tahmini USD (hedge / maliyet limiti için)
         "prompt_key": "video_prompt_wan",
         "description": "15s uzun video!",
         "helper_module": "fal_helper",
@@ -138,6 +146,7 @@ VIDEO_MODELS: Dict[str, dict] = {
         "default_duration": 5,
         "max_duration": 5,
         "aspect_ratio": "9:16",
+        "cost_per_second": 0.08,  # Tahmini USD (hedge / maliyet limiti için)
         "prompt_key": "video_prompt_hailuo",
         "description": "Hızlı ve ekonomik",
         "helper_module": "fal_helper",
@@ -208,6 +217,21 @@ def get_max_duration(model_id: str) -> int:
     return config.get("max_duration", 10)
 
 
+def estimate_cost(model_id: str, duration: int) -> float:
+    """
+    Estimated generation cost in USD (cost_per_second x duration).
+
+    Args:
+        model_id: Model identifier
+        duration: Video duration in seconds
+
+    Returns:
+        Estimated cost (0.0 if the model has no price set)
+    """
+    config = get_model_config(model_id)
+    return config.get("cost_per_second", 0.0) * duration
+
+
 def get_prompt_key(model_id: str) -> str:
     """
     Get the prompt key for selecting model-specific prompt from create_reels_prompt output.
@@ -0,0 +1,361 @@
+"""
+Video Router - Gözlenen süreye göre model seçimi ve hedge
+
+generate_video_smart eskiden tek bir model seçip sadece hata sonrası Veo'ya
+geçiyordu; takılan bir provider kuyruğu 10+ dakika kaybettirebiliyordu.
+Burada:
+
+- Her model denemesi (süre, sonuç, tahmini maliyet) video_generations
+  tablosuna yazılır
+- Model zorlanmamışsa istenen süreyi destekleyen (get_model_durations)
+  sağlıklı modeller arasından medyan süresi en kısa olan seçilir; hata oranı
+  video_router_max_failure_rate üstündeki modeller sona kalır
+- Seçilen model hata verirse sıradaki modele hemen geçilir
+- Hedge (video_hedge_enabled): ilk model kendi p90 süresini aşarsa başka bir
+  provider'da ikinci üretim başlatılır; ilk biten kazanır, diğeri iptal edilir
+- Bir video için tahmini toplam maliyet video_max_cost_per_run ile sınırlıdır;
+  zorlanan model bu varsayılan limitle değiştirilmez (limit sadece otomatik
+  seçilen ilk modele, fallback ve hedge'e uygulanır)
+
+Kaybeden denemenin uzak işi provider'da iptal edilir (fal.ai queue cancel,
+Sora delete) ve job tracker takibinden çıkarılır; iptal API'si olmayan
+provider'larda (Veo) iş sadece takipten çıkarılır.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.database import async_crud
+from app.jobs import cancel_on_abandon
+from app.utils.logger import get_logger
+from app.video_models import VIDEO_MODELS, estimate_cost, get_model_durations
+
+logger = get_logger("video_router")
+
+# Bir video için en fazla denenecek model (ilk + fallback/hedge)
+MAX_MODELS_PER_RUN = 2
+
+# İstatistik yoksa varsayılan süre (sıralama için, saniye)
+DEFAULT_LATENCY_S = 180.0
+
+# p90 / hata oranı bu kadar denemeden sonra dikkate alınır
+MIN_SAMPLES = 3
+
+# UI kısa isimleri ve fal_helper model adları -> video_models.py ID'leri
+MODEL_ALIASES = {
+    "sora2": "sora-2",
+    "sora2-pro": "sora-2-pro",
+    "veo": "veo-3.1",
+    "veo3": "veo-3.1",
+    "kling-2.1": "kling-2.5-pro",  # Backward compatibility
+}
+
+
+def resolve_model_id(model: Optional[str]) -> Optional[str]:
+    """Alias / fal model adını VIDEO_MODELS ID'sine çevir (bilinmiyorsa None)"""
+    if not model:
+        return None
+    model = MODEL_ALIASES.get(model, model)
+    if model in VIDEO_MODELS:
+        return model
+    for key, config in VIDEO_MODELS.items():
+        if config.get("fal_model") == model:
+            return key
+    return None
+
+
+def fit_duration(model_id: str, duration: int) -> int:
+    """İstenen süreyi karşılayan en kısa desteklenen süre (yoksa en uzunu)"""
+    durations = sorted(get_model_durations(model_id))
+    for supported in durations:
+        if supported >= duration:
+            return supported
+    return durations[-1]
+
+
+def _is_healthy(model_stats: Optional[Dict[str, Any]]) -> bool:
+    if not model_stats or model_stats["attempts"] < MIN_SAMPLES:
+        return True
+    return model_stats["failure_rate"] <= settings.video_router_max_failure_rate
+
+
+def _expected_latency(model_stats: Optional[Dict[str, Any]]) -> float:
+    if model_stats and model_stats.get("p50_s") is not None:
+        return model_stats["p50_s"]
+    return DEFAULT_LATENCY_S
+
+
+def rank_models(
+    stats: Dict[str, Dict[str, Any]],
+    duration: int,
+    preferred: Optional[str] = None
+) -> List[str]:
+    """
+    Denenecek modeller, tercih sırasına göre.
+
+    Zorlanan model (preferred) her zaman ilk sıradadır. Diğerleri: istenen
+    süreyi destekleyenler önce, sonra sağlıklılar, sonra medyan süre ve
+    tahmini maliyet. Sadece sohbet formatına özel modeller (conversational_only)
+    sadece zorlanırsa kullanılır.
+    """
+    candidates = [
+        model_id for model_id, config in VIDEO_MODELS.items()
+        if model_id != preferred and not config.get("conversational_only")
+    ]
+
+    def sort_key(model_id: str):
+        model_stats = stats.get(model_id)
+        return (
+            max(get_model_durations(model_id)) < duration,
+            not _is_healthy(model_stats),
+            _expected_latency(model_stats),
+            estimate_cost(model_id, fit_duration(model_id, duration)),
+        )
+
+    ranked = sorted(candidates, key=sort_key)
+    return [preferred] + ranked if preferred else ranked
+
+
+def hedge_delay(model_stats: Optional[Dict[str, Any]]) -> float:
+    """İkinci modelin başlatılacağı süre: modelin p90'ı, geçmiş yoksa video_hedge_delay"""
+    if model_stats and model_stats["samples"] >= MIN_SAMPLES and model_stats.get("p90_s"):
+        return model_stats["p90_s"]
+    return settings.video_hedge_delay
+
+
+async def generate_with_model(
+    model_id: str,
+    prompt: str,
+    duration: int,
+    voice_mode: bool = False
+) -> Dict[str, Any]:
+    """Tek modelle video üret (fallback yok; provider'a göre helper seçilir)"""
+    config = VIDEO_MODELS[model_id]
+    provider = config["provider"]
+
+    if provider == "openai":
+        from app.sora_helper import generate_video_sora
+        return await generate_video_sora(
+            prompt=prompt,
+            duration=duration,
+            size="720x1280",
+            model=model_id,
+            voice_mode=voice_mode
+        )
+
+    if provider == "google":
+        from app.veo_helper import generate_video_veo3
+        result = await generate_video_veo3(
+            prompt,
+            aspect_ratio=config["aspect_ratio"],
+            duration_seconds=duration,
+            model=config["model_id"]
+        )
+        if result.get("success"):
+            result["model_used"] = result.get("model", "veo-3")
+        return result
+
+    # fal.ai: Kling / Hailuo / Wan
+    from app.fal_helper import FalVideoGenerator
+    fal_model = config["fal_model"]
+    generate_audio = None
+    if fal_model.startswith("kling"):
+        # Voice mode'da native audio KAPATILIR (TTS voiceover eklenecek)
+        if voice_mode:
+            generate_audio = False
+        elif fal_model in ("kling_26_pro", "kling_v3_pro"):
+            generate_audio = True
+    return await FalVideoGenerator.generate_video(
+        prompt=prompt,
+        model=fal_model,
+        duration=duration,
+        aspect_ratio=config["aspect_ratio"],
+        generate_audio=generate_audio
+    )
+
+
+async def _attempt(
+    model_id: str,
+    prompt: str,
+    duration: int,
+    voice_mode: bool,
+    hedged: bool
+) -> Dict[str, Any]:
+    """
+    generate_with_model + süre/sonuç kaydı.
+
+    İptal edilirse 'cancelled' kaydedilir ve uzak iş provider'da iptal edilir.
+    """
+    cost = estimate_cost(model_id, duration)
+    started = time.monotonic()
+    status = "failed"
+    error = None
+    try:
+        try:
+            with cancel_on_abandon():
+                result = await generate_with_model(model_id, prompt, duration, voice_mode)
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        if result.get("success"):
+            status = "success"
+        else:
+            error = result.get("error") or "Unknown error"
+        return result
+    finally:
+        try:
+            await async_crud.log_video_generation(
+                model_id=model_id,
+                status=status,
+                duration_s=round(time.monotonic() - started, 1),
+                video_seconds=duration,
+                cost_usd=round(cost, 3),
+                hedged=hedged,
+                error=error
+            )
+        except Exception as e:
+            logger.warning(f"Video denemesi kaydedilemedi ({model_id}): {e}")
+
+
+async def generate_video_routed(
+    prompt: str,
+    duration: int = 8,
+    voice_mode: bool = False,
+    preferred: Optional[str] = None,
+    hedge: Optional[bool] = None,
+    max_cost: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Gözlenen süre / hata oranına göre model seçip video üret.
+
+    Args:
+        prompt: Video prompt'u
+        duration: İstenen süre (model desteklemiyorsa en yakın üst süre)
+        voice_mode: True ise native audio / konuşma kapatılır (TTS eklenecek)
+        preferred: Zorlanan model (VIDEO_MODELS ID'si); None ise en hızlı sağlıklı model
+        hedge: p90 aşılınca ikinci provider başlatılsın mı (None: video_hedge_enabled)
+        max_cost: Tahmini USD limiti (None: video_max_cost_per_run, 0: limitsiz).
+            Zorlanan model sadece açıkça verilen max_cost'u aşarsa hata döner
+            (başka modele geçilmez); video_max_cost_per_run onu engellemez
+
+    Returns:
+        Kazanan helper'ın sonucu + model_id, models_tried, hedged, cost_estimate_usd
+        (ilk seçilen model kazanmadıysa fallback_from)
+    """
+    hedge = settings.video_hedge_enabled if hedge is None else hedge
+    explicit_cost_limit = max_cost is not None
+    max_cost = settings.video_max_cost_per_run if max_cost is None else max_cost
+
+    try:
+        stats = await async_crud.get_video_model_stats(window=settings.video_router_window)
+    except Exception as e:
+        logger.warning(f"Video model istatistikleri okunamadı: {e}")
+        stats = {}
+
+    ranked = rank_models(stats, duration, preferred=preferred)
+
+    running: Dict[asyncio.Task, str] = {}
+    launched: List[str] = []
+    hedged_models: List[str] = []
+    spent = 0.0
+
+    def launch(model_id: str, as_hedge: bool):
+        nonlocal spent
+        model_duration = fit_duration(model_id, duration)
+        spent += estimate_cost(model_id, model_duration)
+        launched.append(model_id)
+        if as_hedge:
+            hedged_models.append(model_id)
+        print(f"[VIDEO] → {model_id} ({model_duration}s){' [hedge]' if as_hedge else ''}")
+        task = asyncio.create_task(_attempt(model_id, prompt, model_duration, voice_mode, as_hedge))
+        running[task] = model_id
+
+    def fits_budget(model_id: str) -> bool:
+        return not max_cost or spent + estimate_cost(model_id, fit_duration(model_id, duration)) <= max_cost
+
+    def next_model(avoid_provider: Optional[str] = None) -> Optional[str]:
+        """Bütçeye sığan sıradaki model (mümkünse farklı provider)"""
+        affordable = [
+            model_id for model_id in ranked
+            if model_id not in launched
+            and max(get_model_durations(model_id)) >= duration
+            and fits_budget(model_id)
+        ]
+        for model_id in affordable:
+            if VIDEO_MODELS[model_id]["provider"] != avoid_provider:
+                return model_id
+        return affordable[0] if affordable else None
+
+    if preferred:
+        # Zorlanan model değiştirilmez; sadece çağıranın verdiği limit engeller
+        primary = ranked[0]
+        if explicit_cost_limit and not fits_budget(primary):
+            cost = estimate_cost(primary, fit_duration(primary, duration))
+            logger.warning(f"{primary} tahmini maliyeti (${cost:.2f}) limiti (${max_cost:.2f}) aşıyor")
+            return {
+                "success": False,
+                "error": f"{primary} estimated cost ${cost:.2f} exceeds limit ${max_cost:.2f}",
+                "models_tried": []
+            }
+    else:
+        primary = next((model_id for model_id in ranked if fits_budget(model_id)), None)
+        if primary is None:
+            logger.warning(f"Maliyet limitine (${max_cost:.2f}) sığan video modeli yok")
+            return {"success": False, "error": f"No video model within cost limit (${max_cost:.2f})", "models_tried": []}
+
+    loop = asyncio.get_running_loop()
+    launch(primary, as_hedge=False)
+    hedge_at = loop.time() + hedge_delay(stats.get(primary)) if hedge else None
+    last_result: Dict[str, Any] = {"success": False, "error": "No video model available"}
+
+    try:
+        while running:
+            timeout = None
+            if hedge_at is not None and len(launched) < MAX_MODELS_PER_RUN:
+                timeout = max(0.0, hedge_at - loop.time())
+
+            done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                # İlk model p90'ını aştı - başka provider'da paralel dene
+                hedge_at = None
+                backup = next_model(avoid_provider=VIDEO_MODELS[primary]["provider"])
+                if backup:
+                    logger.info(f"{primary} p90 süresini aştı, hedge: {backup}")
+                    launch(backup, as_hedge=True)
+                continue
+
+            for task in done:
+                model_id = running.pop(task)
+                result = task.result()
+                if result.get("success"):
+                    result.setdefault("model_used", model_id)
+                    result["model_id"] = model_id
+                    result["models_tried"] = list(launched)
+                    result["hedged"] = model_id in hedged_models
+                    result["cost_estimate_usd"] = round(spent, 2)
+                    if model_id != primary:
+                        result["fallback_from"] = primary
+                    print(f"[VIDEO] ✅ {model_id} kazandı ({len(launched)} model denendi)")
+                    return result
+
+                last_result = result
+                print(f"[VIDEO] ⚠️ {model_id} basarisiz: {result.get('error')}")
+                if not running and len(launched) < MAX_MODELS_PER_RUN:
+                    backup = next_model(avoid_provider=VIDEO_MODELS[model_id]["provider"])
+                    if backup:
+                        hedge_at = None
+                        launch(backup, as_hedge=False)
+    finally:
+        # Kaybeden denemeleri iptal et (_attempt 'cancelled' kaydeder, uzak iş provider'da iptal edilir)
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+    last_result["models_tried"] = list(launched)
+    return last_result
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Altyazı zamanlaması benchmark'ı: iki geçiş (small + medium doğrulama) vs script hizalama.
+
+Her TTS klibi için üç yol ölçülür:
+  - iki geçiş: small transcription + indeks bazlı hybrid eşleme + medium
+    doğrulama transcription'ı (eski create_subtitle_file + verify akışı)
+  - hizalama (whisper): align_script, small model zamanlamasına hizalama
+  - hizalama (vad): align_script, sadece enerji bazlı konuşma bölgeleri
+
+Kelime sınırı doğruluğu gerçek referans zamanlamaya göre ölçülür (start/end
+mutlak hata ortalaması ve 100 ms içindeki sınır oranı). Referans ölçülen
+yollardan (hizalama / Whisper) türetilmez; her klipte ya "words" ya da
+ElevenLabs /text-to-speech/{voice_id}/with-timestamps yanıtındaki "alignment"
+(karakter zamanlamaları, kelimelere gruplanır) bulunmalıdır. İkisi de olmayan
+klipler atlanır.
+
+Manifest (JSON):
+    [{"audio": "outputs/audio/tts_1.mp3", "script": "Konuşulan metin...",
+      "words": [{"word": "...", "start": 0.0, "end": 0.4}, ...]},
+     {"audio": "outputs/audio/tts_2.mp3", "script": "...",
+      "alignment": {"characters": [...], "character_start_times_seconds": [...],
+                    "character_end_times_seconds": [...]}}]
+
+Kullanım:
+    python scripts/benchmark_alignment.py clips.json
+    python scripts/benchmark_alignment.py clips.json --warmup
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Proje root'unu path'e ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.subtitle_helper import (
+    align_script,
+    extract_word_timestamps,
+    tokenize_script,
+    verify_and_correct_subtitles,
+)
+
+
+def legacy_hybrid_words(script_words, whisper_words):
+    """Eski hybrid mod: script kelimesi i, Whisper kelimesi i'nin zamanını alır"""
+    max_words = max(len(script_words), len(whisper_words), 1)
+    if abs(len(script_words) - len(whisper_words)) / max_words > 0.3:
+        return whisper_words
+    aligned = []
+    for i, word in enumerate(script_words):
+        if i < len(whisper_words):
+            aligned.append({"word": word, "start": whisper_words[i]["start"], "end": whisper_words[i]["end"]})
+        elif aligned:
+            last_end = aligned[-1]["end"]
+            aligned.append({"word": word, "start": last_end, "end": last_end + 0.3})
+    return aligned
+
+
+async def run_two_pass(audio: str, script: str, model_size: str):
+    first = await extract_word_timestamps(audio, model_size=model_size)
+    if not first.get("success"):
+        return None
+    words = legacy_hybrid_words(tokenize_script(script), first["words"])
+    await verify_and_correct_subtitles(audio, first.get("full_text", ""), model_size_verify="medium")
+    return words
+
+
+async def run_alignment(audio: str, script: str, model_size: str, method: str):
+    result = await align_script(audio, script, model_size=model_size, method=method)
+    return result["words"] if result.get("success") else None
+
+
+def words_from_characters(alignment: dict):
+    """ElevenLabs karakter zamanlamalarını boşlukla ayrılmış kelimelere grupla"""
+    words = []
+    current = None
+    for char, start, end in zip(
+        alignment["characters"],
+        alignment["character_start_times_seconds"],
+        alignment["character_end_times_seconds"]
+    ):
+        if char.isspace():
+            current = None
+            continue
+        if current is None:
+            current = {"word": "", "start": start, "end": end}
+            words.append(current)
+        current["word"] += char
+        current["end"] = end
+    return words
+
+
+def reference_words(clip: dict):
+    """Gerçek referans: manifest'teki words veya TTS karakter zamanlaması"""
+    if clip.get("words"):
+        return clip["words"]
+    if clip.get("alignment"):
+        return words_from_characters(clip["alignment"])
+    return None
+
+
+def boundary_errors(words, reference):
+    """Aynı indeksteki kelimelerin start/end mutlak hataları (saniye)"""
+    errors = []
+    for word, ref in zip(words, reference):
+        errors.append(abs(word["start"] - ref["start"]))
+        errors.append(abs(word["end"] - ref["end"]))
+    # Eksik kelimeler en kötü durum kabul edilir
+    missing = abs(len(reference) - len(words))
+    errors.extend([1.0] * (2 * missing))
+    return errors
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Altyazı hizalama benchmark'ı")
+    parser.add_argument("manifest", help="Klip listesi (JSON)")
+    parser.add_argument("--model-size", default="small", help="İlk geçiş / hizalama modeli")
+    parser.add_argument("--warmup", action="store_true", help="Ölçümden önce small ve medium modelleri yükle")
+    args = parser.parse_args()
+
+    clips = json.loads(Path(args.manifest).read_text(encoding="utf-8"))
+    if not clips:
+        print("Manifest boş")
+        return 1
+
+    if args.warmup:
+        print("Modeller yükleniyor...")
+        for model_size in (args.model_size, "medium"):
+            await extract_word_timestamps(clips[0]["audio"], model_size=model_size)
+
+    paths = {
+        "iki geçiş": lambda c: run_two_pass(c["audio"], c["script"], args.model_size),
+        "hizalama (whisper)": lambda c: run_alignment(c["audio"], c["script"], args.model_size, "whisper"),
+        "hizalama (vad)": lambda c: run_alignment(c["audio"], c["script"], args.model_size, "vad"),
+    }
+    report = {name: {"times": [], "errors": [], "failed": 0} for name in paths}
+
+    for clip in clips:
+        reference = reference_words(clip)
+        if not reference:
+            print(f"{clip['audio']}: referans zamanlama yok (words / alignment), atlandı")
+            continue
+        for name, run in paths.items():
+            started = time.monotonic()
+            words = await run(clip)
+            elapsed = time.monotonic() - started
+            if not words:
+                report[name]["failed"] += 1
+                continue
+            report[name]["times"].append(elapsed)
+            report[name]["errors"].extend(boundary_errors(words, reference))
+        print(f"{clip['audio']}: tamam")
+
+    print(f"\n{'Yol':<20} {'Süre (s)':>9} {'p50 (s)':>8} {'MAE (ms)':>9} {'<100ms':>7} {'Hata':>5}")
+    for name, data in report.items():
+        if not data["times"]:
+            print(f"{name:<20} {'-':>9} {'-':>8} {'-':>9} {'-':>7} {data['failed']:>5}")
+            continue
+        errors = data["errors"]
+        mae_ms = statistics.mean(errors) * 1000 if errors else 0.0
+        within = sum(1 for e in errors if e <= 0.1) / len(errors) if errors else 0.0
+        print(f"{name:<20} {sum(data['times']):>9.2f} {statistics.median(data['times']):>8.2f} "
+              f"{mae_ms:>9.0f} {within:>7.0%} {data['failed']:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+SQLite bağlantı havuzu benchmark'ı.
+
+Eski open-per-call yöntemi (her çağrıda sqlite3.connect + close) ile
+ConnectionPool'u geçici bir veritabanında karşılaştırır ve ops/sec raporlar.
+
+Kullanım:
+    python scripts/benchmark_db_pool.py
+    python scripts/benchmark_db_pool.py --ops 5000 --threads 4
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Proje root'unu path'e ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.database.connection import ConnectionPool
+
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        topic TEXT NOT NULL,
+        post_text TEXT NOT NULL,
+        status TEXT DEFAULT 'draft'
+    )
+'''
+
+
+def open_per_call(db_path: Path):
+    """Eski get_connection() davranışı"""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def workload(get_conn, ops: int, write_every: int):
+    """get_post / create_post benzeri karışık iş yükü"""
+    for i in range(ops):
+        conn = get_conn()
+        cursor = conn.cursor()
+        if i % write_every == 0:
+            cursor.execute(
+                "INSERT INTO posts (topic, post_text, status) VALUES (?, ?, 'draft')",
+                (f"topic {i}", "text")
+            )
+            conn.commit()
+        else:
+            cursor.execute("SELECT * FROM posts WHERE id = ?", ((i % 100) + 1,))
+            cursor.fetchone()
+        conn.close()
+
+
+def run(label: str, get_conn, ops: int, threads: int, write_every: int) -> float:
+    per_thread = ops // threads
+    workers = [
+        threading.Thread(target=workload, args=(get_conn, per_thread, write_every))
+        for _ in range(threads)
+    ]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    ops_sec = (per_thread * threads) / elapsed
+    print(f"  {label:<16} {ops_sec:>10,.0f} ops/sec  ({elapsed:.2f}s)")
+    return ops_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite pool benchmark")
+    parser.add_argument("--ops", type=int, default=4000, help="Toplam işlem sayısı")
+    parser.add_argument("--threads", type=int, default=1, help="Eşzamanlı thread sayısı")
+    parser.add_argument("--write-every", type=int, default=10, help="Her N işlemde bir yazma")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(SCHEMA)
+        conn.executemany(
+            "INSERT INTO posts (topic, post_text) VALUES (?, ?)",
+            [(f"seed {i}", "text") for i in range(100)]
+        )
+        conn.commit()
+        conn.close()
+
+        pool = ConnectionPool(db_path, size=max(4, args.threads))
+
+        print(f"[BENCH] ops={args.ops} threads={args.threads} write_every={args.write_every}")
+        baseline = run("open-per-call", lambda: open_per_call(db_path), args.ops, args.threads, args.write_every)
+        pooled = run("pooled", pool.acquire, args.ops, args.threads, args.write_every)
+        print(f"  speedup          {pooled / baseline:>10.1f}x")
+        print(f"  pool stats       {pool.get_stats()}")
+        pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
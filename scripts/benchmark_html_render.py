@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+HTML -> PNG render benchmark'ı: render başına context vs sayfa havuzu.
+
+Sentetik carousel slide HTML'leri üretir; önce eski yolla (her render için
+yeni context + sayfa, sırayla), sonra app.renderer'ın sayfa havuzuna
+eşzamanlı RenderPool.render() çağrılarıyla (carousel slide görevleri gibi)
+render eder. Toplam süre ve slide/saniye raporlanır. Tarayıcı açılışı iki
+yolda da ölçüm dışındadır ve ayrıca raporlanır.
+
+Kullanım:
+    python scripts/benchmark_html_render.py
+    python scripts/benchmark_html_render.py --slides 10 --pool-size 4 --runs 3
+    python scripts/benchmark_html_render.py --settle-ms 300 --recycle-after 5
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Proje root'unu path'e ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from playwright.async_api import async_playwright
+
+from app.renderer import DEVICE_SCALE_FACTOR, RenderPool, get_render_pool_size
+
+SLIDE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><style>
+body {{ margin: 0; width: 1080px; height: 1080px; font-family: sans-serif;
+       background: linear-gradient(135deg, #1f3a1f, #4a7c4a); color: #fff; }}
+.card {{ margin: 80px; padding: 60px; border-radius: 32px; background: rgba(56, 189, 248, 0.15); }}
+h1 {{ font-size: 72px; margin: 0 0 40px; }}
+li {{ font-size: 40px; margin: 16px 0; }}
+</style></head><body><div class="card">
+<h1>Slide {n}/{total}</h1>
+<ul>{items}</ul>
+</div></body></html>"""
+
+
+def make_slides(count: int):
+    """Sentetik carousel slide HTML'leri"""
+    return [
+        SLIDE_TEMPLATE.format(
+            n=n,
+            total=count,
+            items="".join(f"<li>LoRaWAN sensör maddesi {n}.{i}</li>" for i in range(1, 6))
+        )
+        for n in range(1, count + 1)
+    ]
+
+
+async def render_serial(browser, slides, workdir: Path, settle_ms: int) -> float:
+    """Eski yol: tek (açık) browser, her render için yeni context + sayfa, sırayla"""
+    start = time.perf_counter()
+    for i, html in enumerate(slides, 1):
+        context = await browser.new_context(
+            viewport={'width': 1080, 'height': 1080},
+            device_scale_factor=DEVICE_SCALE_FACTOR
+        )
+        page = await context.new_page()
+        await page.set_content(html, wait_until='domcontentloaded')
+        await page.wait_for_timeout(settle_ms)
+        await page.screenshot(
+            path=str(workdir / f"serial_{i}.png"),
+            type='png',
+            clip={'x': 0, 'y': 0, 'width': 1080, 'height': 1080}
+        )
+        await context.close()
+    return time.perf_counter() - start
+
+
+async def render_pooled(pool: RenderPool, slides, workdir: Path, run: int) -> float:
+    """Sayfa havuzu: tüm slide'lar paralel (havuz boyutuna kadar)"""
+    paths = [str(workdir / f"pool_{run}_{i}.png") for i in range(1, len(slides) + 1)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(pool.render(html, path) for html, path in zip(slides, paths)))
+    elapsed = time.perf_counter() - start
+    assert all(results), "render failed"
+    return elapsed
+
+
+def report(name: str, timings, slides: int):
+    median = statistics.median(timings)
+    print(f"  {name:<28} {median:>7.2f}s  {slides / median:>6.2f} slide/s")
+
+
+async def main_async(args):
+    slides = make_slides(args.slides)
+    pool_size = args.pool_size or get_render_pool_size()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+
+        # Browser açılışı ölçüm dışında (havuzun ısınmasıyla aynı şekilde)
+        async with async_playwright() as playwright:
+            launch_start = time.perf_counter()
+            browser = await playwright.chromium.launch(headless=True, args=['--no-sandbox', '--disable-setuid-sandbox'])
+            serial_startup = time.perf_counter() - launch_start
+            serial = [await render_serial(browser, slides, workdir, args.settle_ms) for _ in range(args.runs)]
+            await browser.close()
+
+        pool = RenderPool(size=pool_size, recycle_after=args.recycle_after, settle_ms=args.settle_ms)
+        # Isınma: browser açılışı ve sayfaların hazırlanması ölçüm dışında
+        warmup_start = time.perf_counter()
+        await pool.render(slides[0], str(workdir / "warmup.png"))
+        pool_startup = time.perf_counter() - warmup_start
+        pooled = [await render_pooled(pool, slides, workdir, run) for run in range(args.runs)]
+        status = pool.get_status()
+        await pool.close()
+
+    print(f"\n{args.slides} slide, {args.runs} tekrar (medyan), settle {args.settle_ms}ms")
+    report("context-per-render (seri)", serial, args.slides)
+    report(f"sayfa havuzu (size={pool_size})", pooled, args.slides)
+    print(f"\n  başlangıç (ölçüm dışı): browser {serial_startup:.2f}s, havuz ısınması {pool_startup:.2f}s")
+    print(f"\n  pool: {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML -> PNG render benchmark")
+    parser.add_argument("--slides", type=int, default=7, help="Carousel slide sayısı")
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--pool-size", type=int, default=0, help="0 = CPU sayısı")
+    parser.add_argument("--settle-ms", type=int, default=1000)
+    parser.add_argument("--recycle-after", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Claude worker pool benchmark'ı (offline, fake worker ile).
+
+Kısa agent aksiyonlarını (_shorten_caption, generate_comment_cta,
+review_visual) önce süreç-başına-çağrı, sonra sıcak worker pool ile
+çalıştırır ve aksiyon bazında p50/p95 gecikmeyi raporlar.
+
+Kullanım:
+    python scripts/benchmark_llm_pool.py
+    python scripts/benchmark_llm_pool.py --calls 30 --concurrency 4 --pool-size 4 --startup-ms 1500
+"""
+import argparse
+import asyncio
+import os
+import shlex
+import sys
+import time
+from pathlib import Path
+
+# Proje root'unu path'e ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.llm import runner
+from app.llm.pool import ClaudeWorkerPool, STREAM_JSON_ARGS
+
+FAKE_WORKER = Path(__file__).resolve().parent / "fake_claude_worker.py"
+
+ACTIONS = {
+    "creator._shorten_caption": "Bu caption'ı 100 kelimeye kısalt: ...",
+    "creator.generate_comment_cta": "Yorum CTA'sı üret: ...",
+    "reviewer.review_visual": "Görseli değerlendir ve JSON puan döndür: ...",
+}
+
+
+async def run_load(call, calls: int, concurrency: int) -> dict:
+    """Her aksiyon için `calls` adet çağrı, en fazla `concurrency` eşzamanlı"""
+    sem = asyncio.Semaphore(concurrency)
+    latencies = {label: [] for label in ACTIONS}
+
+    async def one(label: str, prompt: str, i: int):
+        async with sem:
+            start = time.perf_counter()
+            await call(f"{prompt} #{i}", label)
+            latencies[label].append((time.perf_counter() - start) * 1000)
+
+    tasks = [one(label, prompt, i) for i in range(calls) for label, prompt in ACTIONS.items()]
+    start = time.perf_counter()
+    await asyncio.gather(*tasks)
+    return {"latencies": latencies, "wall_s": time.perf_counter() - start}
+
+
+def summarize(name: str, result: dict):
+    print(f"\n[{name}] toplam {result['wall_s']:.1f}s")
+    print(f"  {'aksiyon':<32} {'p50 ms':>8} {'p95 ms':>8}")
+    for label, values in result["latencies"].items():
+        ordered = sorted(values)
+        p50 = runner._percentile(ordered, 50)
+        p95 = runner._percentile(ordered, 95)
+        print(f"  {label:<32} {p50:>8.0f} {p95:>8.0f}")
+
+
+async def main_async(args):
+    os.environ["FAKE_CLAUDE_STARTUP_MS"] = str(args.startup_ms)
+    os.environ["FAKE_CLAUDE_LATENCY_MS"] = str(args.latency_ms)
+    cli = [sys.executable, str(FAKE_WORKER)]
+    runner.settings.llm_cli_command = shlex.join(cli)
+
+    async def one_shot(prompt: str, label: str):
+        return await runner.run_claude_cli(prompt, timeout=60)
+
+    before = await run_load(one_shot, args.calls, args.concurrency)
+    summarize("process-per-call", before)
+
+    pool = ClaudeWorkerPool(
+        [*cli, *STREAM_JSON_ARGS],
+        size=args.pool_size,
+        max_waiters=args.calls * len(ACTIONS)
+    )
+    # Isınma (ölçüm dışında): worker'lar tek kullanımlık; ilk istekler soğuk
+    # worker'ları tüketir ve yerlerine arka planda açılan ilk yenileri tetikler
+    await pool.start()
+    await asyncio.gather(*(pool.request("warmup", timeout=60) for _ in range(args.pool_size)))
+
+    async def pooled(prompt: str, label: str):
+        return await pool.request(prompt, timeout=60)
+
+    after = await run_load(pooled, args.calls, args.concurrency)
+    summarize(f"worker pool (size={args.pool_size})", after)
+    print(f"\n  pool: {pool.get_status()}")
+    await pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Claude worker pool benchmark")
+    parser.add_argument("--calls", type=int, default=10, help="Aksiyon başına çağrı sayısı")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--pool-size", type=int, default=2)
+    parser.add_argument("--startup-ms", type=float, default=800)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
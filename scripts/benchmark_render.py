@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Reels finalizasyonu benchmark'ı: adım adım render vs tek geçiş.
+
+Sentetik segmentler (testsrc2 + sine), bir TTS benzeri ses dosyası ve ASS
+altyazı üretir; aynı RenderPlan'ı önce eski adım adım yolla (concat ->
+merge -> altyazı burn, her adım ayrı encode), sonra tek geçişte render
+eder. Encode süresi, çıktı bitrate'i, boyut ve süre raporlanır.
+
+Not: Adım adım yol ara dosyalarını outputs/ dizinine yazar.
+
+Kullanım:
+    python scripts/benchmark_render.py
+    python scripts/benchmark_render.py --segments 4 --segment-duration 8 --crossfade 0.5
+    python scripts/benchmark_render.py --no-subtitles --runs 3
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+# Proje root'unu path'e ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.media import RenderPlan, RenderSegment, probe_media, render_single_pass, render_stepwise, run_media
+
+
+ASS_TEMPLATE = """[Script Info]
+ScriptType: v4.00+
+PlayResX: 720
+PlayResY: 1280
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, OutlineColour, Bold, Outline, Shadow, Alignment, MarginV
+Style: Default,DejaVu Sans,48,&HFFFFFF,&H000000,1,3,0,2,150
+
+[Events]
+Format: Layer, Start, End, Style, Text
+{events}
+"""
+
+
+async def make_inputs(workdir: Path, segments: int, segment_duration: float, audio_duration: float):
+    """Sentetik video segmentleri, ses ve ASS dosyası üret"""
+    paths = []
+    for i in range(segments):
+        path = workdir / f"segment_{i}.mp4"
+        await run_media([
+            "ffmpeg", "-y",
+            "-f", "lavfi", "-i", f"testsrc2=size=1080x1920:rate=30:duration={segment_duration}",
+            "-f", "lavfi", "-i", f"sine=frequency={300 + i * 100}:duration={segment_duration}",
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "20", "-c:a", "aac", "-shortest",
+            str(path)
+        ], timeout=300).check()
+        paths.append(str(path))
+
+    audio_path = workdir / "voice.mp3"
+    await run_media([
+        "ffmpeg", "-y", "-f", "lavfi", "-i", f"sine=frequency=220:duration={audio_duration}",
+        "-c:a", "libmp3lame", "-q:a", "2", str(audio_path)
+    ], timeout=120).check()
+
+    events = []
+    t = 0.0
+    while t < audio_duration:
+        start = f"0:{int(t // 60):02d}:{t % 60:05.2f}"
+        end_t = min(t + 2, audio_duration)
+        end = f"0:{int(end_t // 60):02d}:{end_t % 60:05.2f}"
+        events.append(f"Dialogue: 0,{start},{end},Default,Altyazı satırı {int(t // 2) + 1}")
+        t += 2
+    ass_path = workdir / "subs.ass"
+    ass_path.write_text(ASS_TEMPLATE.format(events="\n".join(events)), encoding="utf-8")
+
+    return paths, str(audio_path), str(ass_path)
+
+
+async def output_stats(path: str) -> dict:
+    info = await probe_media(path)
+    return {
+        "duration": info.duration or 0.0,
+        "bitrate_kbps": (info.bit_rate or 0) / 1000,
+        "size_mb": info.size / 1024 / 1024,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Render benchmark (adım adım vs tek geçiş)")
+    parser.add_argument("--segments", type=int, default=3, help="Segment sayısı (2-6)")
+    parser.add_argument("--segment-duration", type=float, default=8.0, help="Segment süresi (saniye)")
+    parser.add_argument("--crossfade", type=float, default=0.5, help="Crossfade süresi (0 = düz kesme)")
+    parser.add_argument("--no-subtitles", action="store_true", help="ASS burn-in olmadan ölç")
+    parser.add_argument("--runs", type=int, default=1, help="Her yol için tekrar sayısı")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="render_bench_") as tmp:
+        workdir = Path(tmp)
+        video_total = args.segments * args.segment_duration - (args.segments - 1) * args.crossfade
+        print(f"Girdiler hazırlanıyor: {args.segments}x{args.segment_duration}s, crossfade {args.crossfade}s...")
+        paths, audio_path, ass_path = await make_inputs(workdir, args.segments, args.segment_duration, video_total - 1)
+
+        def plan(n: int) -> RenderPlan:
+            return RenderPlan(
+                segments=[RenderSegment(p) for p in paths],
+                output_path=str(workdir / f"single_{n}.mp4"),
+                crossfade=args.crossfade,
+                audio_path=audio_path,
+                fade_out=0.5,
+                ass_path=None if args.no_subtitles else ass_path,
+            )
+
+        report = {}
+        for name, render in (("adım adım", render_stepwise), ("tek geçiş", render_single_pass)):
+            times = []
+            stats = None
+            for n in range(args.runs):
+                result = await render(plan(n))
+                if not result.get("success"):
+                    print(f"{name}: HATA - {result.get('error')}")
+                    return 1
+                times.append(result["encode_s"])
+                stats = await output_stats(result["output_path"])
+            report[name] = (statistics.median(times), stats)
+
+        print(f"\n{'Yol':<12} {'Encode (s)':>11} {'Bitrate (kbps)':>15} {'Boyut (MB)':>11} {'Süre (s)':>9}")
+        for name, (encode_s, stats) in report.items():
+            print(f"{name:<12} {encode_s:>11.2f} {stats['bitrate_kbps']:>15.0f} {stats['size_mb']:>11.2f} {stats['duration']:>9.2f}")
+
+        stepwise_s, single_s = report["adım adım"][0], report["tek geçiş"][0]
+        if single_s > 0:
+            print(f"\nHızlanma: {stepwise_s / single_s:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
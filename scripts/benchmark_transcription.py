@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Transcription backend benchmark'ı: openai-whisper (fp32) vs faster-whisper (int8).
+
+Her (backend, model) kombinasyonu ayrı bir süreçte çalışır: model yüklenir,
+tüm klipler transcribe edilir, süreç kendi tepe bellek kullanımını (RSS)
+raporlar. Real-time factor = inference süresi / ses süresi (düşük = hızlı).
+Metin benzerliği ilk backend'in aynı model çıktısına göre hesaplanır.
+
+Kullanım:
+    python scripts/benchmark_transcription.py outputs/audio/tts_*.mp3
+    python scripts/benchmark_transcription.py clip.mp3 --models small medium --backends whisper faster-whisper
+    python scripts/benchmark_transcription.py clip.mp3 --compute-type int8_float32 --cpu-threads 4
+"""
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Proje root'unu path'e ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.transcription.backends import BACKENDS, get_backend
+
+RESULT_KEYS = {"success", "words", "segments", "full_text", "duration"}
+
+
+def run_child(args) -> int:
+    """Tek backend + model: yükle, transcribe et, JSON rapor yaz"""
+    backend = get_backend(args.backend, compute_type=args.compute_type, cpu_threads=args.cpu_threads)
+    if not backend.is_available():
+        print(json.dumps({"error": f"{backend.name} kurulu değil ({backend.install_hint})"}))
+        return 0
+
+    started = time.monotonic()
+    model = backend.load(args.model)
+    load_s = time.monotonic() - started
+
+    inference_s = 0.0
+    texts = []
+    for clip in args.clips:
+        started = time.monotonic()
+        result = backend.transcribe(model, clip, language=args.language)
+        inference_s += time.monotonic() - started
+        if set(result) != RESULT_KEYS:
+            print(json.dumps({"error": f"beklenmeyen sonuç alanları: {sorted(result)}"}))
+            return 0
+        texts.append(result["full_text"])
+
+    # Linux'ta ru_maxrss KB cinsinden
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({"load_s": load_s, "inference_s": inference_s, "peak_rss_mb": peak_rss_mb, "texts": texts}))
+    return 0
+
+
+async def audio_seconds(clips) -> float:
+    from app.media import probe_duration
+    durations = await asyncio.gather(*(probe_duration(c) for c in clips))
+    return sum(d or 0.0 for d in durations)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Transcription backend benchmark'ı")
+    parser.add_argument("clips", nargs="+", help="Ses dosyaları")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--models", nargs="+", default=["small", "medium"])
+    parser.add_argument("--compute-type", default="int8", help="faster-whisper quantization")
+    parser.add_argument("--cpu-threads", type=int, default=0, help="faster-whisper CPU thread sayısı")
+    parser.add_argument("--language", default="tr")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    parser.add_argument("--model", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_child(args)
+
+    total_audio = asyncio.run(audio_seconds(args.clips))
+    print(f"{len(args.clips)} klip, toplam {total_audio:.1f}s ses\n")
+
+    rows = []
+    baseline_texts = {}
+    for model in args.models:
+        for backend in args.backends:
+            cmd = [
+                sys.executable, __file__, *args.clips, "--child",
+                "--backend", backend, "--model", model, "--language", args.language,
+                "--compute-type", args.compute_type, "--cpu-threads", str(args.cpu_threads)
+            ]
+            proc = subprocess.run(cmd, capture_output=True, text=True)
+            lines = proc.stdout.strip().splitlines()
+            try:
+                report = json.loads(lines[-1])
+            except (IndexError, json.JSONDecodeError):
+                report = {"error": (proc.stderr.strip().splitlines() or ["çıktı yok"])[-1]}
+
+            if "error" in report:
+                rows.append((backend, model, None, report["error"]))
+                continue
+
+            texts = report["texts"]
+            baseline = baseline_texts.setdefault(model, texts)
+            similarity = sum(
+                SequenceMatcher(None, a.lower(), b.lower()).ratio() for a, b in zip(baseline, texts)
+            ) / max(len(texts), 1)
+            report["rtf"] = report["inference_s"] / total_audio if total_audio else 0.0
+            report["similarity"] = similarity
+            rows.append((backend, model, report, None))
+
+    print(f"{'Backend':<16} {'Model':<8} {'Yükleme (s)':>12} {'RTF':>6} {'Tepe RSS (MB)':>14} {'Metin benzerliği':>17}")
+    for backend, model, report, error in rows:
+        if error:
+            print(f"{backend:<16} {model:<8} HATA: {error}")
+            continue
+        print(f"{backend:<16} {model:<8} {report['load_s']:>12.1f} {report['rtf']:>6.2f} "
+              f"{report['peak_rss_mb']:>14.0f} {report['similarity']:>17.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+TTS indirme benchmark'ı: tam yanıt (bellekte) vs streaming (diske akıtma).
+
+Aynı uzun metin iki modda ElevenLabs'e gönderilir (TTS cache'i atlanır):
+  - buffered: /text-to-speech, yanıt gövdesi bellekte toplanıp yazılır
+  - stream:   /text-to-speech/{voice}/stream, chunk'lar geldikçe diske yazılır
+
+Her mod için dosya hazır olana kadar geçen süre, Python heap tepe
+kullanımı (tracemalloc), dosya boyutu ve MP3 frame header'larından
+ölçülen süre raporlanır; ölçülen süre ffprobe ile karşılaştırılır.
+
+Not: Her çalıştırma ElevenLabs karakter kotası harcar (metin x mod x runs).
+
+Kullanım:
+    python scripts/benchmark_tts_stream.py --words 600
+    python scripts/benchmark_tts_stream.py --text-file script.txt --runs 2
+    python scripts/benchmark_tts_stream.py --words 300 --voice-id <voice_id>
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Proje root'unu path'e ekle
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.elevenlabs_helper import ElevenLabsHelper
+from app.media import probe_duration
+
+SAMPLE_SENTENCE = (
+    "Akıllı tarım sensörleri topraktaki nemi, sıcaklığı ve besin seviyesini "
+    "her dakika ölçerek sulamayı otomatik olarak ayarlar."
+)
+
+
+def build_text(args) -> str:
+    if args.text_file:
+        return Path(args.text_file).read_text(encoding="utf-8").strip()
+    words = SAMPLE_SENTENCE.split()
+    repeated = (words * (args.words // len(words) + 1))[:args.words]
+    return " ".join(repeated)[:5000]
+
+
+async def run_once(text: str, voice_id: str, stream: bool) -> dict:
+    started = time.monotonic()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        result = await ElevenLabsHelper.generate_speech(
+            text=text, voice_id=voice_id, stream=stream
+        )
+        ready_s = time.monotonic() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    if not result.get("success"):
+        return {"error": result.get("error", "unknown error")}
+    return {
+        "ready_s": ready_s,
+        "peak_mb": peak / (1024 * 1024),
+        "size_kb": result["file_size_bytes"] / 1024,
+        "measured": result.get("measured_duration") or 0.0,
+        "ffprobe": await probe_duration(result["audio_path"]) or 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="TTS streaming indirme benchmark'ı")
+    parser.add_argument("--words", type=int, default=600, help="Üretilecek metin uzunluğu (kelime)")
+    parser.add_argument("--text-file", help="Metin dosyası (--words yerine)")
+    parser.add_argument("--voice-id", help="ElevenLabs voice ID (varsayılan: ELEVENLABS_VOICE_ID)")
+    parser.add_argument("--runs", type=int, default=1, help="Mod başına tekrar")
+    args = parser.parse_args()
+
+    text = build_text(args)
+    voice_id = args.voice_id or ElevenLabsHelper._get_voice_id()
+    print(f"Metin: {len(text.split())} kelime, {len(text)} karakter\n")
+
+    print(f"{'Mod':<10} {'Ready (s)':>10} {'Tepe heap (MB)':>15} {'Boyut (KB)':>11} "
+          f"{'Süre (s)':>9} {'ffprobe (s)':>12}")
+    for mode in ("buffered", "stream"):
+        runs = []
+        for _ in range(args.runs):
+            report = await run_once(text, voice_id, stream=(mode == "stream"))
+            if "error" in report:
+                print(f"{mode:<10} HATA: {report['error']}")
+                break
+            runs.append(report)
+        if not runs:
+            continue
+        med = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+        print(f"{mode:<10} {med['ready_s']:>10.2f} {med['peak_mb']:>15.2f} {med['size_kb']:>11.0f} "
+              f"{med['measured']:>9.2f} {med['ffprobe']:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Offline Claude CLI taklidi (yük testi / benchmark için).
+
+Gerçek CLI'ın kullandığımız iki modunu konuşur:
+    tek seferlik:  fake_claude_worker.py -p "<prompt>" --print
+    stream-json:   fake_claude_worker.py -p --input-format stream-json --output-format stream-json --verbose
+
+Süreç başlangıcı (--startup-ms) ve yanıt süresi (--latency-ms) simüle edilir.
+Yanıt, prompt'un kısa bir özetini içeren JSON'dur. stream-json modunda gerçek
+CLI gibi tek bir oturum tutulur: `session_turn` oturumdaki kaçıncı prompt
+olduğunu, `context_chars` önceki prompt'ların toplam uzunluğunu gösterir.
+
+Kullanım:
+    LLM_CLI_COMMAND="python scripts/fake_claude_worker.py" LLM_POOL_ENABLED=true python -m app.main
+    python scripts/fake_claude_worker.py -p "merhaba" --print
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+
+
+def fake_response(prompt: str, session_turn: int = 1, context_chars: int = 0) -> str:
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+    return json.dumps({
+        "fake": True,
+        "digest": digest,
+        "chars": len(prompt),
+        "session_turn": session_turn,
+        "context_chars": context_chars
+    }, ensure_ascii=False)
+
+
+def simulate_latency(latency_ms: float, jitter: float):
+    time.sleep(max(0.0, latency_ms * (1 + random.uniform(-jitter, jitter))) / 1000)
+
+
+def run_stream(args):
+    print(json.dumps({"type": "system", "subtype": "init", "pid": os.getpid()}), flush=True)
+    history = []  # Oturum bağlamı (gerçek CLI önceki turları hatırlar)
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+            content = message["message"]["content"]
+            if isinstance(content, list):
+                content = "".join(part.get("text", "") for part in content)
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            print(json.dumps({"type": "result", "is_error": True, "result": f"bad input: {e}"}), flush=True)
+            continue
+
+        simulate_latency(args.latency_ms, args.jitter)
+        print(json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": "..."}]}}), flush=True)
+        result = fake_response(content, session_turn=len(history) + 1, context_chars=sum(map(len, history)))
+        history.append(content)
+        print(json.dumps({"type": "result", "is_error": False, "result": result}), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Claude CLI taklidi")
+    parser.add_argument("-p", "--print-mode", dest="prompt", nargs="?", const="", default=None)
+    parser.add_argument("--print", action="store_true")
+    parser.add_argument("--input-format", default="text")
+    parser.add_argument("--output-format", default="text")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--startup-ms", type=float, default=float(os.environ.get("FAKE_CLAUDE_STARTUP_MS", 800)))
+    parser.add_argument("--latency-ms", type=float, default=float(os.environ.get("FAKE_CLAUDE_LATENCY_MS", 150)))
+    parser.add_argument("--jitter", type=float, default=0.2, help="Gecikme sapması (0.2 = ±%%20)")
+    args = parser.parse_args()
+
+    # CLI'ın Node runtime + config yüklemesi
+    simulate_latency(args.startup_ms, args.jitter)
+
+    if args.input_format == "stream-json":
+        run_stream(args)
+        return
+
+    simulate_latency(args.latency_ms, args.jitter)
+    print(fake_response(args.prompt or ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Test ortamı: app.config import edilmeden önce zorunlu alanlar ve geçici base dir
+
+OLIVENET_BASE_DIR geçici bir dizine ayarlanır; böylece repo'daki .env
+okunmaz (varsayılan ayarlar geçerli) ve SQLite veritabanı geçici dizinde
+oluşturulur.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("OLIVENET_BASE_DIR", tempfile.mkdtemp(prefix="olivenet-tests-"))
+os.environ.setdefault("TELEGRAM_BOT_TOKEN", "test")
+os.environ.setdefault("TELEGRAM_ADMIN_CHAT_ID", "0")
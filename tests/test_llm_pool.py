@@ -0,0 +1,56 @@
+"""
+ClaudeWorkerPool - istekler arası oturum izolasyonu (fake worker ile, offline)
+
+Kullanım:
+    python -m pytest tests/test_llm_pool.py -q
+"""
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("FAKE_CLAUDE_STARTUP_MS", "0")
+os.environ.setdefault("FAKE_CLAUDE_LATENCY_MS", "0")
+
+from app.llm.pool import STREAM_JSON_ARGS, ClaudeWorkerPool, WorkerError, ClaudeWorker  # noqa: E402
+
+FAKE_WORKER = [sys.executable, str(ROOT / "scripts" / "fake_claude_worker.py"), *STREAM_JSON_ARGS]
+
+
+def test_consecutive_requests_share_no_context():
+    async def run():
+        pool = ClaudeWorkerPool(FAKE_WORKER, size=1, health_interval=3600)
+        try:
+            first = json.loads(await pool.request("persona A: uzun bir gizli bağlam", timeout=30))
+            second = json.loads(await pool.request("persona B: ikinci prompt", timeout=30))
+        finally:
+            await pool.close()
+        return first, second, pool.stats
+
+    first, second, stats = asyncio.run(run())
+
+    # Her istek yeni bir CLI oturumunda: önceki prompt görünmez
+    assert first["session_turn"] == 1
+    assert second["session_turn"] == 1
+    assert second["context_chars"] == 0
+    assert stats["recycled"] >= 1
+
+
+def test_worker_refuses_second_prompt():
+    async def run():
+        worker = ClaudeWorker(FAKE_WORKER)
+        await worker.start()
+        try:
+            await worker.request("ilk", timeout=30)
+            try:
+                await worker.request("ikinci", timeout=30)
+            except WorkerError:
+                return True
+            return False
+        finally:
+            await worker.stop()
+
+    assert asyncio.run(run())
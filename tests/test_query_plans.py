@@ -0,0 +1,92 @@
+"""
+EXPLAIN QUERY PLAN regresyon testi - crud.py hot path sorguları
+
+Geçici bir veritabanına tüm migration'ları uygular, hot path CRUD
+fonksiyonlarını bu bağlantıya bağlı (bind_connection) çalıştırır ve
+çalıştırdıkları SQL'i (sqlite trace callback) EXPLAIN QUERY PLAN ile
+kontrol eder. Sorgular crud.py'den geldiği için crud.py'deki bir değişiklik
+index'i devre dışı bırakırsa test başarısız olur.
+
+Yeni bir sık kullanılan sorgu eklediğinizde HOT_CALLS listesine de ekleyin.
+
+Kullanım:
+    python -m pytest tests/test_query_plans.py -q
+"""
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from app.database import crud
+from app.database.connection import bind_connection
+from app.database.migrations import apply_migrations
+from app.database.models import MIGRATIONS
+
+NOW = datetime(2024, 1, 15, 12, 0)
+
+# (isim, crud çağrısı) - hot path sorguları
+HOT_CALLS = [
+    ("get_posts_by_status", lambda: crud.get_posts_by_status("draft")),
+    ("get_published_posts", lambda: crud.get_published_posts()),
+    ("get_analytics_summary", lambda: crud.get_analytics_summary()),
+    ("get_scheduled_posts", lambda: crud.get_scheduled_posts(NOW, NOW)),
+    ("get_week_calendar", lambda: crud.get_week_calendar(NOW)),
+    ("get_todays_calendar", lambda: crud.get_todays_calendar(day_of_week=2)),
+    ("get_post_analytics", lambda: crud.get_post_analytics(1)),
+    ("get_agent_logs(agent)", lambda: crud.get_agent_logs("creator")),
+    ("get_agent_logs", lambda: crud.get_agent_logs()),
+    ("get_approval_history(post)", lambda: crud.get_approval_history(post_id=1)),
+    ("get_approval_history", lambda: crud.get_approval_history()),
+    ("update_hook_performance",
+     lambda: crud.update_hook_performance("question", "egitici", "instagram", reach=100, engagement=10)),
+    ("get_best_performing_hooks", lambda: crud.get_best_performing_hooks()),
+    ("get_ab_test_results", lambda: crud.get_ab_test_results()),
+    ("get_interrupted_runs", lambda: crud.get_interrupted_runs()),
+    ("get_remote_job_durations", lambda: crud.get_remote_job_durations("fal", "kling_pro")),
+    ("get_video_model_stats", lambda: crud.get_video_model_stats()),
+]
+
+# Plan içermeyen / transaction kontrol ifadeleri
+SKIPPED_PREFIXES = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA")
+
+
+def find_full_scans(plan_rows) -> list:
+    """Plan satırlarından index kullanmayan SCAN'leri döndür"""
+    scans = []
+    for row in plan_rows:
+        detail = row[-1]
+        if detail.startswith("SCAN") and "INDEX" not in detail:
+            scans.append(detail)
+    return scans
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    conn = sqlite3.connect(str(tmp_path_factory.mktemp("plans") / "plan.db"))
+    conn.row_factory = sqlite3.Row
+    apply_migrations(conn, MIGRATIONS)
+    yield conn
+    conn.close()
+
+
+def executed_sql(conn, call) -> list:
+    """crud çağrısının bu bağlantıda çalıştırdığı SQL ifadeleri (parametreler gömülü)"""
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        with bind_connection(conn):
+            call()
+    finally:
+        conn.set_trace_callback(None)
+    return [sql for sql in statements if not sql.lstrip().upper().startswith(SKIPPED_PREFIXES)]
+
+
+@pytest.mark.parametrize("name, call", HOT_CALLS, ids=[name for name, _ in HOT_CALLS])
+def test_hot_query_uses_index(conn, name, call):
+    statements = executed_sql(conn, call)
+    assert statements, f"{name} hiç sorgu çalıştırmadı"
+
+    for sql in statements:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+        scans = find_full_scans(plan)
+        assert not scans, f"{name}: full table scan {scans}\n{' '.join(sql.split())}"
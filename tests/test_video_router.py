@@ -0,0 +1,59 @@
+"""
+Video router - zorlanan model ve maliyet limiti (üretim ve DB istatistikleri mock'lu)
+
+Kullanım:
+    python -m pytest tests/test_video_router.py -q
+"""
+import asyncio
+
+import pytest
+
+from app import video_router
+from app.config import settings
+from app.video_models import estimate_cost
+
+
+@pytest.fixture
+def launched(monkeypatch):
+    """_attempt'i sahte başarıyla değiştir, başlatılan modelleri topla"""
+    models = []
+
+    async def fake_attempt(model_id, prompt, duration, voice_mode, hedged):
+        models.append((model_id, duration))
+        return {"success": True}
+
+    async def no_stats(window):
+        return {}
+
+    monkeypatch.setattr(video_router, "_attempt", fake_attempt)
+    monkeypatch.setattr(video_router.async_crud, "get_video_model_stats", no_stats)
+    monkeypatch.setattr(settings, "video_hedge_enabled", False)
+    return models
+
+
+@pytest.mark.parametrize("model_id, duration", [("veo-3.1", 8), ("sora-2-pro", 12)])
+def test_forced_model_kept_under_default_cost_limit(launched, model_id, duration):
+    # Varsayılan limiti aşan model bile zorlanırsa değiştirilmez
+    assert estimate_cost(model_id, duration) > settings.video_max_cost_per_run
+
+    result = asyncio.run(video_router.generate_video_routed("prompt", duration=duration, preferred=model_id))
+
+    assert result["success"]
+    assert result["model_id"] == model_id
+    assert launched == [(model_id, duration)]
+
+
+def test_forced_model_over_explicit_limit_fails(launched):
+    result = asyncio.run(video_router.generate_video_routed("prompt", duration=8, preferred="veo-3.1", max_cost=1.0))
+
+    assert not result["success"]
+    assert "exceeds limit" in result["error"]
+    assert launched == []
+
+
+def test_auto_selected_model_respects_cost_limit(launched):
+    result = asyncio.run(video_router.generate_video_routed("prompt", duration=8, max_cost=1.0))
+
+    model_id, duration = launched[0]
+    assert result["model_id"] == model_id
+    assert estimate_cost(model_id, duration) <= 1.0